@@ -5,39 +5,55 @@
 # This must be the very first action to ensure all subsequent imports and
 # global variables have access to the values in the .env file.
 # ==============================================================================
+import json
 import os
 import sys
 import time
 import uuid
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import uvicorn
-from antifragile_framework.config.config_loader import load_provider_profiles
+import yaml
+from antifragile_framework.config.config_loader import (
+    load_provider_profiles,
+    load_resilience_config,
+)
+from antifragile_framework.config.cost_estimator import CostEstimator
 from antifragile_framework.core.exceptions import AllProvidersFailedError
 from antifragile_framework.core.failover_engine import FailoverEngine
+from antifragile_framework.core.learning_engine import LearningEngine
 from antifragile_framework.core.online_learning_subscriber import (
     OnlineLearningSubscriber,
 )
 from antifragile_framework.core.provider_ranking_engine import (
+    DEFAULT_EXPLORATION_FRACTION,
+    RANKING_MODE_RESILIENCE,
     ProviderRankingEngine,
 )
+from antifragile_framework.core.shared_state import (
+    DEFAULT_MAX_STALENESS_SECONDS,
+    create_shared_state,
+)
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
 )
+from antifragile_framework.providers.client_cache import get_default_client_cache
 from antifragile_framework.providers.provider_registry import (
     get_default_provider_registry,
 )
 from antifragile_framework.resilience.bias_ledger import BiasLedger
+from antifragile_framework.resilience.ledger_sink import LedgerSink
 from dotenv import load_dotenv
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from telemetry import event_topics
 from telemetry.core_logger import UniversalEventSchema, core_logger
-from telemetry.event_bus import EventBus
+from telemetry.event_bus import AsyncEventBus
 
 load_dotenv()
 
@@ -50,6 +66,30 @@ load_dotenv()
 # ==============================================================================
 
 
+# How long shutdown waits for queued telemetry events to be delivered.
+EVENT_BUS_DRAIN_TIMEOUT_SECONDS = 5.0
+
+
+# Immutable configuration shared by every worker. The serve launcher fills it
+# before forking so workers inherit the parsed copy; otherwise the first
+# lifespan startup does. Treat the values as read-only.
+_immutable_config: Dict[str, Any] = {}
+
+
+def preload_immutable_config() -> Dict[str, Any]:
+    """
+    Loads and validates the provider profiles and resilience config once per
+    process tree. Raises FileNotFoundError, ValueError or yaml.YAMLError on
+    invalid configuration.
+    """
+    if not _immutable_config:
+        _immutable_config.update(
+            provider_profiles=load_provider_profiles(),
+            resilience_config=load_resilience_config(),
+        )
+    return _immutable_config
+
+
 def get_api_keys_from_env(
     env_var_name: str, default: str = "YOUR_KEY_HERE"
 ) -> List[str]:
@@ -142,25 +182,67 @@ async def lifespan(app: FastAPI):
         print("[INFO] Lifespan: PERFORMANCE_TEST_MODE not set. Init production.")
 
     try:
-        provider_profiles = load_provider_profiles()
-    except (FileNotFoundError, ValueError) as e:
+        immutable_config = preload_immutable_config()
+    except (FileNotFoundError, ValueError, yaml.YAMLError) as e:
         core_logger.log_event(
             event_type="api.startup.failure",
             event_topic="api.errors",
-            payload={"error": f"Failed to load provider profiles: {e}"},
+            payload={"error": f"Failed to load configuration: {e}"},
             severity="CRITICAL"
         )
-        sys.exit(f"CRITICAL ERROR: Invalid provider profiles. Error: {e}")
+        sys.exit(f"CRITICAL ERROR: Invalid configuration. Error: {e}")
+    provider_profiles = immutable_config["provider_profiles"]
 
     # ==============================================================================
     # REFACTOR: Create the provider registry
     # ==============================================================================
     provider_registry = get_default_provider_registry()
 
-    event_bus = EventBus()
-    ranking_engine = ProviderRankingEngine()
+    # Events are queued and delivered by background workers, so publishing
+    # from the request path never waits on subscribers.
+    event_bus = AsyncEventBus()
+    # Workers share ranking EMAs, breaker trips and key cooldowns through
+    # SHARED_STATE_BACKEND: "mmap" (one host, SHARED_STATE_PATH) or "redis"
+    # (several nodes, SHARED_STATE_URL). Unset keeps all state per worker.
+    shared_state = create_shared_state(
+        {
+            "backend": os.getenv("SHARED_STATE_BACKEND"),
+            "path": os.getenv("SHARED_STATE_PATH"),
+            "url": os.getenv("SHARED_STATE_URL"),
+            "max_staleness_seconds": os.getenv(
+                "SHARED_STATE_MAX_STALENESS_SECONDS", DEFAULT_MAX_STALENESS_SECONDS
+            ),
+        }
+    )
+    # "multi_objective" also orders models by success, latency and cost.
+    # "thompson" or "ucb" sends a bounded share of traffic to explore.
+    ranking_engine = ProviderRankingEngine(
+        ranking_mode=os.getenv("PROVIDER_RANKING_MODE", RANKING_MODE_RESILIENCE),
+        exploration_policy=os.getenv("PROVIDER_EXPLORATION_POLICY") or None,
+        exploration_fraction=float(
+            os.getenv("PROVIDER_EXPLORATION_FRACTION", DEFAULT_EXPLORATION_FRACTION)
+        ),
+        shared_state=shared_state,
+    )
     learning_subscriber = OnlineLearningSubscriber(ranking_engine)
-    bias_ledger = BiasLedger(event_bus=event_bus, provider_profiles=provider_profiles)
+    # Optional durable copy of every ledger entry as rotating NDJSON segments.
+    ledger_sink_dir = os.getenv("BIAS_LEDGER_SINK_DIR")
+    ledger_sink = (
+        LedgerSink(
+            ledger_sink_dir,
+            compression=os.getenv("BIAS_LEDGER_SINK_COMPRESSION") or None,
+        )
+        if ledger_sink_dir
+        else None
+    )
+    # One compiled price table serves both the engine and the ledger, so
+    # swapping the engine's provider_profiles reprices both.
+    cost_estimator = CostEstimator(provider_profiles)
+    bias_ledger = BiasLedger(
+        event_bus=event_bus,
+        ledger_sink=ledger_sink,
+        cost_estimator=cost_estimator,
+    )
 
     event_bus.subscribe(
         event_topics.LEARNING_FEEDBACK_PUBLISHED,
@@ -172,6 +254,15 @@ async def lifespan(app: FastAPI):
         payload={"message": "Online learning subscriber connected to event bus."},
         severity="INFO"
     )
+    # Rolling per-(provider, model) performance buckets folded live from the
+    # ledger; LEARNING_CHECKPOINT_PATH keeps them across restarts. The API has
+    # no time-series backend to catch up from, so entries logged while it was
+    # down are not folded. With one, await learning_engine.catch_up() here.
+    learning_engine = LearningEngine(
+        db_interface=None,
+        checkpoint_path=os.getenv("LEARNING_CHECKPOINT_PATH") or None,
+    )
+    learning_engine.subscribe(event_bus)
 
     # ==============================================================================
     # REFACTOR: Inject the provider registry into the FailoverEngine
@@ -182,11 +273,14 @@ async def lifespan(app: FastAPI):
         event_bus=event_bus,
         bias_ledger=bias_ledger,
         provider_ranking_engine=ranking_engine,
-        provider_profiles=provider_profiles,  # ← This line added
+        cost_estimator=cost_estimator,
+        shared_state=shared_state,
+        resilience_config=immutable_config["resilience_config"],
     )
 
     app.state.failover_engine = failover_engine
     app.state.ranking_engine = ranking_engine
+    app.state.learning_engine = learning_engine
 
     core_logger.log_event(
         event_type="api.startup.end",
@@ -201,7 +295,15 @@ async def lifespan(app: FastAPI):
         payload={"message": "Adaptive Mind API shutting down."},
         severity="INFO"
     )
+    await event_bus.drain(timeout=EVENT_BUS_DRAIN_TIMEOUT_SECONDS)
     event_bus.shutdown()
+    # Live folding has stopped, so the final write can block.
+    learning_engine.save_checkpoint()
+    if ledger_sink:
+        ledger_sink.close()
+    if shared_state:
+        shared_state.close()
+    await get_default_client_cache().close()
 
 
 app = FastAPI(
@@ -312,6 +414,51 @@ async def chat_completions(request: Request, body: ChatCompletionRequest):
     return completion_response
 
 
+async def _sse_events(
+    first_chunk: CompletionChunk, chunks: AsyncIterator[CompletionChunk]
+) -> AsyncIterator[str]:
+    """Formats completion chunks as Server-Sent Events."""
+    try:
+        yield f"data: {first_chunk.model_dump_json()}\n\n"
+        async for chunk in chunks:
+            yield f"data: {chunk.model_dump_json()}\n\n"
+    except Exception as e:
+        # Headers are already sent, so errors after the first chunk are
+        # reported in-band.
+        error = json.dumps({"error_type": type(e).__name__, "detail": str(e)})
+        yield f"event: error\ndata: {error}\n\n"
+        return
+    finally:
+        await chunks.aclose()
+    yield "data: [DONE]\n\n"
+
+
+@app.post(
+    "/v1/chat/completions/stream",
+    responses={503: {"model": ErrorDetail}, 500: {"model": ErrorDetail}},
+    tags=["Core Functionality"],
+)
+async def chat_completions_stream(request: Request, body: ChatCompletionRequest):
+    """
+    Streams a completion as Server-Sent Events. Failover happens until the
+    first chunk arrives, so a request no provider can serve still gets a 503.
+    """
+    failover_engine: FailoverEngine = request.app.state.failover_engine
+    chunks = failover_engine.execute_request_stream(
+        model_priority_map=body.model_priority_map,
+        messages=body.messages,
+        request_id=request.state.request_id,
+        preferred_provider=body.preferred_provider,
+        max_estimated_cost_usd=body.max_estimated_cost_usd,
+    )
+    first_chunk = await chunks.__anext__()
+    return StreamingResponse(
+        _sse_events(first_chunk, chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.get("/v1/learning/rankings", tags=["Learning Engine"])
 async def get_provider_rankings(request: Request):
     """
@@ -321,10 +468,15 @@ async def get_provider_rankings(request: Request):
     return {
         "ranked_providers": ranking_engine.get_ranked_providers(),
         "provider_scores": ranking_engine.get_provider_scores(),
+        "ranking_mode": ranking_engine.ranking_mode,
+        "candidate_stats": ranking_engine.get_candidate_stats(),
+        "exploration": ranking_engine.get_exploration_stats(),
     }
 
 
 if __name__ == "__main__":
+    # Development server. For production use the multi-worker launcher:
+    #   python -m antifragile_framework.api.serve --workers auto
     print("Starting Adaptive Mind API server with Uvicorn...")
     uvicorn.run(
         "antifragile_framework.api.framework_api:app",
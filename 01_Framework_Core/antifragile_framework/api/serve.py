@@ -0,0 +1,333 @@
+# antifragile_framework/api/serve.py
+"""
+Production launcher for the framework API.
+
+    python -m antifragile_framework.api.serve --workers 4 --port 8000
+
+The parent process imports the application and loads the immutable
+configuration (provider profiles, resilience config) once, binds the listening
+socket and forks the workers, so every worker starts from the same parsed
+state. Each worker runs its own event loop (uvloop and httptools when
+installed), warms up, and serves from the shared socket. SIGTERM or SIGINT
+drains the workers: they stop accepting connections, finish in-flight
+requests within the graceful shutdown timeout and run the lifespan shutdown
+(telemetry drain, ledger sink close). Workers that die unexpectedly are
+restarted.
+
+Configuration comes from the command line or the API_HOST, API_PORT,
+API_WORKERS ("auto" = one per CPU), API_GRACEFUL_SHUTDOWN_SECONDS and
+API_LOG_LEVEL environment variables. Set SHARED_STATE_BACKEND so workers share
+provider rankings, breaker trips and key cooldowns.
+"""
+
+import argparse
+import gc
+import hashlib
+import json
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import uvicorn
+
+# Both are optional accelerators; uvicorn falls back to asyncio and h11.
+try:
+    import uvloop  # noqa: F401
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+try:
+    import httptools  # noqa: F401
+
+    HTTPTOOLS_AVAILABLE = True
+except ImportError:
+    HTTPTOOLS_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8000
+DEFAULT_GRACEFUL_SHUTDOWN_SECONDS = 30
+DEFAULT_LOG_LEVEL = "info"
+# A crashed worker is restarted after this delay, so a worker that fails on
+# startup does not spin.
+WORKER_RESTART_DELAY_SECONDS = 1.0
+# Extra time past the graceful shutdown timeout before stragglers are killed.
+WORKER_KILL_GRACE_SECONDS = 5.0
+
+
+def resolve_worker_count(value: Union[int, str, None]) -> int:
+    """Returns the worker count for a number, or one per CPU for None/'auto'."""
+    if value is None or str(value).strip().lower() in ("", "auto"):
+        return os.cpu_count() or 1
+    try:
+        workers = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Worker count must be a positive integer or 'auto': {value}")
+    if workers < 1:
+        raise ValueError(f"Worker count must be a positive integer or 'auto': {value}")
+    return workers
+
+
+def load_serve_config(argv: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Builds the launcher config from the environment and command line."""
+    parser = argparse.ArgumentParser(
+        description="Run the Adaptive Mind API with multiple worker processes."
+    )
+    parser.add_argument("--host", default=os.getenv("API_HOST", DEFAULT_HOST))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("API_PORT", DEFAULT_PORT))
+    )
+    parser.add_argument(
+        "--workers",
+        default=os.getenv("API_WORKERS", "auto"),
+        help="Number of worker processes, or 'auto' for one per CPU.",
+    )
+    parser.add_argument(
+        "--graceful-shutdown-seconds",
+        type=int,
+        default=int(
+            os.getenv(
+                "API_GRACEFUL_SHUTDOWN_SECONDS", DEFAULT_GRACEFUL_SHUTDOWN_SECONDS
+            )
+        ),
+    )
+    parser.add_argument(
+        "--log-level", default=os.getenv("API_LOG_LEVEL", DEFAULT_LOG_LEVEL)
+    )
+    args = parser.parse_args(argv)
+    if args.graceful_shutdown_seconds < 0:
+        raise ValueError("'graceful_shutdown_seconds' must be non-negative.")
+    return {
+        "host": args.host,
+        "port": args.port,
+        "workers": resolve_worker_count(args.workers),
+        "graceful_shutdown_seconds": args.graceful_shutdown_seconds,
+        "log_level": args.log_level,
+    }
+
+
+def build_uvicorn_config(app: Any, serve_config: Dict[str, Any]) -> uvicorn.Config:
+    """A uvicorn config using uvloop and httptools when they are installed."""
+    return uvicorn.Config(
+        app,
+        host=serve_config["host"],
+        port=serve_config["port"],
+        loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+        http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+        lifespan="on",
+        log_level=serve_config["log_level"],
+        timeout_graceful_shutdown=serve_config["graceful_shutdown_seconds"],
+    )
+
+
+def preload_application() -> Any:
+    """
+    Imports the application and loads its immutable configuration in the
+    parent process. Invalid configuration fails here, before any worker
+    starts. The surviving objects are moved out of the garbage collector's
+    reach so the pages stay shared with the forked workers.
+    """
+    from antifragile_framework.api import framework_api
+
+    framework_api.preload_immutable_config()
+    # The OpenAPI schema is derived from the routes only; build it once.
+    framework_api.app.openapi()
+    gc.collect()
+    gc.freeze()
+    return framework_api.app
+
+
+def warm_up_worker():
+    """
+    Per-worker initialization, run after the fork and before serving: reseeds
+    the process-wide RNG (forked children otherwise share its state) and runs
+    the request validation, JSON encoding and ledger hashing paths once.
+    """
+    from antifragile_framework.api.framework_api import ChatCompletionRequest
+
+    random.seed()
+    request = ChatCompletionRequest.model_validate(
+        {
+            "model_priority_map": {"openai": ["gpt-4o"]},
+            "messages": [{"role": "user", "content": "warmup"}],
+        }
+    )
+    encoded = json.dumps(request.model_dump(mode="json"), sort_keys=True)
+    hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _exit_worker(signum, frame):
+    raise SystemExit(0)
+
+
+def _run_worker(config: uvicorn.Config, sockets: List[socket.socket]) -> int:
+    """Runs one worker in a forked child; returns its exit code."""
+    # A stop signal before the server starts exits at once. While serving,
+    # the server's own handlers drain first and then re-raise the signal,
+    # which lands here and ends the worker cleanly.
+    signal.signal(signal.SIGTERM, _exit_worker)
+    signal.signal(signal.SIGINT, _exit_worker)
+    try:
+        warm_up_worker()
+        server = uvicorn.Server(config)
+        server.run(sockets=sockets)
+        return 0 if server.started else 1
+    except SystemExit as e:
+        return e.code or 0
+    except Exception as e:
+        log.error(f"Worker {os.getpid()} failed: {e}", exc_info=True)
+        return 1
+
+
+class WorkerSupervisor:
+    """
+    Forks and supervises `workers` processes serving from one listening
+    socket, restarts workers that exit unexpectedly, and drains them all on
+    SIGTERM or SIGINT.
+    """
+
+    def __init__(
+        self,
+        config: uvicorn.Config,
+        workers: int,
+        graceful_shutdown_seconds: float = DEFAULT_GRACEFUL_SHUTDOWN_SECONDS,
+    ):
+        if workers < 1:
+            raise ValueError("WorkerSupervisor requires at least one worker.")
+        self.config = config
+        self.workers = workers
+        self.graceful_shutdown_seconds = graceful_shutdown_seconds
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+
+    def _spawn(self, sockets: List[socket.socket]) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = _run_worker(self.config, sockets)
+            finally:
+                os._exit(code)
+        self._children[pid] = time.monotonic()
+        log.info(f"Started worker {pid}.")
+        return pid
+
+    def _handle_stop(self, signum, frame):
+        if not self._stopping:
+            log.info(f"Received {signal.Signals(signum).name}; draining workers.")
+        self._stopping = True
+
+    def _reap(self) -> List[int]:
+        """Collects exited workers without blocking; returns their pids."""
+        exited = []
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                break
+            if pid == 0:
+                break
+            if self._children.pop(pid, None) is not None:
+                exited.append(pid)
+                if not self._stopping:
+                    log.warning(
+                        f"Worker {pid} exited with status "
+                        f"{os.waitstatus_to_exitcode(status)}."
+                    )
+        return exited
+
+    def _drain(self):
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                self._children.pop(pid, None)
+        deadline = time.monotonic() + (
+            self.graceful_shutdown_seconds + WORKER_KILL_GRACE_SECONDS
+        )
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        for pid in list(self._children):
+            log.warning(f"Worker {pid} did not drain in time; killing it.")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+            self._children.pop(pid, None)
+
+    def run(self, sockets: Optional[List[socket.socket]] = None):
+        """Serves until SIGTERM/SIGINT, then drains; blocks until done."""
+        sockets = sockets or [self.config.bind_socket()]
+        previous_handlers = {
+            sig: signal.signal(sig, self._handle_stop)
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for _ in range(self.workers):
+                self._spawn(sockets)
+            while not self._stopping:
+                for _ in self._reap():
+                    if self._stopping:
+                        break
+                    time.sleep(WORKER_RESTART_DELAY_SECONDS)
+                    if not self._stopping:
+                        self._spawn(sockets)
+                time.sleep(0.1)
+            self._drain()
+        finally:
+            for sig, handler in previous_handlers.items():
+                signal.signal(sig, handler)
+            for sock in sockets:
+                sock.close()
+        log.info("All workers stopped.")
+
+
+def serve(serve_config: Dict[str, Any]):
+    """Runs the API with `serve_config` from load_serve_config()."""
+    app = preload_application()
+    config = build_uvicorn_config(app, serve_config)
+    workers = serve_config["workers"]
+    log.info(
+        f"Serving on {serve_config['host']}:{serve_config['port']} with "
+        f"{workers} worker(s), loop={config.loop}, http={config.http}."
+    )
+    if workers > 1 and not os.getenv("SHARED_STATE_BACKEND"):
+        log.warning(
+            "SHARED_STATE_BACKEND is not set; each worker keeps its own provider "
+            "rankings, breaker states and key cooldowns."
+        )
+    if workers == 1 or not hasattr(os, "fork"):
+        if workers > 1:
+            log.warning("This platform cannot fork; serving with one worker.")
+        warm_up_worker()
+        uvicorn.Server(config).run()
+        return
+    WorkerSupervisor(
+        config, workers, serve_config["graceful_shutdown_seconds"]
+    ).run()
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    try:
+        serve_config = load_serve_config(argv)
+    except ValueError as e:
+        sys.exit(f"ERROR: {e}")
+    serve(serve_config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# antifragile_framework/config/cost_estimator.py
+
+import logging
+from decimal import ROUND_FLOOR, ROUND_HALF_UP, Decimal
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from antifragile_framework.config.schemas import CostProfile, ProviderProfiles
+
+log = logging.getLogger(__name__)
+
+MICRO_DOLLARS_PER_DOLLAR = 1_000_000
+TOKENS_PER_PRICE_UNIT = 1_000_000
+DEFAULT_MODEL_KEY = "_default"
+
+# (input, output) price in micro-dollars per million tokens.
+PricePair = Tuple[int, int]
+# The CostProfile and the input_cpm/output_cpm objects a price was compiled from.
+CompiledPrice = Tuple[CostProfile, Any, Any, PricePair]
+
+
+def _to_micros(amount: Decimal, rounding: str = ROUND_HALF_UP) -> int:
+    return int(
+        (Decimal(amount) * MICRO_DOLLARS_PER_DOLLAR).to_integral_value(
+            rounding=rounding
+        )
+    )
+
+
+def usd_to_micros(amount_usd: Optional[float]) -> Optional[int]:
+    """
+    Converts a USD cost cap to whole micro-dollars, rounding down. Estimates are
+    whole micro-dollars too, so `estimate > cap` is unchanged by the rounding.
+    """
+    if amount_usd is None:
+        return None
+    return _to_micros(Decimal(str(amount_usd)), rounding=ROUND_FLOOR)
+
+
+def micros_to_usd(amount_micros: Optional[int]) -> Optional[Decimal]:
+    """Converts micro-dollars to a USD Decimal with six decimal places."""
+    if amount_micros is None:
+        return None
+    return Decimal(amount_micros).scaleb(-6)
+
+
+class CostEstimator:
+    """
+    Estimates call costs from ProviderProfiles prices compiled into integer
+    micro-dollars per million tokens.
+
+    Costs are computed with integer arithmetic and rounded half-up to the whole
+    micro-dollar, matching the previous Decimal quantize to $0.000001. Models
+    without an entry use their provider's "_default" profile, resolved at
+    lookup. reload() swaps in new profiles and compiles every price up front.
+    A compiled price is reused only while its CostProfile and both price
+    objects are the ones it was compiled from, so in-place edits are recompiled
+    on their next lookup.
+    """
+
+    def __init__(self, provider_profiles: Optional[ProviderProfiles] = None):
+        self._provider_profiles: Optional[ProviderProfiles] = None
+        self._compiled: Dict[int, CompiledPrice] = {}
+        self.reload(provider_profiles)
+
+    @property
+    def provider_profiles(self) -> Optional[ProviderProfiles]:
+        return self._provider_profiles
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._provider_profiles is not None
+
+    def reload(self, provider_profiles: Optional[ProviderProfiles]):
+        """Replaces the profiles and compiles all of their prices."""
+        compiled: Dict[int, CompiledPrice] = {}
+        if provider_profiles is not None:
+            for models in provider_profiles.profiles.values():
+                for cost_profile in models.values():
+                    compiled[id(cost_profile)] = self._compile(cost_profile)
+        # A reader that pairs the new profiles with the old table only misses
+        # the cache; the identity check in _price_of keeps prices correct.
+        self._provider_profiles, self._compiled = provider_profiles, compiled
+
+    @staticmethod
+    def _compile(cost_profile: CostProfile) -> CompiledPrice:
+        input_cpm, output_cpm = cost_profile.input_cpm, cost_profile.output_cpm
+        price = (_to_micros(input_cpm), _to_micros(output_cpm))
+        return cost_profile, input_cpm, output_cpm, price
+
+    def _price_of(self, cost_profile: CostProfile) -> PricePair:
+        compiled = self._compiled.get(id(cost_profile))
+        if (
+            compiled is None
+            or compiled[0] is not cost_profile
+            or compiled[1] is not cost_profile.input_cpm
+            or compiled[2] is not cost_profile.output_cpm
+        ):
+            compiled = self._compile(cost_profile)
+            self._compiled[id(cost_profile)] = compiled
+        return compiled[3]
+
+    @staticmethod
+    def _resolve(
+        models: Mapping[str, CostProfile], model: str
+    ) -> Optional[CostProfile]:
+        cost_profile = models.get(model)
+        if cost_profile is None:
+            cost_profile = models.get(DEFAULT_MODEL_KEY)
+        return cost_profile
+
+    def get_price(self, provider: str, model: str) -> Optional[PricePair]:
+        provider_profiles = self._provider_profiles
+        if provider_profiles is None:
+            return None
+        cost_profile = self._resolve(
+            provider_profiles.profiles.get(provider) or {}, model
+        )
+        return None if cost_profile is None else self._price_of(cost_profile)
+
+    def estimate_micros(
+        self, provider: str, model: str, input_tokens: int, output_tokens: int
+    ) -> Optional[int]:
+        """Estimated cost in micro-dollars, or None if the model has no price."""
+        price = self.get_price(provider, model)
+        if price is None:
+            return None
+        total = input_tokens * price[0] + output_tokens * price[1]
+        return (total + TOKENS_PER_PRICE_UNIT // 2) // TOKENS_PER_PRICE_UNIT
+
+    def estimate_usd(
+        self, provider: str, model: str, input_tokens: int, output_tokens: int
+    ) -> Optional[Decimal]:
+        return micros_to_usd(
+            self.estimate_micros(provider, model, input_tokens, output_tokens)
+        )
+
+    def estimate_candidates(
+        self,
+        model_priority_map: Mapping[str, Iterable[str]],
+        input_tokens: int,
+        output_tokens: int,
+    ) -> Dict[Tuple[str, str], Optional[int]]:
+        """
+        Scores every (provider, model) candidate in a model priority map in one
+        pass. Unpriced candidates map to None.
+        """
+        provider_profiles = self._provider_profiles
+        profiles = provider_profiles.profiles if provider_profiles is not None else {}
+        half = TOKENS_PER_PRICE_UNIT // 2
+        costs: Dict[Tuple[str, str], Optional[int]] = {}
+        unpriced: List[str] = []
+        for provider, models in model_priority_map.items():
+            provider_models = profiles.get(provider) or {}
+            for model in models or ():
+                key = (provider, model)
+                cost_profile = self._resolve(provider_models, model)
+                if cost_profile is None:
+                    costs[key] = None
+                    unpriced.append(f"{provider}/{model}")
+                    continue
+                price = self._price_of(cost_profile)
+                costs[key] = (
+                    input_tokens * price[0] + output_tokens * price[1] + half
+                ) // TOKENS_PER_PRICE_UNIT
+        if unpriced and self.is_loaded:
+            log.debug(f"No cost profile or default for: {', '.join(unpriced)}.")
+        return costs
@@ -2,8 +2,11 @@
 
 import threading
 import time
+from collections import deque
 from enum import Enum, auto
-from typing import Any, Dict
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from .shared_state import NAMESPACE_CIRCUIT_BREAKERS, SharedStateBackend
 
 
 class CircuitBreakerState(Enum):
@@ -23,13 +26,21 @@ class CircuitBreakerError(Exception):
 
 
 class CircuitBreaker:
-    """A stateful object that wraps calls to a service to prevent cascading failures."""
+    """
+    A stateful object that wraps calls to a service to prevent cascading failures.
+
+    With a shared_state backend, every trip is published, and a breaker that is
+    not already open adopts a live trip published by another worker, so one
+    worker's outage detection opens the circuit everywhere. Shared state is
+    read before taking the lock and trips are published after releasing it.
+    """
 
     def __init__(
         self,
         service_name: str,
         failure_threshold: int = 5,
         reset_timeout_seconds: int = 60,
+        shared_state: Optional[SharedStateBackend] = None,
     ):
         if failure_threshold <= 0:
             raise ValueError("Failure threshold must be positive.")
@@ -44,13 +55,51 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time: float = 0.0
         self.lock = threading.Lock()
+        self._shared_state = shared_state
+        # Wall-clock time of the newest trip this breaker published or adopted.
+        self._last_shared_trip = 0.0
+        # A trip recorded under the lock, published once the lock is released.
+        self._unpublished_trip: Optional[Dict[str, float]] = None
+
+    def _read_shared_trip(self) -> Optional[Dict[str, Any]]:
+        """Returns the shared trip record for this service. Call without the lock."""
+        if self._shared_state is None or self.state == CircuitBreakerState.OPEN:
+            return None
+        return self._shared_state.read(NAMESPACE_CIRCUIT_BREAKERS).get(
+            self.service_name
+        )
+
+    def _adopt_shared_trip(self, record: Optional[Dict[str, Any]]):
+        """Opens the breaker if another worker tripped it. Call under the lock."""
+        if self.state == CircuitBreakerState.OPEN:
+            return
+        if not record or record["tripped_at"] <= self._last_shared_trip:
+            return
+        self._last_shared_trip = record["tripped_at"]
+        age = max(0.0, time.time() - record["tripped_at"])
+        if age < self._reset_timeout_seconds:
+            self._trip(publish=False)
+            self.last_failure_time = time.monotonic() - age
+
+    def _publish_trip(self):
+        """Publishes the trip recorded by _trip(). Call without the lock."""
+        if self._shared_state is None or self._unpublished_trip is None:
+            return
+        with self.lock:
+            record, self._unpublished_trip = self._unpublished_trip, None
+        if record is not None:
+            self._shared_state.write(
+                NAMESPACE_CIRCUIT_BREAKERS, self.service_name, record
+            )
 
     def _set_state(self, new_state: CircuitBreakerState):
         if self.state != new_state:
             self.state = new_state
 
     def check(self):
+        shared_trip = self._read_shared_trip()
         with self.lock:
+            self._adopt_shared_trip(shared_trip)
             if self.state == CircuitBreakerState.OPEN:
                 time_since_failure = time.monotonic() - self.last_failure_time
                 if time_since_failure > self._reset_timeout_seconds:
@@ -58,7 +107,17 @@ class CircuitBreaker:
                 else:
                     raise CircuitBreakerError(self.service_name)
 
-    def record_failure(self):
+    def is_call_permitted(self) -> bool:
+        """Like check(), but only reports whether a call would be let through."""
+        shared_trip = self._read_shared_trip()
+        with self.lock:
+            self._adopt_shared_trip(shared_trip)
+            if self.state == CircuitBreakerState.OPEN:
+                time_since_failure = time.monotonic() - self.last_failure_time
+                return time_since_failure > self._reset_timeout_seconds
+            return True
+
+    def record_failure(self, latency_seconds: Optional[float] = None):
         with self.lock:
             if self.state == CircuitBreakerState.HALF_OPEN:
                 self._trip()
@@ -66,14 +125,27 @@ class CircuitBreaker:
                 self.failure_count += 1
                 if self.failure_count >= self._failure_threshold:
                     self._trip()
+        self._publish_trip()
 
-    def record_success(self):
+    def record_success(self, latency_seconds: Optional[float] = None):
         self.reset()
 
-    def _trip(self):
+    def release_probe(self):
+        """
+        Hands back an admission from check() that will record no outcome.
+        Consecutive-failure breakers keep no probe budget, so this is a no-op.
+        """
+
+    def _trip(self, publish: bool = True):
         self._set_state(CircuitBreakerState.OPEN)
         self.last_failure_time = time.monotonic()
         self.failure_count = 0
+        if publish:
+            self._last_shared_trip = time.time()
+            self._unpublished_trip = {
+                "tripped_at": self._last_shared_trip,
+                "reset_timeout_seconds": self._reset_timeout_seconds,
+            }
 
     def reset(self):
         with self.lock:
@@ -82,19 +154,260 @@ class CircuitBreaker:
             self.last_failure_time = 0.0
 
 
+class SlidingWindowCircuitBreaker(CircuitBreaker):
+    """
+    A circuit breaker that trips on the failure rate and slow-call rate over the
+    last `window_size` calls rather than on a consecutive-failure count.
+
+    Outcomes and latencies are kept in a fixed-size ring buffer with running
+    totals, so recording a call is O(1). In HALF_OPEN only `half_open_max_probes`
+    callers are let through; the circuit closes once that many probes succeed
+    and reopens on the first probe failure. A caller that ends up recording no
+    outcome hands its probe back with release_probe(); a probe that never
+    reports back is released after `reset_timeout_seconds` so it cannot wedge
+    the breaker.
+    """
+
+    def __init__(
+        self,
+        service_name: str,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: int = 60,
+        window_size: int = 100,
+        minimum_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration_seconds: Optional[float] = None,
+        slow_call_rate_threshold: float = 1.0,
+        half_open_max_probes: int = 1,
+        shared_state: Optional[SharedStateBackend] = None,
+    ):
+        super().__init__(
+            service_name=service_name,
+            failure_threshold=failure_threshold,
+            reset_timeout_seconds=reset_timeout_seconds,
+            shared_state=shared_state,
+        )
+        if window_size <= 0:
+            raise ValueError("Window size must be positive.")
+        if not (0 < minimum_calls <= window_size):
+            raise ValueError("Minimum calls must be between 1 and the window size.")
+        if not (0 < failure_rate_threshold <= 1):
+            raise ValueError("Failure rate threshold must be between 0 and 1.")
+        if not (0 < slow_call_rate_threshold <= 1):
+            raise ValueError("Slow call rate threshold must be between 0 and 1.")
+        if slow_call_duration_seconds is not None and slow_call_duration_seconds <= 0:
+            raise ValueError("Slow call duration must be positive.")
+        if half_open_max_probes <= 0:
+            raise ValueError("Half-open probe budget must be positive.")
+
+        self._window_size = window_size
+        self._minimum_calls = minimum_calls
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_duration_seconds = slow_call_duration_seconds
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._half_open_max_probes = half_open_max_probes
+
+        # Ring buffer of (failed, slow, latency_seconds) outcomes.
+        self._window: List[Optional[Tuple[bool, bool, Optional[float]]]] = [
+            None
+        ] * window_size
+        self._window_index = 0
+        self._call_count = 0
+        self._slow_count = 0
+        self._probes_in_flight: Deque[float] = deque()
+        self._probe_successes = 0
+
+    @property
+    def failure_rate(self) -> float:
+        with self.lock:
+            return self.failure_count / self._call_count if self._call_count else 0.0
+
+    @property
+    def slow_call_rate(self) -> float:
+        with self.lock:
+            return self._slow_count / self._call_count if self._call_count else 0.0
+
+    def _is_slow(self, latency_seconds: Optional[float]) -> bool:
+        return (
+            self._slow_call_duration_seconds is not None
+            and latency_seconds is not None
+            and latency_seconds >= self._slow_call_duration_seconds
+        )
+
+    def _record_outcome(self, failed: bool, latency_seconds: Optional[float]):
+        slow = self._is_slow(latency_seconds)
+        evicted = self._window[self._window_index]
+        if evicted is not None:
+            self.failure_count -= evicted[0]
+            self._slow_count -= evicted[1]
+        else:
+            self._call_count += 1
+        self._window[self._window_index] = (failed, slow, latency_seconds)
+        self._window_index = (self._window_index + 1) % self._window_size
+        self.failure_count += failed
+        self._slow_count += slow
+
+    def _should_trip(self) -> bool:
+        if self._call_count < self._minimum_calls:
+            return False
+        if self.failure_count / self._call_count >= self._failure_rate_threshold:
+            return True
+        return (
+            self._slow_call_duration_seconds is not None
+            and self._slow_count / self._call_count >= self._slow_call_rate_threshold
+        )
+
+    def _expire_stale_probes(self, now: float):
+        while (
+            self._probes_in_flight
+            and now - self._probes_in_flight[0] > self._reset_timeout_seconds
+        ):
+            self._probes_in_flight.popleft()
+
+    def check(self):
+        shared_trip = self._read_shared_trip()
+        with self.lock:
+            self._adopt_shared_trip(shared_trip)
+            now = time.monotonic()
+            if self.state == CircuitBreakerState.OPEN:
+                if now - self.last_failure_time <= self._reset_timeout_seconds:
+                    raise CircuitBreakerError(self.service_name)
+                self._set_state(CircuitBreakerState.HALF_OPEN)
+                self._probes_in_flight.clear()
+                self._probe_successes = 0
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                self._expire_stale_probes(now)
+                if (
+                    len(self._probes_in_flight) + self._probe_successes
+                    >= self._half_open_max_probes
+                ):
+                    raise CircuitBreakerError(self.service_name)
+                self._probes_in_flight.append(now)
+
+    def is_call_permitted(self) -> bool:
+        shared_trip = self._read_shared_trip()
+        with self.lock:
+            self._adopt_shared_trip(shared_trip)
+            now = time.monotonic()
+            if self.state == CircuitBreakerState.OPEN:
+                return now - self.last_failure_time > self._reset_timeout_seconds
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                self._expire_stale_probes(now)
+                return (
+                    len(self._probes_in_flight) + self._probe_successes
+                    < self._half_open_max_probes
+                )
+            return True
+
+    def release_probe(self):
+        """
+        Frees a half-open probe slot taken by check() for a call that will
+        record no outcome (skipped, cancelled, or failed for a reason that
+        says nothing about the service), so the next caller can probe now
+        instead of after the stale-probe timeout.
+        """
+        with self.lock:
+            if self.state == CircuitBreakerState.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight.pop()
+
+    def record_failure(self, latency_seconds: Optional[float] = None):
+        with self.lock:
+            if self.state == CircuitBreakerState.HALF_OPEN:
+                self._trip()
+            else:
+                self._record_outcome(True, latency_seconds)
+                if self.state == CircuitBreakerState.CLOSED and self._should_trip():
+                    self._trip()
+        self._publish_trip()
+
+    def record_success(self, latency_seconds: Optional[float] = None):
+        with self.lock:
+            self._record_success_locked(latency_seconds)
+        self._publish_trip()
+
+    def _record_success_locked(self, latency_seconds: Optional[float]):
+        if self.state == CircuitBreakerState.HALF_OPEN:
+            if self._is_slow(latency_seconds):
+                self._trip()
+                return
+            if self._probes_in_flight:
+                self._probes_in_flight.popleft()
+            self._probe_successes += 1
+            if self._probe_successes >= self._half_open_max_probes:
+                self._close()
+            return
+        self._record_outcome(False, latency_seconds)
+        if self.state == CircuitBreakerState.CLOSED and self._should_trip():
+            self._trip()
+
+    def _clear_window(self):
+        self._window = [None] * self._window_size
+        self._window_index = 0
+        self._call_count = 0
+        self._slow_count = 0
+        self.failure_count = 0
+        self._probes_in_flight.clear()
+        self._probe_successes = 0
+
+    def _trip(self, publish: bool = True):
+        super()._trip(publish)
+        self._clear_window()
+
+    def _close(self):
+        self._set_state(CircuitBreakerState.CLOSED)
+        self.last_failure_time = 0.0
+        self._clear_window()
+
+    def reset(self):
+        with self.lock:
+            self._close()
+
+
+def model_breaker_key(provider_name: str, model: str) -> str:
+    """Registry key for the breaker guarding a single (provider, model) pair."""
+    return f"{provider_name}::{model}"
+
+
+BREAKER_MODES = {
+    "consecutive": CircuitBreaker,
+    "sliding_window": SlidingWindowCircuitBreaker,
+}
+
+
 class CircuitBreakerRegistry:
     """Manages a collection of CircuitBreaker instances, one for each service/provider."""
 
-    def __init__(self):
+    def __init__(self, shared_state: Optional[SharedStateBackend] = None):
         self._breakers: Dict[str, CircuitBreaker] = {}
         self._lock = threading.Lock()
+        self._shared_state = shared_state
 
     def get_breaker(self, service_name: str, **kwargs: Any) -> CircuitBreaker:
+        """
+        Returns the breaker for `service_name`, creating it on first use. An
+        optional `mode` kwarg ("consecutive" or "sliding_window") selects the
+        breaker type; the remaining kwargs are passed to its constructor.
+        """
         if service_name in self._breakers:
             return self._breakers[service_name]
         with self._lock:
             if service_name not in self._breakers:
-                self._breakers[service_name] = CircuitBreaker(
-                    service_name=service_name, **kwargs
+                mode = kwargs.pop("mode", "consecutive")
+                breaker_class = BREAKER_MODES.get(mode)
+                if breaker_class is None:
+                    raise ValueError(
+                        f"Unknown circuit breaker mode '{mode}'. "
+                        f"Expected one of: {sorted(BREAKER_MODES)}."
+                    )
+                self._breakers[service_name] = breaker_class(
+                    service_name=service_name,
+                    shared_state=self._shared_state,
+                    **kwargs,
                 )
             return self._breakers[service_name]
+
+    def get_model_breaker(
+        self, provider_name: str, model: str, **kwargs: Any
+    ) -> CircuitBreaker:
+        """Returns the breaker for a (provider, model) pair, creating it on first use."""
+        return self.get_breaker(model_breaker_key(provider_name, model), **kwargs)
@@ -1,26 +1,46 @@
 # antifragile_framework/core/failover_engine.py
 
-import json
+import asyncio
 import logging
 import math
+import time
 import uuid
-from datetime import datetime, timezone
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Any, Dict, List, Optional
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
 
 from antifragile_framework.config.config_loader import load_resilience_config
-from antifragile_framework.config.schemas import CostProfile, ProviderProfiles
+from antifragile_framework.config.cost_estimator import (
+    CostEstimator,
+    micros_to_usd,
+    usd_to_micros,
+)
+from antifragile_framework.config.schemas import ProviderProfiles
 from antifragile_framework.core.circuit_breaker import (
     CircuitBreaker,
     CircuitBreakerError,
     CircuitBreakerRegistry,
     CircuitBreakerState,
 )
-from antifragile_framework.core.resource_guard import ResourceGuard
+from antifragile_framework.core.resource_guard import (
+    AsyncResourceGuard,
+    ResourceGuard,
+)
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
     LLMProvider,
+    StreamingError,
 )
 
 # ==============================================================================
@@ -32,9 +52,14 @@ from antifragile_framework.providers.provider_registry import (
 )
 from antifragile_framework.resilience.bias_ledger import BiasLedger
 from antifragile_framework.resilience.prompt_rewriter import PromptRewriter
-from antifragile_framework.utils.error_parser import ErrorCategory, ErrorParser
+from antifragile_framework.utils.error_parser import (
+    ErrorCategory,
+    ErrorParser,
+    parse_retry_after,
+)
+from antifragile_framework.utils.token_counter import PromptTokenEstimator
 from telemetry import event_topics
-from telemetry.core_logger import UniversalEventSchema, core_logger
+from telemetry.core_logger import core_logger
 from telemetry.event_bus import EventBus
 
 from .exceptions import (
@@ -44,14 +69,83 @@ from .exceptions import (
     NoResourcesAvailableError,
     RewriteFailedError,
 )
-from .provider_ranking_engine import ProviderRankingEngine
-from .schemas import RequestContext
+from .provider_ranking_engine import (
+    RANKING_MODE_MULTI_OBJECTIVE,
+    ProviderRankingEngine,
+)
+from .schemas import LifecycleEvent, RequestContext
+from .shared_state import SharedStateBackend
 
 log = logging.getLogger(__name__)
 
 # A conservative estimate for cost capping if user doesn't specify max_tokens
 DEFAULT_MAX_OUTPUT_TOKEN_ESTIMATE = 2048
 
+# Number of recent per-provider call latencies kept for hedge delay derivation
+HEDGE_LATENCY_WINDOW_SIZE = 256
+
+DEFAULT_HEDGING_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "delay_ms": None,
+    "latency_percentile": 0.95,
+    "default_delay_ms": 2000,
+    "min_delay_ms": 50,
+    "min_samples": 20,
+    "max_parallel_legs": 2,
+}
+
+
+class _ProbePermit:
+    """
+    One admission granted by a breaker's check(), shared by the legs that use
+    it. Outcomes recorded through the permit resolve it. When the last holder
+    releases an unresolved permit, its half-open probe slot goes back to the
+    breaker, so legs that are skipped, cancelled or fail for reasons that say
+    nothing about the service do not hold the probe budget until it expires.
+    """
+
+    __slots__ = ("breaker", "_holders", "_resolved")
+
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self._holders = 1
+        self._resolved = False
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        return self.breaker.state
+
+    def record_success(self, latency_seconds: Optional[float] = None):
+        self._resolved = True
+        self.breaker.record_success(latency_seconds=latency_seconds)
+
+    def record_failure(self, latency_seconds: Optional[float] = None):
+        self._resolved = True
+        self.breaker.record_failure(latency_seconds=latency_seconds)
+
+    def acquire(self) -> "_ProbePermit":
+        self._holders += 1
+        return self
+
+    def release(self):
+        self._holders -= 1
+        if self._holders == 0 and not self._resolved:
+            self._resolved = True
+            self.breaker.release_probe()
+
+
+class _CandidateLeg(NamedTuple):
+    """A single (provider, model) attempt produced by the candidate iterator."""
+
+    provider_name: str
+    model: str
+    guard: ResourceGuard
+    breaker: _ProbePermit
+    estimated_cost_micros: Optional[int]
+    model_breaker: Optional[_ProbePermit] = None
+    # (topic, payload) failover events deferred until the leg is started.
+    failover_events: Tuple[Tuple[str, Dict[str, Any]], ...] = ()
+
 
 class FailoverEngine:
     def __init__(
@@ -67,6 +161,10 @@ class FailoverEngine:
         provider_ranking_engine: Optional[ProviderRankingEngine] = None,
         provider_profiles: Optional[ProviderProfiles] = None,
         config_path: Optional[str] = None,
+        cost_estimator: Optional[CostEstimator] = None,
+        token_estimator: Optional[PromptTokenEstimator] = None,
+        shared_state: Optional[SharedStateBackend] = None,
+        resilience_config: Optional[Dict[str, Any]] = None,
     ):
 
         # Use the provided registry or create a default one
@@ -74,18 +172,35 @@ class FailoverEngine:
 
         self.providers: Dict[str, LLMProvider] = {}
         self.guards: Dict[str, ResourceGuard] = {}
-        self.circuit_breakers = CircuitBreakerRegistry()
+        # Breaker trips and key cooldowns are shared with other workers when a
+        # shared_state backend is given.
+        self.shared_state = shared_state
+        self.circuit_breakers = CircuitBreakerRegistry(shared_state=shared_state)
+        self._model_breaker_configs: Dict[str, Dict[str, Any]] = {}
         self.error_parser = ErrorParser()
+        self.token_estimator = token_estimator or PromptTokenEstimator()
         self.event_bus = event_bus
         self.prompt_rewriter = prompt_rewriter
         self.bias_ledger = bias_ledger
         self.provider_ranking_engine = provider_ranking_engine
         self.logger = core_logger
-        self.provider_profiles = provider_profiles
-
-        self.resilience_config = load_resilience_config(config_path=config_path)
+        # Shared with the BiasLedger when the caller passes the same estimator.
+        self.cost_estimator = cost_estimator or CostEstimator()
+        if provider_profiles is not None or cost_estimator is None:
+            self.cost_estimator.reload(provider_profiles)
+
+        # A pre-loaded config (e.g. parsed once before forking workers) skips
+        # reading config_path.
+        self.resilience_config = (
+            resilience_config
+            if resilience_config is not None
+            else load_resilience_config(config_path=config_path)
+        )
         self.resilience_score_penalties: Dict[str, float] = {}
         self._load_and_validate_penalties()
+        self.hedging_config: Dict[str, Any] = {}
+        self._load_hedging_config()
+        self._provider_latencies: Dict[str, Deque[float]] = {}
 
         for name, config in provider_configs.items():
             # ==============================================================================
@@ -107,15 +222,27 @@ class FailoverEngine:
                 provider_instance_config["api_key"] = api_keys[0]
 
             self.providers[name] = provider_class(provider_instance_config)
-            self.guards[name] = ResourceGuard(
+            resource_config = config.get("resource_config", {})
+            guard_class = (
+                AsyncResourceGuard
+                if resource_config.get("guard_type") == "asyncio"
+                else ResourceGuard
+            )
+            self.guards[name] = guard_class(
                 provider_name=name,
                 api_keys=api_keys,
-                resource_config=config.get("resource_config", {}),
+                resource_config=resource_config,
                 event_bus=self.event_bus,
+                shared_state=shared_state,
             )
             self.circuit_breakers.get_breaker(
                 name, **config.get("circuit_breaker_config", {})
             )
+            # Model breakers default to the provider's breaker settings.
+            self._model_breaker_configs[name] = config.get(
+                "model_circuit_breaker_config",
+                config.get("circuit_breaker_config", {}),
+            )
             log.info(f"Initialized provider '{name}' with {len(api_keys)} resources.")
 
     # ... (methods _load_and_validate_penalties through _is_provider_healthy_for_dynamic_selection remain the same) ...
@@ -142,8 +269,39 @@ class FailoverEngine:
                     f"Resilience score penalty '{penalty_key}' must be between 0.0 and 1.0. Found: {penalty_value}"
                 )
             self.resilience_score_penalties[penalty_key] = float(penalty_value)
+        optional_penalties = ["hedge_win_penalty"]
+        for penalty_key in optional_penalties:
+            penalty_value = penalties_config.get(penalty_key, 0.0)
+            if not isinstance(penalty_value, (int, float)) or not (
+                0.0 <= penalty_value <= 1.0
+            ):
+                raise ValueError(
+                    f"Resilience score penalty '{penalty_key}' must be a number between 0.0 and 1.0. Found: {penalty_value}"
+                )
+            self.resilience_score_penalties[penalty_key] = float(penalty_value)
         log.info("Resilience score penalties loaded and validated successfully.")
 
+    def _load_hedging_config(self):
+        hedging_config = {
+            **DEFAULT_HEDGING_CONFIG,
+            **(self.resilience_config.get("hedging") or {}),
+        }
+        if int(hedging_config["max_parallel_legs"]) < 1:
+            raise ValueError("Hedging 'max_parallel_legs' must be at least 1.")
+        if not (0.0 < float(hedging_config["latency_percentile"]) <= 1.0):
+            raise ValueError(
+                "Hedging 'latency_percentile' must be between 0.0 and 1.0."
+            )
+        if hedging_config["delay_ms"] is not None and hedging_config["delay_ms"] < 0:
+            raise ValueError("Hedging 'delay_ms' must be non-negative.")
+        hedging_config["enabled"] = bool(hedging_config["enabled"])
+        hedging_config["max_parallel_legs"] = int(hedging_config["max_parallel_legs"])
+        self.hedging_config = hedging_config
+        if hedging_config["enabled"]:
+            log.info(
+                f"Request hedging enabled (max_parallel_legs={hedging_config['max_parallel_legs']})."
+            )
+
     def _record_lifecycle_event(
             self,
             context: RequestContext,
@@ -151,34 +309,31 @@ class FailoverEngine:
             severity: str,
             payload_data: Dict[str, Any],
     ):
-        timestamp = datetime.now(timezone.utc).isoformat()
-        context.lifecycle_events.append(
-            {"timestamp": timestamp, "event_name": event_name, **payload_data}
-        )
-
-        # Map event types to appropriate topics
-        event_topic = self._get_event_topic(event_name)
+        event = LifecycleEvent(event_name, severity, payload_data)
+        context.lifecycle_events.append(event)
 
-        event_schema = UniversalEventSchema(
-            event_type=event_name,
-            event_topic=event_topic,  # ADD THIS LINE
-            event_source=self.__class__.__name__,
-            timestamp_utc=timestamp,
-            severity=severity,
-            payload={"request_id": context.request_id, **payload_data},
+        # Logging and bus payloads are only built if someone will consume them.
+        log_enabled = self.logger.is_enabled_for(severity)
+        publish = self.event_bus is not None and self.event_bus.has_subscribers(
+            event_name
         )
+        if not (log_enabled or publish):
+            return
 
-        # Fix the logger call - use log_event instead of log
-        self.logger.log_event(
-            event_type=event_name,
-            event_topic=event_topic,
-            payload={"request_id": context.request_id, **payload_data},
-            severity=severity
-        )
-
-        if self.event_bus:
+        event_topic = self._get_event_topic(event_name)
+        if log_enabled:
+            self.logger.log_event(
+                event_type=event_name,
+                event_topic=event_topic,
+                payload={"request_id": context.request_id, **payload_data},
+                severity=severity,
+            )
+        if publish:
             self.event_bus.publish(
-                event_type=event_name, payload=event_schema.model_dump()
+                event_type=event_name,
+                payload=event.to_event_payload(
+                    event_topic, self.__class__.__name__, context.request_id
+                ),
             )
 
     def _get_event_topic(self, event_type: str) -> str:
@@ -233,60 +388,81 @@ class FailoverEngine:
                 score -= self.resilience_score_penalties.get(
                     "mitigated_success_penalty", 0.0
                 )
+        if context.winning_leg_index:
+            score -= self.resilience_score_penalties.get("hedge_win_penalty", 0.0)
         return max(0.0, min(1.0, score))
 
-    def _estimate_prompt_tokens(self, messages: List[ChatMessage]) -> int:
-        total_chars = 0
-        for message in messages:
-            if message.content:
-                total_chars += len(message.content)
-        return math.ceil(total_chars / 4) if total_chars > 0 else 0
+    def _estimate_prompt_tokens(
+        self, messages: List[ChatMessage], provider_name: Optional[str] = None
+    ) -> int:
+        return self.token_estimator.count_messages(messages, provider_name)
+
+    @property
+    def provider_profiles(self) -> Optional[ProviderProfiles]:
+        return self.cost_estimator.provider_profiles
+
+    @provider_profiles.setter
+    def provider_profiles(self, provider_profiles: Optional[ProviderProfiles]):
+        # Recompiles the shared price table, so edited prices apply immediately.
+        self.cost_estimator.reload(provider_profiles)
 
-    def _estimate_call_cost(
+    def _estimate_candidate_costs(
         self,
-        provider_name: str,
-        model_name: str,
-        input_tokens: int,
+        model_priority_map: Dict[str, List[str]],
+        messages: List[ChatMessage],
         output_tokens_estimate: int,
-    ) -> Optional[Decimal]:
-        if not self.provider_profiles:
+    ) -> Dict[Tuple[str, str], Optional[int]]:
+        """
+        Micro-dollar cost of every (provider, model) candidate for a request.
+        The prompt is counted with each provider's own tokenizer.
+        """
+        if not self.cost_estimator.is_loaded:
             log.warning("Provider profiles not loaded. Cannot estimate cost.")
-            return None
-        try:
-            provider_data = self.provider_profiles.profiles.get(provider_name)
-            if not provider_data:
-                log.warning(
-                    f"No cost data for provider '{provider_name}'. Cannot estimate cost."
+        candidate_costs: Dict[Tuple[str, str], Optional[int]] = {}
+        for provider_name, models in model_priority_map.items():
+            candidate_costs.update(
+                self.cost_estimator.estimate_candidates(
+                    {provider_name: models},
+                    self._estimate_prompt_tokens(messages, provider_name),
+                    output_tokens_estimate,
                 )
-                return None
-            cost_profile: Optional[CostProfile] = provider_data.get(model_name)
-            if not cost_profile:
-                cost_profile = provider_data.get("_default")
-                if cost_profile:
-                    log.debug(
-                        f"Cost profile for '{provider_name}/{model_name}' not found. Using provider default."
-                    )
-                else:
-                    log.warning(
-                        f"No cost profile or default found for provider '{provider_name}'. Cannot estimate cost."
-                    )
-                    return None
-            input_cost = (Decimal(input_tokens) * cost_profile.input_cpm) / Decimal(
-                "1000000"
             )
-            output_cost = (
-                Decimal(output_tokens_estimate) * cost_profile.output_cpm
-            ) / Decimal("1000000")
-            total_cost = (input_cost + output_cost).quantize(
-                Decimal("0.000001"), rounding=ROUND_HALF_UP
-            )
-            return total_cost
-        except Exception as e:
-            log.error(
-                f"Error calculating estimated cost for {provider_name}/{model_name}: {e}",
-                exc_info=True,
+        return candidate_costs
+
+    def _get_dynamic_candidate_priority(
+        self, model_priority_map: Dict[str, List[str]]
+    ) -> Tuple[List[str], Dict[str, List[str]]]:
+        """
+        Orders providers and, when the ranking engine is in multi-objective
+        mode, the models within each provider in one step. Providers follow
+        their best-ranked candidate; the returned map holds each provider's
+        models in utility order. Otherwise the map is returned unchanged.
+        """
+        ranking_mode = getattr(self.provider_ranking_engine, "ranking_mode", None)
+        if ranking_mode != RANKING_MODE_MULTI_OBJECTIVE:
+            return (
+                self._get_dynamic_provider_priority(model_priority_map),
+                model_priority_map,
             )
-            return None
+
+        ranked_models: Dict[str, List[str]] = {}
+        for provider_name, model in self.provider_ranking_engine.rank_candidates(
+            model_priority_map
+        ):
+            ranked_models.setdefault(provider_name, []).append(model)
+        # Providers without candidate models keep their place at the end.
+        for provider_name, models in model_priority_map.items():
+            ranked_models.setdefault(provider_name, list(models or []))
+
+        final_priority = [
+            p
+            for p in ranked_models
+            if self._is_provider_healthy_for_dynamic_selection(p, ranked_models[p])
+        ]
+        log.debug(
+            f"Dynamic candidate order set: {[(p, ranked_models[p]) for p in final_priority]}."
+        )
+        return final_priority, ranked_models
 
     def _get_dynamic_provider_priority(
         self, model_priority_map: Dict[str, List[str]]
@@ -299,7 +475,9 @@ class FailoverEngine:
             return [
                 p
                 for p in static_providers
-                if self._is_provider_healthy_for_dynamic_selection(p)
+                if self._is_provider_healthy_for_dynamic_selection(
+                    p, model_priority_map.get(p)
+                )
             ]
 
         ranked_providers: List[str] = (
@@ -312,7 +490,9 @@ class FailoverEngine:
             return [
                 p
                 for p in static_providers
-                if self._is_provider_healthy_for_dynamic_selection(p)
+                if self._is_provider_healthy_for_dynamic_selection(
+                    p, model_priority_map.get(p)
+                )
             ]
 
         static_providers_set = {p.lower() for p in static_providers}
@@ -328,7 +508,9 @@ class FailoverEngine:
         final_priority = [
             p
             for p in final_priority_unfiltered
-            if self._is_provider_healthy_for_dynamic_selection(p)
+            if self._is_provider_healthy_for_dynamic_selection(
+                p, model_priority_map.get(p)
+            )
         ]
 
         log.debug(
@@ -336,7 +518,21 @@ class FailoverEngine:
         )
         return final_priority
 
-    def _is_provider_healthy_for_dynamic_selection(self, provider_name: str) -> bool:
+    def _get_model_breaker(self, provider_name: str, model: str) -> CircuitBreaker:
+        return self.circuit_breakers.get_model_breaker(
+            provider_name, model, **self._model_breaker_configs.get(provider_name, {})
+        )
+
+    def _has_live_model(self, provider_name: str, models: List[str]) -> bool:
+        """True if at least one of the models' breakers would let a call through."""
+        return any(
+            self._get_model_breaker(provider_name, model).is_call_permitted()
+            for model in models
+        )
+
+    def _is_provider_healthy_for_dynamic_selection(
+        self, provider_name: str, models: Optional[List[str]] = None
+    ) -> bool:
         if provider_name not in self.providers:
             log.debug(
                 f"Provider '{provider_name}' not initialized. Skipping in dynamic selection."
@@ -344,9 +540,15 @@ class FailoverEngine:
             return False
 
         breaker = self.circuit_breakers.get_breaker(provider_name)
-        if breaker.state == CircuitBreakerState.OPEN:
+        if not breaker.is_call_permitted():
             log.debug(
-                f"Provider '{provider_name}' skipped in dynamic selection: circuit is OPEN."
+                f"Provider '{provider_name}' skipped in dynamic selection: circuit is {breaker.state.name}."
+            )
+            return False
+
+        if models and not self._has_live_model(provider_name, models):
+            log.debug(
+                f"Provider '{provider_name}' skipped in dynamic selection: all requested models have open circuits."
             )
             return False
 
@@ -360,6 +562,32 @@ class FailoverEngine:
         return True
 
     # ... (execute_request and _attempt_request_sequence remain largely the same, but call the updated _attempt_model_with_keys) ...
+    def _preferred_models_exceed_cost_cap(
+        self,
+        context: RequestContext,
+        provider_name: str,
+        model_priority_map: Dict[str, List[str]],
+        candidate_costs: Dict[Tuple[str, str], Optional[int]],
+    ) -> bool:
+        """
+        True if a cost cap is set and every model listed for the preferred
+        provider is estimated above it; records the cap on the context.
+        """
+        cost_cap = context.max_estimated_cost_micros
+        if cost_cap is None:
+            return False
+        all_too_expensive = all(
+            cost is not None and cost > cost_cap
+            for cost in (
+                candidate_costs.get((provider_name, model))
+                for model in model_priority_map.get(provider_name, [])
+            )
+        )
+        if all_too_expensive:
+            context.cost_cap_enforced = True
+            context.cost_cap_skip_reason = "ALL_MODELS_TOO_EXPENSIVE_FOR_PREFERENCE"
+        return all_too_expensive
+
     async def execute_request(
         self,
         model_priority_map: Dict[str, List[str]],
@@ -390,14 +618,18 @@ class FailoverEngine:
         failover_reason: Optional[str] = None
 
         provider_sequence_to_attempt: Optional[List[str]] = None
+        # The preferred provider's admission from the pre-check, so the attempt
+        # does not spend a second half-open probe on it.
+        admitted_permit: Optional[_ProbePermit] = None
+        attempt_model_map = model_priority_map
 
         try:
-            estimated_input_tokens = self._estimate_prompt_tokens(
-                context.initial_messages
-            )
             output_tokens_for_estimate = kwargs.get(
                 "max_tokens", DEFAULT_MAX_OUTPUT_TOKEN_ESTIMATE
             )
+            candidate_costs = self._estimate_candidate_costs(
+                model_priority_map, context.initial_messages, output_tokens_for_estimate
+            )
 
             if preferred_provider:
                 provider_name_lower = preferred_provider.lower()
@@ -409,6 +641,7 @@ class FailoverEngine:
                     guard = self.guards[provider_name_lower]
                     try:
                         breaker.check()
+                        admitted_permit = _ProbePermit(breaker)
                     except CircuitBreakerError:
                         failover_reason = (
                             f"PREFERRED_PROVIDER_CIRCUIT_OPEN:{preferred_provider}"
@@ -426,34 +659,28 @@ class FailoverEngine:
                         failover_reason = (
                             f"ALL_PREFERRED_KEYS_UNHEALTHY:{preferred_provider}"
                         )
-                    if not failover_reason and max_estimated_cost_usd is not None:
-                        preferred_models = model_priority_map.get(
-                            provider_name_lower, []
+                    if not failover_reason and not self._has_live_model(
+                        provider_name_lower,
+                        model_priority_map.get(provider_name_lower, []),
+                    ):
+                        failover_reason = (
+                            f"ALL_PREFERRED_MODELS_CIRCUIT_OPEN:{preferred_provider}"
                         )
-                        all_too_expensive = True
-                        for model in preferred_models:
-                            cost = self._estimate_call_cost(
-                                provider_name_lower,
-                                model,
-                                estimated_input_tokens,
-                                output_tokens_for_estimate,
-                            )
-                            if cost is None or cost <= Decimal(
-                                str(max_estimated_cost_usd)
-                            ):
-                                all_too_expensive = False
-                                break
-                        if all_too_expensive:
-                            failover_reason = f"ALL_PREFERRED_MODELS_EXCEED_COST_CAP_INITIAL_CHECK:{preferred_provider}"
-                            context.cost_cap_enforced = True
-                            context.cost_cap_skip_reason = (
-                                "ALL_MODELS_TOO_EXPENSIVE_FOR_PREFERENCE"
-                            )
+                    if not failover_reason and self._preferred_models_exceed_cost_cap(
+                        context,
+                        provider_name_lower,
+                        model_priority_map,
+                        candidate_costs,
+                    ):
+                        failover_reason = f"ALL_PREFERRED_MODELS_EXCEED_COST_CAP_INITIAL_CHECK:{preferred_provider}"
 
                 if not failover_reason:
                     log.info(f"Attempting preferred provider: {preferred_provider}")
                     provider_sequence_to_attempt = [provider_name_lower]
                 else:
+                    if admitted_permit is not None:
+                        admitted_permit.release()
+                        admitted_permit = None
                     log.warning(
                         f"{failover_reason}. Falling back to dynamic selection."
                     )
@@ -462,8 +689,8 @@ class FailoverEngine:
                 log.info(
                     "Entering dynamic fallback mode or proceeding with value-driven selection."
                 )
-                dynamic_provider_priority = self._get_dynamic_provider_priority(
-                    model_priority_map
+                dynamic_provider_priority, attempt_model_map = (
+                    self._get_dynamic_candidate_priority(model_priority_map)
                 )
                 if not dynamic_provider_priority:
                     failover_reason = failover_reason or "NO_VIABLE_DYNAMIC_PROVIDERS"
@@ -480,10 +707,10 @@ class FailoverEngine:
                     final_response = await self._attempt_request_sequence(
                         context,
                         provider_sequence_to_attempt,
-                        model_priority_map,
+                        attempt_model_map,
                         context.final_messages,
-                        estimated_input_tokens,
-                        output_tokens_for_estimate,
+                        candidate_costs,
+                        admitted_permit=admitted_permit,
                         **kwargs,
                     )
                     final_outcome = "SUCCESS"
@@ -518,16 +745,22 @@ class FailoverEngine:
                                 "INFO",
                                 {},
                             )
-                            dynamic_provider_priority = (
-                                self._get_dynamic_provider_priority(model_priority_map)
+                            dynamic_provider_priority, attempt_model_map = (
+                                self._get_dynamic_candidate_priority(
+                                    model_priority_map
+                                )
                             )
+                            # Only the rewritten turns miss the token cache.
                             final_response = await self._attempt_request_sequence(
                                 context,
                                 dynamic_provider_priority,
-                                model_priority_map,
+                                attempt_model_map,
                                 context.final_messages,
-                                estimated_input_tokens,
-                                output_tokens_for_estimate,
+                                self._estimate_candidate_costs(
+                                    model_priority_map,
+                                    context.final_messages,
+                                    output_tokens_for_estimate,
+                                ),
                                 **kwargs,
                             )
                             final_outcome = "MITIGATED_SUCCESS"
@@ -573,10 +806,9 @@ class FailoverEngine:
                     cost_cap_skip_reason=context.cost_cap_skip_reason,
                 )
                 if self.event_bus and ledger_entry:
-                    payload = json.loads(ledger_entry.model_dump_json())
                     self.event_bus.publish(
                         event_type=event_topics.LEARNING_FEEDBACK_PUBLISHED,
-                        payload=payload,
+                        payload=ledger_entry.to_payload(),
                     )
 
         if final_response:
@@ -586,149 +818,737 @@ class FailoverEngine:
             errors=["Request failed due to an unknown issue."]
         )
 
+    async def execute_request_stream(
+        self,
+        model_priority_map: Dict[str, List[str]],
+        messages: List[ChatMessage],
+        request_id: Optional[str] = None,
+        preferred_provider: Optional[str] = None,
+        max_estimated_cost_usd: Optional[float] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        """
+        Streams a completion, failing over between keys, models and providers
+        until one leg produces its first chunk. Once a chunk has been yielded
+        the caller has seen output, so a later error ends the stream instead of
+        failing over. Hedging and content policy mitigation are not applied.
+        """
+        context = RequestContext(
+            request_id=request_id or str(uuid.uuid4()),
+            initial_messages=messages,
+            final_messages=messages,
+            preferred_provider=preferred_provider,
+            max_estimated_cost_usd=max_estimated_cost_usd,
+            streamed=True,
+        )
+        initial_selection_mode = (
+            "PREFERENCE_DRIVEN" if preferred_provider else "VALUE_DRIVEN"
+        )
+        failover_reason: Optional[str] = None
+        final_response: Optional[CompletionResponse] = None
+        final_exception: Optional[Exception] = None
+        final_outcome = "FAILURE"
+
+        request_start = time.monotonic()
+        first_chunk_at: Optional[float] = None
+        content_parts: List[str] = []
+        usage = None
+        model_used: Optional[str] = None
+        final_provider: Optional[str] = None
+
+        try:
+            provider_sequence: Optional[List[str]] = None
+            attempt_model_map = model_priority_map
+            candidate_costs = self._estimate_candidate_costs(
+                model_priority_map,
+                messages,
+                kwargs.get("max_tokens", DEFAULT_MAX_OUTPUT_TOKEN_ESTIMATE),
+            )
+            if preferred_provider:
+                provider_name_lower = preferred_provider.lower()
+                if not self._is_provider_healthy_for_dynamic_selection(
+                    provider_name_lower, model_priority_map.get(provider_name_lower)
+                ):
+                    failover_reason = (
+                        f"PREFERRED_PROVIDER_UNAVAILABLE:{preferred_provider}"
+                    )
+                elif self._preferred_models_exceed_cost_cap(
+                    context, provider_name_lower, model_priority_map, candidate_costs
+                ):
+                    failover_reason = f"ALL_PREFERRED_MODELS_EXCEED_COST_CAP_INITIAL_CHECK:{preferred_provider}"
+                else:
+                    provider_sequence = [provider_name_lower]
+                if failover_reason:
+                    log.warning(
+                        f"{failover_reason}. Falling back to dynamic selection."
+                    )
+            if provider_sequence is None:
+                provider_sequence, attempt_model_map = (
+                    self._get_dynamic_candidate_priority(model_priority_map)
+                )
+                if not provider_sequence:
+                    failover_reason = failover_reason or "NO_VIABLE_DYNAMIC_PROVIDERS"
+                    raise AllProvidersFailedError(
+                        errors=[
+                            "No viable dynamic providers after health/cost filtering."
+                        ]
+                    )
+
+            overall_errors: List[str] = []
+            candidate_legs = self._iter_candidate_legs(
+                context,
+                provider_sequence,
+                attempt_model_map,
+                candidate_costs,
+                overall_errors,
+            )
+            try:
+                for leg in candidate_legs:
+                    leg_stream = self._stream_leg(context, leg, messages, **kwargs)
+                    try:
+                        chunk = await leg_stream.__anext__()
+                    except AllProviderKeysFailedError as model_failure:
+                        overall_errors.append(str(model_failure))
+                        continue
+                    except ContentPolicyError as e:
+                        failover_reason = "STREAM_CONTENT_POLICY_NO_MITIGATION"
+                        raise AllProvidersFailedError(
+                            errors=[
+                                str(e),
+                                "Prompt mitigation is not available for streamed requests.",
+                            ]
+                        )
+
+                    first_chunk_at = time.monotonic()
+                    context.ttft_ms = round((first_chunk_at - request_start) * 1000, 2)
+                    final_provider = leg.provider_name
+                    try:
+                        while True:
+                            content_parts.append(chunk.delta)
+                            model_used = chunk.model_used or model_used
+                            usage = chunk.usage or usage
+                            yield chunk
+                            try:
+                                chunk = await leg_stream.__anext__()
+                            except StopAsyncIteration:
+                                break
+                    finally:
+                        await leg_stream.aclose()
+                    final_outcome = "SUCCESS"
+                    break
+                else:
+                    if preferred_provider and not failover_reason:
+                        failover_reason = (
+                            f"PREFERRED_PROVIDER_EXHAUSTED:{preferred_provider}"
+                        )
+                    failover_reason = failover_reason or "ALL_DYNAMIC_PROVIDERS_FAILED"
+                    raise AllProvidersFailedError(errors=overall_errors)
+            finally:
+                candidate_legs.close()
+
+        except (GeneratorExit, asyncio.CancelledError):
+            # The caller stopped consuming (e.g. the client disconnected).
+            failover_reason = failover_reason or "STREAM_CANCELLED"
+            raise
+
+        except Exception as e:
+            final_exception = e
+            if first_chunk_at is not None:
+                failover_reason = failover_reason or "STREAM_INTERRUPTED"
+            raise
+
+        finally:
+            if first_chunk_at is not None:
+                stream_end = time.monotonic()
+                content = "".join(content_parts)
+                output_tokens = (
+                    usage.output_tokens if usage else math.ceil(len(content) / 4)
+                )
+                if stream_end > first_chunk_at and output_tokens:
+                    context.tokens_per_second = round(
+                        output_tokens / (stream_end - first_chunk_at), 2
+                    )
+                if final_outcome == "SUCCESS":
+                    final_response = CompletionResponse(
+                        success=True,
+                        content=content,
+                        model_used=model_used,
+                        usage=usage,
+                        latency_ms=(stream_end - request_start) * 1000,
+                        metadata={"provider_name": final_provider},
+                    )
+            resilience_score = self._calculate_resilience_score(context, final_outcome)
+            if self.bias_ledger:
+                ledger_entry = self.bias_ledger.log_request_lifecycle(
+                    context=context,
+                    initial_selection_mode=initial_selection_mode,
+                    final_response=final_response,
+                    final_error=final_exception,
+                    resilience_score=resilience_score,
+                    failover_reason=failover_reason,
+                    cost_cap_enforced=context.cost_cap_enforced,
+                    cost_cap_skip_reason=context.cost_cap_skip_reason,
+                )
+                if self.event_bus and ledger_entry:
+                    self.event_bus.publish(
+                        event_type=event_topics.LEARNING_FEEDBACK_PUBLISHED,
+                        payload=ledger_entry.to_payload(),
+                    )
+
     async def _attempt_request_sequence(
         self,
         context: RequestContext,
         provider_priority: List[str],
         model_priority_map: Dict[str, List[str]],
         messages: List[ChatMessage],
-        estimated_input_tokens: int,
-        output_tokens_for_estimate: int,
+        candidate_costs: Dict[Tuple[str, str], Optional[int]],
+        admitted_permit: Optional[_ProbePermit] = None,
         **kwargs: Any,
     ) -> CompletionResponse:
-        overall_errors = []
-        last_provider = None
+        overall_errors: List[str] = []
+        hedging = bool(self.hedging_config.get("enabled"))
+        candidate_legs = self._iter_candidate_legs(
+            context,
+            provider_priority,
+            model_priority_map,
+            candidate_costs,
+            overall_errors,
+            admitted_permit=admitted_permit,
+            defer_failover_events=hedging,
+        )
 
-        for provider_name in provider_priority:
-            if last_provider:
-                self._record_lifecycle_event(
-                    context,
-                    event_topics.PROVIDER_FAILOVER,
-                    "WARNING",
-                    {
-                        "from_provider": last_provider,
-                        "to_provider": provider_name,
-                    },
+        # Closing the iterator releases the admissions of providers it stopped in.
+        try:
+            if hedging:
+                return await self._attempt_hedged_sequence(
+                    context, candidate_legs, messages, overall_errors, **kwargs
                 )
-            last_provider = provider_name
 
-            if provider_name not in self.providers:
-                log.warning(
-                    f"Provider '{provider_name}' not found in initialized providers. Skipping."
-                )
-                overall_errors.append(
-                    f"Provider '{provider_name}' was skipped: not initialized."
-                )
-                continue
+            for leg in candidate_legs:
+                try:
+                    return await self._attempt_leg(context, leg, messages, **kwargs)
+                except AllProviderKeysFailedError as model_failure:
+                    overall_errors.append(str(model_failure))
+                    continue
+        finally:
+            candidate_legs.close()
 
-            model_priority = model_priority_map.get(provider_name)
-            if not model_priority:
-                log.warning(
-                    f"No model priority list found for provider '{provider_name}'. Skipping."
-                )
-                overall_errors.append(
-                    f"Provider '{provider_name}' was skipped: no model list provided."
-                )
-                continue
+        raise AllProvidersFailedError(errors=overall_errors)
 
-            guard = self.guards[provider_name]
-            breaker = self.circuit_breakers.get_breaker(provider_name)
+    def _iter_candidate_legs(
+        self,
+        context: RequestContext,
+        provider_priority: List[str],
+        model_priority_map: Dict[str, List[str]],
+        candidate_costs: Dict[Tuple[str, str], Optional[int]],
+        overall_errors: List[str],
+        admitted_permit: Optional[_ProbePermit] = None,
+        defer_failover_events: bool = False,
+    ) -> Iterator[_CandidateLeg]:
+        """
+        Lazily yields the (provider, model) legs to attempt, in priority order.
+        candidate_costs holds the micro-dollar estimate for each leg.
+
+        Provider/model failover, circuit breaker and cost cap events are recorded
+        as the iterator advances, so a caller that stops at the first success
+        only records the transitions it actually made. With
+        defer_failover_events, failover events are attached to the next
+        yielded leg instead, for callers (hedging) that advance the iterator
+        without a failure and record them only if the leg replaces a failed one.
+
+        Each yielded leg holds a share of its provider's breaker permit and its
+        own model breaker permit, which whoever runs (or drops) the leg gives
+        back with _release_leg. The iterator holds its own share of the
+        provider permit until it moves past the provider or is closed, so
+        callers should close it when they stop early.
+        """
+        last_provider = None
+        deferred_failovers: Optional[List[Tuple[str, Dict[str, Any]]]] = (
+            [] if defer_failover_events else None
+        )
 
-            try:
-                breaker.check()
-            except CircuitBreakerError as e:
-                self._record_lifecycle_event(
-                    context,
-                    event_topics.CIRCUIT_TRIPPED,
-                    "CRITICAL",
-                    {"provider": provider_name, "error": str(e)},
-                )
-                overall_errors.append(str(e))
-                continue
+        try:
+            for provider_name in provider_priority:
+                if last_provider:
+                    self._record_failover(
+                        context,
+                        deferred_failovers,
+                        event_topics.PROVIDER_FAILOVER,
+                        {
+                            "from_provider": last_provider,
+                            "to_provider": provider_name,
+                        },
+                    )
+                last_provider = provider_name
 
-            last_model = None
-            viable_models_for_provider = []
-            for model_name in model_priority:
-                estimated_cost = self._estimate_call_cost(
-                    provider_name,
-                    model_name,
-                    estimated_input_tokens,
-                    output_tokens_for_estimate,
-                )
-                if (
-                    context.max_estimated_cost_usd is not None
-                    and estimated_cost is not None
-                ):
-                    if estimated_cost > Decimal(str(context.max_estimated_cost_usd)):
+                if provider_name not in self.providers:
+                    log.warning(
+                        f"Provider '{provider_name}' not found in initialized providers. Skipping."
+                    )
+                    overall_errors.append(
+                        f"Provider '{provider_name}' was skipped: not initialized."
+                    )
+                    continue
+
+                model_priority = model_priority_map.get(provider_name)
+                if not model_priority:
+                    log.warning(
+                        f"No model priority list found for provider '{provider_name}'. Skipping."
+                    )
+                    overall_errors.append(
+                        f"Provider '{provider_name}' was skipped: no model list provided."
+                    )
+                    continue
+
+                guard = self.guards[provider_name]
+                breaker = self.circuit_breakers.get_breaker(provider_name)
+
+                if admitted_permit is not None and admitted_permit.breaker is breaker:
+                    permit, admitted_permit = admitted_permit, None
+                else:
+                    try:
+                        breaker.check()
+                    except CircuitBreakerError as e:
                         self._record_lifecycle_event(
                             context,
-                            event_topics.MODEL_SKIPPED_DUE_TO_COST,
-                            "INFO",
-                            {
-                                "provider": provider_name,
-                                "model": model_name,
-                                "estimated_cost_usd": str(estimated_cost),
-                                "max_cost_cap_usd": str(context.max_estimated_cost_usd),
-                            },
+                            event_topics.CIRCUIT_TRIPPED,
+                            "CRITICAL",
+                            {"provider": provider_name, "error": str(e)},
                         )
-                        context.cost_cap_enforced = True
-                        context.cost_cap_skip_reason = "MODEL_TOO_EXPENSIVE"
+                        overall_errors.append(str(e))
                         continue
-                viable_models_for_provider.append(model_name)
+                    permit = _ProbePermit(breaker)
 
-            if not viable_models_for_provider:
-                log.warning(
-                    f"All models for provider '{provider_name}' were skipped due to cost. Skipping provider."
-                )
-                overall_errors.append(
-                    f"Provider '{provider_name}' was skipped: no viable models after cost checks."
-                )
-                continue
+                try:
+                    yield from self._iter_model_legs(
+                        context,
+                        provider_name,
+                        model_priority,
+                        guard,
+                        permit,
+                        candidate_costs,
+                        overall_errors,
+                        deferred_failovers,
+                    )
+                finally:
+                    permit.release()
+        finally:
+            if admitted_permit is not None:
+                admitted_permit.release()
 
-            for model in viable_models_for_provider:
-                if last_model:
+    def _iter_model_legs(
+        self,
+        context: RequestContext,
+        provider_name: str,
+        model_priority: List[str],
+        guard: ResourceGuard,
+        permit: _ProbePermit,
+        candidate_costs: Dict[Tuple[str, str], Optional[int]],
+        overall_errors: List[str],
+        deferred_failovers: Optional[List[Tuple[str, Dict[str, Any]]]],
+    ) -> Iterator[_CandidateLeg]:
+        """Yields one provider's legs that pass the cost cap and model breakers."""
+        viable_models_for_provider = []
+        for model_name in model_priority:
+            estimated_cost = candidate_costs.get((provider_name, model_name))
+            if (
+                context.max_estimated_cost_micros is not None
+                and estimated_cost is not None
+            ):
+                if estimated_cost > context.max_estimated_cost_micros:
                     self._record_lifecycle_event(
                         context,
-                        event_topics.MODEL_FAILOVER,
-                        "WARNING",
+                        event_topics.MODEL_SKIPPED_DUE_TO_COST,
+                        "INFO",
                         {
                             "provider": provider_name,
-                            "from_model": last_model,
-                            "to_model": model,
+                            "model": model_name,
+                            "estimated_cost_usd": str(micros_to_usd(estimated_cost)),
+                            "max_cost_cap_usd": str(context.max_estimated_cost_usd),
                         },
                     )
-                last_model = model
+                    context.cost_cap_enforced = True
+                    context.cost_cap_skip_reason = "MODEL_TOO_EXPENSIVE"
+                    continue
+            viable_models_for_provider.append((model_name, estimated_cost))
+
+        if not viable_models_for_provider:
+            log.warning(
+                f"All models for provider '{provider_name}' were skipped due to cost. Skipping provider."
+            )
+            overall_errors.append(
+                f"Provider '{provider_name}' was skipped: no viable models after cost checks."
+            )
+            return
+
+        last_model = None
+        for model, estimated_cost in viable_models_for_provider:
+            model_breaker = self._get_model_breaker(provider_name, model)
+            try:
+                model_breaker.check()
+            except CircuitBreakerError as e:
+                self._record_lifecycle_event(
+                    context,
+                    event_topics.MODEL_SKIPPED_CIRCUIT_OPEN,
+                    "WARNING",
+                    {"provider": provider_name, "model": model},
+                )
+                overall_errors.append(str(e))
+                continue
+            if last_model:
+                self._record_failover(
+                    context,
+                    deferred_failovers,
+                    event_topics.MODEL_FAILOVER,
+                    {
+                        "provider": provider_name,
+                        "from_model": last_model,
+                        "to_model": model,
+                    },
+                )
+            last_model = model
+            failover_events: Tuple[Tuple[str, Dict[str, Any]], ...] = ()
+            if deferred_failovers:
+                failover_events = tuple(deferred_failovers)
+                deferred_failovers.clear()
+            yield _CandidateLeg(
+                provider_name,
+                model,
+                guard,
+                permit.acquire(),
+                estimated_cost,
+                _ProbePermit(model_breaker),
+                failover_events,
+            )
+
+    def _record_failover(
+        self,
+        context: RequestContext,
+        deferred_failovers: Optional[List[Tuple[str, Dict[str, Any]]]],
+        event_topic: str,
+        payload: Dict[str, Any],
+    ):
+        """Records a failover event now, or queues it for the next leg."""
+        if deferred_failovers is None:
+            self._record_lifecycle_event(context, event_topic, "WARNING", payload)
+        else:
+            deferred_failovers.append((event_topic, payload))
+
+    @staticmethod
+    def _release_leg(leg: _CandidateLeg):
+        """Gives back the breaker permits a leg holds once it is done or dropped."""
+        leg.breaker.release()
+        if leg.model_breaker is not None:
+            leg.model_breaker.release()
+
+    async def _attempt_leg(
+        self,
+        context: RequestContext,
+        leg: _CandidateLeg,
+        messages: List[ChatMessage],
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """
+        Runs one (provider, model) leg and records breaker success and latency.
+        The leg's breaker permits are released however the attempt ends.
+        """
+        leg_start = time.monotonic()
+        try:
+            response = await self._attempt_model_with_keys(
+                context,
+                leg.provider_name,
+                self.providers[leg.provider_name],
+                leg.guard,
+                leg.breaker,
+                leg.model,
+                messages,
+                model_breaker=leg.model_breaker,
+                **kwargs,
+            )
+            leg_latency = time.monotonic() - leg_start
+            self._record_provider_latency(leg.provider_name, leg_latency)
+            was_half_open = leg.breaker.state == CircuitBreakerState.HALF_OPEN
+            leg.breaker.record_success(latency_seconds=leg_latency)
+            if leg.model_breaker is not None:
+                leg.model_breaker.record_success(latency_seconds=leg_latency)
+        finally:
+            self._release_leg(leg)
+        if was_half_open:
+            self._record_lifecycle_event(
+                context,
+                event_topics.CIRCUIT_RESET,
+                "INFO",
+                {"provider": leg.provider_name},
+            )
+        return response
+
+    async def _stream_leg(
+        self,
+        context: RequestContext,
+        leg: _CandidateLeg,
+        messages: List[ChatMessage],
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        """
+        Streams one (provider, model) leg, rotating keys until a key produces its
+        first chunk. Errors after that point are recorded against the breakers
+        and re-raised, since the chunks already yielded cannot be retracted.
+        The leg's breaker permits are released however the stream ends.
+        """
+        provider = self.providers[leg.provider_name]
+        key_attempts = 0
+        last_key_error = "No resources available."
+        estimated_tokens = self._estimate_prompt_tokens(
+            messages, leg.provider_name
+        ) + kwargs.get("max_tokens", DEFAULT_MAX_OUTPUT_TOKEN_ESTIMATE)
+        request_kwargs = kwargs.copy()
+        request_kwargs["model"] = leg.model
+        try:
+            while True:
                 try:
-                    response = await self._attempt_model_with_keys(
+                    with leg.guard.get_resource(
+                        estimated_tokens=estimated_tokens
+                    ) as resource:
+                        key_attempts += 1
+                        context.api_call_count += 1
+                        if key_attempts > 1:
+                            self._record_lifecycle_event(
+                                context,
+                                event_topics.API_KEY_ROTATION,
+                                "INFO",
+                                {
+                                    "provider": leg.provider_name,
+                                    "model": leg.model,
+                                    "new_resource_id": resource.safe_value,
+                                },
+                            )
+                        leg_start = time.monotonic()
+                        chunks = provider.astream_completion(
+                            messages, api_key_override=resource.value, **request_kwargs
+                        )
+                        try:
+                            first_chunk = await chunks.__anext__()
+                        except StopAsyncIteration:
+                            first_chunk = None
+                            error: Exception = StreamingError(
+                                f"{leg.provider_name} returned an empty stream."
+                            )
+                        except Exception as e:
+                            first_chunk = None
+                            error = e
+                        if first_chunk is None:
+                            last_key_error = self._handle_key_exception(
+                                error,
+                                leg.provider_name,
+                                leg.model,
+                                leg.guard,
+                                leg.breaker,
+                                leg.model_breaker,
+                                resource.value,
+                                key_attempts,
+                            )
+                            continue
+
+                        leg.guard.record_success(resource.value)
+                        try:
+                            yield first_chunk
+                            async for chunk in chunks:
+                                yield chunk
+                        except Exception:
+                            leg.breaker.record_failure()
+                            if leg.model_breaker is not None:
+                                leg.model_breaker.record_failure()
+                            raise
+                        finally:
+                            await chunks.aclose()
+                except NoResourcesAvailableError:
+                    error_msg = f"All keys for '{leg.provider_name}' (model: {leg.model}) failed or are in cooldown. Last key error: {last_key_error}"
+                    raise AllProviderKeysFailedError(
+                        leg.provider_name, key_attempts, error_msg
+                    )
+
+                leg_latency = time.monotonic() - leg_start
+                self._record_provider_latency(leg.provider_name, leg_latency)
+                was_half_open = leg.breaker.state == CircuitBreakerState.HALF_OPEN
+                leg.breaker.record_success(latency_seconds=leg_latency)
+                if leg.model_breaker is not None:
+                    leg.model_breaker.record_success(latency_seconds=leg_latency)
+                if was_half_open:
+                    self._record_lifecycle_event(
                         context,
-                        provider_name,
-                        self.providers[provider_name],
-                        guard,
-                        breaker,
-                        model,
-                        messages,
-                        **kwargs,
+                        event_topics.CIRCUIT_RESET,
+                        "INFO",
+                        {"provider": leg.provider_name},
+                    )
+                return
+        finally:
+            self._release_leg(leg)
+
+    def _record_provider_latency(self, provider_name: str, latency_seconds: float):
+        window = self._provider_latencies.get(provider_name)
+        if window is None:
+            window = deque(maxlen=HEDGE_LATENCY_WINDOW_SIZE)
+            self._provider_latencies[provider_name] = window
+        window.append(latency_seconds)
+
+    def _get_hedge_delay_seconds(self, provider_name: str) -> float:
+        """
+        Returns how long to wait on a leg before firing a hedge. A fixed
+        `delay_ms` wins; otherwise the configured latency percentile of the
+        provider's recent calls is used once enough samples exist.
+        """
+        config = self.hedging_config
+        if config.get("delay_ms") is not None:
+            return float(config["delay_ms"]) / 1000
+
+        window = self._provider_latencies.get(provider_name)
+        if not window or len(window) < config["min_samples"]:
+            return float(config["default_delay_ms"]) / 1000
+
+        ordered = sorted(window)
+        index = min(
+            len(ordered) - 1,
+            math.ceil(config["latency_percentile"] * len(ordered)) - 1,
+        )
+        return max(float(config["min_delay_ms"]) / 1000, ordered[max(0, index)])
+
+    def _can_launch_hedge(
+        self,
+        context: RequestContext,
+        running_legs: Dict["asyncio.Task", _CandidateLeg],
+        next_leg: _CandidateLeg,
+    ) -> bool:
+        """
+        Enforces the parallel leg limit and the request's cost cap across legs.
+        Under a cap, a leg with an unknown cost never runs alongside another.
+        """
+        if len(running_legs) >= self.hedging_config["max_parallel_legs"]:
+            return False
+        if context.max_estimated_cost_micros is None:
+            return True
+        in_flight_costs = [leg.estimated_cost_micros for leg in running_legs.values()]
+        in_flight_costs.append(next_leg.estimated_cost_micros)
+        if any(cost is None for cost in in_flight_costs):
+            return False
+        return sum(in_flight_costs) <= context.max_estimated_cost_micros
+
+    async def _attempt_hedged_sequence(
+        self,
+        context: RequestContext,
+        candidate_legs: Iterator[_CandidateLeg],
+        messages: List[ChatMessage],
+        overall_errors: List[str],
+        **kwargs: Any,
+    ) -> CompletionResponse:
+        """
+        Runs candidate legs with speculative hedging. A failed leg fails over
+        immediately; a slow leg triggers the next candidate in parallel once the
+        hedge delay expires. The first success wins and the losers are cancelled.
+        """
+        running_legs: Dict[asyncio.Task, _CandidateLeg] = {}
+        leg_indexes: Dict[asyncio.Task, int] = {}
+        pending_leg: Optional[_CandidateLeg] = None
+        legs_started = 0
+        exhausted = False
+
+        def next_leg() -> Optional[_CandidateLeg]:
+            nonlocal pending_leg, exhausted
+            if pending_leg is None and not exhausted:
+                pending_leg = next(candidate_legs, None)
+                exhausted = pending_leg is None
+            return pending_leg
+
+        def start_leg(leg: _CandidateLeg, hedge: bool = False) -> None:
+            nonlocal pending_leg, legs_started
+            # A hedge runs alongside a healthy leg, so it is not a failover.
+            if not hedge:
+                for event_topic, payload in leg.failover_events:
+                    self._record_lifecycle_event(
+                        context, event_topic, "WARNING", payload
                     )
-                    was_half_open = breaker.state == CircuitBreakerState.HALF_OPEN
-                    breaker.record_success()
-                    if was_half_open:
+            task = asyncio.ensure_future(
+                self._attempt_leg(context, leg, messages, **kwargs)
+            )
+            running_legs[task] = leg
+            leg_indexes[task] = legs_started
+            legs_started += 1
+            pending_leg = None
+
+        async def cancel_running() -> None:
+            for task in running_legs:
+                task.cancel()
+            if running_legs:
+                await asyncio.gather(*running_legs, return_exceptions=True)
+            running_legs.clear()
+
+        try:
+            while True:
+                if not running_legs:
+                    leg = next_leg()
+                    if leg is None:
+                        raise AllProvidersFailedError(errors=overall_errors)
+                    start_leg(leg)
+
+                newest_leg = list(running_legs.values())[-1]
+                hedge_delay = self._get_hedge_delay_seconds(newest_leg.provider_name)
+                can_hedge = len(running_legs) < self.hedging_config["max_parallel_legs"]
+                done, _ = await asyncio.wait(
+                    set(running_legs),
+                    timeout=hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+
+                if not done:
+                    leg = next_leg()
+                    if leg is not None and self._can_launch_hedge(
+                        context, running_legs, leg
+                    ):
+                        context.hedges_launched += 1
                         self._record_lifecycle_event(
                             context,
-                            event_topics.CIRCUIT_RESET,
+                            event_topics.HEDGE_LAUNCHED,
                             "INFO",
-                            {"provider": provider_name},
+                            {
+                                "provider": leg.provider_name,
+                                "model": leg.model,
+                                "leg_index": legs_started,
+                                "hedge_delay_ms": round(hedge_delay * 1000, 2),
+                            },
+                        )
+                        start_leg(leg, hedge=True)
+                    else:
+                        # Nothing to hedge with (or over budget): wait for an outcome.
+                        done, _ = await asyncio.wait(
+                            set(running_legs), return_when=asyncio.FIRST_COMPLETED
                         )
-                    return response
-                except (
-                    AllProviderKeysFailedError,
-                    ContentPolicyError,
-                ) as model_failure:
-                    if isinstance(model_failure, ContentPolicyError):
-                        raise model_failure
-                    overall_errors.append(str(model_failure))
-                    continue
 
-        raise AllProvidersFailedError(errors=overall_errors)
+                for task in done:
+                    leg = running_legs.pop(task)
+                    leg_index = leg_indexes.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        context.winning_leg_index = leg_index
+                        self._record_lifecycle_event(
+                            context,
+                            event_topics.HEDGE_WON,
+                            "INFO",
+                            {
+                                "provider": leg.provider_name,
+                                "model": leg.model,
+                                "leg_index": leg_index,
+                                "legs_started": legs_started,
+                            },
+                        )
+                        await cancel_running()
+                        return task.result()
+                    if isinstance(error, AllProviderKeysFailedError):
+                        overall_errors.append(str(error))
+                        continue
+                    raise error
+        finally:
+            await cancel_running()
+            if pending_leg is not None:
+                self._release_leg(pending_leg)
 
     async def _attempt_model_with_keys(
         self,
@@ -736,16 +1556,21 @@ class FailoverEngine:
         provider_name: str,
         provider: LLMProvider,
         guard: ResourceGuard,
-        breaker: CircuitBreaker,
+        breaker: _ProbePermit,
         model: str,
         messages: List[ChatMessage],
+        model_breaker: Optional[_ProbePermit] = None,
         **kwargs: Any,
     ) -> CompletionResponse:
         key_attempts = 0
         last_key_error = "No resources available."
+        # Charge the key's TPM budget for the prompt plus the requested output ceiling.
+        estimated_tokens = self._estimate_prompt_tokens(
+            messages, provider_name
+        ) + kwargs.get("max_tokens", DEFAULT_MAX_OUTPUT_TOKEN_ESTIMATE)
         while True:
             try:
-                with guard.get_resource() as resource:
+                with guard.get_resource(estimated_tokens=estimated_tokens) as resource:
                     key_attempts += 1
                     context.api_call_count += 1
                     if key_attempts > 1:
@@ -767,7 +1592,14 @@ class FailoverEngine:
                             api_key_override=resource.value,
                             **request_kwargs,
                         )
+                        if response.metadata and response.metadata.get(
+                            "rate_limit_headers"
+                        ):
+                            guard.update_rate_limits_from_headers(
+                                resource.value, response.metadata["rate_limit_headers"]
+                            )
                         if response.success:
+                            guard.record_success(resource.value)
                             return response
 
                         last_key_error = (
@@ -787,45 +1619,97 @@ class FailoverEngine:
                             provider_name,
                         )
 
-                        guard.penalize_resource(resource.value)
+                        retry_after = error_details.retry_after_seconds
+                        if retry_after is None and response.metadata:
+                            # Header-only failures still carry Retry-After.
+                            retry_after = parse_retry_after(
+                                response.metadata.get("rate_limit_headers")
+                            )
+
+                        guard.penalize_resource(
+                            resource.value,
+                            retry_after_seconds=retry_after,
+                            error_category=error_details.category,
+                        )
 
                         # If it's a model-specific issue, stop trying keys and fail over to the next model.
                         if error_details.category == ErrorCategory.MODEL_ISSUE:
+                            if model_breaker is not None:
+                                model_breaker.record_failure()
                             raise AllProviderKeysFailedError(
                                 provider_name, key_attempts, last_key_error
                             )
 
                         if error_details.category == ErrorCategory.TRANSIENT:
                             breaker.record_failure()
+                            if model_breaker is not None:
+                                model_breaker.record_failure()
                         continue
 
                     except Exception as e:
-                        last_key_error = f"{type(e).__name__}: {e}"
-                        error_details = self.error_parser.classify_error(
-                            e, provider_name
+                        last_key_error = self._handle_key_exception(
+                            e,
+                            provider_name,
+                            model,
+                            guard,
+                            breaker,
+                            model_breaker,
+                            resource.value,
+                            key_attempts,
                         )
-
-                        if error_details.category == ErrorCategory.CONTENT_POLICY:
-                            raise ContentPolicyError(
-                                provider=provider_name,
-                                model=model,
-                                original_error=e,
-                            )
-
-                        guard.penalize_resource(resource.value)
-
-                        if error_details.category == ErrorCategory.MODEL_ISSUE:
-                            raise AllProviderKeysFailedError(
-                                provider_name, key_attempts, last_key_error
-                            )
-
-                        if error_details.category == ErrorCategory.TRANSIENT:
-                            breaker.record_failure()
                         continue
             except NoResourcesAvailableError:
                 error_msg = f"All keys for '{provider_name}' (model: {model}) failed or are in cooldown. Last key error: {last_key_error}"
                 raise AllProviderKeysFailedError(provider_name, key_attempts, error_msg)
 
+    def _handle_key_exception(
+        self,
+        error: Exception,
+        provider_name: str,
+        model: str,
+        guard: ResourceGuard,
+        breaker: _ProbePermit,
+        model_breaker: Optional[_ProbePermit],
+        resource_value: str,
+        key_attempts: int,
+    ) -> str:
+        """
+        Classifies an exception raised by a provider call made with one key.
+        Raises if the caller should stop rotating keys for this model; otherwise
+        penalizes the key and returns the error message so the next key is tried.
+        """
+        last_key_error = f"{type(error).__name__}: {error}"
+        error_headers = getattr(getattr(error, "response", None), "headers", None)
+        if error_headers:
+            guard.update_rate_limits_from_headers(resource_value, error_headers)
+        error_details = self.error_parser.classify_error(error, provider_name)
+
+        if error_details.category == ErrorCategory.CONTENT_POLICY:
+            raise ContentPolicyError(
+                provider=provider_name,
+                model=model,
+                original_error=error,
+            )
+
+        guard.penalize_resource(
+            resource_value,
+            retry_after_seconds=error_details.retry_after_seconds,
+            error_category=error_details.category,
+        )
+
+        if error_details.category == ErrorCategory.MODEL_ISSUE:
+            if model_breaker is not None:
+                model_breaker.record_failure()
+            raise AllProviderKeysFailedError(
+                provider_name, key_attempts, last_key_error
+            )
+
+        if error_details.category == ErrorCategory.TRANSIENT:
+            breaker.record_failure()
+            if model_breaker is not None:
+                model_breaker.record_failure()
+        return last_key_error
+
     # ======================================================================
     # REFACTOR 2: Remove the old, fragile string-matching method.
     # We no longer need this as its logic is replaced by the ErrorParser.
@@ -1,14 +1,19 @@
 # antifragile_framework/core/learning_engine.py
 
+import asyncio
+import inspect
+import json
+import os
 import sys
 import logging
-from collections import defaultdict
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 
 # Standardized path setup relative to the current file
 # Assuming current file is in PROJECT_ROOT/01_Framework_Core/antifragile_framework/core/
 from pathlib import Path
-from typing import Any, Dict, Iterator, List
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from pydantic import ValidationError
 
@@ -101,26 +106,666 @@ except ImportError as e:
 
 log = logging.getLogger(__name__)
 
+DEFAULT_LEDGER_BATCH_SIZE = 1000
+
+# The only BiasLedgerEntry fields analyze_provider_performance reads.
+LEDGER_ANALYSIS_FIELDS = [
+    "final_provider",
+    "final_model",
+    "outcome",
+    "total_latency_ms",
+    "resilience_events",
+    "mitigation_attempted",
+    "mitigation_succeeded",
+    "resilience_score",
+]
+
+_SUCCESS_OUTCOMES = ("SUCCESS", "MITIGATED_SUCCESS")
+
+
+def _event_payload(raw_event: Dict[str, Any]) -> Any:
+    """The ledger entry carried by a stored event ('event_data' for DB rows)."""
+    payload = raw_event.get("payload")
+    if payload is None:
+        payload = raw_event.get("event_data")
+    if isinstance(payload, str):
+        try:
+            payload = json.loads(payload)
+        except json.JSONDecodeError:
+            return None
+    return payload
+
+
+_COUNTER_FIELDS = (
+    "total_requests",
+    "successful_requests",
+    "total_latency_ms",
+    "mitigation_attempted_count",
+    "mitigation_successful_count",
+    "failover_occurred_count",
+    "circuit_breaker_tripped_count",
+    "resilience_scores_sum",
+    "resilience_score_count",
+)
+
+
+def _new_counters() -> Dict[str, Any]:
+    counters: Dict[str, Any] = {field: 0 for field in _COUNTER_FIELDS}
+    counters["total_latency_ms"] = 0.0
+    counters["resilience_scores_sum"] = 0.0
+    counters["error_distribution"] = {}
+    return counters
+
+
+def _merge_counters(target: Dict[str, Any], delta: Dict[str, Any]):
+    for field in _COUNTER_FIELDS:
+        target[field] += delta[field]
+    errors = target["error_distribution"]
+    for error_type, count in delta["error_distribution"].items():
+        errors[error_type] = errors.get(error_type, 0) + count
+
+
+def _ledger_contribution(entry: Dict[str, Any]) -> Tuple[str, str, Dict[str, Any]]:
+    """One ledger entry's (provider, model, counters) contribution."""
+    provider_name = entry.get("final_provider") or "unknown"
+    model_name = entry.get("final_model") or "unknown"
+    counters = _new_counters()
+    counters["total_requests"] = 1
+
+    resilience_events = entry.get("resilience_events") or []
+    if entry["outcome"] in _SUCCESS_OUTCOMES:
+        counters["successful_requests"] = 1
+        counters["total_latency_ms"] = entry.get("total_latency_ms") or 0.0
+    else:
+        error_type = "unknown_failure"
+        for event in reversed(resilience_events):
+            event_type = event.get("event_type")
+            payload_inner = event.get("payload") or {}
+            if (
+                event_type == event_topics.API_CALL_FAILURE
+                and payload_inner.get("error_type")
+            ):
+                error_type = payload_inner["error_type"]
+                break
+            elif event_type == event_topics.ALL_PROVIDERS_FAILED:
+                error_type = "all_providers_failed"
+                break
+        counters["error_distribution"][error_type] = 1
+
+    if entry.get("mitigation_attempted"):
+        counters["mitigation_attempted_count"] = 1
+        if entry.get("mitigation_succeeded"):
+            counters["mitigation_successful_count"] = 1
+
+    for event in resilience_events:
+        event_type = event.get("event_type")
+        if event_type in (
+            event_topics.PROVIDER_FAILOVER,
+            event_topics.MODEL_FAILOVER,
+            event_topics.API_KEY_ROTATION,
+        ):
+            counters["failover_occurred_count"] += 1
+        elif event_type == event_topics.CIRCUIT_TRIPPED:
+            counters["circuit_breaker_tripped_count"] += 1
+
+    resilience_score = entry.get("resilience_score")
+    if resilience_score is not None:
+        counters["resilience_scores_sum"] = resilience_score
+        counters["resilience_score_count"] = 1
+    return provider_name, model_name, counters
+
+
+def _is_ledger_entry(entry: Any) -> bool:
+    return isinstance(entry, dict) and "outcome" in entry
+
+
+def _counter_rows(
+    metrics: Dict[Tuple[str, str], Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Counters in the row shape of a pushed-down SQL query."""
+    return [
+        {
+            "provider_name": provider_name,
+            "model_name": model_name,
+            **counters,
+            "error_distribution": dict(counters["error_distribution"]),
+        }
+        for (provider_name, model_name), counters in metrics.items()
+    ]
+
+
+class _ProviderPerformanceAggregator:
+    """
+    Folds BiasLedger payloads into per-(provider, model) counters, reading only
+    the fields the analysis needs. Memory use depends on the number of
+    provider/model pairs, not on the number of entries.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.skipped = 0
+
+    def add(self, entry: Any):
+        if not _is_ledger_entry(entry):
+            self.skipped += 1
+            return
+        try:
+            provider_name, model_name, delta = _ledger_contribution(entry)
+        except Exception as e:
+            log.error(f"Error processing BiasLedgerEntry: {e}", exc_info=True)
+            return
+        counters = self.metrics.get((provider_name, model_name))
+        if counters is None:
+            counters = self.metrics[(provider_name, model_name)] = _new_counters()
+        _merge_counters(counters, delta)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        return _counter_rows(self.metrics)
+
+    def results(
+        self, start_time: datetime, end_time: datetime
+    ) -> List[ProviderPerformanceAnalysis]:
+        if self.skipped:
+            log.warning(f"Skipped {self.skipped} malformed BiasLedger entries.")
+        return analyses_from_aggregate_rows(self.rows(), start_time, end_time)
+
+
+def analyses_from_aggregate_rows(
+    rows: List[Dict[str, Any]], start_time: datetime, end_time: datetime
+) -> List[ProviderPerformanceAnalysis]:
+    """
+    Builds ProviderPerformanceAnalysis objects from per-(provider, model)
+    aggregate counters, whether they were summed in Python or in the database.
+    """
+    results: List[ProviderPerformanceAnalysis] = []
+
+    for metrics in rows:
+        total_requests = metrics["total_requests"] or 0
+        successful_requests = metrics["successful_requests"] or 0
+        mitigation_attempted = metrics["mitigation_attempted_count"] or 0
+        mitigation_successful = metrics["mitigation_successful_count"] or 0
+        failover_occurred = metrics["failover_occurred_count"] or 0
+        circuit_breaker_tripped = metrics["circuit_breaker_tripped_count"] or 0
+        resilience_score_count = metrics["resilience_score_count"] or 0
+        error_distribution = metrics.get("error_distribution") or {}
+        if isinstance(error_distribution, str):
+            error_distribution = json.loads(error_distribution)
+
+        success_rate = (
+            successful_requests / total_requests if total_requests > 0 else 0.0
+        )
+        # Ensure successful_requests > 0 before division
+        avg_latency_ms = (
+            (metrics["total_latency_ms"] or 0.0) / successful_requests
+            if successful_requests > 0
+            else 0.0
+        )
+        mitigation_success_rate = (
+            mitigation_successful / mitigation_attempted
+            if mitigation_attempted > 0
+            else 0.0
+        )
+        failover_rate = (
+            failover_occurred / total_requests if total_requests > 0 else 0.0
+        )
+        circuit_breaker_trip_rate = (
+            circuit_breaker_tripped / total_requests if total_requests > 0 else 0.0
+        )
+        avg_resilience_score = (
+            metrics["resilience_scores_sum"] / resilience_score_count
+            if resilience_score_count > 0
+            else 1.0
+        )  # Default to 1.0 if no scores recorded
+
+        results.append(
+            ProviderPerformanceAnalysis(
+                provider_name=metrics["provider_name"],
+                model_name=metrics["model_name"],
+                total_requests=total_requests,
+                successful_requests=successful_requests,
+                success_rate=success_rate,
+                avg_latency_ms=avg_latency_ms,
+                error_distribution={
+                    error_type: int(count)
+                    for error_type, count in error_distribution.items()
+                },
+                mitigation_attempted_count=mitigation_attempted,
+                mitigation_successful_count=mitigation_successful,
+                mitigation_success_rate=mitigation_success_rate,
+                failover_occurred_count=failover_occurred,
+                failover_rate=failover_rate,
+                circuit_breaker_tripped_count=circuit_breaker_tripped,
+                circuit_breaker_trip_rate=circuit_breaker_trip_rate,
+                avg_resilience_score=avg_resilience_score,
+                analysis_period_start=start_time,
+                analysis_period_end=end_time,
+            )
+        )
+    log.info(
+        f"Provider performance analysis complete. Generated {len(results)} analysis objects."
+    )
+    return results
+
+
+DEFAULT_BUCKET_SECONDS = (60, 3600)
+DEFAULT_BUCKET_RETENTION_SECONDS = {60: 2 * 86400, 3600: 30 * 86400}
+CHECKPOINT_VERSION = 1
+
+
+def _epoch_seconds(timestamp: Any) -> Optional[float]:
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(timestamp, datetime):
+        return None
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _accepts_keyword(func: Any, name: str) -> Optional[bool]:
+    """Whether `func` takes keyword `name`; None if it cannot be inspected."""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    return any(
+        parameter.name == name or parameter.kind is parameter.VAR_KEYWORD
+        for parameter in parameters
+    )
+
+
+async def _as_async_iterator(iterable):
+    for item in iterable:
+        yield item
+
+
+class BucketedPerformanceAggregates:
+    """
+    Per-(provider, model) ledger counters kept in fixed time buckets at several
+    resolutions (by default 1 minute and 1 hour).
+
+    Each entry is folded into one bucket per resolution, so a window query
+    sums whole coarse buckets and only uses fine buckets at the window edges:
+    its cost depends on the number of buckets, not on the number of entries.
+    Windows are aligned to the finest resolution. Buckets older than their
+    resolution's retention are pruned, so long windows stay answerable from
+    coarse buckets after the fine ones for that period are gone.
+    """
+
+    def __init__(
+        self,
+        bucket_seconds: Sequence[int] = DEFAULT_BUCKET_SECONDS,
+        retention_seconds: Optional[Dict[int, float]] = None,
+    ):
+        resolutions = sorted({int(seconds) for seconds in bucket_seconds})
+        if not resolutions or resolutions[0] <= 0:
+            raise ValueError("Bucket resolutions must be positive seconds.")
+        for finer, coarser in zip(resolutions, resolutions[1:]):
+            if coarser % finer:
+                raise ValueError(
+                    f"Bucket resolution {coarser}s is not a multiple of {finer}s."
+                )
+        self.resolutions: Tuple[int, ...] = tuple(resolutions)
+        retention = dict(DEFAULT_BUCKET_RETENTION_SECONDS)
+        retention.update(retention_seconds or {})
+        self.retention_seconds = {
+            resolution: retention.get(resolution) for resolution in self.resolutions
+        }
+        # (resolution, bucket_start) -> (provider, model) -> counters
+        self.buckets: Dict[
+            Tuple[int, int], Dict[Tuple[str, str], Dict[str, Any]]
+        ] = {}
+        self.high_water_mark: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def add(self, entry: Any, timestamp: Any = None) -> bool:
+        """
+        Folds one ledger payload into its buckets. The timestamp defaults to
+        the entry's own timestamp_utc. Returns False for skipped entries.
+        """
+        if not _is_ledger_entry(entry):
+            return False
+        when = _epoch_seconds(
+            timestamp if timestamp is not None else entry.get("timestamp_utc")
+        )
+        if when is None:
+            log.warning("Skipping BiasLedger entry without a usable timestamp.")
+            return False
+        try:
+            provider_name, model_name, delta = _ledger_contribution(entry)
+        except Exception as e:
+            log.error(f"Error processing BiasLedgerEntry: {e}", exc_info=True)
+            return False
+
+        with self._lock:
+            opened_bucket = False
+            for resolution in self.resolutions:
+                key = (resolution, int(when // resolution) * resolution)
+                bucket = self.buckets.get(key)
+                if bucket is None:
+                    bucket = self.buckets[key] = {}
+                    opened_bucket = True
+                counters = bucket.get((provider_name, model_name))
+                if counters is None:
+                    counters = bucket[(provider_name, model_name)] = _new_counters()
+                _merge_counters(counters, delta)
+            if self.high_water_mark is None or when > self.high_water_mark:
+                self.high_water_mark = when
+            if opened_bucket:
+                self._prune_locked()
+        return True
+
+    def _prune_locked(self):
+        now = self.high_water_mark
+        expired = [
+            key
+            for key in self.buckets
+            if self.retention_seconds[key[0]] is not None
+            and key[1] + key[0] < now - self.retention_seconds[key[0]]
+        ]
+        for key in expired:
+            del self.buckets[key]
+
+    def _cover(self, start: int, end: int, level: int, keys: List[Tuple[int, int]]):
+        """Appends the bucket keys that exactly tile [start, end)."""
+        resolution = self.resolutions[level]
+        if level == 0:
+            keys.extend((resolution, b) for b in range(start, end, resolution))
+            return
+        first = -(-start // resolution) * resolution
+        last = (end // resolution) * resolution
+        if first >= last:
+            self._cover(start, end, level - 1, keys)
+            return
+        self._cover(start, first, level - 1, keys)
+        keys.extend((resolution, b) for b in range(first, last, resolution))
+        self._cover(last, end, level - 1, keys)
+
+    def window_rows(
+        self, start_time: datetime, end_time: datetime
+    ) -> List[Dict[str, Any]]:
+        """Summed counters for [start_time, end_time), one row per provider/model."""
+        finest = self.resolutions[0]
+        start = int(_epoch_seconds(start_time) // finest) * finest
+        end = -int(-_epoch_seconds(end_time) // finest) * finest
+        keys: List[Tuple[int, int]] = []
+        if end > start:
+            self._cover(start, end, len(self.resolutions) - 1, keys)
+
+        totals: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        with self._lock:
+            for key in keys:
+                bucket = self.buckets.get(key)
+                if not bucket:
+                    continue
+                for pair, counters in bucket.items():
+                    target = totals.get(pair)
+                    if target is None:
+                        target = totals[pair] = _new_counters()
+                    _merge_counters(target, counters)
+        return _counter_rows(totals)
+
+    def to_state(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = [
+                [resolution, bucket_start, provider_name, model_name, counters]
+                for (resolution, bucket_start), bucket in self.buckets.items()
+                for (provider_name, model_name), counters in bucket.items()
+            ]
+            return {
+                "version": CHECKPOINT_VERSION,
+                "resolutions": list(self.resolutions),
+                "high_water_mark": self.high_water_mark,
+                "buckets": buckets,
+            }
+
+    def load_state(self, state: Dict[str, Any]):
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(
+                f"Unsupported performance checkpoint version {state.get('version')}."
+            )
+        if tuple(state.get("resolutions", ())) != self.resolutions:
+            raise ValueError(
+                f"Checkpoint resolutions {state.get('resolutions')} do not match "
+                f"{list(self.resolutions)}."
+            )
+        buckets: Dict[Tuple[int, int], Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        for resolution, bucket_start, provider_name, model_name, counters in state[
+            "buckets"
+        ]:
+            restored = _new_counters()
+            _merge_counters(restored, counters)
+            buckets.setdefault((resolution, bucket_start), {})[
+                (provider_name, model_name)
+            ] = restored
+        with self._lock:
+            self.buckets = buckets
+            self.high_water_mark = state.get("high_water_mark")
+
+    def save_checkpoint(self, path: Path):
+        """Writes the bucket state atomically, so a crash never leaves half a file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_state(), f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def load_checkpoint(self, path: Path) -> bool:
+        path = Path(path)
+        if not path.exists():
+            return False
+        with open(path, "r", encoding="utf-8") as f:
+            self.load_state(json.load(f))
+        return True
+
 
 class LearningEngine:
     """
     The LearningEngine processes historical data from the BiasLedger (via TimeSeriesDBInterface)
     to identify provider performance patterns and inform adaptive strategies.
+
+    Besides full-window analysis, it keeps rolling per-(provider, model)
+    buckets fed by handle_ledger_event, so analyze_window answers dashboard
+    queries without rescanning the ledger. With a checkpoint_path the buckets
+    survive restarts and catch_up() only reads entries newer than the checkpoint.
+
+    subscribe() starts live folding from an EventBus. Live folding and
+    catch_up() split the timeline at the moment live folding started: live
+    events stamped before it are left to catch_up(), and catch_up() stops
+    there. Each entry is therefore folded once, in whichever order the two run.
     """
 
-    def __init__(self, db_interface: TimeSeriesDBInterface):
+    def __init__(
+        self,
+        db_interface: TimeSeriesDBInterface,
+        bucket_seconds: Sequence[int] = DEFAULT_BUCKET_SECONDS,
+        bucket_retention_seconds: Optional[Dict[int, float]] = None,
+        checkpoint_path: Optional[Path] = None,
+        checkpoint_interval_seconds: float = 60.0,
+    ):
+        if checkpoint_interval_seconds < 0:
+            raise ValueError("checkpoint_interval_seconds must be non-negative.")
         self.db_interface = db_interface
+        self.aggregates = BucketedPerformanceAggregates(
+            bucket_seconds, bucket_retention_seconds
+        )
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self._last_checkpoint = time.monotonic()
+        # Serializes checkpoint writes between the executor and shutdown.
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_future: Optional[asyncio.Future] = None
+        # Set by subscribe(): when live folding took over, and the high-water
+        # mark catch_up() resumes from (advanced by each catch_up()).
+        self.live_since: Optional[float] = None
+        self._caught_up_to: Optional[float] = None
+        if self.checkpoint_path is not None:
+            try:
+                if self.aggregates.load_checkpoint(self.checkpoint_path):
+                    log.info(
+                        f"Restored performance buckets from {self.checkpoint_path}."
+                    )
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                log.warning(
+                    f"Ignoring unreadable performance checkpoint "
+                    f"{self.checkpoint_path}: {e}"
+                )
+
+    def fold_ledger_entry(self, entry: Dict[str, Any], timestamp: Any = None) -> bool:
+        """Folds one new ledger entry into the rolling buckets."""
+        folded = self.aggregates.add(entry, timestamp)
+        if (
+            folded
+            and self.checkpoint_path is not None
+            and time.monotonic() - self._last_checkpoint
+            >= self.checkpoint_interval_seconds
+        ):
+            self._schedule_checkpoint()
+        return folded
+
+    def _schedule_checkpoint(self):
+        """
+        Writes the checkpoint on the default executor when called from an event
+        loop, so live folding never blocks it on json.dump and fsync. At most
+        one background write is in flight; without a loop it writes inline.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save_checkpoint()
+            return
+        if self._checkpoint_future is not None and not self._checkpoint_future.done():
+            return
+        self._last_checkpoint = time.monotonic()
+        self._checkpoint_future = loop.run_in_executor(None, self.save_checkpoint)
+
+    def subscribe(self, event_bus: Any, live_since: Optional[datetime] = None):
+        """
+        Folds BIAS_LOG_ENTRY_CREATED events from `event_bus` as they are
+        published. Entries stamped before `live_since` (default: now) are left
+        to catch_up().
+        """
+        since = live_since or datetime.now(timezone.utc)
+        self._caught_up_to = self.aggregates.high_water_mark
+        self.live_since = _epoch_seconds(since)
+        event_bus.subscribe(
+            event_topics.BIAS_LOG_ENTRY_CREATED, self.handle_ledger_event
+        )
+        log.info(f"Folding ledger entries live from {since.isoformat()}.")
+
+    def handle_ledger_event(self, event_type: str, payload: Dict[str, Any]):
+        """EventBus handler for BIAS_LOG_ENTRY_CREATED."""
+        if self.live_since is not None and isinstance(payload, dict):
+            when = _epoch_seconds(payload.get("timestamp_utc"))
+            if when is not None and when < self.live_since:
+                return
+        self.fold_ledger_entry(payload)
+
+    def save_checkpoint(self):
+        """
+        Writes the checkpoint synchronously, after any background write still
+        in flight. Call it from a thread or at shutdown, not on a busy loop.
+        """
+        if self.checkpoint_path is None:
+            return
+        with self._checkpoint_lock:
+            self._last_checkpoint = time.monotonic()
+            try:
+                self.aggregates.save_checkpoint(self.checkpoint_path)
+            except OSError as e:
+                log.error(f"Failed to write performance checkpoint: {e}")
+
+    async def catch_up(
+        self,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        batch_size: int = DEFAULT_LEDGER_BATCH_SIZE,
+    ) -> int:
+        """
+        Folds ledger entries stored after the buckets' high-water mark (or after
+        `start_time` on a cold start), so a restart from a checkpoint only reads
+        the entries it missed. Once live folding has started, the mark is the
+        one observed when it started and catch_up() stops at `live_since`.
+        Returns the number of entries folded.
+        """
+        live_since = self.live_since
+        if live_since is None:
+            high_water_mark = self.aggregates.high_water_mark
+        else:
+            high_water_mark = self._caught_up_to
+        if start_time is None:
+            if high_water_mark is None:
+                raise ValueError("catch_up() needs a start_time without a checkpoint.")
+            start_time = datetime.fromtimestamp(high_water_mark, tz=timezone.utc)
+        end_time = end_time or datetime.now(timezone.utc)
+        if live_since is not None:
+            end_time = min(
+                end_time, datetime.fromtimestamp(live_since, tz=timezone.utc)
+            )
+
+        events = self._query_ledger_events(
+            start_time,
+            end_time,
+            batch_size,
+            fields=LEDGER_ANALYSIS_FIELDS + ["timestamp_utc"],
+        )
+        if not hasattr(events, "__aiter__"):
+            events = _as_async_iterator(events)
+
+        folded = 0
+        async for raw_event in events:
+            entry = _event_payload(raw_event)
+            if not _is_ledger_entry(entry):
+                continue
+            timestamp = raw_event.get("timestamp_utc") or entry.get("timestamp_utc")
+            when = _epoch_seconds(timestamp)
+            # Entries at the mark were already folded before the checkpoint;
+            # entries from live_since on are folded live.
+            if (
+                when is None
+                or (high_water_mark is not None and when <= high_water_mark)
+                or (live_since is not None and when >= live_since)
+            ):
+                continue
+            if self.aggregates.add(entry, timestamp):
+                folded += 1
+                if live_since is not None and (
+                    self._caught_up_to is None or when > self._caught_up_to
+                ):
+                    self._caught_up_to = when
+        log.info(f"Folded {folded} ledger entries into performance buckets.")
+        await asyncio.to_thread(self.save_checkpoint)
+        return folded
+
+    def analyze_window(
+        self, start_time: datetime, end_time: datetime
+    ) -> List[ProviderPerformanceAnalysis]:
+        """
+        Provider performance for [start_time, end_time) from the rolling
+        buckets, in time proportional to the number of buckets in the window.
+        """
+        return analyses_from_aggregate_rows(
+            self.aggregates.window_rows(start_time, end_time), start_time, end_time
+        )
 
     def get_raw_bias_ledger_entries(
             self,  # Synchronous method for test compatibility
             start_time: datetime,
             end_time: datetime,
-            batch_size: int = 1000,
+            batch_size: int = DEFAULT_LEDGER_BATCH_SIZE,
     ) -> Iterator[BiasLedgerEntry]:  # FIXED: Return BiasLedgerEntry objects, not raw dicts
         """
         Retrieves raw BiasLedgerEntry events from the database within a given time range
         and attempts to deserialize them into BiasLedgerEntry Pydantic objects.
-        Malformed entries are logged and skipped.
+        Malformed entries are logged and skipped. Requires a backend whose
+        query_events_generator is synchronous; analysis uses
+        astream_ledger_payloads instead.
 
         Yields: BiasLedgerEntry objects that passed validation.
         """
@@ -135,9 +780,7 @@ class LearningEngine:
                 batch_size=batch_size,
         ):
             try:
-                # The raw_event_dict is a dict representation of UniversalEventSchema.model_dump()
-                # Its 'payload' field is the actual BiasLedgerEntry data.
-                payload = raw_event_dict.get("payload", {})
+                payload = _event_payload(raw_event_dict) or {}
 
                 # Validate and create BiasLedgerEntry object
                 bias_ledger_entry = BiasLedgerEntry.model_validate(payload)
@@ -156,164 +799,130 @@ class LearningEngine:
                 )
                 continue
 
-    def analyze_provider_performance(
-            self, start_time: datetime, end_time: datetime
+    def _query_ledger_events(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        batch_size: int,
+        fields: List[str] = LEDGER_ANALYSIS_FIELDS,
+    ):
+        """
+        Queries BiasLedger events, asking for the `fields` projection only
+        from backends whose query_events_generator accepts a `fields` keyword;
+        others return full payloads.
+        """
+        query_events = self.db_interface.query_events_generator
+        query = {
+            "event_type": event_topics.BIAS_LOG_ENTRY_CREATED,
+            "start_time": start_time,
+            "end_time": end_time,
+            "batch_size": batch_size,
+        }
+        accepts_fields = _accepts_keyword(query_events, "fields")
+        if accepts_fields is False:
+            return query_events(**query)
+        try:
+            return query_events(fields=fields, **query)
+        except TypeError:
+            if accepts_fields:
+                raise
+            return query_events(**query)
+
+    async def astream_ledger_payloads(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        batch_size: int = DEFAULT_LEDGER_BATCH_SIZE,
+    ) -> AsyncIterator[Any]:
+        """
+        Streams the raw BiasLedger payloads in a time window, unvalidated and
+        projected to LEDGER_ANALYSIS_FIELDS where the backend supports it.
+        Works with both async and synchronous query_events_generator backends.
+        """
+        events = self._query_ledger_events(start_time, end_time, batch_size)
+        if hasattr(events, "__aiter__"):
+            async for raw_event in events:
+                yield _event_payload(raw_event)
+        else:
+            for raw_event in events:
+                yield _event_payload(raw_event)
+
+    async def aanalyze_provider_performance(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        batch_size: int = DEFAULT_LEDGER_BATCH_SIZE,
+        pushdown: bool = True,
     ) -> List[ProviderPerformanceAnalysis]:
         """
-        Analyzes BiasLedger entries to aggregate performance metrics for each provider/model.
+        Aggregates performance metrics for each provider/model over the window.
+
+        With `pushdown`, the backend is asked to compute the aggregate counters
+        itself (see TimeSeriesDBInterface.aggregate_provider_performance), so
+        only one row per provider/model leaves the database. Backends that
+        cannot, or `pushdown=False`, fall back to one streaming pass in Python:
+        linear time, with memory bounded by the page size and the number of
+        provider/model pairs. The Python pass is the reference implementation.
         """
         log.info(f"Analyzing provider performance from {start_time} to {end_time}...")
-
-        aggregated_data = defaultdict(
-            lambda: defaultdict(
-                lambda: {
-                    "total_requests": 0,
-                    "successful_requests": 0,
-                    "total_latency_ms": 0.0,
-                    "error_distribution": defaultdict(int),
-                    "mitigation_attempted_count": 0,
-                    "mitigation_successful_count": 0,
-                    "failover_occurred_count": 0,
-                    "circuit_breaker_tripped_count": 0,
-                    "resilience_scores_sum": 0.0,
-                    "resilience_score_count": 0,
-                }
-            )
-        )
-
-        # FIXED: Now this works with BiasLedgerEntry objects directly
-        for bias_ledger_entry in self.get_raw_bias_ledger_entries(
-                start_time, end_time
-        ):
+        if pushdown:
+            rows = None
             try:
-                # Now we can use attribute access since these are BiasLedgerEntry objects
-                provider_name = bias_ledger_entry.final_provider or "unknown"
-                model_name = bias_ledger_entry.final_model or "unknown"
-
-                provider_model_metrics = aggregated_data[provider_name][model_name]
-                provider_model_metrics["total_requests"] += 1
-
-                # Use attribute access for BiasLedgerEntry objects
-                outcome = bias_ledger_entry.outcome
-                if outcome == "SUCCESS" or outcome == "MITIGATED_SUCCESS":
-                    provider_model_metrics["successful_requests"] += 1
-                    provider_model_metrics["total_latency_ms"] += bias_ledger_entry.total_latency_ms
-                else:
-                    error_type = "unknown_failure"
-                    resilience_events = bias_ledger_entry.resilience_events or []
-                    if resilience_events:
-                        for event in reversed(resilience_events):  # Iterate through lifecycle events
-                            event_type = event.get("event_type")
-                            payload_inner = event.get("payload", {})
-                            if (
-                                    event_type == event_topics.API_CALL_FAILURE
-                                    and payload_inner.get("error_type")
-                            ):
-                                error_type = payload_inner["error_type"]
-                                break
-                            elif event_type == event_topics.ALL_PROVIDERS_FAILED:
-                                error_type = "all_providers_failed"
-                                break
-                    provider_model_metrics["error_distribution"][error_type] += 1
-
-                # Use attribute access for mitigation fields
-                mitigation_attempted = bias_ledger_entry.mitigation_attempted
-                if mitigation_attempted:
-                    provider_model_metrics["mitigation_attempted_count"] += 1
-                    mitigation_succeeded = getattr(bias_ledger_entry, 'mitigation_succeeded', False)
-                    if mitigation_succeeded:
-                        provider_model_metrics["mitigation_successful_count"] += 1
-
-                # Use attribute access for resilience events
-                resilience_events = bias_ledger_entry.resilience_events or []
-                for event in resilience_events:  # Iterate through lifecycle events
-                    if event.get("event_type") in [
-                        event_topics.PROVIDER_FAILOVER,
-                        event_topics.MODEL_FAILOVER,
-                        event_topics.API_KEY_ROTATION,
-                    ]:
-                        provider_model_metrics["failover_occurred_count"] += 1
-                    elif event.get("event_type") == event_topics.CIRCUIT_TRIPPED:
-                        provider_model_metrics["circuit_breaker_tripped_count"] += 1
-
-                # Use attribute access for resilience score
-                resilience_score = getattr(bias_ledger_entry, 'resilience_score', None)
-                if resilience_score is not None:
-                    provider_model_metrics["resilience_scores_sum"] += resilience_score
-                    provider_model_metrics["resilience_score_count"] += 1
-
+                rows = await self.db_interface.aggregate_provider_performance(
+                    start_time=start_time, end_time=end_time
+                )
             except Exception as e:
-                log.error(
-                    f"Error processing BiasLedgerEntry: {e}",
-                    exc_info=True,
+                log.warning(
+                    f"Database aggregation of provider performance failed, "
+                    f"falling back to streaming: {e}"
                 )
+            if rows is not None:
+                return analyses_from_aggregate_rows(rows, start_time, end_time)
 
-        results: List[ProviderPerformanceAnalysis] = []
-
-        for provider_name, models_data in aggregated_data.items():
-            for model_name, metrics in models_data.items():
-                total_requests = metrics["total_requests"]
-                successful_requests = metrics["successful_requests"]
-                mitigation_attempted = metrics["mitigation_attempted_count"]
-                mitigation_successful = metrics["mitigation_successful_count"]
+        aggregator = _ProviderPerformanceAggregator()
+        async for entry in self.astream_ledger_payloads(
+            start_time, end_time, batch_size
+        ):
+            aggregator.add(entry)
+        return aggregator.results(start_time, end_time)
 
-                success_rate = (
-                    successful_requests / total_requests if total_requests > 0 else 0.0
-                )
-                # Ensure successful_requests > 0 before division
-                avg_latency_ms = (
-                    metrics["total_latency_ms"] / successful_requests
-                    if successful_requests > 0
-                    else 0.0
-                )
-                mitigation_success_rate = (
-                    mitigation_successful / mitigation_attempted
-                    if mitigation_attempted > 0
-                    else 0.0
-                )
-                failover_rate = (
-                    metrics["failover_occurred_count"] / total_requests
-                    if total_requests > 0
-                    else 0.0
-                )
-                circuit_breaker_trip_rate = (
-                    metrics["circuit_breaker_tripped_count"] / total_requests
-                    if total_requests > 0
-                    else 0.0
-                )
-                avg_resilience_score = (
-                    metrics["resilience_scores_sum"] / metrics["resilience_score_count"]
-                    if metrics["resilience_score_count"] > 0
-                    else 1.0
-                )  # Default to 1.0 if no scores recorded
-
-                results.append(
-                    ProviderPerformanceAnalysis(
-                        provider_name=provider_name,
-                        model_name=model_name,
-                        total_requests=total_requests,
-                        successful_requests=successful_requests,
-                        success_rate=success_rate,
-                        avg_latency_ms=avg_latency_ms,
-                        error_distribution=dict(metrics["error_distribution"]),
-                        mitigation_attempted_count=mitigation_attempted,
-                        mitigation_successful_count=mitigation_successful,
-                        mitigation_success_rate=mitigation_success_rate,
-                        failover_occurred_count=metrics["failover_occurred_count"],
-                        failover_rate=failover_rate,
-                        circuit_breaker_tripped_count=metrics[
-                            "circuit_breaker_tripped_count"
-                        ],
-                        circuit_breaker_trip_rate=circuit_breaker_trip_rate,
-                        avg_resilience_score=avg_resilience_score,
-                        analysis_period_start=start_time,
-                        analysis_period_end=end_time,
-                    )
+    def analyze_provider_performance(
+            self,
+            start_time: datetime,
+            end_time: datetime,
+            batch_size: int = DEFAULT_LEDGER_BATCH_SIZE,
+    ) -> List[ProviderPerformanceAnalysis]:
+        """
+        Synchronous wrapper around aanalyze_provider_performance for callers
+        outside an event loop. Async callers should await the async version.
+        """
+        events = self._query_ledger_events(start_time, end_time, batch_size)
+        if hasattr(events, "__aiter__"):
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.run(
+                    self._aggregate_async_events(events, start_time, end_time)
                 )
-        log.info(
-            f"Provider performance analysis complete. Generated {len(results)} analysis objects."
-        )
-        return results
+            raise RuntimeError(
+                "analyze_provider_performance() cannot drive an async ledger query "
+                "inside a running event loop; await aanalyze_provider_performance()."
+            )
+
+        log.info(f"Analyzing provider performance from {start_time} to {end_time}...")
+        aggregator = _ProviderPerformanceAggregator()
+        for raw_event in events:
+            aggregator.add(_event_payload(raw_event))
+        return aggregator.results(start_time, end_time)
+
+    async def _aggregate_async_events(
+        self, events, start_time: datetime, end_time: datetime
+    ) -> List[ProviderPerformanceAnalysis]:
+        log.info(f"Analyzing provider performance from {start_time} to {end_time}...")
+        aggregator = _ProviderPerformanceAggregator()
+        async for raw_event in events:
+            aggregator.add(_event_payload(raw_event))
+        return aggregator.results(start_time, end_time)
 
 
 # Example Usage (for testing this module in isolation)
@@ -354,8 +963,9 @@ def main():
             return []
 
         # Simulate some BiasLedgerEntry events for testing LearningEngine
+        # Accepts the optional projection but always yields full payloads.
         def query_events_generator(
-                self, event_type, start_time, end_time, batch_size
+                self, event_type, start_time, end_time, batch_size, fields=None
         ):
             if event_type == event_topics.BIAS_LOG_ENTRY_CREATED:
                 for i in range(15):  # Generate 15 mock events
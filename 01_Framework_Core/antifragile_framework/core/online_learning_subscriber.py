@@ -7,7 +7,7 @@ from datetime import datetime, timezone
 # Standardized path setup relative to the current file
 # Assuming current file is in PROJECT_ROOT/01_Framework_Core/antifragile_framework/core/
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from pydantic import ValidationError
 
@@ -34,9 +34,8 @@ try:
         ProviderRankingEngine,
     )
     from antifragile_framework.resilience.bias_ledger import BiasLedgerEntry
+    from telemetry import event_topics
     from telemetry.core_logger import UniversalEventSchema, core_logger
-
-    # No need to import event_topics here, as the payload should contain enough context
 except ImportError as e:
     logging.critical(
         f"CRITICAL ERROR: Failed to import core dependencies for OnlineLearningSubscriber: {e}. "
@@ -52,6 +51,9 @@ except ImportError as e:
         def update_provider_score(self, *args, **kwargs):
             logging.warning("Mock ProviderRankingEngine used.")
 
+        def record_outcome(self, *args, **kwargs):
+            logging.warning("Mock ProviderRankingEngine used.")
+
     class BiasLedgerEntry:
         def __init__(self, **kwargs):
             pass
@@ -97,6 +99,38 @@ class OnlineLearningSubscriber:
         self.logger = core_logger
         log.info("OnlineLearningSubscriber initialized.")
 
+    @staticmethod
+    def _cost_per_token(ledger_entry: BiasLedgerEntry) -> Optional[float]:
+        tokens = (ledger_entry.input_tokens or 0) + (ledger_entry.output_tokens or 0)
+        if ledger_entry.estimated_cost_usd is None or tokens <= 0:
+            return None
+        return float(ledger_entry.estimated_cost_usd) / tokens
+
+    def _record_candidate_outcomes(self, ledger_entry: BiasLedgerEntry):
+        """
+        Feeds the (provider, model) candidate stats: every model the request
+        failed over from counts as a failure, and the final model counts as a
+        success or failure with the request's latency and cost per token.
+        """
+        for event in ledger_entry.resilience_events:
+            if event.get("event_name") != event_topics.MODEL_FAILOVER:
+                continue
+            if event.get("provider") and event.get("from_model"):
+                self.ranking_engine.record_outcome(
+                    provider_name=event["provider"],
+                    model_name=event["from_model"],
+                    success=False,
+                )
+
+        if ledger_entry.final_provider and ledger_entry.final_model:
+            self.ranking_engine.record_outcome(
+                provider_name=ledger_entry.final_provider,
+                model_name=ledger_entry.final_model,
+                success=ledger_entry.outcome in ("SUCCESS", "MITIGATED_SUCCESS"),
+                latency_ms=ledger_entry.total_latency_ms,
+                cost_per_token_usd=self._cost_per_token(ledger_entry),
+            )
+
     def handle_event(self, event_data: Dict[str, Any]):  # CORRECTED: Removed 'async'
         """
         Handles incoming events from the EventBus.
@@ -116,6 +150,8 @@ class OnlineLearningSubscriber:
             provider = ledger_entry.final_provider
             score = ledger_entry.resilience_score
 
+            self._record_candidate_outcomes(ledger_entry)
+
             # We only learn from requests that actually used a provider and have a score
             if provider is not None and score is not None:
                 self.ranking_engine.update_provider_score(
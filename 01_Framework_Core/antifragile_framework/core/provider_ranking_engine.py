@@ -1,14 +1,251 @@
 # antifragile_framework/core/provider_ranking_engine.py
 
+import itertools
+import math
+import random
 import threading
-from typing import Dict, List
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple
 from telemetry.core_logger import UniversalEventSchema, core_logger
 
+from .shared_state import (
+    NAMESPACE_PROVIDER_SCORES,
+    SharedStateBackend,
+    default_worker_id,
+)
+
+RANKING_MODE_RESILIENCE = "resilience"
+RANKING_MODE_MULTI_OBJECTIVE = "multi_objective"
+RANKING_MODES = (RANKING_MODE_RESILIENCE, RANKING_MODE_MULTI_OBJECTIVE)
+
+# Weights of the default utility. Latency is in units of `latency_scale_ms`
+# and cost in units of `cost_scale_usd_per_token`, so 0.2 means "one second
+# of p95 latency costs as much utility as 20 points of success rate".
+DEFAULT_UTILITY_WEIGHTS: Dict[str, float] = {
+    "success": 1.0,
+    "p50_latency": 0.0,
+    "p95_latency": 0.2,
+    "cost": 0.2,
+}
+DEFAULT_LATENCY_SCALE_MS = 1000.0
+DEFAULT_COST_SCALE_USD_PER_TOKEN = 0.00001
+DEFAULT_LATENCY_WINDOW = 500
+
+EXPLORATION_THOMPSON = "thompson"
+EXPLORATION_UCB = "ucb"
+EXPLORATION_POLICIES = (EXPLORATION_THOMPSON, EXPLORATION_UCB)
+DEFAULT_EXPLORATION_FRACTION = 0.1
+DEFAULT_EVIDENCE_HALF_LIFE_SECONDS = 300.0
+DEFAULT_UCB_CONFIDENCE = 1.0
+# Pseudo-observations behind the Beta prior centred on `default_score`.
+PRIOR_STRENGTH = 2.0
+# With decay enabled, a snapshot is rebuilt once it is this fraction of a
+# half-life old, even if no new outcome arrived.
+SNAPSHOT_MAX_AGE_HALF_LIVES = 0.05
+# Shared EMAs from workers that stopped reporting are ignored after this long,
+# and deleted by the next prune.
+DEFAULT_SHARED_RECORD_MAX_AGE_SECONDS = 3600.0
+# A worker prunes stale shared EMAs at most this often.
+SHARED_PRUNE_INTERVAL_SECONDS = 60.0
+
+
+class P2Quantile:
+    """
+    Streaming estimate of one quantile with the P-square algorithm (Jain and
+    Chlamtac, 1985): five markers, O(1) memory and time per observation.
+    """
+
+    def __init__(self, quantile: float):
+        if not (0.0 < quantile < 1.0):
+            raise ValueError("Quantile must be between 0.0 and 1.0.")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4.0]
+        self._increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float):
+        self.count += 1
+        q = self._heights
+        if self.count <= 5:
+            q.append(value)
+            q.sort()
+            return
+
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = next(i for i in range(4) if q[i] <= value < q[i + 1])
+
+        n = self._positions
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not (q[i - 1] < height < q[i + 1]):
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self.count == 0:
+            return None
+        if self.count <= 5:
+            index = round(self.quantile * (self.count - 1))
+            return self._heights[index]
+        return self._heights[2]
+
+
+class _DecayingBeta:
+    """
+    Success/failure evidence for a Beta posterior. Rewards may be fractional
+    (a ResilienceScore of 0.8 adds 0.8 successes and 0.2 failures) and all
+    evidence halves every half-life, so stale observations fade out.
+    """
+
+    __slots__ = ("successes", "failures", "updated_at")
+
+    def __init__(self):
+        self.successes = 0.0
+        self.failures = 0.0
+        self.updated_at = time.monotonic()
+
+    def decayed(self, now: float, half_life: Optional[float]) -> Tuple[float, float]:
+        if half_life is None:
+            return self.successes, self.failures
+        factor = 0.5 ** (max(0.0, now - self.updated_at) / half_life)
+        return self.successes * factor, self.failures * factor
+
+    def add(self, reward: float, now: float, half_life: Optional[float]):
+        successes, failures = self.decayed(now, half_life)
+        self.successes = successes + reward
+        self.failures = failures + (1.0 - reward)
+        self.updated_at = now
+
+
+class _CandidateStats:
+    """
+    Per-(provider, model) performance: EMAs of success and cost per token, and
+    p50/p95 latency sketches over the last one or two windows of successes.
+    """
+
+    def __init__(self, latency_window: int):
+        self.request_count = 0
+        self.evidence = _DecayingBeta()
+        self.success_ema: Optional[float] = None
+        self.cost_per_token_ema: Optional[float] = None
+        self._latency_window = latency_window
+        self._latency_current = (P2Quantile(0.5), P2Quantile(0.95))
+        self._latency_previous: Optional[Tuple[P2Quantile, P2Quantile]] = None
+
+    @staticmethod
+    def _ema(previous: Optional[float], value: float, alpha: float) -> float:
+        if previous is None:
+            return value
+        return alpha * value + (1 - alpha) * previous
+
+    def record(
+        self,
+        alpha: float,
+        success: bool,
+        latency_ms: Optional[float],
+        cost_per_token_usd: Optional[float],
+        now: float,
+        half_life: Optional[float],
+    ):
+        self.request_count += 1
+        self.evidence.add(1.0 if success else 0.0, now, half_life)
+        self.success_ema = self._ema(self.success_ema, 1.0 if success else 0.0, alpha)
+        if cost_per_token_usd is not None:
+            self.cost_per_token_ema = self._ema(
+                self.cost_per_token_ema, cost_per_token_usd, alpha
+            )
+        if success and latency_ms is not None:
+            # Sketches are rotated every window so latency tracks recent
+            # behaviour the way the EMAs do.
+            if self._latency_current[0].count >= self._latency_window:
+                self._latency_previous = self._latency_current
+                self._latency_current = (P2Quantile(0.5), P2Quantile(0.95))
+            for sketch in self._latency_current:
+                sketch.add(latency_ms)
+
+    def latency_quantiles(self) -> Tuple[Optional[float], Optional[float]]:
+        sketches = self._latency_current
+        if (
+            self._latency_previous is not None
+            and sketches[0].count < self._latency_window // 4
+        ):
+            sketches = self._latency_previous
+        return sketches[0].value(), sketches[1].value()
+
+    def metrics(self) -> Dict[str, Optional[float]]:
+        p50, p95 = self.latency_quantiles()
+        return {
+            "success_rate": self.success_ema,
+            "p50_latency_ms": p50,
+            "p95_latency_ms": p95,
+            "cost_per_token_usd": self.cost_per_token_ema,
+            "request_count": self.request_count,
+        }
+
+
+class _CandidateEntry(NamedTuple):
+    metrics: Mapping[str, Optional[float]]
+    utility: float
+    evidence: Tuple[float, float]
+
+
+class _RankingSnapshot(NamedTuple):
+    """An immutable view of the rankings, replaced whole on every update."""
+
+    ranked_providers: Tuple[str, ...]
+    provider_evidence: Mapping[str, Tuple[float, float]]
+    candidates: Mapping[Tuple[str, str], _CandidateEntry]
+    built_at: float
+
 
 class ProviderRankingEngine:
     """
     A thread-safe class that maintains a real-time performance ranking of providers
     based on an Exponential Moving Average (EMA) of their ResilienceScores.
+
+    In "multi_objective" mode it also ranks (provider, model) candidates by a
+    utility over their success rate, p50/p95 latency and cost per token, which
+    the FailoverEngine uses to order providers and models together.
+
+    Rankings are greedy unless an exploration policy is set: then a bounded
+    fraction of rankings is drawn from Thompson samples of, or UCB bounds on,
+    each provider's (or candidate's) decaying Beta posterior, so a provider
+    that had a bad minute still gets enough traffic to recover.
+
+    Writers update the statistics under a lock and publish a new immutable
+    _RankingSnapshot; readers on the request path take the current snapshot
+    with a single reference read and never wait on the lock.
+
+    With a shared_state backend, each worker also publishes its provider EMAs
+    and ranks on the request-count-weighted merge of every live worker's
+    EMAs, refreshed at most every `shared_state.max_staleness_seconds`. The
+    shared view is read before taking the lock, and writers prune records of
+    workers that stopped reporting.
     """
 
     def __init__(
@@ -16,6 +253,20 @@ class ProviderRankingEngine:
         smoothing_factor: float = 0.2,
         default_score: float = 0.75,
         min_requests_threshold: int = 5,
+        ranking_mode: str = RANKING_MODE_RESILIENCE,
+        utility_weights: Optional[Dict[str, float]] = None,
+        utility_fn: Optional[Callable[[Dict[str, Optional[float]]], float]] = None,
+        latency_scale_ms: float = DEFAULT_LATENCY_SCALE_MS,
+        cost_scale_usd_per_token: float = DEFAULT_COST_SCALE_USD_PER_TOKEN,
+        latency_window: int = DEFAULT_LATENCY_WINDOW,
+        exploration_policy: Optional[str] = None,
+        exploration_fraction: float = DEFAULT_EXPLORATION_FRACTION,
+        evidence_half_life_seconds: Optional[float] = None,
+        ucb_confidence: float = DEFAULT_UCB_CONFIDENCE,
+        random_seed: Optional[int] = None,
+        shared_state: Optional[SharedStateBackend] = None,
+        worker_id: Optional[str] = None,
+        shared_record_max_age_seconds: float = DEFAULT_SHARED_RECORD_MAX_AGE_SECONDS,
     ):
         """
         Initializes the ProviderRankingEngine.
@@ -27,9 +278,57 @@ class ProviderRankingEngine:
                                    below the request threshold to handle the "cold start" problem.
             min_requests_threshold (int): The number of requests a provider must have
                                           before its real EMA score is used for ranking.
+            ranking_mode (str): "resilience" ranks providers by ResilienceScore only;
+                                "multi_objective" also ranks (provider, model)
+                                candidates.
+            utility_weights (Optional[Dict[str, float]]): Overrides for the default
+                                utility's "success", "p50_latency", "p95_latency" and
+                                "cost" weights.
+            utility_fn (Optional[Callable]): Replaces the default utility. It receives a
+                                candidate's metrics dict (see get_candidate_stats) and
+                                returns a score, higher is better.
+            latency_scale_ms (float): Latency that counts as one unit of utility.
+            cost_scale_usd_per_token (float): Cost per token that counts as one unit.
+            latency_window (int): Successes per latency sketch window.
+            exploration_policy (Optional[str]): "thompson" or "ucb" to explore; None
+                                keeps rankings greedy.
+            exploration_fraction (float): Share of rankings (0.0-1.0) that explore.
+            evidence_half_life_seconds (Optional[float]): Age at which a score's
+                                evidence counts half. Scores decay towards
+                                `default_score`. Defaults to 300s when exploring,
+                                otherwise no decay.
+            ucb_confidence (float): Width of the UCB exploration bonus.
+            random_seed (Optional[int]): Seeds exploration draws, for reproducibility.
+            shared_state (Optional[SharedStateBackend]): Shares provider EMAs with
+                                other workers and merges theirs into the ranking.
+            worker_id (Optional[str]): This worker's identity in shared state.
+                                Defaults to '<hostname>:<pid>'.
+            shared_record_max_age_seconds (float): Other workers' EMAs older than
+                                this are left out of the merge.
         """
         if not (0.0 < smoothing_factor <= 1.0):
             raise ValueError("Smoothing factor must be between 0.0 and 1.0.")
+        if ranking_mode not in RANKING_MODES:
+            raise ValueError(f"Ranking mode must be one of {RANKING_MODES}.")
+        unknown_weights = set(utility_weights or {}) - set(DEFAULT_UTILITY_WEIGHTS)
+        if unknown_weights:
+            raise ValueError(f"Unknown utility weights: {sorted(unknown_weights)}.")
+        if latency_scale_ms <= 0 or cost_scale_usd_per_token <= 0:
+            raise ValueError("Utility latency and cost scales must be positive.")
+        if latency_window < 4:
+            raise ValueError("Latency window must be at least 4.")
+        if exploration_policy is not None and (
+            exploration_policy not in EXPLORATION_POLICIES
+        ):
+            raise ValueError(
+                f"Exploration policy must be one of {EXPLORATION_POLICIES} or None."
+            )
+        if not (0.0 <= exploration_fraction <= 1.0):
+            raise ValueError("Exploration fraction must be between 0.0 and 1.0.")
+        if evidence_half_life_seconds is None and exploration_policy is not None:
+            evidence_half_life_seconds = DEFAULT_EVIDENCE_HALF_LIFE_SECONDS
+        if evidence_half_life_seconds is not None and evidence_half_life_seconds <= 0:
+            raise ValueError("Evidence half-life must be positive.")
 
         self._alpha = smoothing_factor
         self._default_score = default_score
@@ -40,6 +339,49 @@ class ProviderRankingEngine:
         self._request_counts: Dict[str, int] = {}
         self.logger = core_logger
 
+        self.ranking_mode = ranking_mode
+        self._utility_weights = {**DEFAULT_UTILITY_WEIGHTS, **(utility_weights or {})}
+        self._utility_fn = utility_fn or self.default_utility
+        self._latency_scale_ms = latency_scale_ms
+        self._cost_scale = cost_scale_usd_per_token
+        self._latency_window = latency_window
+        self._candidate_stats: Dict[Tuple[str, str], _CandidateStats] = {}
+
+        self.exploration_policy = exploration_policy
+        self._exploration_fraction = exploration_fraction
+        self._half_life = evidence_half_life_seconds
+        self._ucb_confidence = ucb_confidence
+        self._rng = random.Random(random_seed)
+        self._provider_evidence: Dict[str, _DecayingBeta] = {}
+        self._ranking_ids = itertools.count(1)
+        self._explored_ids = itertools.count(1)
+        self._rankings = 0
+        self._explored_rankings = 0
+
+        self._cold_candidate = self._candidate_entry(
+            {
+                "success_rate": self._default_score,
+                "p50_latency_ms": None,
+                "p95_latency_ms": None,
+                "cost_per_token_usd": None,
+                "request_count": 0,
+            },
+            (0.0, 0.0),
+        )
+        self._shared_state = shared_state
+        self.worker_id = worker_id or default_worker_id()
+        self._shared_record_max_age = shared_record_max_age_seconds
+        self._next_shared_prune = 0.0
+        max_ages = []
+        if self._half_life is not None:
+            max_ages.append(self._half_life * SNAPSHOT_MAX_AGE_HALF_LIVES)
+        if shared_state is not None:
+            max_ages.append(shared_state.max_staleness_seconds)
+        self._snapshot_max_age = min(max_ages) if max_ages else None
+        self._snapshot = _RankingSnapshot(
+            (), MappingProxyType({}), MappingProxyType({}), time.monotonic()
+        )
+
     def update_provider_score(self, provider_name: str, resilience_score: float):
         """
         Updates a provider's performance score using the latest ResilienceScore.
@@ -53,6 +395,7 @@ class ProviderRankingEngine:
             self.logger.log(
                 UniversalEventSchema(
                     event_type="learning.score.invalid",
+                    event_topic="learning.score",
                     event_source=self.__class__.__name__,
                     severity="WARNING",
                     payload={
@@ -64,6 +407,7 @@ class ProviderRankingEngine:
             )
             return
 
+        shared_scores = self._read_shared_scores()
         with self._lock:
             current_count = self._request_counts.get(provider_name, 0)
 
@@ -80,45 +424,208 @@ class ProviderRankingEngine:
                 self._provider_emas[provider_name] = new_ema
 
             self._request_counts[provider_name] = current_count + 1
+            evidence = self._provider_evidence.get(provider_name)
+            if evidence is None:
+                evidence = self._provider_evidence[provider_name] = _DecayingBeta()
+            now = time.monotonic()
+            evidence.add(resilience_score, now, self._half_life)
+            self._publish_snapshot_locked(now, shared_scores)
 
+        if self._shared_state is not None:
+            self._shared_state.write(
+                NAMESPACE_PROVIDER_SCORES,
+                f"{self.worker_id}|{provider_name}",
+                {
+                    "provider": provider_name,
+                    "ema": new_ema,
+                    "count": current_count + 1,
+                    "updated_at": time.time(),
+                },
+            )
+            if now >= self._next_shared_prune:
+                self._next_shared_prune = now + min(
+                    SHARED_PRUNE_INTERVAL_SECONDS, self._shared_record_max_age
+                )
+                self._shared_state.prune(
+                    NAMESPACE_PROVIDER_SCORES,
+                    "updated_at",
+                    self._shared_record_max_age,
+                )
+
+        if self.logger.is_enabled_for("DEBUG"):
             self.logger.log(
                 UniversalEventSchema(
                     event_type="learning.score.update",
+                    event_topic="learning.score",
                     event_source=self.__class__.__name__,
                     severity="DEBUG",
                     payload={
                         "provider": provider_name,
                         "new_ema_score": new_ema,
-                        "request_count": self._request_counts[provider_name],
+                        "request_count": current_count + 1,
                     },
                 )
             )
 
+    def _read_shared_scores(self) -> Mapping[str, Dict[str, Any]]:
+        """Returns every worker's shared EMA records. Call without the lock."""
+        if self._shared_state is None:
+            return MappingProxyType({})
+        return self._shared_state.read(NAMESPACE_PROVIDER_SCORES)
+
+    def _provider_stats_locked(
+        self, now: float, shared_scores: Mapping[str, Dict[str, Any]]
+    ) -> Dict[str, Tuple[float, int, float]]:
+        """
+        Returns {provider: (ema, request_count, updated_at)} with updated_at on
+        the monotonic clock. Other workers' EMAs from `shared_scores` are
+        merged in, weighted by their request counts. Call under the lock.
+        """
+        contributions: Dict[str, List[Tuple[float, int, float]]] = {
+            provider: [
+                (
+                    ema,
+                    self._request_counts[provider],
+                    self._provider_evidence[provider].updated_at,
+                )
+            ]
+            for provider, ema in self._provider_emas.items()
+        }
+        if shared_scores:
+            wall_now = time.time()
+            own_prefix = f"{self.worker_id}|"
+            for key, record in shared_scores.items():
+                age = wall_now - record.get("updated_at", 0.0)
+                if key.startswith(own_prefix) or age > self._shared_record_max_age:
+                    continue
+                if record.get("count", 0) <= 0:
+                    continue
+                contributions.setdefault(record["provider"], []).append(
+                    (record["ema"], record["count"], now - max(0.0, age))
+                )
+
+        stats = {}
+        for provider, parts in contributions.items():
+            count = sum(part[1] for part in parts)
+            ema = sum(part[0] * part[1] for part in parts) / count
+            stats[provider] = (ema, count, max(part[2] for part in parts))
+        return stats
+
+    def _provider_score(self, stats: Tuple[float, int, float], now: float) -> float:
+        ema, count, updated_at = stats
+        # Use the real EMA if we have enough data, otherwise use the default score
+        if count >= self._min_requests:
+            return self._decay_towards_default(ema, updated_at, now)
+        return self._default_score
+
+    def _candidate_entry(
+        self, metrics: Dict[str, Optional[float]], evidence: Tuple[float, float]
+    ) -> _CandidateEntry:
+        return _CandidateEntry(
+            MappingProxyType(metrics), self._utility_fn(metrics), evidence
+        )
+
+    def _publish_snapshot_locked(
+        self, now: float, shared_scores: Mapping[str, Dict[str, Any]]
+    ):
+        """Builds and publishes a new ranking snapshot. Call under the lock."""
+        provider_stats = self._provider_stats_locked(now, shared_scores)
+        ranked_providers = tuple(
+            sorted(
+                provider_stats,
+                key=lambda p: self._provider_score(provider_stats[p], now),
+                reverse=True,  # Highest score first
+            )
+        )
+        provider_evidence = {
+            provider: evidence.decayed(now, self._half_life)
+            for provider, evidence in self._provider_evidence.items()
+        }
+        candidates = {
+            key: self._candidate_entry(
+                self._candidate_metrics_locked(key, now),
+                stats.evidence.decayed(now, self._half_life),
+            )
+            for key, stats in self._candidate_stats.items()
+        }
+        # A single reference assignment, so readers see the old or new snapshot.
+        self._snapshot = _RankingSnapshot(
+            ranked_providers,
+            MappingProxyType(provider_evidence),
+            MappingProxyType(candidates),
+            now,
+        )
+
+    def _current_snapshot(self) -> _RankingSnapshot:
+        """
+        Returns the published snapshot. With decay or shared state enabled, a
+        snapshot older than the max age is rebuilt first, so scores keep
+        fading and other workers' updates show up without local writes.
+        """
+        snapshot = self._snapshot
+        if self._snapshot_max_age is None:
+            return snapshot
+        now = time.monotonic()
+        if now - snapshot.built_at <= self._snapshot_max_age:
+            return snapshot
+        shared_scores = self._read_shared_scores()
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._publish_snapshot_locked(now, shared_scores)
+            return self._snapshot
+
+    def _should_explore(self) -> bool:
+        """Counts one ranking and decides whether it explores."""
+        self._rankings = next(self._ranking_ids)
+        if self.exploration_policy is None:
+            return False
+        if self._rng.random() >= self._exploration_fraction:
+            return False
+        self._explored_rankings = next(self._explored_ids)
+        return True
+
+    def _decay_towards_default(
+        self, score: float, updated_at: float, now: float
+    ) -> float:
+        if self._half_life is None:
+            return score
+        factor = 0.5 ** (max(0.0, now - updated_at) / self._half_life)
+        return self._default_score + (score - self._default_score) * factor
+
+    def _exploration_score(
+        self, successes: float, failures: float, total_evidence: float
+    ) -> float:
+        """Thompson sample or UCB bound of a Beta posterior."""
+        alpha = successes + PRIOR_STRENGTH * self._default_score
+        beta = failures + PRIOR_STRENGTH * (1.0 - self._default_score)
+        if self.exploration_policy == EXPLORATION_THOMPSON:
+            return self._rng.betavariate(alpha, beta)
+        bonus = math.sqrt(
+            2.0 * math.log(total_evidence + 1.0) / (successes + failures + 1.0)
+        )
+        return alpha / (alpha + beta) + self._ucb_confidence * bonus
+
     def get_ranked_providers(self) -> List[str]:
         """
         Returns a list of provider names, sorted from highest score to lowest.
         Providers with too few requests are ranked by the default score.
-        This method is thread-safe.
+        When exploring, the ranking uses posterior samples (or bounds) instead.
+        This method is thread-safe and does not take the lock.
 
         Returns:
             List[str]: A sorted list of provider names.
         """
-        with self._lock:
-            # Create a list of all known providers to ensure none are missed
-            all_providers = list(self._provider_emas.keys())
-
-            def get_score(provider_name: str) -> float:
-                # Use the real EMA if we have enough data, otherwise use the default score
-                if self._request_counts.get(provider_name, 0) >= self._min_requests:
-                    return self._provider_emas.get(provider_name, self._default_score)
-                return self._default_score
-
-            sorted_providers = sorted(
-                all_providers,
-                key=get_score,
-                reverse=True,  # Highest score first
-            )
-            return sorted_providers
+        snapshot = self._current_snapshot()
+        if not self._should_explore():
+            return list(snapshot.ranked_providers)
+
+        counts = snapshot.provider_evidence
+        total = sum(s + f for s, f in counts.values())
+        scores = {
+            p: self._exploration_score(*counts.get(p, (0.0, 0.0)), total)
+            for p in snapshot.ranked_providers
+        }
+        return sorted(snapshot.ranked_providers, key=scores.get, reverse=True)
 
     def get_provider_scores(self) -> Dict[str, Dict]:
         """
@@ -135,3 +642,137 @@ class ProviderRankingEngine:
                 }
                 for provider in self._provider_emas
             }
+
+    def record_outcome(
+        self,
+        provider_name: str,
+        model_name: str,
+        success: bool,
+        latency_ms: Optional[float] = None,
+        cost_per_token_usd: Optional[float] = None,
+    ):
+        """
+        Folds one request outcome into the (provider, model) candidate stats.
+        Latency is only sampled from successes. This method is thread-safe.
+
+        Args:
+            provider_name (str): The provider that served (or failed) the request.
+            model_name (str): The model that served (or failed) the request.
+            success (bool): Whether the request succeeded.
+            latency_ms (Optional[float]): End-to-end latency of the request.
+            cost_per_token_usd (Optional[float]): Estimated cost per total token.
+        """
+        key = (provider_name.lower(), model_name)
+        shared_scores = self._read_shared_scores()
+        with self._lock:
+            stats = self._candidate_stats.get(key)
+            if stats is None:
+                stats = self._candidate_stats[key] = _CandidateStats(
+                    self._latency_window
+                )
+            now = time.monotonic()
+            stats.record(
+                self._alpha,
+                success,
+                latency_ms,
+                cost_per_token_usd,
+                now,
+                self._half_life,
+            )
+            self._publish_snapshot_locked(now, shared_scores)
+
+    def default_utility(self, metrics: Dict[str, Optional[float]]) -> float:
+        """
+        Weighted success rate minus weighted p50/p95 latency and cost per token.
+        Metrics that are not known yet contribute nothing.
+        """
+        weights = self._utility_weights
+        utility = weights["success"] * (metrics["success_rate"] or 0.0)
+        for weight, key in (
+            (weights["p50_latency"], "p50_latency_ms"),
+            (weights["p95_latency"], "p95_latency_ms"),
+        ):
+            if metrics[key] is not None:
+                utility -= weight * metrics[key] / self._latency_scale_ms
+        cost = metrics["cost_per_token_usd"]
+        if cost is not None:
+            utility -= weights["cost"] * cost / self._cost_scale
+        return utility
+
+    def _candidate_metrics_locked(
+        self, key: Tuple[str, str], now: float
+    ) -> Dict[str, Optional[float]]:
+        stats = self._candidate_stats[key]
+        metrics = stats.metrics()
+        # Cold candidates get the default success rate, like cold providers.
+        if stats.request_count < self._min_requests:
+            metrics["success_rate"] = self._default_score
+        else:
+            metrics["success_rate"] = self._decay_towards_default(
+                metrics["success_rate"], stats.evidence.updated_at, now
+            )
+        return metrics
+
+    def rank_candidates(
+        self, model_priority_map: Dict[str, List[str]]
+    ) -> List[Tuple[str, str]]:
+        """
+        Returns every (provider, model) pair of the map, sorted by utility from
+        highest to lowest. Ties keep the map's order. This method is thread-safe
+        and does not take the lock.
+
+        Args:
+            model_priority_map (Dict[str, List[str]]): Candidate models per provider.
+
+        Returns:
+            List[Tuple[str, str]]: The ranked (provider, model) candidates.
+        """
+        snapshot = self._current_snapshot()
+        entries = {
+            (provider, model): snapshot.candidates.get(
+                (provider.lower(), model), self._cold_candidate
+            )
+            for provider, models in model_priority_map.items()
+            for model in models or []
+        }
+        if self._should_explore():
+            total = sum(s + f for s, f in (e.evidence for e in entries.values()))
+            utilities = {
+                candidate: self._utility_fn(
+                    {
+                        **entry.metrics,
+                        "success_rate": self._exploration_score(
+                            *entry.evidence, total
+                        ),
+                    }
+                )
+                for candidate, entry in entries.items()
+            }
+        else:
+            utilities = {
+                candidate: entry.utility for candidate, entry in entries.items()
+            }
+        return sorted(entries, key=utilities.get, reverse=True)
+
+    def get_candidate_stats(self) -> Dict[str, Dict]:
+        """
+        Returns the metrics and utility of every known (provider, model)
+        candidate, keyed by "provider/model", for observability.
+        """
+        return {
+            f"{provider}/{model}": {**entry.metrics, "utility": entry.utility}
+            for (provider, model), entry in self._current_snapshot().candidates.items()
+        }
+
+    def get_exploration_stats(self) -> Dict[str, Any]:
+        """
+        Returns the exploration policy and how many rankings explored, for
+        observability.
+        """
+        return {
+            "policy": self.exploration_policy,
+            "exploration_fraction": self._exploration_fraction,
+            "evidence_half_life_seconds": self._half_life,
+            "rankings": self._rankings,
+            "explored_rankings": self._explored_rankings,
+        }
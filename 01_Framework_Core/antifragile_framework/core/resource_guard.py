@@ -1,6 +1,10 @@
 # antifragile_framework/core/resource_guard.py
 
+import heapq
+import itertools
 import logging
+import math
+import random
 import threading
 import time
 from contextlib import contextmanager
@@ -60,10 +64,20 @@ except ImportError as e:
 
     UniversalEventSchema = MockEventSchema
 
+from antifragile_framework.utils.error_parser import ErrorCategory
+
 from .exceptions import NoResourcesAvailableError
+from .shared_state import (
+    NAMESPACE_KEY_COOLDOWNS,
+    SharedStateBackend,
+    resource_fingerprint,
+)
 
 log = logging.getLogger(__name__)
 
+# A shared cooldown is only adopted if it ends this much later than the local one.
+SHARED_COOLDOWN_TOLERANCE_SECONDS = 0.5
+
 class ResourceState(Enum):
     AVAILABLE = auto()
     IN_USE = auto()
@@ -71,8 +85,96 @@ class ResourceState(Enum):
     DISABLED = auto()
 
 
+# Provider rate-limit response headers, mapped to (limit, remaining) fields.
+RATE_LIMIT_HEADER_FIELDS = {
+    "x-ratelimit-limit-requests": "limit_requests",
+    "x-ratelimit-remaining-requests": "remaining_requests",
+    "x-ratelimit-limit-tokens": "limit_tokens",
+    "x-ratelimit-remaining-tokens": "remaining_tokens",
+    "anthropic-ratelimit-requests-limit": "limit_requests",
+    "anthropic-ratelimit-requests-remaining": "remaining_requests",
+    "anthropic-ratelimit-tokens-limit": "limit_tokens",
+    "anthropic-ratelimit-tokens-remaining": "remaining_tokens",
+}
+
+
+def parse_rate_limit_headers(headers: Optional[Any]) -> Dict[str, int]:
+    """
+    Extracts request/token limits from OpenAI- or Anthropic-style response
+    headers. Unknown or malformed headers are ignored.
+    """
+    limits: Dict[str, int] = {}
+    if not headers:
+        return limits
+    try:
+        items = list(headers.items())
+    except (AttributeError, TypeError):
+        return limits
+    for name, value in items:
+        field = RATE_LIMIT_HEADER_FIELDS.get(str(name).lower())
+        if field is None:
+            continue
+        try:
+            limits[field] = int(float(value))
+        except (TypeError, ValueError):
+            continue
+    return limits
+
+
+class _TokenBucket:
+    """A per-minute token bucket. Callers handle locking."""
+
+    def __init__(self, capacity: float, tokens: Optional[float] = None):
+        self.capacity = float(capacity)
+        self.tokens = self.capacity if tokens is None else float(tokens)
+        self.refill_per_second = self.capacity / 60.0
+        self.last_refill_timestamp = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.last_refill_timestamp
+        if elapsed > 0:
+            self.tokens = min(
+                self.capacity, self.tokens + elapsed * self.refill_per_second
+            )
+        self.last_refill_timestamp = now
+
+    def fraction_remaining(self, now: float) -> float:
+        self._refill(now)
+        return self.tokens / self.capacity if self.capacity > 0 else 0.0
+
+    def can_consume(self, amount: float, now: float) -> bool:
+        self._refill(now)
+        # A request larger than the whole bucket is admitted once it is full.
+        return self.tokens >= min(amount, self.capacity)
+
+    def consume(self, amount: float, now: float):
+        self._refill(now)
+        self.tokens = max(0.0, self.tokens - amount)
+
+    def seconds_until_available(self, amount: float, now: float) -> float:
+        self._refill(now)
+        deficit = min(amount, self.capacity) - self.tokens
+        if deficit <= 0 or self.refill_per_second <= 0:
+            return 0.0
+        return deficit / self.refill_per_second
+
+    def reseed(self, capacity: Optional[int], remaining: Optional[int], now: float):
+        if capacity is not None and capacity > 0:
+            self.capacity = float(capacity)
+            self.refill_per_second = self.capacity / 60.0
+        self._refill(now)
+        if remaining is not None:
+            self.tokens = max(0.0, min(self.capacity, float(remaining)))
+
+
 class MonitoredResource:
-    """Represents a single, monitored resource (e.g., an API key)."""
+    """
+    Represents a single, monitored resource (e.g., an API key).
+
+    A resource admits up to `max_concurrency` in-flight requests and, when
+    configured or seeded from rate-limit headers, draws from per-minute request
+    (RPM) and token (TPM) buckets. It is IN_USE only while saturated.
+    """
 
     def __init__(
         self,
@@ -83,9 +185,21 @@ class MonitoredResource:
         healing_interval_seconds: int = 3600,
         healing_increment: float = 0.1,
         event_bus: Optional[EventBus] = None,
+        max_concurrency: int = 1,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None,
+        backoff_base_seconds: float = 1.0,
+        backoff_max_seconds: Optional[float] = None,
+        backoff_jitter: float = 0.5,
     ):
         if not (0 < penalty <= 1):
             raise ValueError("Penalty must be between 0 and 1.")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        if backoff_base_seconds <= 0:
+            raise ValueError("backoff_base_seconds must be positive.")
+        if not (0 <= backoff_jitter <= 1):
+            raise ValueError("backoff_jitter must be between 0 and 1.")
 
         self.value = value
         self.provider_name = provider_name
@@ -96,7 +210,24 @@ class MonitoredResource:
         self.last_reserved_timestamp: float = 0.0
         self.lock = threading.Lock()
 
+        self.max_concurrency = max_concurrency
+        self.in_flight: int = 0
+        self.request_bucket: Optional[_TokenBucket] = (
+            _TokenBucket(rpm_limit) if rpm_limit else None
+        )
+        self.token_bucket: Optional[_TokenBucket] = (
+            _TokenBucket(tpm_limit) if tpm_limit else None
+        )
+
         self._cooldown_seconds = cooldown_seconds
+        # Length of the cooldown currently in force; set per failure.
+        self.current_cooldown_seconds: float = cooldown_seconds
+        self.consecutive_failures: int = 0
+        self._backoff_base_seconds = backoff_base_seconds
+        self._backoff_max_seconds = (
+            backoff_max_seconds if backoff_max_seconds is not None else cooldown_seconds
+        )
+        self._backoff_jitter = backoff_jitter
         self._penalty = penalty
         self._healing_interval_seconds = healing_interval_seconds
         self._healing_increment = healing_increment
@@ -110,7 +241,7 @@ class MonitoredResource:
     def __repr__(self) -> str:
         return (
             f"<MonitoredResource(value='{self.safe_value}', score={self.health_score:.2f}, "
-            f"state={self.state.name})>"
+            f"state={self.state.name}, in_flight={self.in_flight}/{self.max_concurrency})>"
         )
 
     def _log_and_publish_event(
@@ -137,7 +268,7 @@ class MonitoredResource:
     def _update_health(self):
         now = time.monotonic()
         if self.state == ResourceState.COOLING_DOWN:
-            if now - self.last_failure_timestamp > self._cooldown_seconds:
+            if now - self.last_failure_timestamp >= self.current_cooldown_seconds:
                 old_state = self.state.name
                 self.state = ResourceState.AVAILABLE
                 self.last_health_update_timestamp = now
@@ -181,47 +312,200 @@ class MonitoredResource:
             self._update_health()
             return self.state == ResourceState.AVAILABLE
 
-    def penalize(self):
+    def penalize(
+        self,
+        retry_after_seconds: Optional[float] = None,
+        error_category: Optional[ErrorCategory] = None,
+    ):
         with self.lock:
-            old_score = self.health_score
-            self.health_score *= 1 - self._penalty
-            if self.health_score < 0.01:
-                self.health_score = 0.01
-            old_state = self.state.name
-            self.state = ResourceState.COOLING_DOWN
-            now = time.monotonic()
-            self.last_failure_timestamp = now
-            self.last_health_update_timestamp = now
-            self._log_and_publish_event(
-                event_topics.RESOURCE_PENALIZED,
-                "WARNING",
-                {
-                    "resource_id": self.safe_value,
-                    "old_state": old_state,
-                    "new_state": self.state.name,
-                    "reason": "Penalty applied after failure",
-                    "old_score": old_score,
-                    "new_score": self.health_score,
-                    "provider": self.provider_name,
-                },
+            self._apply_penalty(retry_after_seconds, error_category)
+
+    def record_success(self):
+        """Resets the failure streak that drives exponential backoff."""
+        with self.lock:
+            self.consecutive_failures = 0
+
+    def compute_cooldown(
+        self,
+        retry_after_seconds: Optional[float] = None,
+        error_category: Optional[ErrorCategory] = None,
+    ) -> float:
+        """
+        Cooldown for the current failure. A provider's Retry-After wins; other
+        retriable failures back off exponentially with jitter; fatal, unknown
+        and uncategorized failures keep the fixed cooldown, so a revoked key is
+        not retried within seconds. Callers handle locking.
+        """
+        if retry_after_seconds is not None:
+            return max(0.0, float(retry_after_seconds))
+        if error_category in (None, ErrorCategory.FATAL, ErrorCategory.UNKNOWN):
+            return float(self._cooldown_seconds)
+        # Cap the exponent so long failure streaks cannot overflow.
+        exponent = min(max(0, self.consecutive_failures - 1), 32)
+        delay = min(
+            self._backoff_max_seconds, self._backoff_base_seconds * 2**exponent
+        )
+        return delay * (1 - self._backoff_jitter * random.random())
+
+    def _apply_penalty(
+        self,
+        retry_after_seconds: Optional[float] = None,
+        error_category: Optional[ErrorCategory] = None,
+    ):
+        """Applies the penalty and starts the cooldown. Callers handle locking."""
+        old_score = self.health_score
+        self.health_score *= 1 - self._penalty
+        if self.health_score < 0.01:
+            self.health_score = 0.01
+        self.consecutive_failures += 1
+        self.current_cooldown_seconds = self.compute_cooldown(
+            retry_after_seconds, error_category
+        )
+        old_state = self.state.name
+        self.state = ResourceState.COOLING_DOWN
+        now = time.monotonic()
+        self.last_failure_timestamp = now
+        self.last_health_update_timestamp = now
+        self._log_and_publish_event(
+            event_topics.RESOURCE_PENALIZED,
+            "WARNING",
+            {
+                "resource_id": self.safe_value,
+                "old_state": old_state,
+                "new_state": self.state.name,
+                "reason": "Penalty applied after failure",
+                "old_score": old_score,
+                "new_score": self.health_score,
+                "cooldown_seconds": round(self.current_cooldown_seconds, 3),
+                "retry_after_seconds": retry_after_seconds,
+                "provider": self.provider_name,
+            },
+        )
+
+    def adopt_cooldown(self, remaining_seconds: float) -> bool:
+        """
+        Starts a cooldown reported by another worker, without a health penalty,
+        unless the local cooldown already lasts as long. Callers handle locking.
+        """
+        now = time.monotonic()
+        if (
+            self.state == ResourceState.COOLING_DOWN
+            and self.cooldown_expires_at
+            >= now + remaining_seconds - SHARED_COOLDOWN_TOLERANCE_SECONDS
+        ):
+            return False
+        self.state = ResourceState.COOLING_DOWN
+        self.last_failure_timestamp = now
+        self.current_cooldown_seconds = remaining_seconds
+        return True
+
+    @property
+    def cooldown_expires_at(self) -> float:
+        """Monotonic timestamp at which the current cooldown ends."""
+        return self.last_failure_timestamp + self.current_cooldown_seconds
+
+    def has_capacity(self, estimated_tokens: int = 0) -> bool:
+        """True if a concurrency slot and rate-limit budget are free. Callers handle locking."""
+        if self.in_flight >= self.max_concurrency:
+            return False
+        now = time.monotonic()
+        if self.request_bucket and not self.request_bucket.can_consume(1, now):
+            return False
+        if self.token_bucket and not self.token_bucket.can_consume(
+            estimated_tokens, now
+        ):
+            return False
+        return True
+
+    def headroom(self) -> float:
+        """Fraction (0..1) of the tightest remaining budget. Callers handle locking."""
+        now = time.monotonic()
+        remaining = 1.0 - self.in_flight / self.max_concurrency
+        if self.request_bucket:
+            remaining = min(remaining, self.request_bucket.fraction_remaining(now))
+        if self.token_bucket:
+            remaining = min(remaining, self.token_bucket.fraction_remaining(now))
+        return max(0.0, remaining)
+
+    def selection_score(self) -> float:
+        """Ranking used for key selection: health weighted by remaining headroom."""
+        return self.health_score * self.headroom()
+
+    def seconds_until_capacity(self, estimated_tokens: int = 0) -> float:
+        """Time until the rate-limit buckets can admit another request."""
+        now = time.monotonic()
+        wait = 0.0
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.seconds_until_available(1, now))
+        if self.token_bucket:
+            wait = max(
+                wait, self.token_bucket.seconds_until_available(estimated_tokens, now)
             )
+        return wait
+
+    def _acquire(self, estimated_tokens: int = 0):
+        """Takes a concurrency slot and charges the buckets. Callers handle locking."""
+        now = time.monotonic()
+        self.in_flight += 1
+        if self.request_bucket:
+            self.request_bucket.consume(1, now)
+        if self.token_bucket:
+            self.token_bucket.consume(estimated_tokens, now)
+        self.last_reserved_timestamp = now
+        if self.in_flight >= self.max_concurrency:
+            self.state = ResourceState.IN_USE
+
+    def _release_slot(self):
+        """Frees a concurrency slot. Callers handle locking."""
+        if self.in_flight > 0:
+            self.in_flight -= 1
+        if self.state == ResourceState.IN_USE and self.in_flight < self.max_concurrency:
+            self.state = ResourceState.AVAILABLE
+
+    def update_rate_limits(
+        self,
+        limit_requests: Optional[int] = None,
+        remaining_requests: Optional[int] = None,
+        limit_tokens: Optional[int] = None,
+        remaining_tokens: Optional[int] = None,
+    ):
+        """Seeds or refreshes the RPM/TPM buckets from provider-reported limits."""
+        with self.lock:
+            now = time.monotonic()
+            if limit_requests or self.request_bucket:
+                if self.request_bucket is None:
+                    self.request_bucket = _TokenBucket(limit_requests)
+                self.request_bucket.reseed(limit_requests, remaining_requests, now)
+            if limit_tokens or self.token_bucket:
+                if self.token_bucket is None:
+                    self.token_bucket = _TokenBucket(limit_tokens)
+                self.token_bucket.reseed(limit_tokens, remaining_tokens, now)
 
     def release(self):
         with self.lock:
-            if self.state == ResourceState.IN_USE:
-                self.state = ResourceState.AVAILABLE
+            self._release_slot()
 
 
 class ResourceGuard:
+    """
+    Selects and cools down the API keys of one provider.
+
+    With a shared_state backend, key cooldowns are published under a hash of
+    the key, and cooldowns started by other workers are adopted the next time
+    the guard is consulted (at most `max_staleness_seconds` late).
+    """
+
     def __init__(
         self,
         provider_name: str,
         api_keys: List[str],
         resource_config: Optional[Dict[str, Any]] = None,
         event_bus: Optional[EventBus] = None,
+        shared_state: Optional[SharedStateBackend] = None,
     ):
         self.provider_name = provider_name
         self.event_bus = event_bus
+        self.shared_state = shared_state
         config = resource_config or {}
 
         monitored_resource_params = {
@@ -230,6 +514,12 @@ class ResourceGuard:
             "healing_interval_seconds": config.get("healing_interval", 3600),
             "healing_increment": config.get("healing_increment", 0.1),
             "event_bus": self.event_bus,
+            "max_concurrency": config.get("max_concurrency", 1),
+            "rpm_limit": config.get("rpm_limit"),
+            "tpm_limit": config.get("tpm_limit"),
+            "backoff_base_seconds": config.get("backoff_base", 1.0),
+            "backoff_max_seconds": config.get("backoff_max"),
+            "backoff_jitter": config.get("backoff_jitter", 0.5),
         }
 
         self._resources: List[MonitoredResource] = [
@@ -243,6 +533,50 @@ class ResourceGuard:
                 f"ResourceGuard for '{provider_name}' initialized with no API keys."
             )
         self.lock = threading.Lock()
+        self._fingerprints: Dict[str, MonitoredResource] = (
+            {
+                resource_fingerprint(provider_name, res.value): res
+                for res in self._resources
+            }
+            if shared_state is not None
+            else {}
+        )
+        self._seen_shared_cooldowns: Optional[Any] = None
+
+    def _publish_cooldown(self, resource: MonitoredResource):
+        if self.shared_state is None:
+            return
+        self.shared_state.write(
+            NAMESPACE_KEY_COOLDOWNS,
+            resource_fingerprint(self.provider_name, resource.value),
+            {"cooldown_until": time.time() + resource.current_cooldown_seconds},
+        )
+
+    def _shared_cooldowns(self) -> Dict[MonitoredResource, float]:
+        """
+        Returns {resource: remaining_seconds} for live cooldowns published by
+        any worker, or nothing if the shared view has not changed since the
+        last call.
+        """
+        if self.shared_state is None:
+            return {}
+        records = self.shared_state.read(NAMESPACE_KEY_COOLDOWNS)
+        if records is self._seen_shared_cooldowns:
+            return {}
+        self._seen_shared_cooldowns = records
+        now = time.time()
+        cooldowns = {}
+        for fingerprint, resource in self._fingerprints.items():
+            record = records.get(fingerprint)
+            if record and record["cooldown_until"] > now:
+                cooldowns[resource] = record["cooldown_until"] - now
+        return cooldowns
+
+    def _adopt_shared_cooldowns(self, cooldowns: Dict[MonitoredResource, float]):
+        """Applies _shared_cooldowns(), which is read before taking the lock."""
+        for resource, remaining in cooldowns.items():
+            with resource.lock:
+                resource.adopt_cooldown(remaining)
 
     def get_total_resource_count(self) -> int:
         return len(self._resources)
@@ -253,31 +587,38 @@ class ResourceGuard:
         Checks if there is at least one healthy and available resource in the guard.
         This performs an internal update of resource states to reflect current cooldowns/healing.
         """
+        shared_cooldowns = self._shared_cooldowns()
         with self.lock:
+            self._adopt_shared_cooldowns(shared_cooldowns)
             return any(res.is_available() for res in self._resources)
 
-    def _reserve_resource(self) -> Optional[MonitoredResource]:
+    def _reserve_resource(
+        self, estimated_tokens: int = 0
+    ) -> Optional[MonitoredResource]:
+        shared_cooldowns = self._shared_cooldowns()
         with self.lock:
+            self._adopt_shared_cooldowns(shared_cooldowns)
             # Ensure all resources' states are updated before sorting and selecting
             for res in self._resources:
                 res._update_health()  # Call internal update to reflect latest state
 
-            available_resources = [res for res in self._resources if res.is_available()]
+            available_resources = [
+                res
+                for res in self._resources
+                if res.is_available() and res.has_capacity(estimated_tokens)
+            ]
             if not available_resources:
                 return None
 
-            # Prioritize resources by health score (highest first)
-            available_resources.sort(key=lambda r: r.health_score, reverse=True)
-
-            healthiest_resource = available_resources[0]
-            with healthiest_resource.lock:  # Acquire lock on the specific resource
-                healthiest_resource.state = ResourceState.IN_USE
-                healthiest_resource.last_reserved_timestamp = time.monotonic()
-            return healthiest_resource
+            # Prioritize resources by health weighted by remaining headroom
+            best_resource = max(available_resources, key=lambda r: r.selection_score())
+            with best_resource.lock:  # Acquire lock on the specific resource
+                best_resource._acquire(estimated_tokens)
+            return best_resource
 
     @contextmanager
-    def get_resource(self):
-        resource = self._reserve_resource()
+    def get_resource(self, estimated_tokens: int = 0):
+        resource = self._reserve_resource(estimated_tokens)
         if not resource:
             raise NoResourcesAvailableError(provider=self.provider_name)
         try:
@@ -285,19 +626,280 @@ class ResourceGuard:
         finally:
             resource.release()
 
-    def penalize_resource(self, resource_value: str):
+    def update_rate_limits_from_headers(self, resource_value: str, headers: Any):
+        """Seeds a key's RPM/TPM budgets from provider rate-limit response headers."""
+        limits = parse_rate_limit_headers(headers)
+        if not limits:
+            return
+        for resource in self._resources:
+            if resource.value == resource_value:
+                resource.update_rate_limits(**limits)
+                return
+
+    def penalize_resource(
+        self,
+        resource_value: str,
+        retry_after_seconds: Optional[float] = None,
+        error_category: Optional[ErrorCategory] = None,
+    ):
+        """
+        Cools a key down after a failure. The cooldown honours the provider's
+        Retry-After when given, otherwise it depends on the error category.
+        """
+        penalized = None
         with self.lock:
             for resource in self._resources:
                 if resource.value == resource_value:
-                    resource.penalize()
-                    return
+                    resource.penalize(retry_after_seconds, error_category)
+                    penalized = resource
+                    break
+        if penalized is not None:
+            self._publish_cooldown(penalized)
+            return
         log.warning(
             f"Attempted to penalize a resource value that was not found: {resource_value[:4]}..."
         )
 
+    def record_success(self, resource_value: str):
+        """Marks a successful call, resetting the key's backoff."""
+        for resource in self._resources:
+            if resource.value == resource_value:
+                resource.record_success()
+                return
+
     def get_all_resources(self) -> List[MonitoredResource]:
+        shared_cooldowns = self._shared_cooldowns()
         with self.lock:
+            self._adopt_shared_cooldowns(shared_cooldowns)
             # When getting all resources, ensure their states are up-to-date
             for res in self._resources:
                 res._update_health()
             return list(self._resources)
+
+
+
+class _CooldownTimerWheel:
+    """
+    A hashed timer wheel for cooldown expiry. Scheduling is O(1) and advancing
+    only visits the slots for ticks that elapsed since the last advance, so
+    promoting keys out of cooldown never scans the whole key set.
+    """
+
+    def __init__(self, tick_seconds: float = 0.25, slot_count: int = 512):
+        if tick_seconds <= 0:
+            raise ValueError("Timer wheel tick must be positive.")
+        if slot_count <= 0:
+            raise ValueError("Timer wheel slot count must be positive.")
+        self._tick_seconds = tick_seconds
+        self._slots: List[List[Any]] = [[] for _ in range(slot_count)]
+        self._current_tick = math.floor(time.monotonic() / tick_seconds)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def schedule(self, expires_at: float, item: Any):
+        # Round up so an item is never released before its deadline.
+        expiry_tick = max(
+            math.ceil(expires_at / self._tick_seconds), self._current_tick + 1
+        )
+        self._slots[expiry_tick % len(self._slots)].append((expiry_tick, item))
+        self._size += 1
+
+    def advance(self, now: float) -> List[Any]:
+        """Returns all items whose deadline is at or before `now`."""
+        now_tick = math.floor(now / self._tick_seconds)
+        if now_tick <= self._current_tick:
+            return []
+        if not self._size:
+            self._current_tick = now_tick
+            return []
+
+        expired = []
+        steps = min(now_tick - self._current_tick, len(self._slots))
+        for tick in range(self._current_tick + 1, self._current_tick + steps + 1):
+            slot = self._slots[tick % len(self._slots)]
+            if not slot:
+                continue
+            remaining = []
+            for expiry_tick, item in slot:
+                if expiry_tick <= now_tick:
+                    expired.append(item)
+                else:
+                    remaining.append((expiry_tick, item))
+            slot[:] = remaining
+        self._size -= len(expired)
+        self._current_tick = now_tick
+        return expired
+
+
+class AsyncResourceGuard(ResourceGuard):
+    """
+    A ResourceGuard for use from a single asyncio event loop.
+
+    Keys with free capacity live in a max-heap ordered by health weighted by
+    headroom, so reserving a key is O(log n). Keys in cooldown, or whose
+    rate-limit buckets are empty, sit in a timer wheel and are promoted lazily
+    the next time the guard is consulted. No OS locks are taken: every
+    method is expected to run on the event loop thread, where calls cannot
+    interleave. Health healing is applied lazily when a key is reserved.
+
+    The public API (get_resource, penalize_resource, has_healthy_resources,
+    get_all_resources) is identical to ResourceGuard.
+    """
+
+    def __init__(
+        self,
+        provider_name: str,
+        api_keys: List[str],
+        resource_config: Optional[Dict[str, Any]] = None,
+        event_bus: Optional[EventBus] = None,
+        shared_state: Optional[SharedStateBackend] = None,
+    ):
+        super().__init__(
+            provider_name=provider_name,
+            api_keys=api_keys,
+            resource_config=resource_config,
+            event_bus=event_bus,
+            shared_state=shared_state,
+        )
+        config = resource_config or {}
+        self._by_value: Dict[str, MonitoredResource] = {
+            res.value: res for res in self._resources
+        }
+        self._heap: List[Any] = []
+        self._heap_versions: Dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._available: set = set()
+        self._cooldowns = _CooldownTimerWheel(
+            tick_seconds=config.get("timer_wheel_tick", 0.25),
+            slot_count=config.get("timer_wheel_slots", 512),
+        )
+        for resource in self._resources:
+            self._push_available(resource)
+
+    def _push_available(self, resource: MonitoredResource):
+        version = self._heap_versions.get(resource.value, 0) + 1
+        self._heap_versions[resource.value] = version
+        heapq.heappush(
+            self._heap,
+            (-resource.selection_score(), next(self._sequence), version, resource),
+        )
+        self._available.add(resource.value)
+
+    def _discard_available(self, resource: MonitoredResource):
+        # Lazy deletion: bump the version so the stale heap entry is skipped.
+        self._heap_versions[resource.value] = (
+            self._heap_versions.get(resource.value, 0) + 1
+        )
+        self._available.discard(resource.value)
+
+    def _defer_until_capacity(self, resource: MonitoredResource):
+        wait = resource.seconds_until_capacity()
+        self._cooldowns.schedule(time.monotonic() + wait, resource)
+
+    def _adopt_shared_cooldowns(self, cooldowns: Dict[MonitoredResource, float]):
+        for resource, remaining in cooldowns.items():
+            if resource.adopt_cooldown(remaining):
+                self._discard_available(resource)
+                self._cooldowns.schedule(resource.cooldown_expires_at, resource)
+
+    def _promote_expired_cooldowns(self):
+        self._adopt_shared_cooldowns(self._shared_cooldowns())
+        for resource in self._cooldowns.advance(time.monotonic()):
+            if resource.value in self._available:
+                continue
+            if resource.state == ResourceState.COOLING_DOWN:
+                if time.monotonic() < resource.cooldown_expires_at:
+                    # Penalized again after being scheduled; wait for the newer deadline.
+                    self._cooldowns.schedule(resource.cooldown_expires_at, resource)
+                    continue
+                resource._update_health()
+            if resource.state != ResourceState.AVAILABLE:
+                continue
+            if resource.has_capacity():
+                self._push_available(resource)
+            elif resource.in_flight < resource.max_concurrency:
+                self._defer_until_capacity(resource)
+
+    def has_healthy_resources(self) -> bool:
+        self._promote_expired_cooldowns()
+        return bool(self._available)
+
+    def _reserve_resource(
+        self, estimated_tokens: int = 0
+    ) -> Optional[MonitoredResource]:
+        self._promote_expired_cooldowns()
+        too_small: List[MonitoredResource] = []
+        reserved = None
+        while self._heap:
+            _, _, version, resource = heapq.heappop(self._heap)
+            if self._heap_versions.get(resource.value) != version:
+                continue
+            resource._update_health()
+            self._discard_available(resource)
+            if not resource.has_capacity():
+                # Out of RPM/TPM budget: park it until the buckets refill.
+                self._defer_until_capacity(resource)
+                continue
+            if not resource.has_capacity(estimated_tokens):
+                # Can still serve smaller requests; keep it in rotation.
+                too_small.append(resource)
+                continue
+            resource._acquire(estimated_tokens)
+            if resource.in_flight < resource.max_concurrency:
+                self._push_available(resource)
+            reserved = resource
+            break
+        for resource in too_small:
+            self._push_available(resource)
+        return reserved
+
+    def _release_resource(self, resource: MonitoredResource):
+        resource._release_slot()
+        if resource.state == ResourceState.AVAILABLE:
+            # Re-pushing also refreshes the heap entry with the new headroom.
+            self._push_available(resource)
+
+    @contextmanager
+    def get_resource(self, estimated_tokens: int = 0):
+        resource = self._reserve_resource(estimated_tokens)
+        if not resource:
+            raise NoResourcesAvailableError(provider=self.provider_name)
+        try:
+            yield resource
+        finally:
+            self._release_resource(resource)
+
+    def update_rate_limits_from_headers(self, resource_value: str, headers: Any):
+        super().update_rate_limits_from_headers(resource_value, headers)
+        resource = self._by_value.get(resource_value)
+        if resource is not None and resource.value in self._available:
+            self._push_available(resource)
+
+    def penalize_resource(
+        self,
+        resource_value: str,
+        retry_after_seconds: Optional[float] = None,
+        error_category: Optional[ErrorCategory] = None,
+    ):
+        resource = self._by_value.get(resource_value)
+        if resource is None:
+            log.warning(
+                f"Attempted to penalize a resource value that was not found: {resource_value[:4]}..."
+            )
+            return
+        resource._apply_penalty(retry_after_seconds, error_category)
+        if resource.value in self._available:
+            self._discard_available(resource)
+        self._cooldowns.schedule(resource.cooldown_expires_at, resource)
+        self._publish_cooldown(resource)
+
+    def record_success(self, resource_value: str):
+        resource = self._by_value.get(resource_value)
+        if resource is not None:
+            resource.consecutive_failures = 0
+
+    def get_all_resources(self) -> List[MonitoredResource]:
+        self._promote_expired_cooldowns()
+        return list(self._resources)
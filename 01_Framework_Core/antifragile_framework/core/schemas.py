@@ -1,12 +1,80 @@
 # antifragile_framework/core/schemas.py
 
+import time
 import uuid
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from antifragile_framework.config.cost_estimator import usd_to_micros
+
+
+class LifecycleEvent(Mapping):
+    """
+    A cheap record of one resilience event within a request.
+
+    Only the event name, severity, payload and two clock readings are stored;
+    the ISO timestamp and the dict/telemetry forms are built on demand. It
+    reads like the dict it replaces ({"timestamp", "event_name", **payload}),
+    so existing consumers can keep indexing it.
+    """
+
+    __slots__ = ("event_name", "severity", "payload", "wall_time", "monotonic_time")
+
+    def __init__(self, event_name: str, severity: str, payload: Dict[str, Any]):
+        self.event_name = event_name
+        self.severity = severity
+        self.payload = payload
+        self.wall_time = time.time()
+        self.monotonic_time = time.monotonic()
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.wall_time, timezone.utc).isoformat()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "event_name":
+            return self.event_name
+        if key == "timestamp":
+            return self.timestamp
+        return self.payload[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield "timestamp"
+        yield "event_name"
+        for key in self.payload:
+            if key not in ("timestamp", "event_name"):
+                yield key
+
+    def __len__(self) -> int:
+        return 2 + sum(
+            1 for key in self.payload if key not in ("timestamp", "event_name")
+        )
+
+    def __repr__(self) -> str:
+        return f"LifecycleEvent({self.event_name!r}, {self.severity!r}, {self.payload!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"timestamp": self.timestamp, "event_name": self.event_name, **self.payload}
+
+    def to_event_payload(
+        self, event_topic: str, event_source: str, request_id: str
+    ) -> Dict[str, Any]:
+        """The UniversalEventSchema-shaped dict published on the event bus."""
+        return {
+            "event_id": str(uuid.uuid4()),
+            "event_type": self.event_name,
+            "event_topic": event_topic,
+            "event_source": event_source,
+            "timestamp_utc": self.timestamp,
+            "severity": self.severity,
+            "payload": {"request_id": request_id, **self.payload},
+            "parent_event_id": None,
+        }
+
 
 @dataclass
 class RequestContext:
@@ -22,16 +90,30 @@ class RequestContext:
     # Default fields follow.
     request_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     start_time: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    lifecycle_events: List[Dict[str, Any]] = field(default_factory=list)
+    lifecycle_events: List[LifecycleEvent] = field(default_factory=list)
     api_call_count: int = 0
     mitigation_attempted: bool = False
     # NEW FIELDS FOR USER-INTENT FIRST ARCHITECTURE
     preferred_provider: Optional[str] = None
     max_estimated_cost_usd: Optional[float] = None
+    # The cap in whole micro-dollars, derived once from max_estimated_cost_usd.
+    max_estimated_cost_micros: Optional[int] = field(init=False, default=None)
     cost_cap_enforced: bool = (
         False  # NEW: Track if cost cap was enforced for this request
     )
     cost_cap_skip_reason: Optional[str] = None  # NEW: Reason for cost cap enforcement
+    # Request hedging: number of speculative legs fired and the index of the
+    # leg (0 = primary) that produced the final response.
+    hedges_launched: int = 0
+    winning_leg_index: Optional[int] = None
+    # Streaming: time to the first content chunk and the output token rate
+    # measured after it.
+    streamed: bool = False
+    ttft_ms: Optional[float] = None
+    tokens_per_second: Optional[float] = None
+
+    def __post_init__(self):
+        self.max_estimated_cost_micros = usd_to_micros(self.max_estimated_cost_usd)
 
 
 class ProviderPerformanceAnalysis(BaseModel):
@@ -0,0 +1,449 @@
+# antifragile_framework/core/shared_state.py
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import socket
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple, Union
+
+# Cross-process locking for the mmap backend is POSIX-only.
+try:
+    import fcntl
+
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# The network backend speaks the redis-py client API; any client with
+# hset/hgetall/hdel works, so redis itself is only needed for from_url().
+try:
+    import redis
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# Namespaces shared between workers.
+NAMESPACE_PROVIDER_SCORES = "ranking.providers"
+NAMESPACE_CIRCUIT_BREAKERS = "circuit_breakers"
+NAMESPACE_KEY_COOLDOWNS = "key_cooldowns"
+
+DEFAULT_MAX_STALENESS_SECONDS = 1.0
+DEFAULT_MMAP_SIZE_BYTES = 1024 * 1024
+# How long close() waits for queued writes to reach the store.
+DEFAULT_CLOSE_TIMEOUT_SECONDS = 5.0
+
+_EMPTY: Mapping[str, Dict[str, Any]] = MappingProxyType({})
+
+
+def default_worker_id() -> str:
+    """Identifies this process across hosts: '<hostname>:<pid>'."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def resource_fingerprint(provider_name: str, resource_value: str) -> str:
+    """A stable shared-state key for an API key that never exposes the key."""
+    digest = hashlib.sha256(resource_value.encode("utf-8")).hexdigest()[:16]
+    return f"{provider_name}:{digest}"
+
+
+class SharedStateBackend(ABC):
+    """
+    A store of JSON-serializable records, grouped by namespace, that several
+    worker processes (or nodes) read and write: provider EMAs, circuit
+    breaker trips and API key cooldowns.
+
+    Reads go through a per-namespace cache that is refreshed at most every
+    `max_staleness_seconds`, so hot-path lookups stay local; callers should
+    read outside their own locks, since a refresh goes to the store. Writes
+    update the cache at once and are handed to a background writer thread,
+    so callers never wait on the store; repeated writes of one key that are
+    still queued collapse into the newest. Backend errors are logged and
+    never raised into the request path: a failed read serves the last cached
+    view, a failed write is dropped.
+    """
+
+    # Backends whose store is plain process memory write synchronously.
+    background_writes = True
+
+    def __init__(self, max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS):
+        if max_staleness_seconds < 0:
+            raise ValueError(
+                "Shared state 'max_staleness_seconds' must be non-negative."
+            )
+        self.max_staleness_seconds = max_staleness_seconds
+        self._cache: Dict[str, Tuple[float, Mapping[str, Dict[str, Any]]]] = {}
+        self._cache_lock = threading.Lock()
+        # Queued operations by (operation, namespace, key); the writer thread
+        # is started on the first write.
+        self._pending: Dict[Tuple[str, str, str], Any] = {}
+        self._in_progress: Dict[Tuple[str, str, str], Any] = {}
+        self._pending_cond = threading.Condition()
+        self._writer: Optional[threading.Thread] = None
+        self._closing = False
+
+    @abstractmethod
+    def _read_namespace(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        """Returns every record of a namespace from the store."""
+
+    @abstractmethod
+    def _write_record(self, namespace: str, key: str, record: Dict[str, Any]):
+        """Stores one record, replacing any previous value."""
+
+    @abstractmethod
+    def _delete_records(self, namespace: str, keys: Iterable[str]):
+        """Removes records from a namespace; missing keys are ignored."""
+
+    def read(self, namespace: str) -> Mapping[str, Dict[str, Any]]:
+        """
+        Returns a read-only view of a namespace, at most
+        `max_staleness_seconds` old. The same object is returned until the
+        cache refreshes, so callers can skip work when it has not changed.
+        """
+        now = time.monotonic()
+        cached = self._cache.get(namespace)
+        if cached is not None and now - cached[0] <= self.max_staleness_seconds:
+            return cached[1]
+        try:
+            records = self._read_namespace(namespace)
+        except Exception as e:
+            log.warning(f"Shared state read of '{namespace}' failed: {e}")
+            return cached[1] if cached is not None else _EMPTY
+        records = MappingProxyType({**records, **self._queued_records(namespace)})
+        with self._cache_lock:
+            self._cache[namespace] = (now, records)
+        return records
+
+    def write(self, namespace: str, key: str, record: Dict[str, Any]):
+        """
+        Stores a record and makes it visible to this process's next read.
+        Other processes see it once the writer thread has stored it.
+        """
+        with self._cache_lock:
+            cached = self._cache.get(namespace)
+            if cached is not None:
+                self._cache[namespace] = (
+                    cached[0],
+                    MappingProxyType({**cached[1], key: record}),
+                )
+        self._submit(("write", namespace, key), record)
+
+    def prune(self, namespace: str, timestamp_field: str, max_age_seconds: float):
+        """
+        Deletes the records of a namespace whose wall-clock `timestamp_field`
+        is older than `max_age_seconds`, from the writer thread.
+        """
+        self._submit(("prune", namespace, timestamp_field), max_age_seconds)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until queued writes reach the store; False on timeout."""
+        with self._pending_cond:
+            return self._pending_cond.wait_for(
+                lambda: not self._pending and not self._in_progress, timeout
+            )
+
+    def _queued_records(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        """This process's writes to `namespace` that the store may not have yet."""
+        with self._pending_cond:
+            return {
+                key: record
+                for queue in (self._in_progress, self._pending)
+                for (kind, queued_namespace, key), record in queue.items()
+                if kind == "write" and queued_namespace == namespace
+            }
+
+    def _submit(self, operation: Tuple[str, str, str], argument: Any):
+        if not self.background_writes:
+            self._apply(operation, argument)
+            return
+        with self._pending_cond:
+            if self._closing:
+                log.warning(f"Shared state is closed; dropped {operation[0]}.")
+                return
+            # Re-inserting moves the key to the end, keeping write order.
+            self._pending.pop(operation, None)
+            self._pending[operation] = argument
+            self._pending_cond.notify_all()
+            # A forked child inherits the writer object but not its thread.
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._run_writer, name="shared-state-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _run_writer(self):
+        while True:
+            with self._pending_cond:
+                self._pending_cond.wait_for(lambda: self._pending or self._closing)
+                if not self._pending:
+                    return
+                self._in_progress, self._pending = self._pending, {}
+            try:
+                for operation, argument in self._in_progress.items():
+                    self._apply(operation, argument)
+            finally:
+                with self._pending_cond:
+                    self._in_progress = {}
+                    self._pending_cond.notify_all()
+
+    def _apply(self, operation: Tuple[str, str, str], argument: Any):
+        kind, namespace, key = operation
+        try:
+            if kind == "write":
+                self._write_record(namespace, key, argument)
+            else:
+                self._prune_namespace(namespace, key, argument)
+        except Exception as e:
+            log.warning(f"Shared state {kind} of '{namespace}/{key}' failed: {e}")
+
+    def _prune_namespace(
+        self, namespace: str, timestamp_field: str, max_age_seconds: float
+    ):
+        cutoff = time.time() - max_age_seconds
+        stale = [
+            key
+            for key, record in self._read_namespace(namespace).items()
+            if record.get(timestamp_field, 0.0) < cutoff
+        ]
+        if not stale:
+            return
+        self._delete_records(namespace, stale)
+        with self._cache_lock:
+            cached = self._cache.get(namespace)
+            if cached is not None:
+                kept = {k: v for k, v in cached[1].items() if k not in stale}
+                self._cache[namespace] = (cached[0], MappingProxyType(kept))
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT_SECONDS):
+        """Stores queued writes (waiting up to `timeout`) and stops the writer."""
+        with self._pending_cond:
+            self._closing = True
+            self._pending_cond.notify_all()
+            writer = self._writer
+        if writer is not None and writer.is_alive():
+            writer.join(timeout)
+            if writer.is_alive():
+                log.warning("Shared state writer did not finish before close.")
+
+
+class InMemorySharedState(SharedStateBackend):
+    """
+    Shares state between components of one process. Useful as the default
+    for single-worker deployments and as a stand-in backend in tests.
+    """
+
+    background_writes = False
+
+    def __init__(self, max_staleness_seconds: float = 0.0):
+        super().__init__(max_staleness_seconds)
+        self._records: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _read_namespace(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._records.get(namespace, {}))
+
+    def _write_record(self, namespace: str, key: str, record: Dict[str, Any]):
+        with self._lock:
+            self._records.setdefault(namespace, {})[key] = record
+
+    def _delete_records(self, namespace: str, keys: Iterable[str]):
+        with self._lock:
+            records = self._records.get(namespace, {})
+            for key in keys:
+                records.pop(key, None)
+
+
+class MmapSharedState(SharedStateBackend):
+    """
+    Shares state between worker processes on one host through a memory-mapped
+    file. The file holds a version counter, a length and a JSON document of
+    all namespaces. Writers rewrite the document under an exclusive flock and
+    bump the version; readers only re-parse when the version changed.
+    """
+
+    _HEADER = struct.Struct("<QQ")
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        size_bytes: int = DEFAULT_MMAP_SIZE_BYTES,
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+    ):
+        super().__init__(max_staleness_seconds)
+        if not FCNTL_AVAILABLE:
+            raise ValueError("The mmap shared state backend requires POSIX fcntl.")
+        if size_bytes <= self._HEADER.size:
+            raise ValueError("Shared state 'size_bytes' is too small.")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.size_bytes = size_bytes
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size_bytes:
+            os.ftruncate(self._fd, size_bytes)
+        self._map = mmap.mmap(self._fd, size_bytes)
+        self._lock = threading.Lock()
+        self._document: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._document_version = 0
+
+    def _load_locked(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Returns the document, re-parsing only if another writer changed it."""
+        version, length = self._HEADER.unpack_from(self._map, 0)
+        if version != self._document_version:
+            start = self._HEADER.size
+            raw = self._map[start : start + length]
+            self._document = json.loads(raw) if length else {}
+            self._document_version = version
+        return self._document
+
+    def _read_namespace(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_SH)
+            try:
+                return dict(self._load_locked().get(namespace, {}))
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _write_record(self, namespace: str, key: str, record: Dict[str, Any]):
+        def store(records: Dict[str, Dict[str, Any]]):
+            records[key] = record
+
+        self._update_namespace(namespace, store)
+
+    def _delete_records(self, namespace: str, keys: Iterable[str]):
+        def delete(records: Dict[str, Dict[str, Any]]):
+            for key in keys:
+                records.pop(key, None)
+
+        self._update_namespace(namespace, delete)
+
+    def _update_namespace(
+        self, namespace: str, update: Callable[[Dict[str, Dict[str, Any]]], None]
+    ):
+        """Applies `update` to a copy of the namespace and rewrites the file."""
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                document = self._load_locked()
+                updated = {**document, namespace: {**document.get(namespace, {})}}
+                update(updated[namespace])
+                raw = json.dumps(updated, separators=(",", ":")).encode("utf-8")
+                if self._HEADER.size + len(raw) > self.size_bytes:
+                    raise ValueError(
+                        f"shared state document of {len(raw)} bytes exceeds "
+                        f"the {self.size_bytes}-byte file"
+                    )
+                version = self._document_version + 1
+                self._map[self._HEADER.size : self._HEADER.size + len(raw)] = raw
+                self._HEADER.pack_into(self._map, 0, version, len(raw))
+                self._document = updated
+                self._document_version = version
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT_SECONDS):
+        super().close(timeout)
+        with self._lock:
+            if not self._map.closed:
+                self._map.close()
+                os.close(self._fd)
+
+
+class RedisSharedState(SharedStateBackend):
+    """
+    Shares state between nodes through a network key-value store. Each
+    namespace is one hash named '<prefix>:<namespace>' whose fields hold JSON
+    records. `client` is anything with the redis-py hset/hgetall/hdel API.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "adaptive_mind",
+        max_staleness_seconds: float = DEFAULT_MAX_STALENESS_SECONDS,
+    ):
+        super().__init__(max_staleness_seconds)
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "RedisSharedState":
+        if not REDIS_AVAILABLE:
+            raise ValueError("The redis shared state backend requires 'redis'.")
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def _hash_name(self, namespace: str) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def _read_namespace(self, namespace: str) -> Dict[str, Dict[str, Any]]:
+        fields = self.client.hgetall(self._hash_name(namespace)) or {}
+        records = {}
+        for key, value in fields.items():
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            records[key] = json.loads(value)
+        return records
+
+    def _write_record(self, namespace: str, key: str, record: Dict[str, Any]):
+        self.client.hset(
+            self._hash_name(namespace), key, json.dumps(record, separators=(",", ":"))
+        )
+
+    def _delete_records(self, namespace: str, keys: Iterable[str]):
+        keys = list(keys)
+        if keys:
+            self.client.hdel(self._hash_name(namespace), *keys)
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT_SECONDS):
+        super().close(timeout)
+        close = getattr(self.client, "close", None)
+        if close is not None:
+            close()
+
+
+def create_shared_state(
+    config: Optional[Dict[str, Any]],
+) -> Optional[SharedStateBackend]:
+    """
+    Builds a backend from a config dict: {"backend": "memory" | "mmap" |
+    "redis", "path", "size_bytes", "url", "prefix", "max_staleness_seconds"}.
+    Returns None when no backend is configured.
+    """
+    if not config or not config.get("backend"):
+        return None
+    backend = config["backend"]
+    staleness = float(
+        config.get("max_staleness_seconds", DEFAULT_MAX_STALENESS_SECONDS)
+    )
+    if backend == "memory":
+        return InMemorySharedState(max_staleness_seconds=staleness)
+    if backend == "mmap":
+        if not config.get("path"):
+            raise ValueError("The mmap shared state backend requires a 'path'.")
+        return MmapSharedState(
+            config["path"],
+            size_bytes=int(config.get("size_bytes", DEFAULT_MMAP_SIZE_BYTES)),
+            max_staleness_seconds=staleness,
+        )
+    if backend == "redis":
+        if not config.get("url"):
+            raise ValueError("The redis shared state backend requires a 'url'.")
+        return RedisSharedState.from_url(
+            config["url"],
+            prefix=config.get("prefix", "adaptive_mind"),
+            max_staleness_seconds=staleness,
+        )
+    raise ValueError(
+        f"Unknown shared state backend '{backend}'. "
+        "Expected one of: ['memory', 'mmap', 'redis']."
+    )
@@ -1,7 +1,7 @@
 # antifragile_framework/providers/api_abstraction_layer.py
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -47,6 +47,28 @@ class CompletionResponse(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(None)
 
 
+class CompletionChunk(BaseModel):
+    """A single incremental piece of a streamed completion."""
+
+    delta: str = Field("", description="Text generated since the previous chunk.")
+    model_used: Optional[str] = Field(None)
+    finish_reason: Optional[str] = Field(
+        None, description="Set on the final content chunk, if the provider reports it."
+    )
+    usage: Optional[TokenUsage] = Field(
+        None,
+        description="Token usage for the whole completion; usually only on the last chunk.",
+    )
+
+
+class StreamingError(Exception):
+    """Raised by a provider stream that failed without a more specific SDK exception."""
+
+    def __init__(self, message: str, response: Optional[CompletionResponse] = None):
+        super().__init__(message)
+        self.response = response
+
+
 class LLMProvider(ABC):
     def __init__(self, config: Dict[str, Any]):
         if not isinstance(config, dict):
@@ -81,3 +103,41 @@ class LLMProvider(ABC):
     ) -> CompletionResponse:
         """Generates a text completion, allowing for a per-call API key override."""
         pass
+
+    async def astream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        api_key_override: Optional[str] = None,
+        **kwargs: Any
+    ) -> AsyncIterator[CompletionChunk]:
+        """
+        Streams a text completion as CompletionChunk objects.
+
+        Unlike agenerate_completion, failures are raised rather than returned,
+        so callers can tell an error before the first chunk from a finished
+        stream. This default implementation buffers agenerate_completion and
+        yields the result as a single chunk; adapters override it with the
+        provider's native streaming API.
+        """
+        response = await self.agenerate_completion(
+            messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            api_key_override=api_key_override,
+            **kwargs
+        )
+        if not response.success:
+            raw_exception = (response.metadata or {}).get("raw_exception")
+            if isinstance(raw_exception, Exception):
+                raise raw_exception
+            raise StreamingError(
+                response.error_message or "Provider returned non-success.", response
+            )
+        yield CompletionChunk(
+            delta=response.content or "",
+            model_used=response.model_used,
+            finish_reason="stop",
+            usage=response.usage,
+        )
@@ -0,0 +1,250 @@
+# antifragile_framework/providers/client_cache.py
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Set, Tuple
+
+import httpx
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CLIENTS = 64
+DEFAULT_IDLE_TIMEOUT_SECONDS = 600.0
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+ClientFactory = Callable[[str, Optional[httpx.AsyncClient]], Any]
+ClientCloser = Callable[[Any], Awaitable[Any]]
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class _CachedClient(NamedTuple):
+    client: Any
+    last_used: float
+    loop: Optional[asyncio.AbstractEventLoop]
+    closer: Optional[ClientCloser]
+
+
+class SDKClientCache:
+    """
+    An LRU cache of provider SDK clients keyed by (provider, api_key).
+
+    Every client for a provider shares one keep-alive httpx.AsyncClient, so
+    rotating API keys reuses pooled connections instead of opening a new pool
+    (and TLS handshake) per call. SDK clients are thin wrappers around that
+    transport: evicting one only drops the reference, and transports are
+    closed by close(). A transport is bound to the event loop it was created
+    on; if the cache is used from a different loop it is rebuilt and the old
+    one is closed.
+
+    Clients that own their connections (e.g. gRPC channels) are cached with
+    use_http_client=False and a `closer` coroutine, which the cache runs when
+    the client is evicted, rebuilt for another loop, or the cache is closed.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_CLIENTS,
+        idle_timeout_seconds: float = DEFAULT_IDLE_TIMEOUT_SECONDS,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry_seconds: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+    ):
+        if max_size <= 0:
+            raise ValueError("Client cache size must be positive.")
+        if idle_timeout_seconds <= 0:
+            raise ValueError("Idle timeout must be positive.")
+
+        self.max_size = max_size
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry_seconds,
+        )
+        self._clients: "OrderedDict[Tuple[str, str], _CachedClient]" = OrderedDict()
+        self._transports: Dict[
+            str, Tuple[Optional[asyncio.AbstractEventLoop], httpx.AsyncClient]
+        ] = {}
+        self._lock = threading.Lock()
+        # Close tasks scheduled on a loop, kept referenced until they finish.
+        self._closing: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def _close_soon(
+        self,
+        owner_loop: Optional[asyncio.AbstractEventLoop],
+        close: Callable[[], Awaitable[Any]],
+        what: str,
+    ):
+        """
+        Runs `close` without blocking the caller: on `owner_loop` if it is still
+        running elsewhere, otherwise as a task on the current loop. With no
+        loop to run on, the resource is left to the garbage collector.
+        """
+
+        async def _close():
+            try:
+                await close()
+            except Exception as e:
+                log.debug(f"Error closing {what}: {e}")
+
+        loop = _current_loop()
+        if owner_loop is not None and owner_loop is not loop:
+            if owner_loop.is_running():
+                asyncio.run_coroutine_threadsafe(_close(), owner_loop)
+                return
+        if loop is None:
+            log.debug(f"No running event loop to close {what}.")
+            return
+        task = loop.create_task(_close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _discard(self, key: Tuple[str, str], entry: _CachedClient):
+        """Closes a client removed from the cache if it owns resources."""
+        if entry.closer is not None:
+            self._close_soon(
+                entry.loop,
+                lambda: entry.closer(entry.client),
+                f"SDK client for provider '{key[0]}'",
+            )
+
+    def _evict_idle(self, now: float):
+        # Entries are in LRU order, so idle ones are at the front.
+        while self._clients:
+            key, entry = next(iter(self._clients.items()))
+            if now - entry.last_used <= self.idle_timeout_seconds:
+                break
+            del self._clients[key]
+            self._discard(key, entry)
+            log.debug(f"Evicted idle SDK client for provider '{key[0]}'.")
+
+    def _drop_provider_clients(self, provider_name: str):
+        for key in [k for k in self._clients if k[0] == provider_name]:
+            self._discard(key, self._clients.pop(key))
+
+    def get_http_client(self, provider_name: str) -> httpx.AsyncClient:
+        """Returns the shared keep-alive transport for a provider."""
+        loop = _current_loop()
+        with self._lock:
+            entry = self._transports.get(provider_name)
+            if entry is not None:
+                transport_loop, http_client = entry
+                if transport_loop is loop and not http_client.is_closed:
+                    return http_client
+                # Created on another (possibly closed) loop: its pooled
+                # connections can't be used here, and neither can its SDK clients.
+                self._drop_provider_clients(provider_name)
+                if not http_client.is_closed:
+                    self._close_soon(
+                        transport_loop,
+                        http_client.aclose,
+                        f"shared HTTP client for provider '{provider_name}'",
+                    )
+            http_client = httpx.AsyncClient(limits=self._limits)
+            self._transports[provider_name] = (loop, http_client)
+            return http_client
+
+    def get_client(
+        self,
+        provider_name: str,
+        api_key: str,
+        factory: ClientFactory,
+        closer: Optional[ClientCloser] = None,
+        use_http_client: bool = True,
+    ) -> Any:
+        """
+        Returns the cached SDK client for (provider_name, api_key), building it
+        with factory(api_key, shared_http_client) on a miss. Clients that manage
+        their own connections pass use_http_client=False (the factory then gets
+        None) and an async `closer` that releases them.
+        """
+        http_client = self.get_http_client(provider_name) if use_http_client else None
+        loop = _current_loop()
+        key = (provider_name, api_key)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                if entry.loop is loop:
+                    self._clients[key] = entry._replace(last_used=now)
+                    self._clients.move_to_end(key)
+                    return entry.client
+                # Bound to another loop's connections; rebuild it for this one.
+                del self._clients[key]
+                self._discard(key, entry)
+
+        entry = _CachedClient(factory(api_key, http_client), now, loop, closer)
+        with self._lock:
+            existing = self._clients.pop(key, None)
+            if existing is not None and existing.loop is loop:
+                # Another caller built one concurrently; keep the first.
+                self._discard(key, entry)
+                entry = existing._replace(last_used=now)
+            elif existing is not None:
+                self._discard(key, existing)
+            self._clients[key] = entry
+            while len(self._clients) > self.max_size:
+                self._discard(*self._clients.popitem(last=False))
+        return entry.client
+
+    async def close(self):
+        """Closes all cached clients and the shared transports."""
+        loop = _current_loop()
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+            transports = list(self._transports.values())
+            self._transports.clear()
+        for key, entry in clients:
+            if entry.closer is None:
+                continue
+            if entry.loop is not None and entry.loop is not loop:
+                self._discard(key, entry)
+                continue
+            try:
+                await entry.closer(entry.client)
+            except Exception as e:
+                log.warning(f"Error closing SDK client for '{key[0]}': {e}")
+        for transport_loop, http_client in transports:
+            if transport_loop is not None and transport_loop is not loop:
+                self._close_soon(
+                    transport_loop, http_client.aclose, "shared HTTP client"
+                )
+                continue
+            try:
+                await http_client.aclose()
+            except Exception as e:
+                log.warning(f"Error closing shared HTTP client: {e}")
+        # Let closes scheduled on this loop (evictions, foreign loops) finish.
+        pending = [task for task in self._closing if task.get_loop() is loop]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+_default_client_cache: Optional[SDKClientCache] = None
+_default_client_cache_lock = threading.Lock()
+
+
+def get_default_client_cache() -> SDKClientCache:
+    """Returns the process-wide client cache shared by the built-in adapters."""
+    global _default_client_cache
+    if _default_client_cache is None:
+        with _default_client_cache_lock:
+            if _default_client_cache is None:
+                _default_client_cache = SDKClientCache()
+    return _default_client_cache
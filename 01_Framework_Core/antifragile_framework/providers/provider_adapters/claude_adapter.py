@@ -6,16 +6,21 @@ import os
 import random
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import anthropic
 from anthropic import AsyncAnthropic
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
     LLMProvider,
     TokenUsage,
 )
+from antifragile_framework.providers.client_cache import (
+    SDKClientCache,
+    get_default_client_cache,
+)
 
 log = logging.getLogger(__name__)
 
@@ -41,6 +46,9 @@ class ClaudeProvider(LLMProvider):
         )
         self.primary_key = self.config.get("api_key")
         self.max_retries = self.config.get("max_retries", 2)
+        self.client_cache: SDKClientCache = self.config.get("client_cache")
+        if self.client_cache is None:
+            self.client_cache = get_default_client_cache()
         try:
             self.client = AsyncAnthropic(
                 api_key=self.primary_key, max_retries=self.max_retries
@@ -52,6 +60,12 @@ class ClaudeProvider(LLMProvider):
             log.error(f"Failed to initialize Anthropic client: {e}")
             raise
 
+    def _build_client(self, api_key: str, http_client: Any) -> AsyncAnthropic:
+        """Builds a client for an override key on the cache's shared transport."""
+        return AsyncAnthropic(
+            api_key=api_key, max_retries=self.max_retries, http_client=http_client
+        )
+
     def get_provider_name(self) -> str:
         return "anthropic"
 
@@ -106,12 +120,13 @@ class ClaudeProvider(LLMProvider):
         usage = None
         if api_key_override and api_key_override != self.primary_key:
             try:
-                client_to_use = AsyncAnthropic(
-                    api_key=api_key_override, max_retries=self.max_retries
+                client_to_use = self.client_cache.get_client(
+                    self.get_provider_name(),
+                    api_key_override,
+                    self._build_client,
                 )
-                log.debug("Created temporary Anthropic client for key override.")
             except Exception as e:
-                error_msg = f"Failed to initialize temporary Anthropic client with override key: {e}"
+                error_msg = f"Failed to initialize Anthropic client for override key: {e}"
                 log.error(error_msg)
                 framework_latency = (time.perf_counter() - framework_start) * 1000
                 return CompletionResponse(
@@ -138,10 +153,12 @@ class ClaudeProvider(LLMProvider):
 
         # End framework preprocessing timing
         api_call_start = time.perf_counter()
+        rate_limit_headers = None
+        raw_exception = None
 
         try:
             # 🚨 EXTERNAL API CALL - This time should NOT count as framework overhead
-            response = await client_to_use.messages.create(
+            raw = await client_to_use.messages.with_raw_response.create(
                 model=model_to_use,
                 system=system_prompt,
                 messages=user_assistant_messages,
@@ -152,6 +169,9 @@ class ClaudeProvider(LLMProvider):
 
             # End external API timing, start framework post-processing
             api_call_end = time.perf_counter()
+            # Rate limit headers come with every response, not only with errors.
+            rate_limit_headers = dict(raw.headers)
+            response = raw.parse()
 
             # Framework processing: response validation and formatting
             if (
@@ -171,12 +191,19 @@ class ClaudeProvider(LLMProvider):
                     latency_ms=framework_latency,
                     error_message="Anthropic response was successful but contained no valid content.",
                     raw_response=response.model_dump(),
+                    metadata={
+                        "provider_name": self.get_provider_name(),
+                        "rate_limit_headers": rate_limit_headers,
+                    },
                 )
 
             # Framework processing: extract data
             content = response.content[0].text
             usage = _extract_anthropic_usage(response)
-            metadata = {"provider_name": self.get_provider_name()}
+            metadata = {
+                "provider_name": self.get_provider_name(),
+                "rate_limit_headers": rate_limit_headers,
+            }
 
             # End framework processing
             framework_end = time.perf_counter()
@@ -199,6 +226,10 @@ class ClaudeProvider(LLMProvider):
 
         except anthropic.APIError as e:
             api_call_end = time.perf_counter()
+            raw_exception = e
+            response_headers = getattr(getattr(e, "response", None), "headers", None)
+            if response_headers:
+                rate_limit_headers = dict(response_headers)
             error_body = getattr(e, "body", {})
             error_details = (
                 error_body.get("error", {}) if isinstance(error_body, dict) else {}
@@ -216,6 +247,7 @@ class ClaudeProvider(LLMProvider):
             error_msg = f"Anthropic API Error ({error_type}): {error_message}"
         except Exception as e:
             api_call_end = time.perf_counter()
+            raw_exception = e
             error_msg = f"An unexpected error occurred with Anthropic: {str(e)}"
             log.exception("Unexpected Anthropic Error")
 
@@ -235,4 +267,60 @@ class ClaudeProvider(LLMProvider):
             latency_ms=framework_latency,
             error_message=error_msg,
             raw_response=None,
+            metadata={
+                "provider_name": self.get_provider_name(),
+                "rate_limit_headers": rate_limit_headers,
+                # Lets the engine classify the failure and read Retry-After.
+                "raw_exception": raw_exception,
+            },
+        )
+
+    def _client_for_key(self, api_key_override: Optional[str]) -> AsyncAnthropic:
+        if api_key_override and api_key_override != self.primary_key:
+            return self.client_cache.get_client(
+                self.get_provider_name(), api_key_override, self._build_client
+            )
+        return self.client
+
+    async def astream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        api_key_override: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        if os.getenv("PERFORMANCE_TEST_MODE", "False").lower() == "true":
+            async for chunk in super().astream_completion(
+                messages, temperature, max_tokens, api_key_override, **kwargs
+            ):
+                yield chunk
+            return
+
+        model_to_use = kwargs.get("model", self.default_model)
+        client_to_use = self._client_for_key(api_key_override)
+        system_prompt, user_assistant_messages = self._prepare_provider_messages(
+            messages
+        )
+        if not user_assistant_messages:
+            raise ValueError(
+                "Cannot make a provider call with no user/assistant messages."
+            )
+
+        async with client_to_use.messages.stream(
+            model=model_to_use,
+            system=system_prompt,
+            messages=user_assistant_messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs.get("provider_specific_params", {}),
+        ) as stream:
+            async for text in stream.text_stream:
+                if text:
+                    yield CompletionChunk(delta=text, model_used=model_to_use)
+            final_message = await stream.get_final_message()
+        yield CompletionChunk(
+            model_used=final_message.model or model_to_use,
+            finish_reason=final_message.stop_reason,
+            usage=_extract_anthropic_usage(final_message),
         )
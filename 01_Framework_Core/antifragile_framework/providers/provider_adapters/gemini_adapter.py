@@ -6,15 +6,22 @@ import os
 import random
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import google.generativeai as genai
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
     LLMProvider,
     TokenUsage,
 )
+from antifragile_framework.providers.client_cache import (
+    SDKClientCache,
+    get_default_client_cache,
+)
+from google.ai import generativelanguage as glm
+from google.api_core import client_options as client_options_lib
 from google.api_core import exceptions as google_exceptions
 
 log = logging.getLogger(__name__)
@@ -43,8 +50,96 @@ class GeminiProvider(LLMProvider):
             raise ValueError(
                 "Google Gemini 'api_key' not found in the provider configuration."
             )
+        self.client_cache: SDKClientCache = self.config.get("client_cache")
+        if self.client_cache is None:
+            self.client_cache = get_default_client_cache()
+        # Fraction of calls whose timing breakdown is logged at DEBUG level.
+        self.timing_log_sample_rate = float(
+            self.config.get("timing_log_sample_rate", 0.01)
+        )
         log.info("GeminiProvider initialized.")
 
+    @staticmethod
+    def _build_client(
+        api_key: str, http_client: Any
+    ) -> glm.GenerativeServiceAsyncClient:
+        """
+        Builds an async Generative Language client bound to one API key, so
+        calls never touch the SDK's process-global genai.configure() state.
+        The gRPC client manages its own channel, so the cache passes no
+        shared HTTP transport (`http_client` is None).
+        """
+        return glm.GenerativeServiceAsyncClient(
+            client_options=client_options_lib.ClientOptions(api_key=api_key)
+        )
+
+    @staticmethod
+    async def _close_client(client: glm.GenerativeServiceAsyncClient):
+        """Closes the client's gRPC channel when the cache drops it."""
+        await client.transport.close()
+
+    def _get_client(self, api_key: str) -> glm.GenerativeServiceAsyncClient:
+        return self.client_cache.get_client(
+            self.get_provider_name(),
+            api_key,
+            self._build_client,
+            closer=self._close_client,
+            use_http_client=False,
+        )
+
+    @staticmethod
+    def _build_request(
+        model_name: str,
+        system_instruction: Optional[str],
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+    ) -> glm.GenerateContentRequest:
+        """
+        Builds the request genai.GenerativeModel would send, so calls go
+        straight to the per-key client instead of through a model object.
+        """
+        if "/" not in model_name:
+            model_name = f"models/{model_name}"
+        return glm.GenerateContentRequest(
+            model=model_name,
+            contents=[
+                glm.Content(
+                    role="model" if msg["role"] == "assistant" else msg["role"],
+                    parts=[glm.Part(text=msg["content"])],
+                )
+                for msg in messages
+            ],
+            generation_config=glm.GenerationConfig(
+                max_output_tokens=max_tokens, temperature=temperature
+            ),
+            system_instruction=(
+                glm.Content(parts=[glm.Part(text=system_instruction)])
+                if system_instruction
+                else None
+            ),
+        )
+
+    def _log_sampled_timing(
+        self,
+        model_name: str,
+        outcome: str,
+        framework_start: float,
+        api_call_start: float,
+        api_call_end: float,
+        framework_end: float,
+    ):
+        if not log.isEnabledFor(logging.DEBUG):
+            return
+        if random.random() >= self.timing_log_sample_rate:
+            return
+        log.debug(
+            f"Gemini call timing: model={model_name} outcome={outcome} "
+            f"preprocessing_ms={(api_call_start - framework_start) * 1000:.2f} "
+            f"api_call_ms={(api_call_end - api_call_start) * 1000:.2f} "
+            f"postprocessing_ms={(framework_end - api_call_end) * 1000:.2f}"
+        )
+
     def get_provider_name(self) -> str:
         return "google_gemini"
 
@@ -87,10 +182,9 @@ class GeminiProvider(LLMProvider):
         api_key_override: Optional[str] = None,
         **kwargs: Any,
     ) -> CompletionResponse:
-        print("🔥 ADAPTER CALLED! This proves the Gemini adapter is being used!")
         # Start timing framework processing
         framework_start = time.perf_counter()
-        print(f"🐛 DEBUG: framework_start = {framework_start}")
+        api_call_start = api_call_end = framework_start
 
         model_to_use = kwargs.get("model", self.default_model)
 
@@ -104,9 +198,6 @@ class GeminiProvider(LLMProvider):
 
         # Framework processing: message preparation
         try:
-            # Per-call configuration is safer for Gemini
-            genai.configure(api_key=api_key_to_use)
-
             system_instruction, user_assistant_messages_raw = (
                 self._prepare_provider_messages(messages)
             )
@@ -118,45 +209,26 @@ class GeminiProvider(LLMProvider):
                     error_message="Cannot make a provider call with no user/assistant messages.",
                 )
 
-            # Framework processing: format messages for Gemini
-            formatted_messages = []
-            for msg in user_assistant_messages_raw:
-                role = "model" if msg["role"] == "assistant" else msg["role"]
-                formatted_messages.append({"role": role, "parts": [msg["content"]]})
-
-            # Framework processing: setup model and config
-            model = genai.GenerativeModel(
-                model_name=model_to_use,
-                system_instruction=system_instruction or None,
-            )
-            generation_config = genai.types.GenerationConfig(
-                max_output_tokens=max_tokens, temperature=temperature
+            # Framework processing: build the request for the cached per-key client
+            client = self._get_client(api_key_to_use)
+            request = self._build_request(
+                model_to_use,
+                system_instruction,
+                user_assistant_messages_raw,
+                max_tokens,
+                temperature,
             )
 
             # End framework preprocessing timing
             api_call_start = time.perf_counter()
-            print(f"🐛 DEBUG: api_call_start = {api_call_start}")
-            preprocessing_time = (api_call_start - framework_start) * 1000
-            print(f"🐛 DEBUG: preprocessing_time = {preprocessing_time:.2f}ms")
-            print(f"🐛 DEBUG: api_call_start = {api_call_start}")
-            print(
-                f"🐛 DEBUG: preprocessing = {(api_call_start - framework_start) * 1000:.2f}ms"
-            )
 
             # 🚨 EXTERNAL API CALL - This time should NOT count as framework overhead
-            response = await model.generate_content_async(
-                formatted_messages, generation_config=generation_config
+            response = genai.types.AsyncGenerateContentResponse.from_response(
+                await client.generate_content(request)
             )
 
             # End external API timing, start framework post-processing
             api_call_end = time.perf_counter()
-            api_call_time = (api_call_end - api_call_start) * 1000
-            print(f"🐛 DEBUG: api_call_end = {api_call_end}")
-            print(f"🐛 DEBUG: api_call_time = {api_call_time:.2f}ms")
-            print(f"🐛 DEBUG: api_call_end = {api_call_end}")
-            print(
-                f"🐛 DEBUG: api_call_time = {(api_call_end - api_call_start) * 1000:.2f}ms"
-            )
 
             # Framework processing: response validation
             if (
@@ -168,15 +240,14 @@ class GeminiProvider(LLMProvider):
                 framework_latency = (
                     (api_call_start - framework_start) + (framework_end - api_call_end)
                 ) * 1000
-                print(f"🐛 DEBUG: framework_latency = {framework_latency:.2f}ms")
-                print("🐛 DEBUG: BREAKDOWN:")
-                print(
-                    f"🐛 DEBUG:   (api_call_start - framework_start) = {(api_call_start - framework_start) * 1000:.2f}ms"
-                )
-                print(
-                    f"🐛 DEBUG:   (framework_end - api_call_end) = {(framework_end - api_call_end) * 1000:.2f}ms"
+                self._log_sampled_timing(
+                    model_to_use,
+                    "empty",
+                    framework_start,
+                    api_call_start,
+                    api_call_end,
+                    framework_end,
                 )
-                print(f"🐛 DEBUG:   SUM = {framework_latency:.2f}ms")
                 finish_reason = (
                     response.candidates[0].finish_reason.name
                     if response.candidates
@@ -212,17 +283,14 @@ class GeminiProvider(LLMProvider):
             framework_latency = (
                 (api_call_start - framework_start) + (framework_end - api_call_end)
             ) * 1000
-
-            print(f"🐛 DEBUG: framework_end = {framework_end}")
-            print(f"🐛 DEBUG: framework_latency = {framework_latency:.2f}ms")
-            print("🐛 DEBUG: BREAKDOWN:")
-            print(
-                f"🐛 DEBUG:   preprocessing = {(api_call_start - framework_start) * 1000:.2f}ms"
-            )
-            print(
-                f"🐛 DEBUG:   postprocessing = {(framework_end - api_call_end) * 1000:.2f}ms"
+            self._log_sampled_timing(
+                model_to_use,
+                "success",
+                framework_start,
+                api_call_start,
+                api_call_end,
+                framework_end,
             )
-            print(f"🐛 DEBUG:   SUM = {framework_latency:.2f}ms")
 
             return CompletionResponse(
                 success=True,
@@ -236,21 +304,15 @@ class GeminiProvider(LLMProvider):
 
         except google_exceptions.PermissionDenied as e:
             api_call_end = time.perf_counter()
-            api_call_time = (api_call_end - api_call_start) * 1000
-            print(f"🐛 DEBUG: api_call_end = {api_call_end}")
-            print(f"🐛 DEBUG: api_call_time = {api_call_time:.2f}ms")
+            raw_exception = e
             error_msg = f"Google Gemini API Error: Your API key is invalid. Details: {getattr(e, 'message', str(e))}"
         except google_exceptions.GoogleAPICallError as e:
             api_call_end = time.perf_counter()
-            api_call_time = (api_call_end - api_call_start) * 1000
-            print(f"🐛 DEBUG: api_call_end = {api_call_end}")
-            print(f"🐛 DEBUG: api_call_time = {api_call_time:.2f}ms")
+            raw_exception = e
             error_msg = f"Google Gemini API Error: {getattr(e, 'message', str(e))}"
         except Exception as e:
             api_call_end = time.perf_counter()
-            api_call_time = (api_call_end - api_call_start) * 1000
-            print(f"🐛 DEBUG: api_call_end = {api_call_end}")
-            print(f"🐛 DEBUG: api_call_time = {api_call_time:.2f}ms")
+            raw_exception = e
             error_msg = f"An unexpected error occurred with Google Gemini: {str(e)}"
             log.exception("Unexpected Google Gemini Error")
 
@@ -259,6 +321,14 @@ class GeminiProvider(LLMProvider):
         framework_latency = (
             (api_call_start - framework_start) + (framework_end - api_call_end)
         ) * 1000
+        self._log_sampled_timing(
+            model_to_use,
+            "error",
+            framework_start,
+            api_call_start,
+            api_call_end,
+            framework_end,
+        )
 
         log.error(
             f"Failed Google Gemini call for model {model_to_use}. Reason: {error_msg}"
@@ -269,4 +339,58 @@ class GeminiProvider(LLMProvider):
             model_used=model_to_use,
             latency_ms=framework_latency,
             error_message=error_msg,
+            metadata={
+                "provider_name": self.get_provider_name(),
+                # Lets the engine classify the failure and read Retry-After.
+                "raw_exception": raw_exception,
+            },
+        )
+
+    async def astream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        api_key_override: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        if os.getenv("PERFORMANCE_TEST_MODE", "False").lower() == "true":
+            async for chunk in super().astream_completion(
+                messages, temperature, max_tokens, api_key_override, **kwargs
+            ):
+                yield chunk
+            return
+
+        model_to_use = kwargs.get("model", self.default_model)
+        api_key_to_use = api_key_override or self.primary_api_key
+        system_instruction, user_assistant_messages_raw = (
+            self._prepare_provider_messages(messages)
+        )
+        if not user_assistant_messages_raw:
+            raise ValueError(
+                "Cannot make a provider call with no user/assistant messages."
+            )
+        client = self._get_client(api_key_to_use)
+        request = self._build_request(
+            model_to_use,
+            system_instruction,
+            user_assistant_messages_raw,
+            max_tokens,
+            temperature,
+        )
+        response = await genai.types.AsyncGenerateContentResponse.from_aiterator(
+            await client.stream_generate_content(request)
+        )
+        async for chunk in response:
+            text = chunk.text if chunk.parts else ""
+            if text:
+                yield CompletionChunk(delta=text, model_used=model_to_use)
+
+        finish_reason = (
+            response.candidates[0].finish_reason.name if response.candidates else None
+        )
+        yield CompletionChunk(
+            model_used=model_to_use,
+            finish_reason=finish_reason,
+            usage=_extract_gemini_usage(response),
         )
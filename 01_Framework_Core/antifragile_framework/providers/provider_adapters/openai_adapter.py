@@ -6,15 +6,20 @@ import os
 import random
 import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import openai
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
     LLMProvider,
     TokenUsage,
 )
+from antifragile_framework.providers.client_cache import (
+    SDKClientCache,
+    get_default_client_cache,
+)
 from openai import AsyncOpenAI
 
 log = logging.getLogger(__name__)
@@ -39,6 +44,9 @@ class OpenAIProvider(LLMProvider):
         self.default_model = self.config.get("default_model", "gpt-4-turbo")
         self.primary_key = self.config.get("api_key")
         self.max_retries = self.config.get("max_retries", 2)
+        self.client_cache: SDKClientCache = self.config.get("client_cache")
+        if self.client_cache is None:
+            self.client_cache = get_default_client_cache()
         try:
             self.client = AsyncOpenAI(
                 api_key=self.primary_key, max_retries=self.max_retries
@@ -50,6 +58,12 @@ class OpenAIProvider(LLMProvider):
             log.error(f"Failed to initialize OpenAI client: {e}")
             raise
 
+    def _build_client(self, api_key: str, http_client: Any) -> AsyncOpenAI:
+        """Builds a client for an override key on the cache's shared transport."""
+        return AsyncOpenAI(
+            api_key=api_key, max_retries=self.max_retries, http_client=http_client
+        )
+
     def get_provider_name(self) -> str:
         return "openai"
 
@@ -104,12 +118,13 @@ class OpenAIProvider(LLMProvider):
         usage = None
         if api_key_override and api_key_override != self.primary_key:
             try:
-                client_to_use = AsyncOpenAI(
-                    api_key=api_key_override, max_retries=self.max_retries
+                client_to_use = self.client_cache.get_client(
+                    self.get_provider_name(),
+                    api_key_override,
+                    self._build_client,
                 )
-                log.debug("Created temporary OpenAI client for key override.")
             except Exception as e:
-                error_msg = f"Failed to initialize temporary OpenAI client with override key: {e}"
+                error_msg = f"Failed to initialize OpenAI client for override key: {e}"
                 log.error(error_msg)
                 framework_latency = (time.perf_counter() - framework_start) * 1000
                 return CompletionResponse(
@@ -140,10 +155,12 @@ class OpenAIProvider(LLMProvider):
 
         # End framework preprocessing timing
         api_call_start = time.perf_counter()
+        rate_limit_headers = None
+        raw_exception = None
 
         try:
             # 🚨 EXTERNAL API CALL - This time should NOT count as framework overhead
-            response = await client_to_use.chat.completions.create(
+            raw = await client_to_use.chat.completions.with_raw_response.create(
                 model=model_to_use,
                 messages=user_assistant_messages,
                 temperature=temperature,
@@ -153,6 +170,9 @@ class OpenAIProvider(LLMProvider):
 
             # End external API timing, start framework post-processing
             api_call_end = time.perf_counter()
+            # Rate limit headers come with every response, not only with errors.
+            rate_limit_headers = dict(raw.headers)
+            response = raw.parse()
 
             # Framework processing: response validation and formatting
             if (
@@ -171,12 +191,19 @@ class OpenAIProvider(LLMProvider):
                     latency_ms=framework_latency,
                     error_message="OpenAI response was successful but contained no valid choices or content.",
                     raw_response=response.model_dump(),
+                    metadata={
+                        "provider_name": self.get_provider_name(),
+                        "rate_limit_headers": rate_limit_headers,
+                    },
                 )
 
             # Framework processing: extract data
             content = response.choices[0].message.content
             usage = _extract_openai_usage(response)
-            metadata = {"provider_name": self.get_provider_name()}
+            metadata = {
+                "provider_name": self.get_provider_name(),
+                "rate_limit_headers": rate_limit_headers,
+            }
 
             # End framework processing
             framework_end = time.perf_counter()
@@ -199,6 +226,10 @@ class OpenAIProvider(LLMProvider):
 
         except openai.APIError as e:
             api_call_end = time.perf_counter()
+            raw_exception = e
+            response_headers = getattr(getattr(e, "response", None), "headers", None)
+            if response_headers:
+                rate_limit_headers = dict(response_headers)
             error_msg = f"OpenAI API Error: {getattr(e, 'message', str(e))}"
             if hasattr(e, "body") and isinstance(e.body, dict):
                 error_details = e.body.get("error", {})
@@ -206,6 +237,7 @@ class OpenAIProvider(LLMProvider):
                     error_msg += f" (Type: {error_details.get('type')}, Code: {error_details.get('code')})"
         except Exception as e:
             api_call_end = time.perf_counter()
+            raw_exception = e
             error_msg = f"An unexpected error occurred with OpenAI: {str(e)}"
             log.exception("Unexpected OpenAI Error")
 
@@ -222,4 +254,74 @@ class OpenAIProvider(LLMProvider):
             model_used=model_to_use,
             latency_ms=framework_latency,
             error_message=error_msg,
+            metadata={
+                "provider_name": self.get_provider_name(),
+                "rate_limit_headers": rate_limit_headers,
+                # Lets the engine classify the failure and read Retry-After.
+                "raw_exception": raw_exception,
+            },
+        )
+
+    def _client_for_key(self, api_key_override: Optional[str]) -> AsyncOpenAI:
+        if api_key_override and api_key_override != self.primary_key:
+            return self.client_cache.get_client(
+                self.get_provider_name(), api_key_override, self._build_client
+            )
+        return self.client
+
+    async def astream_completion(
+        self,
+        messages: List[ChatMessage],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        api_key_override: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[CompletionChunk]:
+        if os.getenv("PERFORMANCE_TEST_MODE", "False").lower() == "true":
+            async for chunk in super().astream_completion(
+                messages, temperature, max_tokens, api_key_override, **kwargs
+            ):
+                yield chunk
+            return
+
+        model_to_use = kwargs.get("model", self.default_model)
+        client_to_use = self._client_for_key(api_key_override)
+        system_prompt, user_assistant_messages = self._prepare_provider_messages(
+            messages
         )
+        if system_prompt:
+            user_assistant_messages.insert(
+                0, {"role": "system", "content": system_prompt}
+            )
+        if not user_assistant_messages:
+            raise ValueError(
+                "Input 'messages' list is empty after processing system prompt."
+            )
+
+        stream = await client_to_use.chat.completions.create(
+            model=model_to_use,
+            messages=user_assistant_messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs.get("provider_specific_params", {}),
+        )
+        async for event in stream:
+            usage = _extract_openai_usage(event)
+            if event.choices:
+                choice = event.choices[0]
+                delta = choice.delta.content if choice.delta else None
+                if not delta and not choice.finish_reason and not usage:
+                    continue
+                yield CompletionChunk(
+                    delta=delta or "",
+                    model_used=event.model or model_to_use,
+                    finish_reason=choice.finish_reason,
+                    usage=usage,
+                )
+            elif usage:
+                # With include_usage, the final event carries usage and no choices.
+                yield CompletionChunk(
+                    model_used=event.model or model_to_use, usage=usage
+                )
@@ -6,7 +6,7 @@ import json
 import logging
 import uuid
 from datetime import datetime, timezone
-from decimal import ROUND_HALF_UP, Decimal
+from decimal import Decimal
 from typing import Any, Dict, List, Optional
 import sys
 from pathlib import Path
@@ -41,6 +41,9 @@ except ImportError as e:
         def log_event(self, *args, **kwargs):
             pass
 
+        def is_enabled_for(self, *args, **kwargs):
+            return False
+
         def log(self, *args, **kwargs):
             pass
 
@@ -62,11 +65,13 @@ except ImportError as e:
 
 
     UniversalEventSchema = MockEventSchema
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 # Continue with your other imports (config, provider schemas, etc.)
+from antifragile_framework.config.cost_estimator import CostEstimator
 from antifragile_framework.config.schemas import ProviderProfiles
 from antifragile_framework.core.schemas import RequestContext
 from antifragile_framework.providers.api_abstraction_layer import CompletionResponse
+from antifragile_framework.resilience.ledger_sink import LedgerSink
 
 log = logging.getLogger(__name__)
 
@@ -145,6 +150,25 @@ class BiasLedgerEntry(BaseModel):
         None,
         description="Score from 1.0 (perfect) down to 0.0 (total failure).",
     )
+    hedges_launched: int = Field(
+        0,
+        description="Number of speculative parallel legs fired for this request (hedging mode).",
+    )
+    winning_leg_index: Optional[int] = Field(
+        None,
+        description="Index of the hedged leg that produced the final response (0 = primary).",
+    )
+    streamed: bool = Field(
+        False, description="True if the response was streamed to the caller."
+    )
+    ttft_ms: Optional[float] = Field(
+        None,
+        description="Time to first token in milliseconds (streamed requests only).",
+    )
+    tokens_per_second: Optional[float] = Field(
+        None,
+        description="Output tokens per second after the first token (streamed requests only).",
+    )
 
     # NEW: Decision Context and Failover Reasons
     preferred_provider_requested: Optional[str] = Field(
@@ -179,9 +203,25 @@ class BiasLedgerEntry(BaseModel):
         None, description="Estimated cost of the successful call in USD."
     )
 
+    # Encoded once on first use and shared by every consumer of the entry.
+    _encoded: Optional[bytes] = PrivateAttr(default=None)
+    _payload: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
     class Config:
         json_encoders = {Decimal: lambda v: str(v)}  # Serialize Decimal to string
 
+    def to_json_bytes(self) -> bytes:
+        """The entry's JSON encoding. Entries must not be mutated after this."""
+        if self._encoded is None:
+            self._encoded = self.model_dump_json().encode("utf-8")
+        return self._encoded
+
+    def to_payload(self) -> Dict[str, Any]:
+        """A JSON-compatible dict view shared across subscribers; treat as read-only."""
+        if self._payload is None:
+            self._payload = json.loads(self.to_json_bytes())
+        return self._payload
+
 
 class BiasLedger:
     def __init__(
@@ -190,54 +230,38 @@ class BiasLedger:
         provider_profiles: Optional[ProviderProfiles] = None,
         prompt_preview_len: int = 512,
         response_preview_len: int = 1024,
+        ledger_sink: Optional[LedgerSink] = None,
+        cost_estimator: Optional[CostEstimator] = None,
     ):
         self.event_bus = event_bus
-        self.provider_profiles = provider_profiles
+        self.ledger_sink = ledger_sink
+        self.cost_estimator = cost_estimator or CostEstimator()
+        if provider_profiles is not None or cost_estimator is None:
+            self.cost_estimator.reload(provider_profiles)
         self.logger = core_logger
         self.prompt_preview_len = prompt_preview_len
         self.response_preview_len = response_preview_len
 
+    @property
+    def provider_profiles(self) -> Optional[ProviderProfiles]:
+        return self.cost_estimator.provider_profiles
+
+    @provider_profiles.setter
+    def provider_profiles(self, provider_profiles: Optional[ProviderProfiles]):
+        self.cost_estimator.reload(provider_profiles)
+
     def _calculate_estimated_cost(
         self, provider: str, model: str, in_tokens: int, out_tokens: int
     ) -> Optional[Decimal]:
         """Calculates the estimated cost with precision, handling missing profiles."""
-        if not self.provider_profiles:
+        if not self.cost_estimator.is_loaded:
             return None
-
-        try:
-            provider_data = self.provider_profiles.profiles.get(provider, {})
-            cost_profile: Optional[CostProfile] = provider_data.get(model)
-
-            if not cost_profile:
-                cost_profile = provider_data.get("_default")
-                if cost_profile:
-                    log.warning(
-                        f"Cost profile for '{provider}/{model}' not found. Using provider default."
-                    )
-                else:
-                    log.warning(
-                        f"No cost profile or default found for provider '{provider}'. Cannot calculate cost."
-                    )
-                    return None
-
-            input_cost = (Decimal(in_tokens) * cost_profile.input_cpm) / Decimal(
-                "1000000"
-            )
-            output_cost = (Decimal(out_tokens) * cost_profile.output_cpm) / Decimal(
-                "1000000"
-            )
-
-            total_cost = (input_cost + output_cost).quantize(
-                Decimal("0.000001"), rounding=ROUND_HALF_UP
+        cost = self.cost_estimator.estimate_usd(provider, model, in_tokens, out_tokens)
+        if cost is None:
+            log.warning(
+                f"No cost profile or default found for '{provider}/{model}'. Cannot calculate cost."
             )
-            return total_cost
-
-        except Exception as e:
-            log.error(
-                f"Error calculating cost for {provider}/{model}: {e}",
-                exc_info=True,
-            )
-            return None
+        return cost
 
     def log_request_lifecycle(
         self,
@@ -320,7 +344,9 @@ class BiasLedger:
                 total_api_calls=context.api_call_count,
                 final_provider=final_provider,
                 final_model=final_model,
-                resilience_events=context.lifecycle_events or [],
+                resilience_events=[
+                    dict(event) for event in context.lifecycle_events or []
+                ],
                 mitigation_attempted=context.mitigation_attempted,
                 mitigation_succeeded=(
                     (outcome == "MITIGATED_SUCCESS")
@@ -328,6 +354,11 @@ class BiasLedger:
                     else None
                 ),
                 resilience_score=resilience_score,
+                hedges_launched=context.hedges_launched,
+                winning_leg_index=context.winning_leg_index,
+                streamed=context.streamed,
+                ttft_ms=context.ttft_ms,
+                tokens_per_second=context.tokens_per_second,
                 # NEW FIELDS FOR DECISION CONTEXT
                 preferred_provider_requested=context.preferred_provider,  # Pulled from RequestContext
                 initial_selection_mode=initial_selection_mode,
@@ -341,19 +372,27 @@ class BiasLedger:
                 schema_version=4,  # UPDATED SCHEMA VERSION
             )
 
+            if self.ledger_sink:
+                try:
+                    self.ledger_sink.append(entry.to_json_bytes())
+                except Exception as e:
+                    log.error(
+                        f"Failed to append ledger entry {entry.request_id} to sink: {e}"
+                    )
+
             if self.event_bus:
-                payload = json.loads(
-                    entry.model_dump_json()
-                )  # Use model_dump_json for Decimal serialization
-                event_schema = UniversalEventSchema(
-                    event_type=event_topics.BIAS_LOG_ENTRY_CREATED,
-                    event_topic="bias.ledger",
-                    event_source=self.__class__.__name__,
-                    timestamp_utc=entry.timestamp_utc,
-                    severity="INFO",
-                    payload=payload,
-                )
-                self.logger.log(event_schema)
+                payload = entry.to_payload()
+                if self.logger.is_enabled_for("INFO"):
+                    self.logger.log(
+                        UniversalEventSchema(
+                            event_type=event_topics.BIAS_LOG_ENTRY_CREATED,
+                            event_topic="bias.ledger",
+                            event_source=self.__class__.__name__,
+                            timestamp_utc=entry.timestamp_utc,
+                            severity="INFO",
+                            payload=payload,
+                        )
+                    )
                 self.event_bus.publish(
                     event_type=event_topics.BIAS_LOG_ENTRY_CREATED,
                     payload=payload,
@@ -0,0 +1,256 @@
+# antifragile_framework/resilience/ledger_sink.py
+
+import io
+import logging
+import os
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+# zstd compression is optional; plain segments work without it.
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_LENGTH_PREFIXED = "length_prefixed"
+SEGMENT_FORMATS = (FORMAT_NDJSON, FORMAT_LENGTH_PREFIXED)
+
+_SEGMENT_SUFFIXES = {FORMAT_NDJSON: ".ndjson", FORMAT_LENGTH_PREFIXED: ".lpj"}
+_LENGTH_PREFIX = struct.Struct(">I")
+
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_BUFFERED_ENTRIES = 256
+DEFAULT_FLUSH_INTERVAL_SECONDS = 1.0
+# Past this many times max_buffered_entries, append() writes the buffer
+# itself, so a stalled disk slows callers instead of growing memory unbounded.
+MAX_BUFFERED_COMMITS = 8
+
+
+class LedgerSink:
+    """
+    A durable, append-only sink for encoded BiasLedger entries.
+
+    Entries are buffered in memory by append(), which does no I/O. A
+    background flusher thread, started on the first append, writes them as
+    group commits of up to `max_buffered_entries` once the buffer is full or
+    `flush_interval_seconds` after the first buffered entry, so an idle sink
+    holds entries no longer than the interval; flush() and close() write
+    synchronously. Segments rotate once they reach `segment_max_bytes`. With
+    zstd compression each group commit is written as an independent frame,
+    so a segment stays readable up to its last complete commit even after a
+    crash.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        segment_format: str = FORMAT_NDJSON,
+        compression: Optional[str] = None,
+        segment_max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        max_buffered_entries: int = DEFAULT_MAX_BUFFERED_ENTRIES,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        fsync: bool = False,
+        file_prefix: str = "bias_ledger",
+    ):
+        if segment_format not in SEGMENT_FORMATS:
+            raise ValueError(
+                f"Unknown ledger segment format '{segment_format}'. "
+                f"Expected one of {SEGMENT_FORMATS}."
+            )
+        if compression not in (None, "zstd"):
+            raise ValueError(f"Unsupported ledger compression '{compression}'.")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            raise ValueError(
+                "zstd ledger compression requires the 'zstandard' package."
+            )
+        if segment_max_bytes <= 0 or max_buffered_entries <= 0:
+            raise ValueError(
+                "Ledger 'segment_max_bytes' and 'max_buffered_entries' must be positive."
+            )
+        if flush_interval_seconds < 0:
+            raise ValueError("Ledger 'flush_interval_seconds' must be non-negative.")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_format = segment_format
+        self.compression = compression
+        self.segment_max_bytes = segment_max_bytes
+        self.max_buffered_entries = max_buffered_entries
+        self.flush_interval_seconds = flush_interval_seconds
+        self.fsync = fsync
+        self.file_prefix = file_prefix
+
+        self._compressor = (
+            zstandard.ZstdCompressor() if compression == "zstd" else None
+        )
+        self._buffer: List[bytes] = []
+        # Guards the buffer; _write_lock serializes writes, so commits land
+        # in append order.
+        self._lock = threading.Lock()
+        self._buffer_ready = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._file: Optional[io.BufferedWriter] = None
+        self._segment_path: Optional[Path] = None
+        self._segment_bytes = 0
+        self._segment_seq = 0
+        self._closed = False
+
+    @property
+    def current_segment(self) -> Optional[Path]:
+        return self._segment_path
+
+    def append(self, encoded_entry: bytes):
+        """Buffers one encoded entry for the flusher thread."""
+        with self._lock:
+            if self._closed:
+                raise ValueError("Cannot append to a closed LedgerSink.")
+            self._buffer.append(encoded_entry)
+            buffered = len(self._buffer)
+            if buffered == 1 or buffered >= self.max_buffered_entries:
+                self._buffer_ready.notify()
+            # A forked child inherits the flusher object but not its thread.
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="ledger-sink-flusher", daemon=True
+                )
+                self._flusher.start()
+        if buffered >= self.max_buffered_entries * MAX_BUFFERED_COMMITS:
+            self.flush()
+
+    def flush(self):
+        """Writes all buffered entries to the current segment."""
+        with self._write_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            self._write_entries(entries)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._buffer_ready.notify()
+            flusher = self._flusher
+        if flusher is not None:
+            flusher.join()
+        with self._write_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            self._write_entries(entries)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _commit_due(self, first_buffered_at: Optional[float]) -> bool:
+        if self._closed or len(self._buffer) >= self.max_buffered_entries:
+            return True
+        return (
+            first_buffered_at is not None
+            and time.monotonic() - first_buffered_at >= self.flush_interval_seconds
+        )
+
+    def _run_flusher(self):
+        first_buffered_at: Optional[float] = None
+        while True:
+            with self._lock:
+                while not self._commit_due(first_buffered_at):
+                    if not self._buffer:
+                        first_buffered_at = None
+                        self._buffer_ready.wait()
+                        continue
+                    if first_buffered_at is None:
+                        first_buffered_at = time.monotonic()
+                    remaining = self.flush_interval_seconds - (
+                        time.monotonic() - first_buffered_at
+                    )
+                    if remaining > 0:
+                        self._buffer_ready.wait(remaining)
+                if self._closed:
+                    return
+            first_buffered_at = None
+            try:
+                self.flush()
+            except Exception as e:
+                log.error(f"Failed to write ledger entries: {e}", exc_info=True)
+
+    def _frame(self, entries: List[bytes]) -> bytes:
+        if self.segment_format == FORMAT_NDJSON:
+            data = b"\n".join(entries) + b"\n"
+        else:
+            data = b"".join(
+                _LENGTH_PREFIX.pack(len(entry)) + entry for entry in entries
+            )
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        return data
+
+    def _open_segment(self):
+        self._segment_seq += 1
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        suffix = _SEGMENT_SUFFIXES[self.segment_format]
+        if self.compression == "zstd":
+            suffix += ".zst"
+        self._segment_path = (
+            self.directory
+            / f"{self.file_prefix}-{stamp}-{os.getpid()}-{self._segment_seq:06d}{suffix}"
+        )
+        self._file = open(self._segment_path, "ab")
+        self._segment_bytes = 0
+        log.info(f"Opened ledger segment {self._segment_path.name}.")
+
+    def _write_entries(self, entries: List[bytes]):
+        """Writes entries in commits of max_buffered_entries. Hold _write_lock."""
+        for start in range(0, len(entries), self.max_buffered_entries):
+            data = self._frame(entries[start : start + self.max_buffered_entries])
+
+            if self._file is None or self._segment_bytes >= self.segment_max_bytes:
+                if self._file is not None:
+                    self._file.close()
+                self._open_segment()
+
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._segment_bytes += len(data)
+
+
+def read_segment(path: Union[str, Path]) -> Iterator[bytes]:
+    """Yields the encoded entries stored in a segment written by LedgerSink."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.suffix == ".zst":
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Reading zstd segments requires the 'zstandard' package.")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            io.BytesIO(data), read_across_frames=True
+        )
+        data = reader.readall()
+        path = path.with_suffix("")
+
+    if path.suffix == _SEGMENT_SUFFIXES[FORMAT_NDJSON]:
+        for line in data.splitlines():
+            if line:
+                yield line
+        return
+
+    offset = 0
+    while offset + _LENGTH_PREFIX.size <= len(data):
+        (length,) = _LENGTH_PREFIX.unpack_from(data, offset)
+        offset += _LENGTH_PREFIX.size
+        if offset + length > len(data):
+            log.warning(f"Truncated entry at the end of ledger segment {path.name}.")
+            return
+        yield data[offset : offset + length]
+        offset += length
@@ -1,7 +1,9 @@
 # antifragile_framework/utils/error_parser.py
 
 import logging
+import time
 from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from enum import Enum, auto
 from typing import Any, Dict, Optional
 
@@ -45,10 +47,34 @@ class ErrorDetails:
     provider: Optional[str] = None
     error_code: Optional[str] = None
     error_message: Optional[str] = None
-    retry_after_seconds: Optional[int] = None
+    retry_after_seconds: Optional[float] = None
     metadata: Optional[Dict[str, Any]] = None
 
 
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Reads a provider's retry hint from response headers: 'retry-after-ms', then
+    'retry-after' as delta-seconds or an HTTP-date. Returns None when absent or
+    unparseable.
+    """
+    if not headers:
+        return None
+    try:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            return max(0.0, float(retry_after_ms) / 1000)
+        retry_after_str = headers.get("retry-after")
+        if not retry_after_str:
+            return None
+        try:
+            return max(0.0, float(retry_after_str))
+        except ValueError:
+            retry_at = parsedate_to_datetime(retry_after_str)
+            return max(0.0, retry_at.timestamp() - time.time())
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
 class ErrorParser:
     def __init__(self):
         self._build_exception_map()
@@ -61,6 +87,32 @@ class ErrorParser:
             "model is deprecated",
             "context_length_exceeded",
         ]
+        # Matched against errors that arrive only as text, e.g. an adapter's
+        # error_message when the SDK exception is not available.
+        self.fatal_error_keywords = [
+            "invalid_api_key",
+            "incorrect api key",
+            "invalid api key",
+            "api key is invalid",
+            "authentication_error",
+            "permission_error",
+            "permission denied",
+            "unauthenticated",
+        ]
+        self.transient_error_keywords = [
+            "rate_limit",
+            "rate limit",
+            "ratelimit",
+            "resource_exhausted",
+            "resource exhausted",
+            "resource has been exhausted",
+            "quota exceeded",
+            "overloaded",
+            "timed out",
+            "timeout",
+            "service unavailable",
+            "connection error",
+        ]
 
     def _build_exception_map(self):
         self.EXCEPTION_MAP = {}
@@ -202,9 +254,18 @@ class ErrorParser:
                     error_message=error_message,
                 )
 
+        lower_message = error_message.lower()
+        if any(keyword in lower_message for keyword in self.fatal_error_keywords):
+            category = ErrorCategory.FATAL
+        elif self._is_model_error_by_message(error_message):
+            category = ErrorCategory.MODEL_ISSUE
+        elif any(keyword in lower_message for keyword in self.transient_error_keywords):
+            category = ErrorCategory.TRANSIENT
+        else:
+            category = ErrorCategory.UNKNOWN
         return ErrorDetails(
-            category=ErrorCategory.UNKNOWN,
-            is_retriable=False,
+            category=category,
+            is_retriable=(category == ErrorCategory.TRANSIENT),
             provider=provider_name,
             error_message=error_message,
         )
@@ -242,14 +303,8 @@ class ErrorParser:
             pass
         return {"error_message": str(exception)}
 
-    def _extract_retry_after(self, exception: Exception) -> Optional[int]:
-        try:
-            if hasattr(exception, "response") and hasattr(
-                exception.response, "headers"
-            ):
-                retry_after_str = exception.response.headers.get("retry-after")
-                if retry_after_str:
-                    return int(retry_after_str)
-        except (ValueError, AttributeError):
-            pass
-        return None
+    def _extract_retry_after(self, exception: Exception) -> Optional[float]:
+        """Reads the retry hint from the headers of the exception's response."""
+        return parse_retry_after(
+            getattr(getattr(exception, "response", None), "headers", None)
+        )
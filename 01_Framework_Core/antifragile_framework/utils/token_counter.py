@@ -0,0 +1,209 @@
+# antifragile_framework/utils/token_counter.py
+
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+# A local BPE tokenizer is optional; without it counts fall back to a heuristic.
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 4096
+# Chat formats wrap every message in a few role/separator tokens.
+DEFAULT_MESSAGE_OVERHEAD_TOKENS = 4
+DEFAULT_TIKTOKEN_ENCODING = "o200k_base"
+
+
+class TokenCounter:
+    """Counts the tokens in a piece of text for one provider family."""
+
+    name = "base"
+
+    def count(self, text: str) -> int:
+        raise NotImplementedError
+
+
+class HeuristicTokenCounter(TokenCounter):
+    """
+    A tokenizer-free estimate that weighs characters by class instead of using
+    a flat chars/4. Latin prose runs ~4 characters per token, but code
+    punctuation and digits split into far more tokens, and CJK ideographs and
+    kana are usually a token each. The defaults are calibrated against BPE
+    tokenizers; pass per-family rates to tune them.
+    """
+
+    name = "heuristic"
+
+    def __init__(
+        self,
+        chars_per_token: float = 4.0,
+        symbol_chars_per_token: float = 2.0,
+        cjk_chars_per_token: float = 1.0,
+        other_chars_per_token: float = 2.0,
+    ):
+        rates = (
+            chars_per_token,
+            symbol_chars_per_token,
+            cjk_chars_per_token,
+            other_chars_per_token,
+        )
+        if any(rate <= 0 for rate in rates):
+            raise ValueError("Characters-per-token rates must be positive.")
+        self.chars_per_token = chars_per_token
+        self.symbol_chars_per_token = symbol_chars_per_token
+        self.cjk_chars_per_token = cjk_chars_per_token
+        self.other_chars_per_token = other_chars_per_token
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if text.isascii():
+            symbols = sum(
+                1 for char in text if not (char.isalpha() or char.isspace())
+            )
+            plain = len(text) - symbols
+            cjk = other = 0
+        else:
+            plain = symbols = cjk = other = 0
+            for char in text:
+                if char.isascii():
+                    if char.isalpha() or char.isspace():
+                        plain += 1
+                    else:
+                        symbols += 1
+                elif _is_cjk(char):
+                    cjk += 1
+                else:
+                    other += 1
+        return math.ceil(
+            plain / self.chars_per_token
+            + symbols / self.symbol_chars_per_token
+            + cjk / self.cjk_chars_per_token
+            + other / self.other_chars_per_token
+        )
+
+
+def _is_cjk(char: str) -> bool:
+    code = ord(char)
+    return (
+        0x3040 <= code <= 0x30FF  # Hiragana, Katakana
+        or 0x3400 <= code <= 0x4DBF  # CJK Extension A
+        or 0x4E00 <= code <= 0x9FFF  # CJK Unified Ideographs
+        or 0xAC00 <= code <= 0xD7AF  # Hangul syllables
+        or 0xF900 <= code <= 0xFAFF  # CJK Compatibility Ideographs
+        or 0x20000 <= code <= 0x2FA1F  # CJK Extensions B-F
+    )
+
+
+class TiktokenTokenCounter(TokenCounter):
+    """Exact counts from a local tiktoken BPE encoding."""
+
+    name = "tiktoken"
+
+    def __init__(self, encoding_name: str = DEFAULT_TIKTOKEN_ENCODING):
+        if not TIKTOKEN_AVAILABLE:
+            raise ValueError("TiktokenTokenCounter requires the 'tiktoken' package.")
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+def build_default_counters() -> Dict[str, TokenCounter]:
+    """
+    Per-provider-family counters: OpenAI's own BPE encoding when tiktoken is
+    installed, otherwise heuristics calibrated to each family's tokenizer.
+    """
+    counters: Dict[str, TokenCounter] = {
+        "anthropic": HeuristicTokenCounter(chars_per_token=3.5),
+        "google_gemini": HeuristicTokenCounter(chars_per_token=4.0),
+    }
+    if TIKTOKEN_AVAILABLE:
+        try:
+            counters["openai"] = TiktokenTokenCounter()
+        except Exception as e:
+            log.warning(f"Could not load tiktoken encoding, using heuristic: {e}")
+    return counters
+
+
+class PromptTokenEstimator:
+    """
+    Estimates prompt tokens for a list of chat messages, choosing a
+    TokenCounter by provider family.
+
+    Per-message counts are memoized in a bounded LRU keyed by the counter and a
+    hash of the message content, so a multi-turn conversation only counts its
+    new turns and a rewritten prompt only counts the messages that changed.
+    """
+
+    def __init__(
+        self,
+        counters: Optional[Dict[str, TokenCounter]] = None,
+        default_counter: Optional[TokenCounter] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        message_overhead_tokens: int = DEFAULT_MESSAGE_OVERHEAD_TOKENS,
+    ):
+        if cache_size <= 0:
+            raise ValueError("Token cache size must be positive.")
+        if message_overhead_tokens < 0:
+            raise ValueError("message_overhead_tokens must be non-negative.")
+        self.counters = build_default_counters() if counters is None else counters
+        self.default_counter = default_counter or HeuristicTokenCounter()
+        self.cache_size = cache_size
+        self.message_overhead_tokens = message_overhead_tokens
+        self._cache: "OrderedDict[Tuple[int, bytes], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_counter(self, provider_name: Optional[str] = None) -> TokenCounter:
+        if provider_name is None:
+            return self.default_counter
+        return self.counters.get(provider_name, self.default_counter)
+
+    def count_text(self, text: str, provider_name: Optional[str] = None) -> int:
+        if not text:
+            return 0
+        counter = self.get_counter(provider_name)
+        key = (id(counter), hashlib.blake2b(text.encode(), digest_size=16).digest())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+        tokens = counter.count(text)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = tokens
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_messages(
+        self, messages: Iterable, provider_name: Optional[str] = None
+    ) -> int:
+        """Total prompt tokens for messages with a `content` attribute or key."""
+        total = 0
+        for message in messages:
+            content = (
+                message.get("content")
+                if isinstance(message, dict)
+                else getattr(message, "content", None)
+            )
+            if content:
+                total += self.count_text(content, provider_name)
+                total += self.message_overhead_tokens
+        return total
@@ -5,7 +5,7 @@
 try:
     from . import event_topics
     from .core_logger import UniversalEventSchema, core_logger
-    from .event_bus import EventBus
+    from .event_bus import AsyncEventBus, EventBus
     from .telemetry_subscriber import TelemetrySubscriber
     from .time_series_db_interface import TimeSeriesDBInterface
 except ImportError as e:
@@ -17,6 +17,7 @@ __all__ = [
     'UniversalEventSchema',
     'core_logger',
     'EventBus',
+    'AsyncEventBus',
     'TelemetrySubscriber',
     'TimeSeriesDBInterface'
 ]
\ No newline at end of file
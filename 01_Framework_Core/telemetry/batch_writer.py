@@ -0,0 +1,155 @@
+# 01_Framework_Core/telemetry/batch_writer.py
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from telemetry.time_series_db_interface import TimeSeriesDBInterface
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL_MS = 200
+DEFAULT_MAX_BUFFERED_EVENTS = 10000
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF_SECONDS = 0.5
+
+
+class TelemetryBatchWriter:
+    """
+    Buffers telemetry events and writes them to a TimeSeriesDBInterface with
+    record_events_batch, every `max_batch_size` events or `flush_interval_ms`,
+    whichever comes first.
+
+    submit() only appends to a bounded buffer, so producers never wait on the
+    database. While a batch is being written or retried, new events keep
+    buffering; once `max_buffered_events` are queued, further events are
+    dropped and counted. A failed batch is retried with exponential backoff
+    and dropped after `max_retries` attempts, so memory stays bounded by
+    `max_buffered_events + max_batch_size` even during a database outage.
+    """
+
+    def __init__(
+        self,
+        db_interface: TimeSeriesDBInterface,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval_ms: float = DEFAULT_FLUSH_INTERVAL_MS,
+        max_buffered_events: int = DEFAULT_MAX_BUFFERED_EVENTS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff_seconds: float = DEFAULT_RETRY_BACKOFF_SECONDS,
+    ):
+        if max_batch_size <= 0 or max_buffered_events <= 0:
+            raise ValueError(
+                "Batch writer 'max_batch_size' and 'max_buffered_events' "
+                "must be positive."
+            )
+        if flush_interval_ms <= 0:
+            raise ValueError("Batch writer 'flush_interval_ms' must be positive.")
+        if max_retries < 0 or retry_backoff_seconds < 0:
+            raise ValueError(
+                "Batch writer 'max_retries' and 'retry_backoff_seconds' "
+                "must be non-negative."
+            )
+        self.db_interface = db_interface
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_ms / 1000.0
+        self.max_buffered_events = max_buffered_events
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._closing = False
+        self.written_events = 0
+        self.dropped_events = 0
+        self.failed_batches = 0
+
+    def start(self):
+        """Starts the background flusher on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._closing = False
+        self._wakeup = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, event_schema: Dict[str, Any]) -> bool:
+        """Buffers one event. Returns False if it was dropped on a full buffer."""
+        if len(self._buffer) >= self.max_buffered_events:
+            self.dropped_events += 1
+            return False
+        self._buffer.append(event_schema)
+        if len(self._buffer) >= self.max_batch_size and self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    async def record_event(self, event_schema: Dict[str, Any]):
+        """A buffering drop-in for TimeSeriesDBInterface.record_event."""
+        self.submit(event_schema)
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        count = min(self.max_batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(count)]
+
+    async def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self.db_interface.record_events_batch(batch)
+                self.written_events += len(batch)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    break
+                delay = self.retry_backoff_seconds * (2**attempt)
+                log.warning(
+                    f"Telemetry batch of {len(batch)} events failed "
+                    f"(attempt {attempt + 1}), retrying in {delay:.2f}s: {e}"
+                )
+                await asyncio.sleep(delay)
+        self.failed_batches += 1
+        self.dropped_events += len(batch)
+        log.error(
+            f"Dropping telemetry batch of {len(batch)} events after "
+            f"{self.max_retries + 1} failed attempts."
+        )
+        return False
+
+    async def flush(self):
+        """Writes everything buffered so far."""
+        lock = self._write_lock or asyncio.Lock()
+        async with lock:
+            while self._buffer:
+                await self._write_batch(self._take_batch())
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self.flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                log.error(f"Telemetry batch flusher error: {e}", exc_info=True)
+
+    async def close(self):
+        """Stops the flusher and writes whatever is still buffered."""
+        self._closing = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            "buffered": len(self._buffer),
+            "written": self.written_events,
+            "dropped": self.dropped_events,
+            "failed_batches": self.failed_batches,
+        }
@@ -54,6 +54,15 @@ logging.basicConfig(
 )
 
 
+_SEVERITY_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
 class CoreLogger:
     """
     The central logging facility for the Adaptive Mind Framework.
@@ -79,9 +88,11 @@ class CoreLogger:
         payload: Dict[str, Any] = None,
         severity: str = "INFO",
         parent_event_id: Optional[str] = None,
-    ) -> str:
+    ) -> Optional[str]:
         """
-        Log a structured event using UniversalEventSchema.
+        Log a structured event.
+
+        Disabled severities return immediately without formatting anything.
 
         Args:
             event_type: Type of event (e.g., 'api.call.success')
@@ -91,42 +102,26 @@ class CoreLogger:
             parent_event_id: Optional parent event ID
 
         Returns:
-            event_id: Unique ID of the logged event
+            event_id: Unique ID of the logged event, or None if the severity
+            is disabled
         """
-        try:
-            # Create structured event
-            event = UniversalEventSchema(
-                event_type=event_type,
-                event_topic=event_topic,
-                event_source=self.component_name,
-                severity=severity,
-                payload=payload or {},
-                parent_event_id=parent_event_id,
-            )
-
-            # Log the event
-            log_message = f"[{event.event_type}] {event.payload}"
-
-            if severity == "DEBUG":
-                self.logger.debug(log_message)
-            elif severity == "INFO":
-                self.logger.info(log_message)
-            elif severity == "WARNING":
-                self.logger.warning(log_message)
-            elif severity == "ERROR":
-                self.logger.error(log_message)
-            elif severity == "CRITICAL":
-                self.logger.critical(log_message)
-            else:
-                self.logger.info(log_message)
+        level = _SEVERITY_LEVELS.get(severity, logging.INFO)
+        if not self.logger.isEnabledFor(level):
+            return None
 
+        try:
+            self.logger.log(level, "[%s] %s", event_type, payload or {})
             self.event_count += 1
-            return event.event_id
+            return str(uuid.uuid4())
 
         except Exception as e:
             self.logger.error(f"Failed to log structured event: {e}")
             return str(uuid.uuid4())
 
+    def is_enabled_for(self, severity: str) -> bool:
+        """True if events of this severity would be emitted at all."""
+        return self.logger.isEnabledFor(_SEVERITY_LEVELS.get(severity, logging.INFO))
+
     def debug(self, message: str, **kwargs):
         """Log debug message"""
         return self.log_event(
@@ -1,9 +1,19 @@
 # 01_Framework_Core/telemetry/event_bus.py
+import asyncio
+import inspect
 import logging
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 log = logging.getLogger(__name__)
 
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_DROP_NEWEST, OVERFLOW_BLOCK)
+
+DEFAULT_MAX_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 100
+
 
 class EventBus:
     """
@@ -26,6 +36,10 @@ class EventBus:
         self._subscribers[event_type].append(handler)
         log.debug(f"Subscribed handler to event type: {event_type}")
 
+    def has_subscribers(self, event_type: str) -> bool:
+        """True if publishing event_type would reach at least one handler."""
+        return bool(self._subscribers.get(event_type))
+
     def publish(self, event_type: str, payload: Dict[str, Any] = None):
         """
         Publish an event to all subscribers.
@@ -37,9 +51,9 @@ class EventBus:
         if event_type in self._subscribers:
             for handler in self._subscribers[event_type]:
                 try:
-                    # Handle both sync and async handlers
-                    if hasattr(handler, '__call__'):
-                        handler(event_type, payload or {})
+                    result = handler(event_type, payload or {})
+                    if inspect.isawaitable(result):
+                        _schedule_awaitable(result, event_type)
                 except Exception as e:
                     log.error(f"Error in event handler for {event_type}: {e}")
         else:
@@ -51,5 +65,198 @@ class EventBus:
         log.info("EventBus shutdown complete")
 
 
+def _schedule_awaitable(awaitable, event_type: str):
+    """Runs an async handler's result on the running loop, if there is one."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        log.warning(
+            f"Async handler for {event_type} dropped: no running event loop."
+        )
+        if inspect.iscoroutine(awaitable):
+            awaitable.close()
+        return
+    loop.create_task(awaitable)
+
+
+class AsyncEventBus(EventBus):
+    """
+    An EventBus that hands events to per-topic worker tasks instead of running
+    handlers in the publisher's call stack.
+
+    publish() only appends to a bounded per-topic queue, so it is O(1) and never
+    waits on subscribers. Each topic's worker drains up to `batch_size` events
+    at a time and delivers them to per-event handlers (sync or async) and to
+    batch handlers registered with subscribe_batch(). When a queue is full the
+    overflow policy decides what is lost: "drop_oldest" evicts the oldest queued
+    event, "drop_newest" discards the new one, and "block" makes apublish() wait
+    for space (publish() cannot block the loop, so it drops the new event).
+
+    Outside a running event loop publish() falls back to synchronous dispatch.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        overflow_policy: str = OVERFLOW_DROP_OLDEST,
+    ):
+        super().__init__()
+        if max_queue_size <= 0:
+            raise ValueError("EventBus 'max_queue_size' must be positive.")
+        if batch_size <= 0:
+            raise ValueError("EventBus 'batch_size' must be positive.")
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown EventBus overflow policy '{overflow_policy}'. "
+                f"Expected one of {OVERFLOW_POLICIES}."
+            )
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self._batch_subscribers: Dict[str, List[Callable]] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._published: Dict[str, int] = {}
+        self._dropped: Dict[str, int] = {}
+        self._handler_errors = 0
+
+    def subscribe_batch(self, event_type: str, handler: Callable):
+        """
+        Subscribe a handler that receives (event_type, [payload, ...]) for each
+        batch drained from the topic's queue. The handler may be async.
+        """
+        self._batch_subscribers.setdefault(event_type, []).append(handler)
+        log.debug(f"Subscribed batch handler to event type: {event_type}")
+
+    def has_subscribers(self, event_type: str) -> bool:
+        return bool(
+            self._subscribers.get(event_type)
+            or self._batch_subscribers.get(event_type)
+        )
+
+    def _get_queue(self, event_type: str) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queues and workers from a previous (closed) loop are unusable.
+            self._queues.clear()
+            self._workers.clear()
+            self._loop = loop
+        queue = self._queues.get(event_type)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._queues[event_type] = queue
+            self._workers[event_type] = loop.create_task(
+                self._run_worker(event_type, queue)
+            )
+        return queue
+
+    def _record_drop(self, event_type: str):
+        self._dropped[event_type] = self._dropped.get(event_type, 0) + 1
+
+    def publish(self, event_type: str, payload: Dict[str, Any] = None):
+        if not self.has_subscribers(event_type):
+            log.debug(f"No subscribers for event type: {event_type}")
+            return
+        try:
+            queue = self._get_queue(event_type)
+        except RuntimeError:
+            self._dispatch_sync(event_type, payload or {})
+            return
+
+        self._published[event_type] = self._published.get(event_type, 0) + 1
+        if queue.full():
+            if self.overflow_policy != OVERFLOW_DROP_OLDEST:
+                self._record_drop(event_type)
+                return
+            queue.get_nowait()
+            queue.task_done()
+            self._record_drop(event_type)
+        queue.put_nowait(payload or {})
+
+    async def apublish(self, event_type: str, payload: Dict[str, Any] = None):
+        """Like publish(), but waits for queue space under the "block" policy."""
+        if self.overflow_policy != OVERFLOW_BLOCK or not self.has_subscribers(
+            event_type
+        ):
+            self.publish(event_type, payload)
+            return
+        queue = self._get_queue(event_type)
+        self._published[event_type] = self._published.get(event_type, 0) + 1
+        await queue.put(payload or {})
+
+    def _dispatch_sync(self, event_type: str, payload: Dict[str, Any]):
+        super().publish(event_type, payload)
+        for handler in self._batch_subscribers.get(event_type, []):
+            try:
+                result = handler(event_type, [payload])
+                if inspect.isawaitable(result):
+                    _schedule_awaitable(result, event_type)
+            except Exception as e:
+                log.error(f"Error in batch event handler for {event_type}: {e}")
+
+    async def _run_worker(self, event_type: str, queue: asyncio.Queue):
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._deliver(event_type, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _deliver(self, event_type: str, batch: List[Dict[str, Any]]):
+        for handler in list(self._batch_subscribers.get(event_type, [])):
+            try:
+                result = handler(event_type, batch)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self._handler_errors += 1
+                log.error(f"Error in batch event handler for {event_type}: {e}")
+        for handler in list(self._subscribers.get(event_type, [])):
+            for payload in batch:
+                try:
+                    result = handler(event_type, payload)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    self._handler_errors += 1
+                    log.error(f"Error in event handler for {event_type}: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Returns queue depth, published and dropped counts per topic."""
+        return {
+            "queue_depth": {topic: q.qsize() for topic, q in self._queues.items()},
+            "published": dict(self._published),
+            "dropped": dict(self._dropped),
+            "total_dropped": sum(self._dropped.values()),
+            "handler_errors": self._handler_errors,
+        }
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every queued event has been delivered. False on timeout."""
+        pending = [queue.join() for queue in self._queues.values()]
+        if not pending:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*pending), timeout)
+            return True
+        except asyncio.TimeoutError:
+            log.warning("EventBus drain timed out with events still queued.")
+            return False
+
+    def shutdown(self):
+        """Cancel the workers, discard queued events and clear all subscribers."""
+        for worker in self._workers.values():
+            worker.cancel()
+        self._workers.clear()
+        self._queues.clear()
+        self._batch_subscribers.clear()
+        super().shutdown()
+
+
 # Global instance for backward compatibility
-event_bus = EventBus()
\ No newline at end of file
+event_bus = EventBus()
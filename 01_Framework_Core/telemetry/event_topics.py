@@ -28,6 +28,9 @@ PROMPT_HUMANIZATION_SUCCESS = "prompt.humanization.success"
 PROMPT_HUMANIZATION_FAILURE = "prompt.humanization.failure"
 ALL_PROVIDERS_FAILED = "all_providers.failed"
 MODEL_SKIPPED_DUE_TO_COST = "model.skipped.cost_cap"
+MODEL_SKIPPED_CIRCUIT_OPEN = "model.skipped.circuit_open"  # Model breaker is open
+HEDGE_LAUNCHED = "request.hedge.launched"  # A parallel leg was fired for a slow call
+HEDGE_WON = "request.hedge.won"  # Records which leg of a hedged request succeeded
 
 
 # ==============================================================================
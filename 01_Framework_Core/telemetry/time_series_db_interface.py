@@ -7,7 +7,7 @@ from datetime import datetime
 # Standardized path setup relative to the current file
 # Assuming current file is in PROJECT_ROOT/01_Framework_Core/telemetry/
 from pathlib import Path
-from typing import Any, Dict, Iterator, List
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 
 CURRENT_DIR = Path(__file__).parent
 PROJECT_ROOT = CURRENT_DIR.parent.parent.parent  # Points to project root
@@ -51,6 +51,16 @@ class TimeSeriesDBInterface(ABC):
         """
         pass
 
+    async def record_events_batch(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Records many telemetry events at once and returns how many were
+        written. The default writes them one by one; backends with a bulk path
+        (COPY, multi-row INSERT) should override it.
+        """
+        for event_schema in events:
+            await self.record_event(event_schema)
+        return len(events)
+
     @abstractmethod
     async def query_events(
         self,
@@ -80,16 +90,21 @@ class TimeSeriesDBInterface(ABC):
         start_time: datetime,
         end_time: datetime,
         batch_size: int = 1000,
-    ) -> Iterator[Dict[str, Any]]:
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        A generator that yields telemetry events in batches to handle large datasets
-        without loading everything into memory at once.
+        An async generator that yields telemetry events in timestamp order, in
+        batches to handle large datasets without loading everything into memory
+        at once. Implementations should page with a (timestamp, id) keyset
+        rather than OFFSET so long windows stay linear.
 
         Args:
             event_type (str): The type of event to query.
             start_time (datetime): The start timestamp for the query range.
             end_time (datetime): The end timestamp for the query range.
             batch_size (int): Number of events to yield per batch.
+            fields (Optional[List[str]]): If given, only these payload keys are
+                returned, for callers that aggregate a few fields.
 
         Yields:
             Dict[str, Any]: An event dictionary.
@@ -119,6 +134,28 @@ class TimeSeriesDBInterface(ABC):
         """
         pass
 
+    async def aggregate_provider_performance(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Computes per-(provider, model) BiasLedger counters inside the backend,
+        so the LearningEngine does not have to stream every entry.
+
+        Each row has provider_name, model_name, total_requests,
+        successful_requests, total_latency_ms (summed over successes),
+        error_distribution ({error_type: count} over failures),
+        mitigation_attempted_count, mitigation_successful_count,
+        failover_occurred_count, circuit_breaker_tripped_count,
+        resilience_scores_sum and resilience_score_count.
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The rows, or None if the backend
+                cannot aggregate in place (the default).
+        """
+        return None
+
 
 # Example usage (for demonstrating the interface, not actual implementation)
 async def main():
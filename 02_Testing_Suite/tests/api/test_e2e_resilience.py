@@ -2,6 +2,7 @@
 
 import logging
 from copy import deepcopy
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 
@@ -13,6 +14,7 @@ from antifragile_framework.api.framework_api import app
 from antifragile_framework.config.config_loader import load_provider_profiles
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
 )
 from antifragile_framework.resilience.prompt_rewriter import PromptRewriter
@@ -68,6 +70,37 @@ class TestE2EHappyPathAndFailover:
         assert response.json()["content"] == "This is a successful test response."
         mock_agenerate.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_ledger_entries_reach_the_learning_engine(
+        self, async_client: AsyncClient, mocker
+    ):
+        mocker.patch(
+            "antifragile_framework.providers.provider_adapters.openai_adapter.OpenAIProvider.agenerate_completion",
+            new_callable=AsyncMock,
+            return_value=CompletionResponse(
+                success=True,
+                content="Folded.",
+                model_used="gpt-4o",
+                latency_ms=10.0,
+                metadata={"provider_name": "openai"},
+            ),
+        )
+        request_payload = {
+            "model_priority_map": {"openai": ["gpt-4o"]},
+            "messages": [{"role": "user", "content": "Hello, world!"}],
+        }
+        response = await async_client.post("/v1/chat/completions", json=request_payload)
+        assert response.status_code == 200
+        await app.state.failover_engine.event_bus.drain(timeout=5)
+
+        end = datetime.now(timezone.utc) + timedelta(minutes=1)
+        analyses = app.state.learning_engine.analyze_window(
+            end - timedelta(hours=1), end
+        )
+        assert [(a.provider_name, a.total_requests) for a in analyses] == [
+            ("openai", 1)
+        ]
+
     @pytest.mark.asyncio
     async def test_resilience_succeeds_on_last_available_provider(
         self, async_client: AsyncClient, mocker
@@ -110,6 +143,59 @@ class TestE2EHappyPathAndFailover:
         assert response.json()["content"] == "Success from Gemini!"
         mock_gemini.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_streaming_endpoint_emits_server_sent_events(
+        self, async_client: AsyncClient, mocker
+    ):
+        async def fake_stream(self, messages, **kwargs):
+            for piece in ("Hello", ", ", "world"):
+                yield CompletionChunk(delta=piece, model_used=kwargs["model"])
+
+        mocker.patch(
+            "antifragile_framework.providers.provider_adapters.openai_adapter.OpenAIProvider.astream_completion",
+            new=fake_stream,
+        )
+        request_payload = {
+            "model_priority_map": {"openai": ["gpt-4o"]},
+            "messages": [{"role": "user", "content": "Hello, world!"}],
+        }
+        response = await async_client.post(
+            "/v1/chat/completions/stream", json=request_payload
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            line[len("data: ") :]
+            for line in response.text.split("\n\n")
+            if line.startswith("data: ")
+        ]
+        assert events[-1] == "[DONE]"
+        deltas = [CompletionChunk.model_validate_json(e).delta for e in events[:-1]]
+        assert "".join(deltas) == "Hello, world"
+
+    @pytest.mark.asyncio
+    async def test_streaming_endpoint_returns_503_before_first_chunk(
+        self, async_client: AsyncClient, mocker
+    ):
+        async def failing_stream(self, messages, **kwargs):
+            raise openai.NotFoundError(
+                "The model `gpt-4o` does not exist", response=mocker.Mock(), body=None
+            )
+            yield  # pragma: no cover
+
+        mocker.patch(
+            "antifragile_framework.providers.provider_adapters.openai_adapter.OpenAIProvider.astream_completion",
+            new=failing_stream,
+        )
+        request_payload = {
+            "model_priority_map": {"openai": ["gpt-4o"]},
+            "messages": [{"role": "user", "content": "Hello, world!"}],
+        }
+        response = await async_client.post(
+            "/v1/chat/completions/stream", json=request_payload
+        )
+        assert response.status_code == 503
+
 
 class TestE2ECostCapping:
     @pytest.mark.parametrize(
@@ -0,0 +1,135 @@
+# tests/api/test_serve.py
+
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+from antifragile_framework.api import framework_api, serve
+from antifragile_framework.core.failover_engine import FailoverEngine
+
+FRAMEWORK_ROOT = Path(framework_api.__file__).resolve().parents[2]
+
+SUPERVISED_APP = textwrap.dedent(
+    """
+    import asyncio
+    import sys
+
+    from antifragile_framework.api.serve import (
+        WorkerSupervisor,
+        build_uvicorn_config,
+    )
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                await send({"type": message["type"] + ".complete"})
+                if message["type"] == "lifespan.shutdown":
+                    return
+        if scope["path"] == "/slow":
+            await asyncio.sleep(1.0)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    config = build_uvicorn_config(
+        app,
+        {
+            "host": "127.0.0.1",
+            "port": 0,
+            "log_level": "warning",
+            "graceful_shutdown_seconds": 5,
+        },
+    )
+    sock = config.bind_socket()
+    print(sock.getsockname()[1], flush=True)
+    WorkerSupervisor(config, workers=2, graceful_shutdown_seconds=5).run([sock])
+    """
+)
+
+
+def test_resolve_worker_count():
+    assert serve.resolve_worker_count(3) == 3
+    assert serve.resolve_worker_count("2") == 2
+    assert serve.resolve_worker_count("auto") == (os.cpu_count() or 1)
+    assert serve.resolve_worker_count(None) == (os.cpu_count() or 1)
+    for invalid in (0, "-1", "many"):
+        with pytest.raises(ValueError):
+            serve.resolve_worker_count(invalid)
+
+
+def test_serve_config_reads_env_and_arguments(monkeypatch):
+    monkeypatch.setenv("API_WORKERS", "3")
+    monkeypatch.setenv("API_PORT", "9000")
+
+    config = serve.load_serve_config(["--host", "0.0.0.0"])
+    assert config["workers"] == 3
+    assert config["port"] == 9000
+    assert config["host"] == "0.0.0.0"
+    assert serve.load_serve_config(["--workers", "5"])["workers"] == 5
+
+    uvicorn_config = serve.build_uvicorn_config(object(), config)
+    assert uvicorn_config.loop == ("uvloop" if serve.UVLOOP_AVAILABLE else "asyncio")
+    assert uvicorn_config.http == (
+        "httptools" if serve.HTTPTOOLS_AVAILABLE else "h11"
+    )
+    assert uvicorn_config.timeout_graceful_shutdown == 30
+
+
+def test_immutable_config_is_loaded_once_and_reused():
+    first = framework_api.preload_immutable_config()
+    assert framework_api.preload_immutable_config() is first
+
+    engine = FailoverEngine(
+        provider_configs={}, resilience_config=first["resilience_config"]
+    )
+    assert engine.resilience_config is first["resilience_config"]
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return response.status
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_supervisor_drains_in_flight_requests_on_sigterm():
+    env = {**os.environ, "PYTHONPATH": str(FRAMEWORK_ROOT)}
+    process = subprocess.Popen(
+        [sys.executable, "-c", SUPERVISED_APP],
+        stdout=subprocess.PIPE,
+        env=env,
+        text=True,
+    )
+    try:
+        base_url = f"http://127.0.0.1:{int(process.stdout.readline())}"
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                assert _get(base_url + "/") == 200
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.1)
+
+        result = {}
+        slow = threading.Thread(
+            target=lambda: result.update(status=_get(base_url + "/slow"))
+        )
+        slow.start()
+        time.sleep(0.3)
+        process.send_signal(signal.SIGTERM)
+        slow.join(timeout=10)
+
+        assert result.get("status") == 200
+        assert process.wait(timeout=20) == 0
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
@@ -0,0 +1,109 @@
+# tests/config/test_cost_estimator.py
+
+from decimal import ROUND_HALF_UP, Decimal
+
+import pytest
+from antifragile_framework.config.cost_estimator import (
+    CostEstimator,
+    micros_to_usd,
+    usd_to_micros,
+)
+from antifragile_framework.config.schemas import CostProfile, ProviderProfiles
+
+
+@pytest.fixture
+def profiles():
+    return ProviderProfiles.model_validate(
+        {
+            "schema_version": "1.0",
+            "last_updated_utc": "2025-08-19T10:00:00Z",
+            "profiles": {
+                "openai": {
+                    "_default": {"input_cpm": "0.50", "output_cpm": "1.50"},
+                    "gpt-4o": {"input_cpm": "5.00", "output_cpm": "15.00"},
+                },
+                "anthropic": {
+                    "claude-3-haiku": {"input_cpm": "0.25", "output_cpm": "1.25"},
+                },
+            },
+        }
+    )
+
+
+def _decimal_cost(cost_profile: CostProfile, in_tokens: int, out_tokens: int):
+    """The Decimal arithmetic the integer estimator replaces."""
+    total = (
+        Decimal(in_tokens) * cost_profile.input_cpm
+        + Decimal(out_tokens) * cost_profile.output_cpm
+    ) / Decimal("1000000")
+    return total.quantize(Decimal("0.000001"), rounding=ROUND_HALF_UP)
+
+
+@pytest.mark.parametrize("tokens", [(0, 0), (1, 1), (3, 7), (1234, 567), (10**6, 5)])
+def test_integer_estimate_matches_decimal_arithmetic(profiles, tokens):
+    estimator = CostEstimator(profiles)
+    for provider, model in [("openai", "gpt-4o"), ("anthropic", "claude-3-haiku")]:
+        expected = _decimal_cost(profiles.profiles[provider][model], *tokens)
+        assert estimator.estimate_usd(provider, model, *tokens) == expected
+
+
+def test_unknown_model_uses_provider_default(profiles):
+    estimator = CostEstimator(profiles)
+    assert estimator.get_price("openai", "gpt-unknown") == (500000, 1500000)
+    assert estimator.estimate_micros("anthropic", "claude-unknown", 10, 10) is None
+    assert estimator.estimate_micros("mystery", "model", 10, 10) is None
+    assert CostEstimator().estimate_micros("openai", "gpt-4o", 10, 10) is None
+
+
+def test_estimate_candidates_scores_whole_priority_map(profiles):
+    estimator = CostEstimator(profiles)
+    costs = estimator.estimate_candidates(
+        {
+            "openai": ["gpt-4o", "gpt-unknown"],
+            "anthropic": ["claude-3-haiku", "claude-unknown"],
+            "mystery": ["model"],
+        },
+        1000,
+        500,
+    )
+    assert costs == {
+        ("openai", "gpt-4o"): estimator.estimate_micros("openai", "gpt-4o", 1000, 500),
+        ("openai", "gpt-unknown"): 1250,
+        ("anthropic", "claude-3-haiku"): 875,
+        ("anthropic", "claude-unknown"): None,
+        ("mystery", "model"): None,
+    }
+
+
+def test_price_edits_and_reloads_are_picked_up(profiles):
+    estimator = CostEstimator(profiles)
+    assert estimator.estimate_micros("openai", "gpt-4o", 1000, 0) == 5000
+
+    profiles.profiles["openai"]["gpt-4o"].input_cpm = Decimal("100.00")
+    assert estimator.estimate_micros("openai", "gpt-4o", 1000, 0) == 100000
+    profiles.profiles["openai"]["gpt-4o"] = CostProfile(
+        input_cpm=Decimal("3.00"), output_cpm=Decimal("6.00")
+    )
+    assert estimator.estimate_candidates({"openai": ["gpt-4o"]}, 1000, 0) == {
+        ("openai", "gpt-4o"): 3000
+    }
+
+    reloaded = profiles.model_copy(deep=True)
+    reloaded.profiles["openai"]["gpt-4o"] = CostProfile(
+        input_cpm=Decimal("1.00"), output_cpm=Decimal("2.00")
+    )
+    estimator.reload(reloaded)
+    assert estimator.provider_profiles is reloaded
+    assert estimator.estimate_micros("openai", "gpt-4o", 1000, 0) == 1000
+
+    estimator.reload(None)
+    assert not estimator.is_loaded
+    assert estimator.estimate_micros("openai", "gpt-4o", 1000, 0) is None
+
+
+def test_usd_micro_conversions():
+    assert usd_to_micros(None) is None
+    assert usd_to_micros(0.01) == 10000
+    # Caps round down, so a 1.5 micro-dollar cap rejects a 2 micro-dollar call.
+    assert usd_to_micros(0.0000015) == 1
+    assert micros_to_usd(1500) == Decimal("0.001500")
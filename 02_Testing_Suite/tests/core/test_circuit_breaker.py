@@ -9,6 +9,7 @@ from antifragile_framework.core.circuit_breaker import (
     CircuitBreakerError,
     CircuitBreakerRegistry,
     CircuitBreakerState,
+    SlidingWindowCircuitBreaker,
 )
 
 # --- Fixtures ---
@@ -173,3 +174,158 @@ def test_circuit_breaker_registry_creates_and_retrieves_breakers():
 
     breaker1_again = registry.get_breaker("service_a")
     assert breaker1 is breaker1_again  # Should be the same instance
+
+
+# --- Sliding-Window Mode Tests ---
+
+
+@pytest.fixture
+def window_breaker():
+    """A sliding-window breaker over 10 calls that trips at a 50% failure rate."""
+    return SlidingWindowCircuitBreaker(
+        "window_service",
+        reset_timeout_seconds=0.1,
+        window_size=10,
+        minimum_calls=4,
+        failure_rate_threshold=0.5,
+        slow_call_duration_seconds=1.0,
+        slow_call_rate_threshold=0.5,
+        half_open_max_probes=2,
+    )
+
+
+def _trip_window_breaker(breaker: SlidingWindowCircuitBreaker):
+    for _ in range(4):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_sliding_window_waits_for_minimum_calls(window_breaker):
+    for _ in range(3):
+        window_breaker.record_failure()
+    assert window_breaker.state == CircuitBreakerState.CLOSED
+
+    window_breaker.record_failure()
+    assert window_breaker.state == CircuitBreakerState.OPEN
+
+
+def test_sliding_window_single_success_does_not_reset(window_breaker):
+    window_breaker.record_failure()
+    window_breaker.record_success()
+    window_breaker.record_failure()
+    assert window_breaker.failure_count == 2
+    assert window_breaker.failure_rate == pytest.approx(2 / 3)
+
+    window_breaker.record_success()  # 2/4 = 50% failure rate
+    assert window_breaker.state == CircuitBreakerState.OPEN
+
+
+def test_sliding_window_evicts_old_outcomes(window_breaker):
+    for _ in range(4):
+        window_breaker.record_success()
+    window_breaker.record_failure()
+    for _ in range(10):
+        window_breaker.record_success()  # the failure falls out of the window
+    assert window_breaker.failure_count == 0
+    assert window_breaker.failure_rate == 0.0
+    assert window_breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_sliding_window_trips_on_slow_call_rate(window_breaker):
+    window_breaker.record_success(latency_seconds=0.2)
+    window_breaker.record_success(latency_seconds=0.3)
+    window_breaker.record_success(latency_seconds=1.5)
+    assert window_breaker.state == CircuitBreakerState.CLOSED
+
+    window_breaker.record_success(latency_seconds=2.0)  # 2/4 slow
+    assert window_breaker.state == CircuitBreakerState.OPEN
+
+
+def test_half_open_admits_only_probe_budget(window_breaker):
+    _trip_window_breaker(window_breaker)
+    time.sleep(0.15)
+
+    assert window_breaker.is_call_permitted() is True
+    window_breaker.check()
+    window_breaker.check()
+    assert window_breaker.state == CircuitBreakerState.HALF_OPEN
+    assert window_breaker.is_call_permitted() is False
+    with pytest.raises(CircuitBreakerError):
+        window_breaker.check()
+
+    window_breaker.record_success(latency_seconds=0.1)
+    assert window_breaker.state == CircuitBreakerState.HALF_OPEN
+    window_breaker.record_success(latency_seconds=0.1)
+    assert window_breaker.state == CircuitBreakerState.CLOSED
+    assert window_breaker.failure_count == 0
+
+
+def test_half_open_probe_failure_reopens(window_breaker):
+    _trip_window_breaker(window_breaker)
+    time.sleep(0.15)
+    window_breaker.check()
+    window_breaker.record_failure()
+    assert window_breaker.state == CircuitBreakerState.OPEN
+    with pytest.raises(CircuitBreakerError):
+        window_breaker.check()
+
+
+def test_half_open_releases_lost_probes(window_breaker):
+    _trip_window_breaker(window_breaker)
+    time.sleep(0.15)
+    window_breaker.check()
+    window_breaker.check()
+    with pytest.raises(CircuitBreakerError):
+        window_breaker.check()
+
+    time.sleep(0.15)  # probes never reported back
+    window_breaker.check()
+    assert window_breaker.state == CircuitBreakerState.HALF_OPEN
+
+
+def test_release_probe_returns_the_slot_at_once(window_breaker):
+    _trip_window_breaker(window_breaker)
+    time.sleep(0.15)
+    window_breaker.check()
+    window_breaker.check()
+    assert window_breaker.is_call_permitted() is False
+
+    window_breaker.release_probe()  # a probe that will record no outcome
+    assert window_breaker.is_call_permitted() is True
+    window_breaker.check()
+    assert window_breaker.state == CircuitBreakerState.HALF_OPEN
+
+
+def test_sliding_window_invalid_config_raises():
+    with pytest.raises(ValueError, match="Minimum calls"):
+        SlidingWindowCircuitBreaker("svc", window_size=5, minimum_calls=6)
+    with pytest.raises(ValueError, match="Failure rate threshold"):
+        SlidingWindowCircuitBreaker("svc", failure_rate_threshold=0)
+    with pytest.raises(ValueError, match="Half-open probe budget"):
+        SlidingWindowCircuitBreaker("svc", half_open_max_probes=0)
+
+
+def test_registry_selects_breaker_mode():
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get_breaker(
+        "service_window", mode="sliding_window", window_size=20, minimum_calls=5
+    )
+    assert isinstance(breaker, SlidingWindowCircuitBreaker)
+    assert breaker._window_size == 20
+    assert type(registry.get_breaker("service_default")) is CircuitBreaker
+
+    with pytest.raises(ValueError, match="Unknown circuit breaker mode"):
+        registry.get_breaker("service_bad", mode="bogus")
+
+
+def test_registry_keeps_model_breakers_separate_from_provider():
+    registry = CircuitBreakerRegistry()
+    provider_breaker = registry.get_breaker("openai", failure_threshold=1)
+    model_breaker = registry.get_model_breaker("openai", "gpt-4o", failure_threshold=1)
+
+    assert model_breaker is not provider_breaker
+    assert registry.get_model_breaker("openai", "gpt-4o") is model_breaker
+
+    model_breaker.record_failure()
+    assert model_breaker.state == CircuitBreakerState.OPEN
+    assert provider_breaker.state == CircuitBreakerState.CLOSED
@@ -1,16 +1,20 @@
 # tests/core/test_failover_engine.py
 
+import asyncio
 from contextlib import contextmanager
 from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, Mock, call
 
 import anthropic
+import httpx
 import openai
 import pytest
 from antifragile_framework.config.schemas import CostProfile, ProviderProfiles
 from antifragile_framework.core.circuit_breaker import (
     CircuitBreakerError,
+    CircuitBreakerState,
+    SlidingWindowCircuitBreaker,
 )
 from antifragile_framework.core.exceptions import (
     AllProvidersFailedError,
@@ -25,13 +29,16 @@ from antifragile_framework.core.resource_guard import (
     MonitoredResource,
     ResourceGuard,
 )
+from antifragile_framework.core.schemas import RequestContext
 
 # ==============================================================================
 # REFACTOR: Import TokenUsage to fix the test fixture bug
 # ==============================================================================
 from antifragile_framework.providers.api_abstraction_layer import (
     ChatMessage,
+    CompletionChunk,
     CompletionResponse,
+    LLMProvider,
     TokenUsage,
 )
 from antifragile_framework.providers.provider_registry import (
@@ -162,7 +169,7 @@ def mock_guards(mocker):
             This fixes the statefulness issue that was causing test failures.
             """
 
-            def side_effect():
+            def side_effect(*args, **kwargs):
                 # Always return the first available key (mimics highest health score selection)
                 if api_keys:
                     key_id = api_keys[0]  # Always use first key (highest health score)
@@ -275,6 +282,26 @@ async def test_success_on_first_provider_model_and_key(
     assert mock_guards["openai"].get_resource.call_count == 1
 
 
+@pytest.mark.asyncio
+async def test_success_response_headers_update_key_rate_limits(
+    engine, mock_openai_adapter, mock_guards
+):
+    headers = {"x-ratelimit-remaining-tokens": "100"}
+    mock_openai_adapter.return_value = CompletionResponse(
+        success=True,
+        content="Success",
+        latency_ms=100.0,
+        metadata={"rate_limit_headers": headers},
+    )
+    await engine.execute_request(
+        model_priority_map={"openai": ["gpt-4o"]},
+        messages=[ChatMessage(role="user", content="Test")],
+    )
+    mock_guards["openai"].update_rate_limits_from_headers.assert_called_once_with(
+        "key-openai-1", headers
+    )
+
+
 @pytest.mark.asyncio
 async def test_key_rotation_on_single_model(
     engine, mock_openai_adapter, mock_bias_ledger, mock_guards
@@ -288,7 +315,7 @@ async def test_key_rotation_on_single_model(
 
     call_count = 0
 
-    def side_effect_func():
+    def side_effect_func(*args, **kwargs):
         nonlocal call_count
         call_count += 1
         if call_count == 1:
@@ -330,7 +357,7 @@ async def test_model_failover_when_first_model_exhausts_keys(
 
     call_count = 0
 
-    def side_effect_func():
+    def side_effect_func(*args, **kwargs):
         nonlocal call_count
         call_count += 1
         if call_count <= 2:
@@ -412,7 +439,7 @@ async def test_provider_failover_on_all_models_failing_due_to_cooldown(
 
     call_count = 0
 
-    def side_effect_func():
+    def side_effect_func(*args, **kwargs):
         nonlocal call_count
         call_count += 1
         if call_count <= 2:
@@ -492,7 +519,7 @@ async def test_all_providers_and_models_fail_raises_final_error(
 
     openai_call_count = 0
 
-    def openai_side_effect():
+    def openai_side_effect(*args, **kwargs):
         nonlocal openai_call_count
         openai_call_count += 1
         if openai_call_count <= 2:
@@ -502,7 +529,7 @@ async def test_all_providers_and_models_fail_raises_final_error(
 
     anthropic_call_count = 0
 
-    def anthropic_side_effect():
+    def anthropic_side_effect(*args, **kwargs):
         nonlocal anthropic_call_count
         anthropic_call_count += 1
         if anthropic_call_count <= 1:
@@ -512,7 +539,7 @@ async def test_all_providers_and_models_fail_raises_final_error(
 
     gemini_call_count = 0
 
-    def gemini_side_effect():
+    def gemini_side_effect(*args, **kwargs):
         nonlocal gemini_call_count
         gemini_call_count += 1
         if gemini_call_count <= 1:
@@ -712,6 +739,25 @@ class TestDynamicProviderRanking:
         mock_anthropic_adapter.assert_called_once()
         mock_openai_adapter.assert_not_called()
 
+    def test_multi_objective_ranking_orders_providers_and_models(self, engine):
+        ranking_engine = ProviderRankingEngine(
+            min_requests_threshold=1, ranking_mode="multi_objective"
+        )
+        ranking_engine.record_outcome("openai", "gpt-4o", True, latency_ms=2500.0)
+        ranking_engine.record_outcome("openai", "gpt-4o-mini", True, latency_ms=400.0)
+        ranking_engine.record_outcome(
+            "anthropic", "claude-3-opus", True, latency_ms=1500.0
+        )
+        engine.provider_ranking_engine = ranking_engine
+
+        providers, models = engine._get_dynamic_candidate_priority(
+            {"anthropic": ["claude-3-opus"], "openai": ["gpt-4o", "gpt-4o-mini"]}
+        )
+
+        assert providers == ["openai", "anthropic"]
+        assert models["openai"] == ["gpt-4o-mini", "gpt-4o"]
+        assert models["anthropic"] == ["claude-3-opus"]
+
 
 # --- NEW TEST SUITE: User-Intent First Architecture & Cost Management (Refactored) ---
 class TestUserIntentAndCostManagement:
@@ -948,3 +994,791 @@ class TestUserIntentAndCostManagement:
         kwargs = mock_bias_ledger.log_request_lifecycle.call_args.kwargs
         assert kwargs["failover_reason"] == "ALL_PREFERRED_KEYS_UNHEALTHY:openai"
         assert kwargs["cost_cap_enforced"] is True
+
+
+# --- Request Hedging Tests ---
+class TestRequestHedging:
+    @staticmethod
+    def _enable_hedging(engine, **overrides):
+        engine.hedging_config.update(
+            {"enabled": True, "delay_ms": 10, "max_parallel_legs": 2, **overrides}
+        )
+
+    @staticmethod
+    def _success(provider_name, model_used, delay=0.0):
+        async def _respond(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return CompletionResponse(
+                success=True,
+                content=f"{provider_name} answer",
+                model_used=model_used,
+                latency_ms=1.0,
+                metadata={"provider_name": provider_name},
+            )
+
+        return _respond
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_hedge_wins(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter, mock_bias_ledger
+    ):
+        self._enable_hedging(engine)
+        mock_openai_adapter.side_effect = self._success("openai", "gpt-4o", delay=5)
+        mock_anthropic_adapter.side_effect = self._success(
+            "anthropic", "claude-3-opus"
+        )
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-opus"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        assert response.content == "anthropic answer"
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        assert context.hedges_launched == 1
+        assert context.winning_leg_index == 1
+        event_names = [e["event_name"] for e in context.lifecycle_events]
+        assert "request.hedge.launched" in event_names
+        won = next(
+            e for e in context.lifecycle_events if e["event_name"] == "request.hedge.won"
+        )
+        assert won["provider"] == "anthropic"
+        score = mock_bias_ledger.log_request_lifecycle.call_args.kwargs[
+            "resilience_score"
+        ]
+        assert score == pytest.approx(
+            1.0 - engine.resilience_score_penalties["hedge_win_penalty"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_hedge_win_records_no_failover_events(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter, mock_bias_ledger
+    ):
+        self._enable_hedging(engine, max_parallel_legs=3)
+        mock_openai_adapter.side_effect = self._success("openai", "gpt-4o", delay=5)
+        mock_anthropic_adapter.side_effect = self._success(
+            "anthropic", "claude-3-opus", delay=0.05
+        )
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o", "gpt-4"],
+                "anthropic": ["claude-3-opus"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        assert response.content == "anthropic answer"
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        assert context.hedges_launched == 2
+        event_names = [e["event_name"] for e in context.lifecycle_events]
+        assert "model.failover" not in event_names
+        assert "provider.failover" not in event_names
+
+    @pytest.mark.asyncio
+    async def test_failed_leg_records_failover_event_when_hedging(
+        self, engine, mock_anthropic_adapter, mock_guards, mock_bias_ledger
+    ):
+        self._enable_hedging(engine, delay_ms=60_000)
+        mock_guards["openai"].get_resource.side_effect = NoResourcesAvailableError(
+            provider="openai"
+        )
+        mock_anthropic_adapter.side_effect = self._success(
+            "anthropic", "claude-3-opus"
+        )
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-opus"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        assert response.content == "anthropic answer"
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        failovers = [
+            e
+            for e in context.lifecycle_events
+            if e["event_name"] == "provider.failover"
+        ]
+        assert len(failovers) == 1
+        assert failovers[0]["from_provider"] == "openai"
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_does_not_launch_hedge(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter, mock_bias_ledger
+    ):
+        self._enable_hedging(engine, delay_ms=1000)
+        mock_openai_adapter.side_effect = self._success("openai", "gpt-4o")
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-opus"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        assert response.content == "openai answer"
+        mock_anthropic_adapter.assert_not_called()
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        assert context.hedges_launched == 0
+        assert context.winning_leg_index == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_leg_fails_over_without_waiting_for_hedge_delay(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter, mock_guards
+    ):
+        self._enable_hedging(engine, delay_ms=60_000)
+        mock_guards["openai"].get_resource.side_effect = NoResourcesAvailableError(
+            provider="openai"
+        )
+        mock_anthropic_adapter.side_effect = self._success(
+            "anthropic", "claude-3-opus"
+        )
+
+        response = await asyncio.wait_for(
+            engine.execute_request(
+                model_priority_map={
+                    "openai": ["gpt-4o"],
+                    "anthropic": ["claude-3-opus"],
+                },
+                messages=[ChatMessage(role="user", content="Test")],
+            ),
+            timeout=5,
+        )
+
+        assert response.content == "anthropic answer"
+        mock_openai_adapter.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cost_cap_limits_parallel_hedges(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter, mock_bias_ledger
+    ):
+        self._enable_hedging(engine)
+        mock_openai_adapter.side_effect = self._success("openai", "gpt-4o", delay=0.1)
+        mock_anthropic_adapter.side_effect = self._success(
+            "anthropic", "claude-3-sonnet"
+        )
+
+        # Each leg fits under the cap on its own (40 and 33 micro-dollars with
+        # per-message overhead), but not both at once.
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-sonnet"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+            max_estimated_cost_usd=0.00005,
+            max_tokens=1,
+        )
+
+        assert response.content == "openai answer"
+        mock_anthropic_adapter.assert_not_called()
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        assert context.hedges_launched == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_cost_is_not_hedged_under_a_cost_cap(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter, mock_bias_ledger
+    ):
+        self._enable_hedging(engine)
+        mock_openai_adapter.side_effect = self._success("openai", "gpt-4o", delay=0.1)
+        mock_anthropic_adapter.side_effect = self._success(
+            "anthropic", "claude-3-sonnet"
+        )
+        # Without a price the anthropic leg's cost is unknown.
+        del engine.provider_profiles.profiles["anthropic"]
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-sonnet"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+            max_estimated_cost_usd=1.0,
+            max_tokens=1,
+        )
+
+        assert response.content == "openai answer"
+        mock_anthropic_adapter.assert_not_called()
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        assert context.hedges_launched == 0
+
+
+# --- Per-(provider, model) Circuit Breaker Tests ---
+
+
+class TestModelCircuitBreakers:
+    @staticmethod
+    def _model_not_found():
+        return openai.NotFoundError(
+            "The model `gpt-4o` does not exist", response=Mock(), body=None
+        )
+
+    @pytest.mark.asyncio
+    async def test_repeated_model_issue_trips_only_that_model(
+        self, engine, mock_openai_adapter, mock_bias_ledger
+    ):
+        messages = [ChatMessage(role="user", content="Test")]
+        model_map = {"openai": ["gpt-4o", "gpt-4-turbo"]}
+        # The openai breaker config (failure_threshold=3) also applies per model.
+        for _ in range(3):
+            mock_openai_adapter.side_effect = [
+                self._model_not_found(),
+                CompletionResponse(success=True, content="ok", latency_ms=1.0),
+            ]
+            await engine.execute_request(
+                model_priority_map=model_map, messages=messages
+            )
+
+        model_breaker = engine.circuit_breakers.get_model_breaker("openai", "gpt-4o")
+        assert model_breaker.state == CircuitBreakerState.OPEN
+        assert (
+            engine.circuit_breakers.get_breaker("openai").state
+            == CircuitBreakerState.CLOSED
+        )
+
+        mock_openai_adapter.reset_mock()
+        mock_openai_adapter.side_effect = None
+        mock_openai_adapter.return_value = CompletionResponse(
+            success=True, content="ok", latency_ms=1.0
+        )
+        response = await engine.execute_request(
+            model_priority_map=model_map, messages=messages
+        )
+
+        assert response.success is True
+        mock_openai_adapter.assert_called_once_with(
+            messages, api_key_override="key-openai-1", model="gpt-4-turbo"
+        )
+        context = mock_bias_ledger.log_request_lifecycle.call_args.kwargs["context"]
+        skipped = [
+            e
+            for e in context.lifecycle_events
+            if e["event_name"] == "model.skipped.circuit_open"
+        ]
+        assert len(skipped) == 1
+
+    @pytest.mark.asyncio
+    async def test_dynamic_selection_skips_provider_with_only_dead_models(
+        self, engine, mock_openai_adapter, mock_anthropic_adapter
+    ):
+        for _ in range(3):
+            engine._get_model_breaker("openai", "gpt-4o").record_failure()
+        mock_anthropic_adapter.return_value = CompletionResponse(
+            success=True, content="claude", latency_ms=1.0
+        )
+
+        assert engine._get_dynamic_provider_priority(
+            {"openai": ["gpt-4o"], "anthropic": ["claude-3-sonnet"]}
+        ) == ["anthropic"]
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-sonnet"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        assert response.content == "claude"
+        mock_openai_adapter.assert_not_called()
+
+
+class TestHalfOpenProbeRelease:
+    """Legs that record no breaker outcome must hand their probe back at once."""
+
+    @staticmethod
+    def _half_open_breaker(engine, mocker, service_name="openai"):
+        breaker = SlidingWindowCircuitBreaker(
+            service_name,
+            reset_timeout_seconds=60,
+            window_size=10,
+            minimum_calls=1,
+            half_open_max_probes=1,
+        )
+        breaker._trip(publish=False)
+        breaker.last_failure_time -= 61  # the reset timeout has passed
+        engine.circuit_breakers._breakers[service_name] = breaker
+        mocker.spy(breaker, "check")
+        return breaker
+
+    @staticmethod
+    def _assert_probe_released(breaker):
+        assert breaker.check.call_count >= 1
+        assert breaker.state == CircuitBreakerState.HALF_OPEN
+        assert breaker.is_call_permitted() is True
+
+    @pytest.mark.asyncio
+    async def test_probe_released_when_all_models_exceed_cost_cap(
+        self, engine, mocker, mock_openai_adapter
+    ):
+        breaker = self._half_open_breaker(engine, mocker)
+
+        with pytest.raises(AllProvidersFailedError):
+            await engine.execute_request(
+                model_priority_map={"openai": ["gpt-4o"]},
+                messages=[ChatMessage(role="user", content="Test")],
+                max_estimated_cost_usd=0.000001,
+            )
+
+        mock_openai_adapter.assert_not_called()
+        self._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_probe_released_when_no_keys_are_available(
+        self, engine, mocker, mock_guards, mock_openai_adapter
+    ):
+        breaker = self._half_open_breaker(engine, mocker)
+        mock_guards["openai"].get_resource.side_effect = NoResourcesAvailableError(
+            provider="openai"
+        )
+
+        with pytest.raises(AllProvidersFailedError):
+            await engine.execute_request(
+                model_priority_map={"openai": ["gpt-4o"]},
+                messages=[ChatMessage(role="user", content="Test")],
+            )
+
+        self._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_probe_released_after_non_transient_error(
+        self, engine, mocker, mock_guards, mock_openai_adapter
+    ):
+        breaker = self._half_open_breaker(engine, mocker)
+
+        @contextmanager
+        def _resource(key_id):
+            yield MagicMock(value=key_id, safe_value=key_id)
+
+        mock_guards["openai"].get_resource.side_effect = [
+            _resource("key-openai-1"),
+            NoResourcesAvailableError(provider="openai"),
+        ]
+        mock_openai_adapter.side_effect = openai.AuthenticationError(
+            "Invalid API key", response=Mock(), body=None
+        )
+
+        with pytest.raises(AllProvidersFailedError):
+            await engine.execute_request(
+                model_priority_map={"openai": ["gpt-4o"]},
+                messages=[ChatMessage(role="user", content="Test")],
+            )
+
+        mock_openai_adapter.assert_called_once()
+        self._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_probe_released_by_cancelled_hedge_loser(
+        self, engine, mocker, mock_openai_adapter, mock_anthropic_adapter
+    ):
+        breaker = self._half_open_breaker(engine, mocker)
+        TestRequestHedging._enable_hedging(engine)
+        mock_openai_adapter.side_effect = TestRequestHedging._success(
+            "openai", "gpt-4o", delay=5
+        )
+        mock_anthropic_adapter.side_effect = TestRequestHedging._success(
+            "anthropic", "claude-3-opus"
+        )
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-opus"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        assert response.content == "anthropic answer"
+        self._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_preferred_provider_probe_released_on_fallback(
+        self, engine, mocker, mock_guards, mock_anthropic_adapter
+    ):
+        breaker = self._half_open_breaker(engine, mocker)
+        mock_guards["openai"].has_healthy_resources.return_value = False
+        mock_anthropic_adapter.return_value = CompletionResponse(
+            success=True, content="claude", latency_ms=1.0
+        )
+
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-sonnet"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+            preferred_provider="openai",
+        )
+
+        assert response.content == "claude"
+        self._assert_probe_released(breaker)
+
+
+class TestModelProbeRelease:
+    """Model breaker probes are handed back like provider breaker probes."""
+
+    MODEL_BREAKER = "openai::gpt-4o"
+
+    @pytest.mark.asyncio
+    async def test_model_probe_released_when_keys_are_exhausted(
+        self, engine, mocker, mock_guards, mock_openai_adapter
+    ):
+        breaker = TestHalfOpenProbeRelease._half_open_breaker(
+            engine, mocker, self.MODEL_BREAKER
+        )
+        mock_guards["openai"].get_resource.side_effect = NoResourcesAvailableError(
+            provider="openai"
+        )
+
+        with pytest.raises(AllProvidersFailedError):
+            await engine.execute_request(
+                model_priority_map={"openai": ["gpt-4o"]},
+                messages=[ChatMessage(role="user", content="Test")],
+            )
+
+        TestHalfOpenProbeRelease._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_model_probe_released_after_non_transient_error(
+        self, engine, mocker, mock_guards, mock_openai_adapter
+    ):
+        breaker = TestHalfOpenProbeRelease._half_open_breaker(
+            engine, mocker, self.MODEL_BREAKER
+        )
+
+        @contextmanager
+        def _resource(key_id):
+            yield MagicMock(value=key_id, safe_value=key_id)
+
+        mock_guards["openai"].get_resource.side_effect = [
+            _resource("key-openai-1"),
+            NoResourcesAvailableError(provider="openai"),
+        ]
+        mock_openai_adapter.side_effect = openai.AuthenticationError(
+            "Invalid API key", response=Mock(), body=None
+        )
+
+        with pytest.raises(AllProvidersFailedError):
+            await engine.execute_request(
+                model_priority_map={"openai": ["gpt-4o"]},
+                messages=[ChatMessage(role="user", content="Test")],
+            )
+
+        TestHalfOpenProbeRelease._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_model_probe_released_by_cancelled_hedge_leg(
+        self, engine, mocker, mock_openai_adapter, mock_anthropic_adapter
+    ):
+        breaker = TestHalfOpenProbeRelease._half_open_breaker(
+            engine, mocker, self.MODEL_BREAKER
+        )
+        TestRequestHedging._enable_hedging(engine)
+        mock_openai_adapter.side_effect = TestRequestHedging._success(
+            "openai", "gpt-4o", delay=5
+        )
+        mock_anthropic_adapter.side_effect = TestRequestHedging._success(
+            "anthropic", "claude-3-opus"
+        )
+
+        await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-opus"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+        TestHalfOpenProbeRelease._assert_probe_released(breaker)
+
+    @pytest.mark.asyncio
+    async def test_model_probe_released_for_hedge_skipped_by_cost_cap(
+        self, engine, mocker, mock_openai_adapter, mock_anthropic_adapter
+    ):
+        breaker = TestHalfOpenProbeRelease._half_open_breaker(
+            engine, mocker, "anthropic::claude-3-sonnet"
+        )
+        TestRequestHedging._enable_hedging(engine)
+        mock_openai_adapter.side_effect = TestRequestHedging._success(
+            "openai", "gpt-4o", delay=0.1
+        )
+
+        # As in test_cost_cap_limits_parallel_hedges: the anthropic leg is
+        # admitted by its model breaker, but both legs together exceed the cap.
+        response = await engine.execute_request(
+            model_priority_map={
+                "openai": ["gpt-4o"],
+                "anthropic": ["claude-3-sonnet"],
+            },
+            messages=[ChatMessage(role="user", content="Test")],
+            max_estimated_cost_usd=0.00005,
+            max_tokens=1,
+        )
+
+        assert response.content == "openai answer"
+        mock_anthropic_adapter.assert_not_called()
+        TestHalfOpenProbeRelease._assert_probe_released(breaker)
+
+
+class TestStreaming:
+    OPENAI_STREAM = (
+        "antifragile_framework.providers.provider_adapters.openai_adapter."
+        "OpenAIProvider.astream_completion"
+    )
+    CLAUDE_STREAM = (
+        "antifragile_framework.providers.provider_adapters.claude_adapter."
+        "ClaudeProvider.astream_completion"
+    )
+
+    @staticmethod
+    async def _collect(stream):
+        return [chunk async for chunk in stream]
+
+    @pytest.mark.asyncio
+    async def test_fails_over_before_first_chunk(
+        self, engine, mocker, mock_bias_ledger
+    ):
+        async def failing_stream(self, messages, **kwargs):
+            raise openai.NotFoundError(
+                "The model `gpt-4o` does not exist", response=Mock(), body=None
+            )
+            yield  # pragma: no cover
+
+        async def claude_stream(self, messages, **kwargs):
+            yield CompletionChunk(delta="Hel", model_used=kwargs["model"])
+            yield CompletionChunk(delta="lo", model_used=kwargs["model"])
+            yield CompletionChunk(
+                model_used=kwargs["model"],
+                finish_reason="end_turn",
+                usage=TokenUsage(input_tokens=3, output_tokens=2),
+            )
+
+        mocker.patch(self.OPENAI_STREAM, new=failing_stream)
+        mocker.patch(self.CLAUDE_STREAM, new=claude_stream)
+
+        chunks = await self._collect(
+            engine.execute_request_stream(
+                model_priority_map={
+                    "openai": ["gpt-4o"],
+                    "anthropic": ["claude-3-sonnet"],
+                },
+                messages=[ChatMessage(role="user", content="Test")],
+            )
+        )
+
+        assert "".join(c.delta for c in chunks) == "Hello"
+        kwargs = mock_bias_ledger.log_request_lifecycle.call_args.kwargs
+        context = kwargs["context"]
+        assert context.streamed is True
+        assert context.ttft_ms is not None
+        assert kwargs["final_response"].content == "Hello"
+        assert kwargs["final_response"].metadata["provider_name"] == "anthropic"
+        assert kwargs["final_response"].usage.output_tokens == 2
+        assert any(
+            e["event_name"] == "provider.failover" for e in context.lifecycle_events
+        )
+
+    @pytest.mark.asyncio
+    async def test_preferred_provider_over_cost_cap_falls_back(
+        self, engine, mocker, mock_bias_ledger
+    ):
+        engine.provider_profiles.profiles["openai"]["gpt-4o"].input_cpm = Decimal(
+            "10000.00"
+        )
+        openai_stream = mocker.patch(self.OPENAI_STREAM)
+
+        async def claude_stream(self, messages, **kwargs):
+            yield CompletionChunk(delta="Hi", model_used=kwargs["model"])
+
+        mocker.patch(self.CLAUDE_STREAM, new=claude_stream)
+
+        chunks = await self._collect(
+            engine.execute_request_stream(
+                model_priority_map={
+                    "openai": ["gpt-4o"],
+                    "anthropic": ["claude-3-sonnet"],
+                },
+                messages=[ChatMessage(role="user", content="Test")],
+                preferred_provider="openai",
+                max_estimated_cost_usd=0.01,
+                max_tokens=1,
+            )
+        )
+
+        assert "".join(c.delta for c in chunks) == "Hi"
+        openai_stream.assert_not_called()
+        kwargs = mock_bias_ledger.log_request_lifecycle.call_args.kwargs
+        assert (
+            kwargs["failover_reason"]
+            == "ALL_PREFERRED_MODELS_EXCEED_COST_CAP_INITIAL_CHECK:openai"
+        )
+        assert kwargs["cost_cap_enforced"] is True
+
+    @pytest.mark.asyncio
+    async def test_error_after_first_chunk_ends_stream(
+        self, engine, mocker, mock_bias_ledger
+    ):
+        async def broken_stream(self, messages, **kwargs):
+            yield CompletionChunk(delta="partial", model_used=kwargs["model"])
+            raise openai.APIConnectionError(request=Mock())
+
+        claude_stream = mocker.patch(self.CLAUDE_STREAM)
+        mocker.patch(self.OPENAI_STREAM, new=broken_stream)
+
+        received = []
+        with pytest.raises(openai.APIConnectionError):
+            async for chunk in engine.execute_request_stream(
+                model_priority_map={
+                    "openai": ["gpt-4o"],
+                    "anthropic": ["claude-3-sonnet"],
+                },
+                messages=[ChatMessage(role="user", content="Test")],
+            ):
+                received.append(chunk.delta)
+
+        assert received == ["partial"]
+        claude_stream.assert_not_called()
+        assert engine.circuit_breakers.get_breaker("openai").failure_count == 1
+        kwargs = mock_bias_ledger.log_request_lifecycle.call_args.kwargs
+        assert kwargs["failover_reason"] == "STREAM_INTERRUPTED"
+        assert kwargs["final_response"] is None
+
+    @pytest.mark.asyncio
+    async def test_non_streaming_provider_yields_single_chunk(
+        self, engine, mocker, mock_openai_adapter
+    ):
+        mocker.patch(self.OPENAI_STREAM, new=LLMProvider.astream_completion)
+        mock_openai_adapter.return_value = CompletionResponse(
+            success=True,
+            content="whole answer",
+            model_used="gpt-4o",
+            latency_ms=1.0,
+            usage=TokenUsage(input_tokens=1, output_tokens=2),
+        )
+
+        chunks = await self._collect(
+            engine.execute_request_stream(
+                model_priority_map={"openai": ["gpt-4o"]},
+                messages=[ChatMessage(role="user", content="Test")],
+            )
+        )
+
+        assert [c.delta for c in chunks] == ["whole answer"]
+        assert chunks[0].finish_reason == "stop"
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing_before_first_chunk_raises(
+        self, engine, mocker, mock_openai_adapter
+    ):
+        mocker.patch(self.OPENAI_STREAM, new=LLMProvider.astream_completion)
+        mock_openai_adapter.return_value = CompletionResponse(
+            success=False,
+            latency_ms=1.0,
+            error_message="Model not found",
+            metadata={
+                "raw_exception": openai.NotFoundError(
+                    "The model `gpt-4o` does not exist", response=Mock(), body=None
+                )
+            },
+        )
+
+        with pytest.raises(AllProvidersFailedError):
+            await self._collect(
+                engine.execute_request_stream(
+                    model_priority_map={"openai": ["gpt-4o"]},
+                    messages=[ChatMessage(role="user", content="Test")],
+                )
+            )
+
+
+class TestLifecycleEventRecording:
+    def _context(self):
+        return RequestContext(initial_messages=[], final_messages=[])
+
+    def test_event_reads_like_the_legacy_dict(self, engine):
+        context = self._context()
+        engine._record_lifecycle_event(
+            context, "provider.failover", "WARNING", {"from_provider": "openai"}
+        )
+
+        event = context.lifecycle_events[0]
+        assert event["event_name"] == "provider.failover"
+        assert event.get("from_provider") == "openai"
+        as_dict = dict(event)
+        assert set(as_dict) == {"timestamp", "event_name", "from_provider"}
+        assert as_dict["timestamp"].endswith("+00:00")
+
+    def test_skips_logging_and_serialization_when_nobody_listens(self, engine):
+        engine.event_bus = Mock()
+        engine.event_bus.has_subscribers.return_value = False
+        engine.logger = Mock()
+        engine.logger.is_enabled_for.return_value = False
+        context = self._context()
+
+        engine._record_lifecycle_event(
+            context, "api_key.rotation", "INFO", {"provider": "openai"}
+        )
+
+        assert len(context.lifecycle_events) == 1
+        engine.logger.log_event.assert_not_called()
+        engine.event_bus.publish.assert_not_called()
+
+    def test_publishes_schema_shaped_payload_to_subscribers(self, engine):
+        engine.event_bus = Mock()
+        engine.event_bus.has_subscribers.return_value = True
+        context = self._context()
+
+        engine._record_lifecycle_event(
+            context, "circuit.tripped", "CRITICAL", {"provider": "openai"}
+        )
+
+        payload = engine.event_bus.publish.call_args.kwargs["payload"]
+        assert payload["event_type"] == "circuit.tripped"
+        assert payload["event_topic"] == "system.health"
+        assert payload["severity"] == "CRITICAL"
+        assert payload["payload"] == {
+            "request_id": context.request_id,
+            "provider": "openai",
+        }
+
+
+@pytest.mark.asyncio
+async def test_retry_after_from_real_adapter_error_reaches_guard(engine, mock_guards):
+    """A 429 from the OpenAI SDK cools the key for exactly its Retry-After."""
+
+    def handler(request):
+        return httpx.Response(
+            429,
+            json={"error": {"message": "Rate limit reached", "type": "requests"}},
+            headers={"retry-after": "7"},
+        )
+
+    engine.providers["openai"].client = openai.AsyncOpenAI(
+        api_key="key-openai-1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    guard = mock_guards["openai"]
+    first_key = guard.get_resource.side_effect
+    guard.get_resource.side_effect = [
+        first_key(),
+        NoResourcesAvailableError(provider="openai"),
+    ]
+
+    with pytest.raises(AllProvidersFailedError):
+        await engine.execute_request(
+            model_priority_map={"openai": ["gpt-4o"]},
+            messages=[ChatMessage(role="user", content="Test")],
+        )
+
+    guard.penalize_resource.assert_called_once_with(
+        "key-openai-1",
+        retry_after_seconds=7.0,
+        error_category=ErrorCategory.TRANSIENT,
+    )
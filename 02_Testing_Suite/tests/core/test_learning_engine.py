@@ -1,13 +1,22 @@
 # tests/core/test_learning_engine.py
 
+import asyncio
+import tempfile
+import threading
 import unittest
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Any, Dict
 from unittest.mock import MagicMock, patch
-from antifragile_framework.core.learning_engine import LearningEngine
+from antifragile_framework.core.learning_engine import (
+    LEDGER_ANALYSIS_FIELDS,
+    BucketedPerformanceAggregates,
+    LearningEngine,
+)
 from antifragile_framework.resilience.bias_ledger import BiasLedgerEntry
 from antifragile_framework.core.schemas import ProviderPerformanceAnalysis  # FIXED IMPORT PATH
 from telemetry import event_topics
+from telemetry.event_bus import EventBus
 from telemetry.time_series_db_interface import TimeSeriesDBInterface
 
 
@@ -480,4 +489,292 @@ class TestLearningEngine(unittest.TestCase):
         )
         self.assertEqual(len(analyses), 1)
         self.assertIsInstance(analyses[0], ProviderPerformanceAnalysis)
-        self.assertEqual(analyses[0].avg_resilience_score, 1.0)
\ No newline at end of file
+        self.assertEqual(analyses[0].avg_resilience_score, 1.0)
+
+    def test_analyze_streams_async_generator_with_projected_fields(self):
+        rows = [
+            {"event_id": 1, "event_data": {"final_provider": "openai",
+                                           "final_model": "gpt-4o",
+                                           "outcome": "SUCCESS",
+                                           "total_latency_ms": 80.0}},
+            {"event_id": 2, "event_data": '{"final_provider": "openai", '
+                                          '"final_model": "gpt-4o", '
+                                          '"outcome": "FAILURE"}'},
+            {"event_id": 3, "event_data": {"final_provider": "openai"}},
+        ]
+
+        async def query_events(**kwargs):
+            for row in rows:
+                yield row
+
+        self.mock_db_interface.query_events_generator.side_effect = query_events
+        self.mock_db_interface.aggregate_provider_performance.return_value = None
+
+        analyses = asyncio.run(
+            self.learning_engine.aanalyze_provider_performance(
+                self.start_time, self.end_time, batch_size=2
+            )
+        )
+
+        call_kwargs = self.mock_db_interface.query_events_generator.call_args.kwargs
+        self.assertEqual(call_kwargs["fields"], LEDGER_ANALYSIS_FIELDS)
+        self.assertEqual(call_kwargs["batch_size"], 2)
+        self.assertEqual(len(analyses), 1)
+        self.assertEqual(analyses[0].total_requests, 2)
+        self.assertEqual(analyses[0].successful_requests, 1)
+        self.assertEqual(analyses[0].avg_latency_ms, 80.0)
+        self.assertEqual(analyses[0].error_distribution, {"unknown_failure": 1})
+
+    def test_backend_without_fields_keyword_gets_no_projection(self):
+        payload = {"final_provider": "openai", "final_model": "gpt-4o",
+                   "outcome": "SUCCESS", "total_latency_ms": 50.0}
+
+        class LegacyBackend:
+            def query_events_generator(
+                self, event_type, start_time, end_time, batch_size
+            ):
+                yield {"event_data": payload}
+
+        engine = LearningEngine(LegacyBackend())
+        analyses = engine.analyze_provider_performance(
+            self.start_time, self.end_time
+        )
+
+        self.assertEqual(len(analyses), 1)
+        self.assertEqual(analyses[0].successful_requests, 1)
+
+    def test_sync_analyze_refuses_async_backend_inside_event_loop(self):
+        async def query_events(**kwargs):
+            yield {}
+
+        self.mock_db_interface.query_events_generator.side_effect = query_events
+
+        async def run_inside_loop():
+            return self.learning_engine.analyze_provider_performance(
+                self.start_time, self.end_time
+            )
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(run_inside_loop())
+
+    def test_pushed_down_aggregates_match_python_reference(self):
+        payloads = [
+            {"final_provider": "openai", "final_model": "gpt-4o",
+             "outcome": "SUCCESS", "total_latency_ms": 100.0,
+             "resilience_score": 0.9},
+            {"final_provider": "openai", "final_model": "gpt-4o",
+             "outcome": "FAILURE", "resilience_score": 0.5,
+             "resilience_events": [
+                 {"event_type": event_topics.API_CALL_FAILURE,
+                  "payload": {"error_type": "rate_limit"}},
+                 {"event_type": event_topics.CIRCUIT_TRIPPED},
+             ]},
+            {"final_provider": "anthropic", "final_model": "claude-3",
+             "outcome": "MITIGATED_SUCCESS", "total_latency_ms": 300.0,
+             "mitigation_attempted": True, "mitigation_succeeded": True,
+             "resilience_events": [{"event_type": event_topics.PROVIDER_FAILOVER}]},
+        ]
+        self.mock_db_interface.query_events_generator.return_value = iter(
+            [{"event_data": payload} for payload in payloads]
+        )
+        reference = asyncio.run(
+            self.learning_engine.aanalyze_provider_performance(
+                self.start_time, self.end_time, pushdown=False
+            )
+        )
+
+        # Rows as the database returns them: JSON as text, integer sums.
+        self.mock_db_interface.aggregate_provider_performance.return_value = [
+            {"provider_name": "openai", "model_name": "gpt-4o",
+             "total_requests": 2, "successful_requests": 1,
+             "total_latency_ms": 100.0, "mitigation_attempted_count": 0,
+             "mitigation_successful_count": 0, "failover_occurred_count": 0,
+             "circuit_breaker_tripped_count": 1, "resilience_scores_sum": 1.4,
+             "resilience_score_count": 2,
+             "error_distribution": '{"rate_limit": 1}'},
+            {"provider_name": "anthropic", "model_name": "claude-3",
+             "total_requests": 1, "successful_requests": 1,
+             "total_latency_ms": 300.0, "mitigation_attempted_count": 1,
+             "mitigation_successful_count": 1, "failover_occurred_count": 1,
+             "circuit_breaker_tripped_count": 0, "resilience_scores_sum": 0,
+             "resilience_score_count": 0, "error_distribution": {}},
+        ]
+        pushed = asyncio.run(
+            self.learning_engine.aanalyze_provider_performance(
+                self.start_time, self.end_time
+            )
+        )
+
+        self.assertEqual(
+            sorted(a.model_dump_json() for a in pushed),
+            sorted(a.model_dump_json() for a in reference),
+        )
+
+
+class TestBucketedPerformance(unittest.TestCase):
+
+    def setUp(self):
+        self.base = datetime(2025, 8, 1, 0, 0, 0, tzinfo=timezone.utc)
+        # One entry every 7 minutes for 5 hours, alternating outcomes/providers.
+        self.entries = [
+            {
+                "timestamp_utc": (self.base + timedelta(minutes=7 * i)).isoformat(),
+                "final_provider": "openai" if i % 3 else "anthropic",
+                "final_model": "gpt-4o" if i % 3 else "claude-3",
+                "outcome": "SUCCESS" if i % 4 else "FAILURE",
+                "total_latency_ms": float(10 * i),
+                "resilience_score": 0.25 * (i % 5),
+            }
+            for i in range(43)
+        ]
+
+    def _reference(self, engine, start, end):
+        window = [
+            {"payload": e}
+            for e in self.entries
+            if start <= datetime.fromisoformat(e["timestamp_utc"]) < end
+        ]
+        engine.db_interface.query_events_generator.return_value = iter(window)
+        return engine.analyze_provider_performance(start, end)
+
+    def _dump(self, analyses):
+        return sorted(a.model_dump_json() for a in analyses)
+
+    def test_window_queries_match_full_recompute(self):
+        engine = LearningEngine(MagicMock())
+        for entry in self.entries:
+            self.assertTrue(engine.fold_ledger_entry(entry))
+
+        for start_minutes, end_minutes in [(0, 300), (13, 197), (61, 119), (5, 6)]:
+            start = self.base + timedelta(minutes=start_minutes)
+            end = self.base + timedelta(minutes=end_minutes)
+            self.assertEqual(
+                self._dump(engine.analyze_window(start, end)),
+                self._dump(self._reference(engine, start, end)),
+            )
+
+    def test_window_uses_coarse_buckets_inside_the_window(self):
+        aggregates = BucketedPerformanceAggregates()
+        keys = []
+        aggregates._cover(30 * 60, 4 * 3600 + 120, 1, keys)
+        self.assertEqual(len(keys), 30 + 3 + 2)
+
+    def test_rejects_resolutions_that_do_not_nest(self):
+        with self.assertRaises(ValueError):
+            BucketedPerformanceAggregates(bucket_seconds=(60, 90))
+
+    def test_checkpoint_restart_only_reads_newer_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Path(tmp) / "buckets.json"
+            engine = LearningEngine(MagicMock(), checkpoint_path=checkpoint)
+            for entry in self.entries[:20]:
+                engine.handle_ledger_event("bias.log_entry.created", entry)
+            engine.save_checkpoint()
+
+            db = MagicMock()
+            restarted = LearningEngine(db, checkpoint_path=checkpoint)
+            db.query_events_generator.return_value = iter(
+                {"timestamp_utc": e["timestamp_utc"], "event_data": e}
+                for e in self.entries[19:]
+            )
+            folded = asyncio.run(
+                restarted.catch_up(end_time=self.base + timedelta(hours=6))
+            )
+
+            self.assertEqual(folded, len(self.entries) - 20)
+            self.assertEqual(
+                db.query_events_generator.call_args.kwargs["start_time"],
+                datetime.fromisoformat(self.entries[19]["timestamp_utc"]),
+            )
+            start, end = self.base, self.base + timedelta(hours=6)
+            self.assertEqual(
+                self._dump(restarted.analyze_window(start, end)),
+                self._dump(self._reference(restarted, start, end)),
+            )
+
+    def test_live_checkpoint_is_written_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Path(tmp) / "buckets.json"
+            engine = LearningEngine(
+                MagicMock(), checkpoint_path=checkpoint, checkpoint_interval_seconds=0
+            )
+            writer_threads = []
+            release = threading.Event()
+            save = engine.aggregates.save_checkpoint
+
+            def slow_save(path):
+                writer_threads.append(threading.get_ident())
+                release.wait(5)
+                save(path)
+
+            engine.aggregates.save_checkpoint = slow_save
+
+            async def fold_live():
+                for entry in self.entries[:5]:
+                    engine.handle_ledger_event("bias.log_entry.created", entry)
+                # Folding returned while the first write was still blocked.
+                self.assertFalse(checkpoint.exists())
+                release.set()
+                await engine._checkpoint_future
+
+            asyncio.run(fold_live())
+
+            self.assertEqual(len(writer_threads), 1)
+            self.assertNotEqual(writer_threads[0], threading.get_ident())
+            self.assertTrue(checkpoint.exists())
+
+    def test_catch_up_with_backend_without_fields_keyword(self):
+        entries = self.entries
+
+        class LegacyBackend:
+            def query_events_generator(
+                self, event_type, start_time, end_time, batch_size
+            ):
+                for entry in entries:
+                    yield {"timestamp_utc": entry["timestamp_utc"], "event_data": entry}
+
+        engine = LearningEngine(LegacyBackend())
+        folded = asyncio.run(
+            engine.catch_up(
+                start_time=self.base, end_time=self.base + timedelta(hours=6)
+            )
+        )
+
+        self.assertEqual(folded, len(entries))
+
+    def test_live_folding_and_catch_up_count_each_entry_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = Path(tmp) / "buckets.json"
+            engine = LearningEngine(MagicMock(), checkpoint_path=checkpoint)
+            for entry in self.entries[:10]:
+                engine.fold_ledger_entry(entry)
+            engine.save_checkpoint()
+
+            db = MagicMock()
+            restarted = LearningEngine(db, checkpoint_path=checkpoint)
+            bus = EventBus()
+            live_since = datetime.fromisoformat(self.entries[25]["timestamp_utc"])
+            restarted.subscribe(bus, live_since=live_since)
+            # Live delivery runs ahead of the catch-up; entries stamped before
+            # live_since are left to catch_up().
+            for entry in self.entries[20:]:
+                bus.publish(event_topics.BIAS_LOG_ENTRY_CREATED, entry)
+
+            stored = [
+                {"timestamp_utc": e["timestamp_utc"], "event_data": e}
+                for e in self.entries[9:]
+            ]
+            db.query_events_generator.side_effect = lambda **kwargs: iter(stored)
+            end = self.base + timedelta(hours=6)
+            self.assertEqual(asyncio.run(restarted.catch_up(end_time=end)), 15)
+            self.assertEqual(
+                db.query_events_generator.call_args.kwargs["end_time"], live_since
+            )
+            self.assertEqual(asyncio.run(restarted.catch_up(end_time=end)), 0)
+
+            db.query_events_generator.side_effect = None
+            start = self.base
+            self.assertEqual(
+                self._dump(restarted.analyze_window(start, end)),
+                self._dump(self._reference(restarted, start, end)),
+            )
@@ -0,0 +1,226 @@
+# tests/core/test_provider_ranking_engine.py
+
+import random
+import threading
+import time
+
+import pytest
+from antifragile_framework.core.online_learning_subscriber import (
+    OnlineLearningSubscriber,
+)
+from antifragile_framework.core.provider_ranking_engine import (
+    P2Quantile,
+    ProviderRankingEngine,
+)
+
+
+def test_p2_quantile_tracks_uniform_distribution():
+    rng = random.Random(7)
+    p50, p95 = P2Quantile(0.5), P2Quantile(0.95)
+    for _ in range(5000):
+        value = rng.uniform(0, 1000)
+        p50.add(value)
+        p95.add(value)
+
+    assert p50.value() == pytest.approx(500, abs=30)
+    assert p95.value() == pytest.approx(950, abs=20)
+
+
+def test_p2_quantile_with_few_samples():
+    sketch = P2Quantile(0.5)
+    assert sketch.value() is None
+    for value in (30.0, 10.0, 20.0):
+        sketch.add(value)
+    assert sketch.value() == 20.0
+
+
+def test_rank_candidates_trades_success_latency_and_cost():
+    engine = ProviderRankingEngine(
+        min_requests_threshold=1, ranking_mode="multi_objective"
+    )
+    for _ in range(10):
+        engine.record_outcome("openai", "gpt-4o", True, 900.0, 0.00001)
+        engine.record_outcome("openai", "gpt-4o-mini", True, 300.0, 0.000001)
+        engine.record_outcome("anthropic", "claude-3-haiku", False)
+
+    ranked = engine.rank_candidates(
+        {
+            "anthropic": ["claude-3-haiku"],
+            "openai": ["gpt-4o", "gpt-4o-mini"],
+            "google_gemini": ["gemini-pro"],
+        }
+    )
+
+    # The unseen candidate keeps the default success rate and no penalties.
+    assert ranked == [
+        ("openai", "gpt-4o-mini"),
+        ("google_gemini", "gemini-pro"),
+        ("openai", "gpt-4o"),
+        ("anthropic", "claude-3-haiku"),
+    ]
+    stats = engine.get_candidate_stats()["openai/gpt-4o-mini"]
+    assert stats["p95_latency_ms"] == 300.0
+    assert stats["request_count"] == 10
+
+
+def test_custom_utility_fn_and_validation():
+    engine = ProviderRankingEngine(
+        min_requests_threshold=1,
+        ranking_mode="multi_objective",
+        utility_fn=lambda metrics: -(metrics["cost_per_token_usd"] or 0.0),
+    )
+    engine.record_outcome("openai", "gpt-4o", True, 100.0, 0.00002)
+    engine.record_outcome("openai", "gpt-4o-mini", False, None, 0.000001)
+
+    assert engine.rank_candidates({"openai": ["gpt-4o", "gpt-4o-mini"]}) == [
+        ("openai", "gpt-4o-mini"),
+        ("openai", "gpt-4o"),
+    ]
+    with pytest.raises(ValueError):
+        ProviderRankingEngine(ranking_mode="fastest")
+    with pytest.raises(ValueError):
+        ProviderRankingEngine(utility_weights={"throughput": 1.0})
+
+
+def test_subscriber_attributes_model_failovers_and_final_model():
+    engine = ProviderRankingEngine(ranking_mode="multi_objective")
+    subscriber = OnlineLearningSubscriber(engine)
+
+    subscriber.handle_event(
+        {
+            "request_id": "req-1",
+            "timestamp_utc": "2025-01-01T00:00:00+00:00",
+            "initial_prompt_hash": "hash",
+            "initial_prompt_preview": "hi",
+            "outcome": "SUCCESS",
+            "total_latency_ms": 250.0,
+            "total_api_calls": 2,
+            "final_provider": "openai",
+            "final_model": "gpt-4o-mini",
+            "resilience_events": [
+                {
+                    "event_name": "model.failover",
+                    "provider": "openai",
+                    "from_model": "gpt-4o",
+                    "to_model": "gpt-4o-mini",
+                }
+            ],
+            "resilience_score": 0.9,
+            "initial_selection_mode": "VALUE_DRIVEN",
+            "input_tokens": 10,
+            "output_tokens": 40,
+            "estimated_cost_usd": "0.0005",
+        }
+    )
+
+    stats = engine.get_candidate_stats()
+    assert stats["openai/gpt-4o"]["request_count"] == 1
+    assert stats["openai/gpt-4o"]["p50_latency_ms"] is None
+    assert stats["openai/gpt-4o-mini"]["p50_latency_ms"] == 250.0
+    assert stats["openai/gpt-4o-mini"]["cost_per_token_usd"] == pytest.approx(1e-5)
+    assert engine.get_provider_scores()["openai"]["request_count"] == 1
+
+
+def _seed_scores(engine, provider, score, count):
+    for _ in range(count):
+        engine.update_provider_score(provider, score)
+
+
+def test_thompson_exploration_is_bounded():
+    engine = ProviderRankingEngine(
+        exploration_policy="thompson", exploration_fraction=0.2, random_seed=3
+    )
+    _seed_scores(engine, "slow", 0.4, 10)
+    _seed_scores(engine, "fast", 0.95, 10)
+
+    first_choices = [engine.get_ranked_providers()[0] for _ in range(1000)]
+
+    stats = engine.get_exploration_stats()
+    assert stats["rankings"] == 1000
+    assert 150 <= stats["explored_rankings"] <= 250
+    assert 0 < first_choices.count("slow") <= stats["explored_rankings"]
+
+
+def test_greedy_ranking_never_explores():
+    engine = ProviderRankingEngine()
+    _seed_scores(engine, "slow", 0.4, 10)
+    _seed_scores(engine, "fast", 0.95, 10)
+
+    assert all(engine.get_ranked_providers()[0] == "fast" for _ in range(200))
+    assert engine.get_exploration_stats()["explored_rankings"] == 0
+
+
+def test_stale_scores_decay_towards_default():
+    engine = ProviderRankingEngine(evidence_half_life_seconds=0.05)
+    _seed_scores(engine, "recovered", 0.1, 10)
+    time.sleep(0.3)
+    _seed_scores(engine, "steady", 0.6, 10)
+
+    assert engine.get_ranked_providers() == ["recovered", "steady"]
+
+
+def test_ucb_prefers_provider_with_little_evidence():
+    engine = ProviderRankingEngine(
+        exploration_policy="ucb", exploration_fraction=1.0, random_seed=1
+    )
+    _seed_scores(engine, "probed", 0.5, 2)
+    _seed_scores(engine, "established", 0.8, 50)
+
+    assert engine.get_ranked_providers()[0] == "probed"
+    with pytest.raises(ValueError):
+        ProviderRankingEngine(exploration_policy="epsilon")
+
+
+def test_readers_do_not_wait_on_the_writer_lock():
+    engine = ProviderRankingEngine(min_requests_threshold=1)
+    _seed_scores(engine, "slow", 0.4, 1)
+    _seed_scores(engine, "fast", 0.95, 1)
+    engine.record_outcome("fast", "model-a", True, 100.0)
+
+    with engine._lock:
+        result = {}
+        reader = threading.Thread(
+            target=lambda: result.update(
+                providers=engine.get_ranked_providers(),
+                candidates=engine.rank_candidates({"fast": ["model-a", "model-b"]}),
+            )
+        )
+        reader.start()
+        reader.join(timeout=2)
+        assert not reader.is_alive()
+
+    assert result["providers"] == ["fast", "slow"]
+    assert result["candidates"] == [("fast", "model-a"), ("fast", "model-b")]
+    # Callers get their own list, never the published snapshot.
+    result["providers"].reverse()
+    assert engine.get_ranked_providers() == ["fast", "slow"]
+
+
+def test_concurrent_updates_and_reads_publish_consistent_snapshots():
+    engine = ProviderRankingEngine(min_requests_threshold=1)
+    providers = [f"provider-{i}" for i in range(8)]
+    errors = []
+
+    def write():
+        rng = random.Random()
+        for _ in range(500):
+            engine.update_provider_score(rng.choice(providers), rng.random())
+
+    def read():
+        try:
+            for _ in range(2000):
+                ranked = engine.get_ranked_providers()
+                assert len(ranked) == len(set(ranked))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write) for _ in range(2)] + [
+        threading.Thread(target=read) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(engine.get_ranked_providers()) == sorted(providers)
@@ -6,9 +6,12 @@ from unittest.mock import MagicMock
 import pytest
 from antifragile_framework.core.exceptions import NoResourcesAvailableError
 from antifragile_framework.core.resource_guard import (
+    AsyncResourceGuard,
     ResourceGuard,
     ResourceState,
+    parse_rate_limit_headers,
 )
+from antifragile_framework.utils.error_parser import ErrorCategory
 
 # --- Fixtures ---
 
@@ -152,3 +155,241 @@ def test_full_penalize_cooldown_and_recovery(
     # 3. Simulate time passing to just after the cooldown ends
     mock_time.return_value = 1000 + cooldown_time + 0.1
     assert resource_to_penalize.is_available() is True
+
+
+# --- AsyncResourceGuard ---
+
+
+@pytest.fixture
+def async_guard(resource_config, monkeypatch):
+    """Provides an AsyncResourceGuard with a controllable monotonic clock."""
+    mock_time = MagicMock(return_value=1000.0)
+    monkeypatch.setattr(time, "monotonic", mock_time)
+    guard = AsyncResourceGuard(
+        provider_name="test_provider",
+        api_keys=["key-abc", "key-def", "key-ghi"],
+        resource_config=resource_config,
+    )
+    guard.mock_time = mock_time
+    return guard
+
+
+def test_async_guard_reserves_healthiest_key(async_guard: AsyncResourceGuard):
+    """The key with the highest health score is reserved first."""
+    async_guard.penalize_resource("key-abc")
+    async_guard.mock_time.return_value = 1000.0 + 11
+    async_guard.get_all_resources()
+
+    with async_guard.get_resource() as first:
+        assert first.value != "key-abc"
+        assert first.state == ResourceState.IN_USE
+        with async_guard.get_resource() as second:
+            assert second.value != "key-abc"
+            with async_guard.get_resource() as third:
+                assert third.value == "key-abc"
+                with pytest.raises(NoResourcesAvailableError):
+                    with async_guard.get_resource():
+                        pass
+
+    assert all(
+        r.state == ResourceState.AVAILABLE for r in async_guard.get_all_resources()
+    )
+
+
+def test_async_guard_promotes_keys_after_cooldown(
+    async_guard: AsyncResourceGuard, resource_config
+):
+    """Penalized keys are skipped until the timer wheel releases them."""
+    for value in ["key-abc", "key-def", "key-ghi"]:
+        async_guard.penalize_resource(value)
+    assert async_guard.has_healthy_resources() is False
+
+    async_guard.mock_time.return_value = 1000.0 + resource_config["cooldown"] - 0.5
+    assert async_guard.has_healthy_resources() is False
+
+    async_guard.mock_time.return_value = 1000.0 + resource_config["cooldown"] + 0.5
+    assert async_guard.has_healthy_resources() is True
+    with async_guard.get_resource() as resource:
+        assert resource.state == ResourceState.IN_USE
+
+
+def test_async_guard_penalize_while_in_use_is_not_released(
+    async_guard: AsyncResourceGuard, resource_config
+):
+    """A key penalized during use stays in cooldown after the context exits."""
+    with async_guard.get_resource() as resource:
+        async_guard.penalize_resource(resource.value)
+    assert resource.state == ResourceState.COOLING_DOWN
+
+    reserved = set()
+    for _ in range(2):
+        with async_guard.get_resource() as other:
+            reserved.add(other.value)
+    assert resource.value not in reserved
+
+    async_guard.mock_time.return_value = 1000.0 + resource_config["cooldown"] + 1
+    async_guard.penalize_resource("key-missing")
+    assert resource.value in {r.value for r in async_guard.get_all_resources()}
+    assert async_guard.has_healthy_resources() is True
+    assert resource.state == ResourceState.AVAILABLE
+
+# --- Adaptive cooldowns ---
+
+
+@pytest.mark.parametrize("guard_class", [ResourceGuard, AsyncResourceGuard])
+def test_retry_after_sets_cooldown_exactly(guard_class, resource_config, monkeypatch):
+    """A key penalized with Retry-After: 2 is back after 2s, not the fixed cooldown."""
+    mock_time = MagicMock(return_value=1000.0)
+    monkeypatch.setattr(time, "monotonic", mock_time)
+    guard = guard_class(
+        provider_name="test_provider",
+        api_keys=["key-abc"],
+        resource_config=resource_config,
+    )
+    guard.penalize_resource(
+        "key-abc", retry_after_seconds=2, error_category=ErrorCategory.TRANSIENT
+    )
+    assert guard.has_healthy_resources() is False
+
+    mock_time.return_value = 1001.9
+    assert guard.has_healthy_resources() is False
+    mock_time.return_value = 1002.0
+    assert guard.has_healthy_resources() is True
+
+
+def test_transient_backoff_grows_and_resets_on_success(guard: ResourceGuard):
+    """Transient failures back off exponentially up to the cap; success resets."""
+    resource = guard.get_all_resources()[0]
+    resource._backoff_jitter = 0
+
+    cooldowns = []
+    for _ in range(6):
+        guard.penalize_resource(resource.value, error_category=ErrorCategory.TRANSIENT)
+        cooldowns.append(resource.current_cooldown_seconds)
+    # backoff_max defaults to the fixed cooldown of 10s.
+    assert cooldowns == [1, 2, 4, 8, 10, 10]
+
+    guard.record_success(resource.value)
+    assert resource.consecutive_failures == 0
+    guard.penalize_resource(resource.value, error_category=ErrorCategory.TRANSIENT)
+    assert resource.current_cooldown_seconds == 1
+
+
+def test_backoff_jitter_stays_within_bounds(resource_config):
+    guard = ResourceGuard(
+        provider_name="test_provider",
+        api_keys=["key-abc"],
+        resource_config={**resource_config, "backoff_base": 4, "backoff_jitter": 0.5},
+    )
+    resource = guard.get_all_resources()[0]
+    for _ in range(20):
+        resource.consecutive_failures = 1
+        assert 2 <= resource.compute_cooldown(None, ErrorCategory.TRANSIENT) <= 4
+
+
+def test_fatal_unknown_and_uncategorized_failures_use_fixed_cooldown(
+    guard: ResourceGuard, resource_config
+):
+    resource = guard.get_all_resources()[0]
+    guard.penalize_resource(resource.value, error_category=ErrorCategory.FATAL)
+    assert resource.current_cooldown_seconds == resource_config["cooldown"]
+    guard.penalize_resource(resource.value)
+    assert resource.current_cooldown_seconds == resource_config["cooldown"]
+    guard.penalize_resource(resource.value, error_category=ErrorCategory.UNKNOWN)
+    assert resource.current_cooldown_seconds == resource_config["cooldown"]
+
+
+def test_invalid_backoff_config_is_rejected(resource_config):
+    with pytest.raises(ValueError):
+        ResourceGuard(
+            provider_name="test_provider",
+            api_keys=["key-abc"],
+            resource_config={**resource_config, "backoff_jitter": 1.5},
+        )
+
+
+# --- Weighted concurrency and rate limits ---
+
+
+@pytest.mark.parametrize("guard_class", [ResourceGuard, AsyncResourceGuard])
+def test_key_serves_up_to_max_concurrency(guard_class, resource_config):
+    """A key stays AVAILABLE until all of its concurrency slots are taken."""
+    guard = guard_class(
+        provider_name="test_provider",
+        api_keys=["key-abc"],
+        resource_config={**resource_config, "max_concurrency": 2},
+    )
+    with guard.get_resource() as first:
+        assert first.state == ResourceState.AVAILABLE
+        with guard.get_resource() as second:
+            assert second is first
+            assert first.in_flight == 2
+            assert first.state == ResourceState.IN_USE
+            with pytest.raises(NoResourcesAvailableError):
+                with guard.get_resource():
+                    pass
+    assert first.in_flight == 0
+    assert first.state == ResourceState.AVAILABLE
+
+
+@pytest.mark.parametrize("guard_class", [ResourceGuard, AsyncResourceGuard])
+def test_get_resource_prefers_key_with_most_headroom(guard_class, resource_config):
+    """With equal health, a partially used key loses to an idle one."""
+    guard = guard_class(
+        provider_name="test_provider",
+        api_keys=["key-abc", "key-def"],
+        resource_config={**resource_config, "max_concurrency": 4},
+    )
+    with guard.get_resource() as first:
+        with guard.get_resource() as second:
+            assert second.value != first.value
+
+
+@pytest.mark.parametrize("guard_class", [ResourceGuard, AsyncResourceGuard])
+def test_rpm_bucket_limits_and_refills(guard_class, resource_config, monkeypatch):
+    """An exhausted RPM bucket blocks the key until tokens refill."""
+    mock_time = MagicMock(return_value=1000.0)
+    monkeypatch.setattr(time, "monotonic", mock_time)
+    guard = guard_class(
+        provider_name="test_provider",
+        api_keys=["key-abc"],
+        resource_config={**resource_config, "max_concurrency": 10, "rpm_limit": 2},
+    )
+    for _ in range(2):
+        with guard.get_resource():
+            pass
+    with pytest.raises(NoResourcesAvailableError):
+        with guard.get_resource():
+            pass
+
+    # Two requests per minute refill one token every 30 seconds.
+    mock_time.return_value = 1031.0
+    with guard.get_resource() as resource:
+        assert resource.value == "key-abc"
+
+
+def test_tpm_budget_seeded_from_headers(guard: ResourceGuard):
+    """Rate-limit headers seed the TPM bucket and steer large requests away."""
+    guard.update_rate_limits_from_headers(
+        "key-abc",
+        {"x-ratelimit-limit-tokens": "10000", "x-ratelimit-remaining-tokens": "100"},
+    )
+    with guard.get_resource(estimated_tokens=500) as resource:
+        assert resource.value == "key-def"
+    with guard.get_resource(estimated_tokens=50) as resource:
+        # key-def has full headroom, key-abc has 1% of its TPM left.
+        assert resource.value == "key-def"
+
+
+def test_parse_rate_limit_headers():
+    """Both OpenAI and Anthropic header families are understood."""
+    assert parse_rate_limit_headers(
+        {
+            "X-RateLimit-Limit-Requests": "500",
+            "x-ratelimit-remaining-requests": "499",
+            "anthropic-ratelimit-tokens-limit": "80000",
+            "anthropic-ratelimit-tokens-remaining": "bogus",
+            "retry-after": "5",
+        }
+    ) == {"limit_requests": 500, "remaining_requests": 499, "limit_tokens": 80000}
+    assert parse_rate_limit_headers(None) == {}
@@ -0,0 +1,231 @@
+# tests/core/test_shared_state.py
+
+import threading
+import time
+
+import pytest
+from antifragile_framework.core.circuit_breaker import (
+    CircuitBreakerError,
+    CircuitBreakerRegistry,
+)
+from antifragile_framework.core.exceptions import NoResourcesAvailableError
+from antifragile_framework.core.provider_ranking_engine import ProviderRankingEngine
+from antifragile_framework.core.resource_guard import (
+    AsyncResourceGuard,
+    ResourceGuard,
+)
+from antifragile_framework.core.shared_state import (
+    NAMESPACE_PROVIDER_SCORES,
+    InMemorySharedState,
+    MmapSharedState,
+    RedisSharedState,
+    create_shared_state,
+)
+
+
+class FakeRedisClient:
+    """An in-process stand-in for a redis-py client (hset/hgetall/hdel only)."""
+
+    def __init__(self):
+        self._hashes = {}
+        self._lock = threading.Lock()
+        # Called before every command, to block or inspect the caller.
+        self.on_call = lambda command: None
+
+    def hset(self, name, key, value):
+        self.on_call("hset")
+        with self._lock:
+            self._hashes.setdefault(name, {})[key.encode()] = value.encode()
+
+    def hgetall(self, name):
+        self.on_call("hgetall")
+        with self._lock:
+            return dict(self._hashes.get(name, {}))
+
+    def hdel(self, name, *keys):
+        self.on_call("hdel")
+        with self._lock:
+            for key in keys:
+                self._hashes.get(name, {}).pop(key.encode(), None)
+
+
+@pytest.fixture
+def network():
+    return FakeRedisClient()
+
+
+def _node(network, staleness=0.0):
+    return RedisSharedState(network, max_staleness_seconds=staleness)
+
+
+def test_mmap_backend_shares_records_between_mappings(tmp_path):
+    path = tmp_path / "state.mmap"
+    first = MmapSharedState(path, size_bytes=4096, max_staleness_seconds=0)
+    second = MmapSharedState(path, size_bytes=4096, max_staleness_seconds=0)
+
+    first.write("breakers", "openai", {"tripped_at": 1.5})
+    second.write("breakers", "anthropic", {"tripped_at": 2.5})
+    first.flush()
+    second.flush()
+
+    assert dict(first.read("breakers")) == {
+        "openai": {"tripped_at": 1.5},
+        "anthropic": {"tripped_at": 2.5},
+    }
+    # A write that does not fit is dropped; earlier records survive.
+    second.write("breakers", "huge", {"blob": "x" * 8192})
+    second.flush()
+    assert "huge" not in first.read("breakers")
+    first.close()
+    second.close()
+
+
+def test_reads_are_cached_for_the_staleness_window(network):
+    writer, reader = _node(network), _node(network, staleness=0.2)
+
+    assert dict(reader.read("ns")) == {}
+    writer.write("ns", "key", {"value": 1})
+    assert dict(reader.read("ns")) == {}
+
+    time.sleep(0.25)
+    assert dict(reader.read("ns")) == {"key": {"value": 1}}
+
+
+def test_create_shared_state_validates_config(tmp_path):
+    assert create_shared_state(None) is None
+    assert isinstance(
+        create_shared_state({"backend": "memory"}), InMemorySharedState
+    )
+    backend = create_shared_state(
+        {"backend": "mmap", "path": str(tmp_path / "s"), "size_bytes": 1024}
+    )
+    assert isinstance(backend, MmapSharedState)
+    backend.close()
+    with pytest.raises(ValueError):
+        create_shared_state({"backend": "mmap"})
+    with pytest.raises(ValueError):
+        create_shared_state({"backend": "etcd"})
+
+
+def test_writes_do_not_wait_for_the_store(network):
+    writer, reader = _node(network), _node(network)
+    released = threading.Event()
+    network.on_call = lambda command: command == "hset" and released.wait(5)
+
+    started = time.monotonic()
+    writer.write("ns", "key", {"value": 1})
+    assert time.monotonic() - started < 1.0
+    # The writer sees its own record at once; others once it is stored.
+    assert dict(writer.read("ns")) == {"key": {"value": 1}}
+    assert dict(reader.read("ns")) == {}
+
+    released.set()
+    assert writer.flush(timeout=5)
+    assert dict(reader.read("ns")) == {"key": {"value": 1}}
+    writer.close()
+
+
+def test_prune_deletes_records_older_than_max_age(network):
+    node = _node(network)
+    node.write("ns", "old", {"updated_at": time.time() - 120})
+    node.write("ns", "new", {"updated_at": time.time()})
+    node.prune("ns", "updated_at", 60)
+    assert node.flush(timeout=5)
+
+    assert set(_node(network).read("ns")) == {"new"}
+    assert set(node.read("ns")) == {"new"}
+
+
+def test_ranking_engine_prunes_stale_worker_records(network):
+    node = _node(network)
+    node.write(
+        NAMESPACE_PROVIDER_SCORES,
+        "gone-host:1|openai",
+        {"provider": "openai", "ema": 0.1, "count": 5, "updated_at": 0.0},
+    )
+    engine = ProviderRankingEngine(shared_state=node, worker_id="w1")
+
+    engine.update_provider_score("openai", 0.9)
+    assert node.flush(timeout=5)
+
+    assert set(_node(network).read(NAMESPACE_PROVIDER_SCORES)) == {"w1|openai"}
+
+
+def test_shared_state_io_runs_outside_component_locks(network):
+    ranking = ProviderRankingEngine(shared_state=_node(network), worker_id="w1")
+    breakers = CircuitBreakerRegistry(shared_state=_node(network))
+    breaker = breakers.get_breaker("openai", failure_threshold=1)
+    guard = ResourceGuard(
+        "openai", ["sk-key-1"], {"cooldown": 60}, shared_state=_node(network)
+    )
+    locks = (ranking._lock, breaker.lock, guard.lock)
+
+    def assert_unlocked(command):
+        assert not any(lock.locked() for lock in locks), command
+
+    network.on_call = assert_unlocked
+    ranking.update_provider_score("openai", 0.9)
+    ranking.record_outcome("openai", "gpt-4o", success=True, latency_ms=10)
+    breaker.check()
+    breaker.record_failure()
+    guard.penalize_resource("sk-key-1")
+    guard.has_healthy_resources()
+    for backend in (ranking._shared_state, breaker._shared_state, guard.shared_state):
+        assert backend.flush(timeout=5)
+
+
+def test_ranking_engines_merge_ema_across_workers(network):
+    first = ProviderRankingEngine(shared_state=_node(network), worker_id="w1")
+    second = ProviderRankingEngine(shared_state=_node(network), worker_id="w2")
+
+    for _ in range(10):
+        first.update_provider_score("openai", 0.2)
+        second.update_provider_score("anthropic", 0.9)
+    first._shared_state.flush()
+    second._shared_state.flush()
+
+    # Each worker ranks on both workers' evidence.
+    assert first.get_ranked_providers() == ["anthropic", "openai"]
+    assert second.get_ranked_providers() == ["anthropic", "openai"]
+
+
+def test_breaker_trip_is_adopted_by_other_workers(network):
+    first = CircuitBreakerRegistry(shared_state=_node(network))
+    second = CircuitBreakerRegistry(shared_state=_node(network))
+    config = {"failure_threshold": 2, "reset_timeout_seconds": 0.2}
+    remote = second.get_breaker("openai", **dict(config))
+
+    local = first.get_breaker("openai", **dict(config))
+    local.record_failure()
+    local.record_failure()
+    local._shared_state.flush()
+
+    assert not remote.is_call_permitted()
+    with pytest.raises(CircuitBreakerError):
+        remote.check()
+    time.sleep(0.25)
+    remote.check()  # Half-open probe after the shared trip expires.
+
+
+@pytest.mark.parametrize("guard_class", [ResourceGuard, AsyncResourceGuard])
+def test_key_cooldown_is_adopted_by_other_workers(network, guard_class):
+    config = {"cooldown": 60}
+    first = guard_class(
+        "openai", ["sk-shared-key-1"], config, shared_state=_node(network)
+    )
+    second = guard_class(
+        "openai", ["sk-shared-key-1"], config, shared_state=_node(network)
+    )
+    assert second.has_healthy_resources()
+
+    first.penalize_resource("sk-shared-key-1")
+    first.shared_state.flush()
+
+    assert not second.has_healthy_resources()
+    with pytest.raises(NoResourcesAvailableError):
+        with second.get_resource():
+            pass
+    # Only a hash of the key is shared.
+    shared_keys = network.hgetall("adaptive_mind:key_cooldowns")
+    assert shared_keys
+    assert all(b"sk-shared" not in key for key in shared_keys)
@@ -0,0 +1,209 @@
+# tests/providers/test_client_cache.py
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from antifragile_framework.providers.client_cache import SDKClientCache
+from antifragile_framework.providers.provider_adapters.gemini_adapter import (
+    GeminiProvider,
+)
+from antifragile_framework.providers.provider_adapters.openai_adapter import (
+    OpenAIProvider,
+)
+
+
+def _factory():
+    return MagicMock(side_effect=lambda key, http_client: (key, http_client))
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_per_provider_and_key():
+    cache = SDKClientCache()
+    factory = _factory()
+
+    first = cache.get_client("openai", "key-1", factory)
+    again = cache.get_client("openai", "key-1", factory)
+    other_key = cache.get_client("openai", "key-2", factory)
+
+    assert first is again
+    assert factory.call_count == 2
+    # Different keys share the provider's keep-alive transport.
+    assert first[1] is other_key[1]
+    assert isinstance(first[1], httpx.AsyncClient)
+    assert cache.get_client("anthropic", "key-1", factory)[1] is not first[1]
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_is_bounded_lru():
+    cache = SDKClientCache(max_size=2)
+    factory = _factory()
+
+    cache.get_client("openai", "key-1", factory)
+    cache.get_client("openai", "key-2", factory)
+    cache.get_client("openai", "key-1", factory)  # key-1 is now most recent
+    cache.get_client("openai", "key-3", factory)  # evicts key-2
+
+    assert len(cache) == 2
+    cache.get_client("openai", "key-1", factory)
+    assert factory.call_count == 3
+    cache.get_client("openai", "key-2", factory)
+    assert factory.call_count == 4
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_idle_clients_are_evicted(monkeypatch):
+    mock_time = MagicMock(return_value=1000.0)
+    monkeypatch.setattr(time, "monotonic", mock_time)
+    cache = SDKClientCache(idle_timeout_seconds=60)
+    factory = _factory()
+
+    cache.get_client("openai", "key-1", factory)
+    mock_time.return_value = 1030.0
+    cache.get_client("openai", "key-2", factory)
+    mock_time.return_value = 1070.0
+    cache.get_client("openai", "key-2", factory)
+
+    assert len(cache) == 1
+    cache.get_client("openai", "key-1", factory)
+    assert factory.call_count == 3
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_close_shuts_transports_and_cache_stays_usable():
+    cache = SDKClientCache()
+    factory = _factory()
+    _, transport = cache.get_client("openai", "key-1", factory)
+
+    await cache.close()
+
+    assert transport.is_closed
+    assert len(cache) == 0
+    _, new_transport = cache.get_client("openai", "key-1", factory)
+    assert new_transport is not transport
+    await cache.close()
+
+
+def test_transport_rebuilt_for_a_new_loop_closes_the_old_one():
+    cache = SDKClientCache()
+    factory = _factory()
+
+    async def use():
+        _, transport = cache.get_client("openai", "key-1", factory)
+        await asyncio.sleep(0)
+        return transport
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+
+    assert second is not first
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(cache.close())
+    assert second.is_closed
+
+
+def test_transport_owned_by_a_running_loop_is_closed_on_that_loop():
+    cache = SDKClientCache()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever)
+    thread.start()
+    try:
+        first = asyncio.run_coroutine_threadsafe(
+            _get_transport(cache), other_loop
+        ).result(5)
+
+        second = asyncio.run(_get_transport(cache))
+
+        assert second is not first
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), other_loop).result(5)
+        assert first.is_closed
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+
+async def _get_transport(cache):
+    return cache.get_http_client("openai")
+
+
+@pytest.mark.asyncio
+async def test_openai_adapter_reuses_override_clients():
+    cache = SDKClientCache()
+    provider = OpenAIProvider({"api_key": "sk-primary", "client_cache": cache})
+    assert provider.client_cache is cache
+
+    first = cache.get_client("openai", "sk-override", provider._build_client)
+    second = cache.get_client("openai", "sk-override", provider._build_client)
+
+    assert first is second
+    assert first.api_key == "sk-override"
+    assert first._client is cache.get_http_client("openai")
+    await cache.close()
+
+
+def _closing_cache(**kwargs):
+    """A cache plus a closer that records which clients it closed."""
+    closed = []
+
+    async def closer(client):
+        closed.append(client[0])
+
+    cache = SDKClientCache(**kwargs)
+
+    def get(key):
+        return cache.get_client(
+            "google_gemini", key, _factory(), closer=closer, use_http_client=False
+        )
+
+    return cache, get, closed
+
+
+@pytest.mark.asyncio
+async def test_self_managed_clients_are_closed_on_eviction_and_close():
+    cache, get, closed = _closing_cache(max_size=1)
+
+    assert get("key-1") == ("key-1", None)
+    get("key-2")  # evicts key-1
+    await asyncio.sleep(0)
+    assert closed == ["key-1"]
+
+    await cache.close()
+    assert closed == ["key-1", "key-2"]
+    # No shared HTTP transport was created for them.
+    assert cache._transports == {}
+
+
+def test_self_managed_clients_are_rebuilt_and_closed_per_loop():
+    cache, get, closed = _closing_cache()
+
+    async def use():
+        return get("key-1")
+
+    first = asyncio.run(use())
+    second = asyncio.run(use())
+
+    assert first is not second
+    assert closed == ["key-1"]
+    asyncio.run(cache.close())
+    assert closed == ["key-1", "key-1"]
+
+
+@pytest.mark.asyncio
+async def test_gemini_clients_close_their_grpc_channel():
+    cache = SDKClientCache()
+    provider = GeminiProvider({"api_key": "primary", "client_cache": cache})
+    client = provider._get_client("override")
+    assert provider._get_client("override") is client
+    client.transport.close = AsyncMock()
+
+    await cache.close()
+
+    client.transport.close.assert_awaited_once()
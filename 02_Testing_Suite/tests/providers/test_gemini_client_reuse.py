@@ -0,0 +1,136 @@
+# tests/providers/test_gemini_client_reuse.py
+
+from unittest.mock import AsyncMock, MagicMock
+
+import google.generativeai as genai
+import pytest
+from antifragile_framework.providers.api_abstraction_layer import ChatMessage
+from antifragile_framework.providers.client_cache import SDKClientCache
+from antifragile_framework.providers.provider_adapters.gemini_adapter import (
+    GeminiProvider,
+)
+from google.ai import generativelanguage as glm
+
+
+@pytest.fixture(autouse=True)
+def force_prod_mode(monkeypatch):
+    monkeypatch.delenv("PERFORMANCE_TEST_MODE", raising=False)
+
+
+@pytest.fixture
+def cache():
+    return SDKClientCache()
+
+
+@pytest.fixture
+def provider(cache):
+    return GeminiProvider({"api_key": "gemini-primary", "client_cache": cache})
+
+
+def _gemini_response(text="Hello"):
+    return glm.GenerateContentResponse(
+        candidates=[
+            glm.Candidate(
+                content=glm.Content(role="model", parts=[glm.Part(text=text)]),
+                finish_reason=glm.Candidate.FinishReason.STOP,
+            )
+        ],
+        usage_metadata=glm.GenerateContentResponse.UsageMetadata(
+            prompt_token_count=3, candidates_token_count=5
+        ),
+    )
+
+
+@pytest.fixture
+def generate(monkeypatch):
+    generate = AsyncMock(return_value=_gemini_response())
+    monkeypatch.setattr(glm.GenerativeServiceAsyncClient, "generate_content", generate)
+    return generate
+
+
+@pytest.mark.asyncio
+async def test_calls_do_not_touch_global_configure(
+    provider, monkeypatch, cache, generate
+):
+    configure = MagicMock()
+    monkeypatch.setattr(genai, "configure", configure)
+
+    messages = [ChatMessage(role="user", content="Hi")]
+    response = await provider.agenerate_completion(messages)
+    await provider.agenerate_completion(messages, api_key_override="gemini-other")
+
+    assert response.success is True
+    assert response.content == "Hello"
+    assert response.usage.output_tokens == 5
+    configure.assert_not_called()
+    assert generate.await_count == 2
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_models_share_one_client_per_key(provider, cache):
+    first = provider._get_client("key-a")
+    second = provider._get_client("key-a")
+    other = provider._get_client("key-b")
+
+    assert isinstance(first, glm.GenerativeServiceAsyncClient)
+    assert first is second
+    assert first is not other
+    assert len(cache) == 2
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_request_carries_model_messages_and_config(provider, cache, generate):
+    messages = [
+        ChatMessage(role="system", content="Be brief."),
+        ChatMessage(role="user", content="Hi"),
+        ChatMessage(role="assistant", content="Hello"),
+        ChatMessage(role="user", content="Again"),
+    ]
+    await provider.agenerate_completion(
+        messages, model="gemini-pro", max_tokens=64, temperature=0.5
+    )
+
+    [request] = generate.await_args.args
+    assert request.model == "models/gemini-pro"
+    assert request.system_instruction.parts[0].text == "Be brief."
+    assert [(c.role, c.parts[0].text) for c in request.contents] == [
+        ("user", "Hi"),
+        ("model", "Hello"),
+        ("user", "Again"),
+    ]
+    assert request.generation_config.max_output_tokens == 64
+    assert request.generation_config.temperature == 0.5
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_uses_the_per_key_client(provider, monkeypatch, cache):
+    async def chunks():
+        yield _gemini_response("Hel")
+        yield _gemini_response("lo")
+
+    stream = AsyncMock(return_value=chunks())
+    monkeypatch.setattr(
+        glm.GenerativeServiceAsyncClient, "stream_generate_content", stream
+    )
+
+    received = [
+        chunk
+        async for chunk in provider.astream_completion(
+            [ChatMessage(role="user", content="Hi")], api_key_override="key-a"
+        )
+    ]
+
+    assert "".join(chunk.delta for chunk in received) == "Hello"
+    assert received[-1].finish_reason == "STOP"
+    stream.assert_awaited_once()
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_adapter_does_not_print(provider, capsys, cache, generate):
+    await provider.agenerate_completion([ChatMessage(role="user", content="Hi")])
+    assert capsys.readouterr().out == ""
+    await cache.close()
@@ -0,0 +1,142 @@
+# tests/providers/test_rate_limit_headers.py
+
+import json
+
+import httpx
+import pytest
+from anthropic import AsyncAnthropic
+from antifragile_framework.providers.api_abstraction_layer import ChatMessage
+from antifragile_framework.providers.provider_adapters.claude_adapter import (
+    ClaudeProvider,
+)
+from antifragile_framework.providers.provider_adapters.openai_adapter import (
+    OpenAIProvider,
+)
+from antifragile_framework.utils.error_parser import ErrorCategory, ErrorParser
+from openai import AsyncOpenAI
+
+MESSAGES = [ChatMessage(role="user", content="Hello")]
+
+OPENAI_COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "Hi"},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+}
+
+ANTHROPIC_MESSAGE = {
+    "id": "msg_1",
+    "type": "message",
+    "role": "assistant",
+    "model": "claude-3-5-sonnet-20240620",
+    "content": [{"type": "text", "text": "Hi"}],
+    "stop_reason": "end_turn",
+    "stop_sequence": None,
+    "usage": {"input_tokens": 3, "output_tokens": 1},
+}
+
+
+def _http_client(status, body, headers):
+    def handler(request):
+        return httpx.Response(
+            status,
+            content=json.dumps(body),
+            headers={"content-type": "application/json", **headers},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _openai(status, body, headers):
+    provider = OpenAIProvider({"api_key": "sk-test", "max_retries": 0})
+    provider.client = AsyncOpenAI(
+        api_key="sk-test",
+        max_retries=0,
+        http_client=_http_client(status, body, headers),
+    )
+    return provider
+
+
+def _claude(status, body, headers):
+    provider = ClaudeProvider({"api_key": "sk-ant-test", "max_retries": 0})
+    provider.client = AsyncAnthropic(
+        api_key="sk-ant-test",
+        max_retries=0,
+        http_client=_http_client(status, body, headers),
+    )
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_openai_success_carries_rate_limit_headers():
+    provider = _openai(
+        200, OPENAI_COMPLETION, {"x-ratelimit-remaining-tokens": "9000"}
+    )
+
+    response = await provider.agenerate_completion(MESSAGES, model="gpt-4o")
+
+    assert response.success
+    assert response.content == "Hi"
+    assert response.usage.input_tokens == 3
+    headers = response.metadata["rate_limit_headers"]
+    assert headers["x-ratelimit-remaining-tokens"] == "9000"
+
+
+@pytest.mark.asyncio
+async def test_openai_error_carries_rate_limit_headers():
+    provider = _openai(
+        429,
+        {"error": {"message": "slow down", "type": "requests", "code": None}},
+        {"x-ratelimit-remaining-requests": "0"},
+    )
+
+    response = await provider.agenerate_completion(MESSAGES, model="gpt-4o")
+
+    assert not response.success
+    headers = response.metadata["rate_limit_headers"]
+    assert headers["x-ratelimit-remaining-requests"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_claude_success_carries_rate_limit_headers():
+    provider = _claude(
+        200, ANTHROPIC_MESSAGE, {"anthropic-ratelimit-tokens-remaining": "7000"}
+    )
+
+    response = await provider.agenerate_completion(
+        MESSAGES, model="claude-3-5-sonnet-20240620"
+    )
+
+    assert response.success
+    assert response.content == "Hi"
+    headers = response.metadata["rate_limit_headers"]
+    assert headers["anthropic-ratelimit-tokens-remaining"] == "7000"
+
+
+@pytest.mark.asyncio
+async def test_claude_error_carries_raw_exception():
+    provider = _claude(
+        401,
+        {
+            "type": "error",
+            "error": {"type": "authentication_error", "message": "invalid x-api-key"},
+        },
+        {},
+    )
+
+    response = await provider.agenerate_completion(
+        MESSAGES, model="claude-3-5-sonnet-20240620"
+    )
+
+    assert not response.success
+    raw_exception = response.metadata["raw_exception"]
+    details = ErrorParser().classify_error(raw_exception, "anthropic")
+    assert details.category == ErrorCategory.FATAL
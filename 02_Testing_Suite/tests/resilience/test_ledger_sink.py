@@ -0,0 +1,131 @@
+# tests/resilience/test_ledger_sink.py
+
+import json
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+from antifragile_framework.core.schemas import RequestContext
+from antifragile_framework.providers.api_abstraction_layer import (
+    ChatMessage,
+    CompletionResponse,
+)
+from antifragile_framework.resilience.bias_ledger import BiasLedger
+from antifragile_framework.resilience.ledger_sink import (
+    ZSTD_AVAILABLE,
+    LedgerSink,
+    read_segment,
+)
+
+
+def _entries(n):
+    return [json.dumps({"request_id": f"req-{i}"}).encode() for i in range(n)]
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the flusher"
+        time.sleep(0.01)
+
+
+@pytest.mark.parametrize("segment_format", ["ndjson", "length_prefixed"])
+def test_entries_round_trip(tmp_path, segment_format):
+    sink = LedgerSink(tmp_path, segment_format=segment_format)
+    for entry in _entries(3):
+        sink.append(entry)
+    sink.close()
+
+    assert list(read_segment(sink.current_segment)) == _entries(3)
+
+
+def test_entries_are_group_committed(tmp_path):
+    sink = LedgerSink(tmp_path, max_buffered_entries=3, flush_interval_seconds=60)
+    entries = _entries(3)
+
+    sink.append(entries[0])
+    sink.append(entries[1])
+    assert sink.current_segment is None  # nothing written yet
+
+    sink.append(entries[2])
+    _wait_for(lambda: sink.current_segment is not None)
+    _wait_for(lambda: list(read_segment(sink.current_segment)) == entries)
+    sink.close()
+
+
+def test_idle_sink_commits_after_flush_interval(tmp_path):
+    sink = LedgerSink(tmp_path, max_buffered_entries=100, flush_interval_seconds=0.2)
+    writers = []
+    write_entries = sink._write_entries
+
+    def record_writer(entries):
+        writers.append(threading.current_thread())
+        write_entries(entries)
+
+    sink._write_entries = record_writer
+    [entry] = _entries(1)
+
+    sink.append(entry)
+    assert sink.current_segment is None
+
+    # No further appends: the flusher commits once the interval passes, off
+    # the appending thread.
+    _wait_for(lambda: sink.current_segment is not None)
+    assert list(read_segment(sink.current_segment)) == [entry]
+    assert threading.current_thread() not in writers
+    sink.close()
+
+
+def test_segments_rotate_at_size_limit(tmp_path):
+    sink = LedgerSink(tmp_path, segment_max_bytes=10, max_buffered_entries=1)
+    for entry in _entries(3):
+        sink.append(entry)
+    sink.close()
+
+    segments = sorted(tmp_path.iterdir())
+    assert len(segments) == 3
+    assert [e for s in segments for e in read_segment(s)] == _entries(3)
+
+
+@pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard is not installed")
+def test_zstd_segments_round_trip(tmp_path):
+    sink = LedgerSink(tmp_path, compression="zstd", max_buffered_entries=2)
+    for entry in _entries(5):
+        sink.append(entry)
+    sink.close()
+
+    assert sink.current_segment.name.endswith(".ndjson.zst")
+    assert list(read_segment(sink.current_segment)) == _entries(5)
+
+
+def test_invalid_configuration_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="segment format"):
+        LedgerSink(tmp_path, segment_format="csv")
+    with pytest.raises(ValueError, match="compression"):
+        LedgerSink(tmp_path, compression="gzip")
+
+
+def test_ledger_encodes_entry_once_for_sink_and_bus(tmp_path):
+    sink = LedgerSink(tmp_path)
+    bus = Mock()
+    ledger = BiasLedger(event_bus=bus, ledger_sink=sink)
+    messages = [ChatMessage(role="user", content="Hello")]
+    context = RequestContext(
+        initial_messages=messages, final_messages=messages, request_id="req-1"
+    )
+
+    entry = ledger.log_request_lifecycle(
+        context=context,
+        initial_selection_mode="VALUE_DRIVEN",
+        final_response=CompletionResponse(
+            success=True, content="Hi", latency_ms=1.0
+        ),
+    )
+    sink.close()
+
+    assert entry.to_json_bytes() is entry.to_json_bytes()
+    assert entry.to_payload() is bus.publish.call_args.kwargs["payload"]
+    [stored] = list(read_segment(sink.current_segment))
+    assert stored == entry.to_json_bytes()
+    assert json.loads(stored)["request_id"] == "req-1"
@@ -0,0 +1,82 @@
+# tests/telemetry/test_batch_writer.py
+
+import asyncio
+
+import pytest
+from telemetry.batch_writer import TelemetryBatchWriter
+
+
+class FakeBatchDB:
+    """Records each batch it receives; fails the first `failures` calls."""
+
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.failures = failures
+
+    async def record_events_batch(self, events):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append([event["n"] for event in events])
+        return len(events)
+
+
+@pytest.mark.asyncio
+async def test_flushes_full_batches_without_waiting_for_interval():
+    db = FakeBatchDB()
+    writer = TelemetryBatchWriter(db, max_batch_size=3, flush_interval_ms=60_000)
+    writer.start()
+    for n in range(7):
+        writer.submit({"n": n})
+    await asyncio.sleep(0.01)
+    assert db.batches[:2] == [[0, 1, 2], [3, 4, 5]]
+
+    await writer.close()
+    assert [n for batch in db.batches for n in batch] == list(range(7))
+    assert writer.get_metrics()["written"] == 7
+
+
+@pytest.mark.asyncio
+async def test_flushes_partial_batch_on_interval():
+    db = FakeBatchDB()
+    writer = TelemetryBatchWriter(db, max_batch_size=100, flush_interval_ms=10)
+    writer.start()
+    writer.submit({"n": 1})
+    await asyncio.sleep(0.05)
+    assert db.batches == [[1]]
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_retries_failed_batches_then_drops_them():
+    db = FakeBatchDB(failures=1)
+    writer = TelemetryBatchWriter(
+        db, max_batch_size=2, max_retries=1, retry_backoff_seconds=0
+    )
+    writer.submit({"n": 1})
+    await writer.flush()
+    assert db.batches == [[1]]
+
+    db.failures = 2
+    writer.submit({"n": 2})
+    await writer.flush()
+    assert db.batches == [[1]]
+    assert writer.get_metrics()["failed_batches"] == 1
+    assert writer.dropped_events == 1
+
+
+def test_buffer_is_bounded():
+    writer = TelemetryBatchWriter(FakeBatchDB(), max_buffered_events=2)
+    assert writer.submit({"n": 1}) and writer.submit({"n": 2})
+    assert not writer.submit({"n": 3})
+    assert writer.get_metrics() == {
+        "buffered": 2,
+        "written": 0,
+        "dropped": 1,
+        "failed_batches": 0,
+    }
+
+
+def test_rejects_invalid_limits():
+    with pytest.raises(ValueError):
+        TelemetryBatchWriter(FakeBatchDB(), max_batch_size=0)
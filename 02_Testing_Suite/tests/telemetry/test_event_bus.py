@@ -0,0 +1,122 @@
+# tests/telemetry/test_event_bus.py
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from telemetry.event_bus import AsyncEventBus, EventBus
+
+
+@pytest.mark.asyncio
+async def test_sync_bus_schedules_async_handlers():
+    bus = EventBus()
+    handler = AsyncMock()
+    bus.subscribe("test.event", handler)
+
+    bus.publish("test.event", {"n": 1})
+    await asyncio.sleep(0)
+
+    handler.assert_awaited_once_with("test.event", {"n": 1})
+
+
+@pytest.mark.asyncio
+async def test_publish_does_not_run_handlers_inline():
+    bus = AsyncEventBus()
+    handler = Mock()
+    bus.subscribe("test.event", handler)
+
+    bus.publish("test.event", {"n": 1})
+    handler.assert_not_called()
+
+    assert await bus.drain(timeout=1)
+    handler.assert_called_once_with("test.event", {"n": 1})
+    bus.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_batch_and_async_handlers_receive_events():
+    bus = AsyncEventBus(batch_size=10)
+    batch_handler = Mock()
+    async_handler = AsyncMock()
+    bus.subscribe_batch("test.event", batch_handler)
+    bus.subscribe("test.event", async_handler)
+
+    for n in range(3):
+        bus.publish("test.event", {"n": n})
+    assert await bus.drain(timeout=1)
+
+    batch_handler.assert_called_once_with(
+        "test.event", [{"n": 0}, {"n": 1}, {"n": 2}]
+    )
+    assert async_handler.await_count == 3
+    bus.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "policy, expected",
+    [("drop_oldest", [1, 2]), ("drop_newest", [0, 1]), ("block", [0, 1])],
+)
+async def test_overflow_policies(policy, expected):
+    bus = AsyncEventBus(max_queue_size=2, overflow_policy=policy)
+    handler = Mock()
+    bus.subscribe("test.event", handler)
+
+    # The worker cannot run until we yield, so the third publish overflows.
+    for n in range(3):
+        bus.publish("test.event", {"n": n})
+
+    metrics = bus.get_metrics()
+    assert metrics["queue_depth"]["test.event"] == 2
+    assert metrics["dropped"]["test.event"] == 1
+
+    assert await bus.drain(timeout=1)
+    assert [c.args[1]["n"] for c in handler.call_args_list] == expected
+    bus.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_apublish_blocks_until_space():
+    bus = AsyncEventBus(max_queue_size=1, overflow_policy="block")
+    handler = Mock()
+    bus.subscribe("test.event", handler)
+
+    await bus.apublish("test.event", {"n": 0})
+    await bus.apublish("test.event", {"n": 1})
+    assert await bus.drain(timeout=1)
+
+    assert handler.call_count == 2
+    assert bus.get_metrics()["total_dropped"] == 0
+    bus.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_handler_errors_do_not_stop_worker():
+    bus = AsyncEventBus()
+    failing = Mock(side_effect=RuntimeError("boom"))
+    healthy = Mock()
+    bus.subscribe("test.event", failing)
+    bus.subscribe("test.event", healthy)
+
+    bus.publish("test.event", {"n": 0})
+    bus.publish("test.event", {"n": 1})
+    assert await bus.drain(timeout=1)
+
+    assert healthy.call_count == 2
+    assert bus.get_metrics()["handler_errors"] == 2
+    bus.shutdown()
+
+
+def test_publish_without_running_loop_dispatches_synchronously():
+    bus = AsyncEventBus()
+    handler = Mock()
+    bus.subscribe("test.event", handler)
+
+    bus.publish("test.event", {"n": 1})
+
+    handler.assert_called_once_with("test.event", {"n": 1})
+
+
+def test_invalid_overflow_policy_is_rejected():
+    with pytest.raises(ValueError, match="overflow policy"):
+        AsyncEventBus(overflow_policy="spill")
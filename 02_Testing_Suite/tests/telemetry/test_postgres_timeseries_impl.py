@@ -0,0 +1,251 @@
+# tests/telemetry/test_postgres_timeseries_impl.py
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import asyncpg
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "03_Demo_Interface"))
+
+import postgres_timeseries_impl as impl  # noqa: E402
+from connection_manager import PostgreSQLConnectionManager  # noqa: E402
+
+START = datetime(2025, 8, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeConnectionManager(PostgreSQLConnectionManager):
+    """Records every query and answers fetch_rows with canned rows."""
+
+    def __new__(cls, *args, **kwargs):
+        # The real manager is a process-wide singleton; each fake is fresh.
+        return object.__new__(cls)
+
+    def __init__(self, rows=None, error_for=None):
+        self.rows = rows if rows is not None else []
+        self.queries = []
+        # Maps a query text to the exception raised when it is run.
+        self.error_for = error_for or {}
+
+    async def fetch_rows(self, query, *args):
+        self.queries.append((query, args))
+        if query in self.error_for:
+            raise self.error_for[query]
+        return [dict(row) for row in self.rows]
+
+
+def _db(rows=None, use_rollups=False, error_for=None):
+    manager = FakeConnectionManager(rows, error_for)
+    return impl.PostgreSQLTimeSeriesDB(manager, use_rollups=use_rollups), manager
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("aggregate_by", ["hour", "day", "provider", "total"])
+async def test_each_shape_uses_its_fixed_query_text(aggregate_by):
+    db, manager = _db()
+    end = START + timedelta(hours=2)
+
+    await db.aggregate_events("api.call.success", START, end, aggregate_by)
+    await db.aggregate_events("api.call.success", START, end, aggregate_by)
+
+    [(first, args), (second, _)] = manager.queries
+    assert first is impl._AGGREGATE_QUERIES[aggregate_by]
+    assert second is first
+    assert args == ("api.call.success", START, end)
+    # The raw queries read the hot columns, not event_data casts.
+    assert "event_data->>'provider_used'" not in first
+    assert "event_data->>'response_time_ms'" not in first
+
+
+def test_time_bucket_queries_truncate_to_their_unit():
+    assert "date_trunc('hour', timestamp)" in impl._AGGREGATE_QUERIES["hour"]
+    assert "date_trunc('day', timestamp)" in impl._AGGREGATE_QUERIES["day"]
+    assert "GROUP BY provider" in impl._AGGREGATE_QUERIES["provider"]
+
+
+@pytest.mark.asyncio
+async def test_null_aggregates_are_filled_with_defaults():
+    bucket = START.replace(minute=0)
+    db, _ = _db(
+        rows=[
+            {
+                "time_bucket": bucket,
+                "total_requests": 3,
+                "successful_requests": None,
+                "avg_response_time_ms": None,
+                "total_cost_usd": None,
+                "failover_count": None,
+            }
+        ]
+    )
+
+    [row] = await db.aggregate_events(
+        "api.call.success", START, START + timedelta(hours=1), "hour"
+    )
+
+    assert row == {
+        "time_bucket": bucket,
+        "total_requests": 3,
+        "successful_requests": 0,
+        "avg_response_time_ms": 0.0,
+        "total_cost_usd": 0.0,
+        "failover_count": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_provider_rows_keep_null_metrics():
+    row = {"aggregated_key": "openai", "total_events": 2, "total_cost_usd": None}
+    db, _ = _db(rows=[row])
+
+    assert await db.aggregate_events(
+        "api.call.success", START, START + timedelta(hours=1), "provider"
+    ) == [row]
+
+
+@pytest.mark.asyncio
+async def test_total_of_an_empty_window_is_one_zero_row():
+    db, _ = _db(rows=[])
+
+    result = await db.aggregate_events(
+        "api.call.success", START, START + timedelta(hours=1), "total"
+    )
+
+    assert result == [
+        {
+            "total_requests": 0,
+            "total_cost_usd": 0.0,
+            "total_failovers": 0,
+            "avg_response_time_ms": 0.0,
+            "latest_bias_score": 0.0,
+        }
+    ]
+
+
+@pytest.mark.asyncio
+async def test_empty_time_buckets_and_unknown_shapes_return_no_rows():
+    db, manager = _db(rows=[])
+    end = START + timedelta(hours=1)
+
+    assert await db.aggregate_events("api.call.success", START, end, "hour") == []
+    assert await db.aggregate_events("api.call.success", START, end, "week") == []
+    assert len(manager.queries) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "window, expected",
+    [
+        (timedelta(seconds=59), impl._AGGREGATE_QUERIES),
+        (timedelta(seconds=60), impl._ROLLUP_AGGREGATE_QUERIES),
+        (timedelta(days=2), impl._ROLLUP_AGGREGATE_QUERIES),
+    ],
+)
+async def test_windows_of_a_bucket_or_more_read_the_rollups(window, expected):
+    db, manager = _db(use_rollups=True)
+
+    await db.aggregate_events("api.call.success", START, START + window, "hour")
+
+    [(query, args)] = manager.queries
+    assert query is expected["hour"]
+    assert args == ("api.call.success", START, START + window)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("aggregate_by", ["hour", "day", "provider", "total"])
+async def test_missing_rollup_tables_fall_back_to_raw_events(aggregate_by):
+    rollup_query = impl._ROLLUP_AGGREGATE_QUERIES[aggregate_by]
+    missing = asyncpg.exceptions.UndefinedTableError(
+        'relation "telemetry_rollups_hour" does not exist'
+    )
+    row = {"aggregated_key": "openai", "total_events": 1}
+    db, manager = _db(rows=[row], use_rollups=True, error_for={rollup_query: missing})
+    end = START + timedelta(hours=2)
+
+    first = await db.aggregate_events("api.call.success", START, end, aggregate_by)
+    second = await db.aggregate_events("api.call.success", START, end, aggregate_by)
+
+    assert first == second
+    assert first and first[0]["total_events"] == 1
+    assert db.use_rollups is False
+    # The rollups are tried once; afterwards only the raw query runs.
+    assert [query for query, _ in manager.queries] == [
+        rollup_query,
+        impl._AGGREGATE_QUERIES[aggregate_by],
+        impl._AGGREGATE_QUERIES[aggregate_by],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_other_rollup_errors_keep_the_rollups_enabled():
+    rollup_query = impl._ROLLUP_AGGREGATE_QUERIES["hour"]
+    db, manager = _db(
+        use_rollups=True, error_for={rollup_query: ConnectionError("reset")}
+    )
+
+    assert await db.aggregate_events(
+        "api.call.success", START, START + timedelta(hours=2), "hour"
+    ) == []
+    assert db.use_rollups is True
+    assert [query for query, _ in manager.queries] == [rollup_query]
+
+
+def _tiled_minutes(start, end):
+    """
+    The minute buckets _ROLLUP_BUCKETS_CTE reads for [start, end], with each
+    hour rollup expanded to its 60 minutes. Mirrors the CTE's bounds.
+    """
+    minute = timedelta(minutes=1)
+    hour = timedelta(hours=1)
+    minute_from = start.replace(second=0, microsecond=0)
+    minute_to = end.replace(second=0, microsecond=0) + minute
+    hour_from = (minute_from + timedelta(minutes=59)).replace(minute=0)
+    hour_to = minute_to.replace(minute=0)
+
+    tiled = []
+    bucket = hour_from
+    while bucket < hour_to:
+        tiled.extend(bucket + i * minute for i in range(60))
+        bucket += hour
+    bucket = minute_from
+    while bucket < minute_to:
+        if not hour_from <= bucket < hour_to:
+            tiled.append(bucket)
+        bucket += minute
+    return minute_from, minute_to, tiled
+
+
+def test_rollup_bounds_are_computed_in_sql():
+    cte = impl._ROLLUP_BUCKETS_CTE
+    assert "date_trunc('minute', $2::timestamptz) AS minute_from" in cte
+    assert "date_trunc('minute', $3::timestamptz) + interval '1 minute'" in cte
+    assert "date_trunc('hour', minute_from + interval '59 minutes')" in cte
+    assert "date_trunc('hour', minute_to) AS hour_to" in cte
+    assert "NOT (m.bucket_start >= b.hour_from AND m.bucket_start < b.hour_to)" in cte
+    for query in impl._ROLLUP_AGGREGATE_QUERIES.values():
+        assert query.startswith(cte)
+
+
+@pytest.mark.parametrize(
+    "start, end",
+    [
+        (START, START + timedelta(minutes=1)),
+        (START + timedelta(minutes=7, seconds=30), START + timedelta(minutes=52)),
+        (START, START + timedelta(hours=1)),
+        (START + timedelta(seconds=1), START + timedelta(hours=3, minutes=59)),
+        (START + timedelta(minutes=59), START + timedelta(hours=1, minutes=1)),
+        (START + timedelta(minutes=45), START + timedelta(days=1, minutes=15)),
+    ],
+)
+def test_rollup_buckets_tile_the_window_exactly_once(start, end):
+    minute_from, minute_to, tiled = _tiled_minutes(start, end)
+
+    assert minute_from <= start and end < minute_to
+    expected = []
+    bucket = minute_from
+    while bucket < minute_to:
+        expected.append(bucket)
+        bucket += timedelta(minutes=1)
+    assert sorted(tiled) == expected
@@ -1,5 +1,7 @@
 # tests/utils/test_error_parser.py
 
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
 from unittest.mock import Mock
 
 import pytest
@@ -131,3 +133,46 @@ def test_unknown_error_classification(parser):
     unknown_error = ValueError("Something unexpected")
     details = parser.classify_error(unknown_error, "some_provider")
     assert details.category == ErrorCategory.UNKNOWN
+
+
+def test_adapter_error_strings_classification(parser):
+    # Adapters report text-only errors when the SDK exception is unavailable.
+    invalid_key = Exception(
+        "OpenAI API Error: Incorrect API key provided: sk-bad. "
+        "(Type: invalid_request_error, Code: invalid_api_key)"
+    )
+    details = parser.classify_error(invalid_key, "openai")
+    assert details.category == ErrorCategory.FATAL
+    assert not details.is_retriable
+
+    auth = Exception("Anthropic API Error: authentication_error: invalid x-api-key")
+    assert parser.classify_error(auth, "anthropic").category == ErrorCategory.FATAL
+
+    for message in (
+        "OpenAI API Error: Rate limit reached for gpt-4o",
+        "Google Gemini API Error: 429 Resource has been exhausted",
+        "Anthropic API Error: overloaded_error: Overloaded",
+    ):
+        details = parser.classify_error(Exception(message), "some_provider")
+        assert details.category == ErrorCategory.TRANSIENT, message
+        assert details.is_retriable
+
+
+def _error_with_headers(headers):
+    error = Exception("Rate limit")
+    error.response = create_mock_response(429, headers=headers)
+    return error
+
+
+def test_retry_after_header_formats(parser):
+    extract = parser._extract_retry_after
+    assert extract(_error_with_headers({"retry-after": "1.5"})) == 1.5
+    both = _error_with_headers({"retry-after-ms": "250", "retry-after": "9"})
+    assert extract(both) == 0.25
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    delay = extract(
+        _error_with_headers({"retry-after": format_datetime(retry_at, usegmt=True)})
+    )
+    assert 28 <= delay <= 30
+    assert extract(_error_with_headers({"retry-after": "soon"})) is None
+    assert extract(ValueError("no response")) is None
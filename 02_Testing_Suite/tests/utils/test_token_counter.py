@@ -0,0 +1,76 @@
+# tests/utils/test_token_counter.py
+
+import pytest
+from antifragile_framework.providers.api_abstraction_layer import ChatMessage
+from antifragile_framework.utils.token_counter import (
+    TIKTOKEN_AVAILABLE,
+    HeuristicTokenCounter,
+    PromptTokenEstimator,
+    TiktokenTokenCounter,
+    TokenCounter,
+)
+
+
+class CountingCounter(TokenCounter):
+    """Counts one token per character and records how often it was asked."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def count(self, text: str) -> int:
+        self.calls += 1
+        return len(text)
+
+
+def test_heuristic_weighs_character_classes():
+    counter = HeuristicTokenCounter()
+    assert counter.count("") == 0
+    assert counter.count("hello world!") == 4  # 11 plain / 4 + 1 symbol / 2
+    # Code splits into more tokens than prose of the same length.
+    assert counter.count("x[i]=f(y);") > counter.count("abcdefghij")
+    # CJK ideographs are roughly a token each, not a quarter of one.
+    assert counter.count("你好世界") == 4
+    assert counter.count("héllo") == 2
+
+
+def test_heuristic_rejects_bad_rates():
+    with pytest.raises(ValueError):
+        HeuristicTokenCounter(chars_per_token=0)
+
+
+def test_counts_are_cached_per_message():
+    counter = CountingCounter()
+    estimator = PromptTokenEstimator(
+        counters={"openai": counter}, message_overhead_tokens=2
+    )
+    history = [ChatMessage(role="user", content="hi"), {"content": "there"}]
+
+    assert estimator.count_messages(history, "openai") == 2 + 2 + 5 + 2
+    assert counter.calls == 2
+    # A new turn only counts the new message.
+    history.append(ChatMessage(role="user", content="again"))
+    assert estimator.count_messages(history, "openai") == 18
+    assert counter.calls == 3
+    assert estimator.hits == 2
+
+
+def test_cache_is_bounded_and_keyed_by_counter():
+    openai_counter, default_counter = CountingCounter(), CountingCounter()
+    estimator = PromptTokenEstimator(
+        counters={"openai": openai_counter},
+        default_counter=default_counter,
+        cache_size=2,
+    )
+    for text in ["a", "b", "c"]:
+        estimator.count_text(text, "openai")
+    estimator.count_text("a", "openai")
+    assert openai_counter.calls == 4  # "a" was evicted
+
+    estimator.count_text("a", "anthropic")
+    assert default_counter.calls == 1
+
+
+@pytest.mark.skipif(not TIKTOKEN_AVAILABLE, reason="tiktoken not installed")
+def test_tiktoken_counter_counts_bpe_tokens():
+    counter = TiktokenTokenCounter()
+    assert counter.count("hello world") == 2
@@ -76,6 +76,11 @@ class PostgreSQLConnectionManager:
                             os.getenv("POSTGRES_COMMAND_TIMEOUT", 30)
                         ),
                         # seconds for a single command
+                        # Prepared statements cached per connection, keyed by
+                        # query text; the time-series queries use fixed texts.
+                        "statement_cache_size": int(
+                            os.getenv("POSTGRES_STATEMENT_CACHE_SIZE", 256)
+                        ),
                     }
 
                     logger.info(
@@ -232,6 +237,32 @@ class PostgreSQLConnectionManager:
                 await self.release_connection(conn)
 
 
+    async def copy_records_to_table(
+        self, table_name: str, records: List[tuple], columns: List[str]
+    ) -> Optional[str]:
+        """
+        Bulk-loads rows with the COPY protocol on a single pooled connection.
+        Much cheaper than one INSERT per row for batches of telemetry.
+        Returns the command status string.
+        """
+        conn = None
+        try:
+            conn = await self.get_connection()
+            status = await conn.copy_records_to_table(
+                table_name, records=records, columns=columns
+            )
+            logger.debug(f"Copied {len(records)} rows into {table_name}: {status}")
+            return status
+        except Exception as e:
+            logger.error(
+                f"Error copying {len(records)} rows into {table_name}: {e}",
+                exc_info=True,
+            )
+            raise
+        finally:
+            if conn:
+                await self.release_connection(conn)
+
 # Example usage (for testing this module in isolation)
 async def main():
     # Set dummy environment variables for local testing
@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 # Standardized path setup relative to the current file
 # Assuming current file is in PROJECT_ROOT/05_Database_Layer/
 from pathlib import Path
-from typing import Any, Dict, Iterator, List
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 CURRENT_DIR = Path(__file__).parent
 PROJECT_ROOT = CURRENT_DIR.parent.parent
@@ -29,10 +29,14 @@ try:
     from telemetry.core_logger import (  # For mock event creation
         UniversalEventSchema,
     )
-    from telemetry.event_topics import (  # For mock events
+    from telemetry.event_topics import (
+        ALL_PROVIDERS_FAILED,
         API_CALL_FAILURE,
         API_CALL_SUCCESS,
+        API_KEY_ROTATION,
         BIAS_LOG_ENTRY_CREATED,
+        CIRCUIT_TRIPPED,
+        MODEL_FAILOVER,
         PROVIDER_FAILOVER,
     )
     from telemetry.time_series_db_interface import TimeSeriesDBInterface
@@ -63,6 +67,9 @@ except ImportError:
         async def execute_query(self, query, *args):
             pass
 
+        async def copy_records_to_table(self, table_name, records, columns):
+            pass
+
     class TimeSeriesDBInterface:
         def __init__(self, conn_manager):
             pass
@@ -92,7 +99,8 @@ except ImportError:
             start_time: datetime,
             end_time: datetime,
             batch_size: int = 1000,
-        ) -> Iterator[Dict[str, Any]]:
+            fields: Optional[List[str]] = None,
+        ) -> AsyncIterator[Dict[str, Any]]:
             for item in []:
                 yield item
 
@@ -124,6 +132,205 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+TELEMETRY_EVENT_COLUMNS = (
+    "id",
+    "event_type",
+    "event_topic",
+    "source_component",
+    "event_data",
+    "correlation_id",
+    "parent_event_id",
+    "duration_ms",
+    "memory_usage_mb",
+    "cpu_usage_percent",
+    "session_id",
+    "query_id",
+    "attempt_id",
+    "timestamp",
+)
+
+
+def _as_uuid(value: Any) -> Optional[uuid.UUID]:
+    if not value:
+        return None
+    if isinstance(value, uuid.UUID):
+        return value
+    return uuid.UUID(value)
+
+
+def _as_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+def _telemetry_record(event_schema: Dict[str, Any]) -> tuple:
+    """
+    Converts a UniversalEventSchema dict into a `telemetry_events` row in
+    TELEMETRY_EVENT_COLUMNS order. UUID and datetime values are used as-is, so
+    producers that already hold parsed values skip the string round trip.
+    """
+    payload = event_schema.get("payload", {})
+    return (
+        _as_uuid(event_schema.get("event_id")) or uuid.uuid4(),
+        event_schema.get("event_type"),
+        # Assuming UniversalEventSchema has event_topic or it can be derived
+        event_schema.get("event_topic"),
+        event_schema.get("event_source"),
+        json.dumps(payload),  # Store full payload as JSONB
+        _as_uuid(payload.get("request_id")),
+        _as_uuid(event_schema.get("parent_event_id")),
+        # Common payload fields mapped to their own columns, if present
+        payload.get("process_time_ms"),
+        payload.get("memory_usage_mb"),
+        payload.get("cpu_usage_percent"),
+        _as_uuid(payload.get("session_id")),
+        _as_uuid(payload.get("query_id")),
+        _as_uuid(payload.get("attempt_id")),
+        _as_timestamp(event_schema.get("timestamp_utc")),
+    )
+
+
+_TIME_BUCKET_AGGREGATE = """
+SELECT
+    date_trunc('{unit}', timestamp) AS time_bucket,
+    COUNT(*) AS total_requests,
+    COUNT(*) FILTER (WHERE success) AS successful_requests,
+    AVG(latency_ms) AS avg_response_time_ms,
+    SUM(cost_usd)::float8 AS total_cost_usd,
+    COUNT(*) FILTER (WHERE failover_occurred) AS failover_count
+FROM telemetry_events
+WHERE event_type = $1 AND timestamp BETWEEN $2 AND $3
+GROUP BY time_bucket
+ORDER BY time_bucket ASC;
+"""
+
+# One fixed text per dashboard query shape (see aggregate_events).
+_AGGREGATE_QUERIES = {
+    "hour": _TIME_BUCKET_AGGREGATE.format(unit="hour"),
+    "day": _TIME_BUCKET_AGGREGATE.format(unit="day"),
+    "provider": """
+SELECT
+    provider AS aggregated_key,
+    COUNT(*) AS total_events,
+    COUNT(*) FILTER (WHERE success) AS successful_events,
+    AVG(latency_ms) AS avg_response_time_ms,
+    SUM(cost_usd)::float8 AS total_cost_usd,
+    COUNT(*) FILTER (WHERE failover_occurred) AS failover_count
+FROM telemetry_events
+WHERE event_type = $1 AND timestamp BETWEEN $2 AND $3
+GROUP BY provider
+ORDER BY total_events DESC;
+""",
+    "total": """
+SELECT
+    COUNT(*) AS total_requests,
+    SUM(cost_usd)::float8 AS total_cost_usd,
+    COUNT(*) FILTER (WHERE failover_occurred) AS total_failovers,
+    AVG(latency_ms) AS avg_response_time_ms,
+    MAX((event_data->>'bias_score')::float) AS latest_bias_score -- Placeholder for overall bias
+FROM telemetry_events
+WHERE event_type = $1 AND timestamp BETWEEN $2 AND $3;
+""",
+}
+
+ROLLUP_BUCKET_SECONDS = 60
+# SQLSTATE of asyncpg's UndefinedTableError: the rollup tables of migration
+# 003 do not exist in this database.
+UNDEFINED_TABLE_SQLSTATE = "42P01"
+
+# Tiles [start, end] with whole hour rollups plus minute rollups at the edges.
+# Bounds are computed in SQL so they follow the same date_trunc as the rollup
+# trigger (migration 003). Windows are widened to whole minutes.
+_ROLLUP_BUCKETS_CTE = """
+WITH bounds AS (
+    SELECT
+        minute_from,
+        minute_to,
+        date_trunc('hour', minute_from + interval '59 minutes') AS hour_from,
+        date_trunc('hour', minute_to) AS hour_to
+    FROM (
+        SELECT
+            date_trunc('minute', $2::timestamptz) AS minute_from,
+            date_trunc('minute', $3::timestamptz) + interval '1 minute' AS minute_to
+    ) m
+),
+buckets AS (
+    SELECT h.*
+    FROM telemetry_rollups_hour h, bounds b
+    WHERE h.event_type = $1
+      AND h.bucket_start >= b.hour_from AND h.bucket_start < b.hour_to
+    UNION ALL
+    SELECT m.*
+    FROM telemetry_rollups_minute m, bounds b
+    WHERE m.event_type = $1
+      AND m.bucket_start >= b.minute_from AND m.bucket_start < b.minute_to
+      AND NOT (m.bucket_start >= b.hour_from AND m.bucket_start < b.hour_to)
+)
+"""
+
+_ROLLUP_TIME_BUCKET_AGGREGATE = _ROLLUP_BUCKETS_CTE + """
+SELECT
+    date_trunc('{unit}', bucket_start) AS time_bucket,
+    SUM(total_count)::bigint AS total_requests,
+    SUM(success_count)::bigint AS successful_requests,
+    SUM(latency_sum) / NULLIF(SUM(latency_count), 0) AS avg_response_time_ms,
+    SUM(cost_sum)::float8 AS total_cost_usd,
+    SUM(failover_count)::bigint AS failover_count
+FROM buckets
+GROUP BY time_bucket
+ORDER BY time_bucket ASC;
+"""
+
+_ROLLUP_AGGREGATE_QUERIES = {
+    "hour": _ROLLUP_TIME_BUCKET_AGGREGATE.format(unit="hour"),
+    "day": _ROLLUP_TIME_BUCKET_AGGREGATE.format(unit="day"),
+    "provider": _ROLLUP_BUCKETS_CTE
+    + """
+SELECT
+    NULLIF(provider, '') AS aggregated_key,
+    SUM(total_count)::bigint AS total_events,
+    SUM(success_count)::bigint AS successful_events,
+    SUM(latency_sum) / NULLIF(SUM(latency_count), 0) AS avg_response_time_ms,
+    SUM(cost_sum)::float8 AS total_cost_usd,
+    SUM(failover_count)::bigint AS failover_count
+FROM buckets
+GROUP BY provider
+ORDER BY total_events DESC;
+""",
+    "total": _ROLLUP_BUCKETS_CTE
+    + """
+SELECT
+    COALESCE(SUM(total_count), 0)::bigint AS total_requests,
+    SUM(cost_sum)::float8 AS total_cost_usd,
+    SUM(failover_count)::bigint AS total_failovers,
+    SUM(latency_sum) / NULLIF(SUM(latency_count), 0) AS avg_response_time_ms,
+    MAX(bias_score_max) AS latest_bias_score
+FROM buckets;
+""",
+}
+
+_TIME_BUCKET_DEFAULTS = {
+    "total_requests": 0,
+    "successful_requests": 0,
+    "avg_response_time_ms": 0.0,
+    "total_cost_usd": 0.0,
+    "failover_count": 0,
+}
+_AGGREGATE_DEFAULTS = {
+    "hour": _TIME_BUCKET_DEFAULTS,
+    "day": _TIME_BUCKET_DEFAULTS,
+    "provider": {},
+    "total": {
+        "total_requests": 0,
+        "total_cost_usd": 0.0,
+        "total_failovers": 0,
+        "avg_response_time_ms": 0.0,
+        "latest_bias_score": 0.0,
+    },
+}
+
+
 class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
     """
     A full implementation of the TimeSeriesDBInterface using PostgreSQL.
@@ -132,12 +339,19 @@ class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
     BiasLedger, Learning Engine, and real-time metrics.
     """
 
-    def __init__(self, connection_manager: PostgreSQLConnectionManager):
+    def __init__(
+        self,
+        connection_manager: PostgreSQLConnectionManager,
+        use_rollups: bool = True,
+    ):
         if not isinstance(connection_manager, PostgreSQLConnectionManager):
             raise TypeError(
                 "connection_manager must be an instance of PostgreSQLConnectionManager"
             )
         self.db_manager = connection_manager
+        # Requires migration 003. Turned off on the first query that finds the
+        # rollup tables missing, which is then answered from raw events.
+        self.use_rollups = use_rollups
         logger.info("PostgreSQLTimeSeriesDB initialized.")
 
     async def initialize(self) -> None:
@@ -158,73 +372,18 @@ class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
     async def record_event(self, event_schema: Dict[str, Any]):
         """
         Records a single telemetry event into the `telemetry_events` table.
-        This is the primary method for writing time-series data.
+        High-volume writers should use record_events_batch or a
+        TelemetryBatchWriter instead.
         """
-        query = """
-        INSERT INTO telemetry_events (
-            id, event_type, event_topic, source_component, event_data,
-            correlation_id, parent_event_id, duration_ms, memory_usage_mb, cpu_usage_percent,
-            session_id, query_id, attempt_id, timestamp
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14);
+        query = f"""
+        INSERT INTO telemetry_events ({", ".join(TELEMETRY_EVENT_COLUMNS)})
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14);
         """
-        payload = event_schema.get("payload", {})
         try:
-            event_id = (
-                uuid.UUID(event_schema.get("event_id"))
-                if event_schema.get("event_id")
-                else uuid.uuid4()
-            )
-            correlation_id = (
-                uuid.UUID(payload.get("request_id"))
-                if payload.get("request_id")
-                else None
-            )
-
-            # Extract common fields from payload for direct column mapping, if they exist
-            # These fields are expected to be in UniversalEventSchema.payload
-            session_id_val = (
-                uuid.UUID(payload.get("session_id"))
-                if payload.get("session_id")
-                else None
-            )
-            query_id_val = (
-                uuid.UUID(payload.get("query_id")) if payload.get("query_id") else None
-            )
-            attempt_id_val = (
-                uuid.UUID(payload.get("attempt_id"))
-                if payload.get("attempt_id")
-                else None
-            )
-            duration_ms_val = payload.get("process_time_ms")
-            memory_usage_mb_val = payload.get("memory_usage_mb")
-            cpu_usage_percent_val = payload.get("cpu_usage_percent")
-            parent_event_id_val = (
-                uuid.UUID(event_schema.get("parent_event_id"))
-                if event_schema.get("parent_event_id")
-                else None
-            )
-
-            await self.db_manager.execute_query(
-                query,
-                event_id,
-                event_schema.get("event_type"),
-                event_schema.get(
-                    "event_topic"
-                ),  # Assuming UniversalEventSchema has event_topic or it can be derived
-                event_schema.get("event_source"),
-                json.dumps(payload),  # Store full payload as JSONB
-                correlation_id,
-                parent_event_id_val,
-                duration_ms_val,
-                memory_usage_mb_val,
-                cpu_usage_percent_val,
-                session_id_val,
-                query_id_val,
-                attempt_id_val,
-                datetime.fromisoformat(event_schema.get("timestamp_utc")),
-            )
+            record = _telemetry_record(event_schema)
+            await self.db_manager.execute_query(query, *record)
             logger.debug(
-                f"Recorded telemetry event: {event_schema.get('event_type')}, ID: {event_id}"
+                f"Recorded telemetry event: {event_schema.get('event_type')}, ID: {record[0]}"
             )
         except Exception as e:
             logger.error(
@@ -233,6 +392,30 @@ class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
             )
             # Depending on robustness needs, may re-raise or just log
 
+    async def record_events_batch(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Writes many events with one COPY on one pooled connection. Events that
+        cannot be converted are logged and skipped; a failed COPY raises so
+        the caller can retry the batch. Returns the number of rows written.
+        """
+        records = []
+        for event_schema in events:
+            try:
+                records.append(_telemetry_record(event_schema))
+            except Exception as e:
+                logger.error(
+                    f"Skipping malformed telemetry event {event_schema.get('event_type')}: {e}"
+                )
+        if not records:
+            return 0
+        await self.db_manager.copy_records_to_table(
+            "telemetry_events",
+            records=records,
+            columns=list(TELEMETRY_EVENT_COLUMNS),
+        )
+        logger.debug(f"Recorded {len(records)} telemetry events in one batch.")
+        return len(records)
+
     async def query_events(
         self,
         event_type: str,
@@ -294,19 +477,33 @@ class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
         start_time: datetime,
         end_time: datetime,
         batch_size: int = 1000,
-    ) -> Iterator[Dict[str, Any]]:
+        fields: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
         """
-        A generator that yields telemetry events in batches to handle large datasets.
+        An async generator that yields telemetry events in (timestamp, id) order.
+
+        Pages are fetched with keyset pagination: each page resumes after the
+        last (timestamp, id) seen, so every page is an index range scan and a
+        full window is read in linear time with at most `batch_size` rows in
+        memory. When `fields` is given, only those keys of event_data are
+        returned.
         """
-        offset = 0
-        while True:
-            batch_query = """
-            SELECT
+        if fields:
+            event_data_column = """(
+                SELECT COALESCE(jsonb_object_agg(key, value), '{}'::jsonb)
+                FROM jsonb_each(event_data)
+                WHERE key = ANY($5::text[])
+            ) AS event_data"""
+            extra_args = [list(fields)]
+        else:
+            event_data_column = "event_data"
+            extra_args = []
+        columns = f"""
                 id AS event_id,
                 event_type,
                 event_topic,
                 source_component,
-                event_data,
+                {event_data_column},
                 correlation_id,
                 parent_event_id,
                 duration_ms,
@@ -315,45 +512,67 @@ class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
                 session_id,
                 query_id,
                 attempt_id,
-                timestamp AS timestamp_utc
-            FROM
-                telemetry_events
-            WHERE
-                event_type = $1 AND timestamp BETWEEN $2 AND $3
-            ORDER BY
-                timestamp ASC
-            LIMIT $4 OFFSET $5;
+                timestamp AS timestamp_utc"""
+        cursor_param = 5 + len(extra_args)
+        first_page_query = f"""
+            SELECT {columns}
+            FROM telemetry_events
+            WHERE event_type = $1 AND timestamp BETWEEN $2 AND $3
+            ORDER BY timestamp ASC, id ASC
+            LIMIT $4;
+            """
+        next_page_query = f"""
+            SELECT {columns}
+            FROM telemetry_events
+            WHERE event_type = $1 AND timestamp BETWEEN $2 AND $3
+              AND (timestamp, id) > (${cursor_param}, ${cursor_param + 1})
+            ORDER BY timestamp ASC, id ASC
+            LIMIT $4;
             """
+        cursor = None
+        while True:
             try:
-                records = await self.db_manager.fetch_rows(
-                    batch_query,
-                    event_type,
-                    start_time,
-                    end_time,
-                    batch_size,
-                    offset,
-                )
-                if not records:
-                    break  # No more records
-
-                for record in records:
-                    # Re-parse event_data (JSONB) into dictionary if it's a string, and map `id` to `event_id`
-                    if "event_data" in record and isinstance(record["event_data"], str):
-                        try:
-                            record["event_data"] = json.loads(record["event_data"])
-                        except json.JSONDecodeError:
-                            pass  # Keep as string if cannot decode
-                    yield record  # Yield each individual event
-
-                offset += len(records)
-                if len(records) < batch_size:
-                    break  # Last batch was smaller than batch_size, so no more records
+                if cursor is None:
+                    records = await self.db_manager.fetch_rows(
+                        first_page_query,
+                        event_type,
+                        start_time,
+                        end_time,
+                        batch_size,
+                        *extra_args,
+                    )
+                else:
+                    records = await self.db_manager.fetch_rows(
+                        next_page_query,
+                        event_type,
+                        start_time,
+                        end_time,
+                        batch_size,
+                        *extra_args,
+                        *cursor,
+                    )
             except Exception as e:
                 logger.error(
                     f"Failed to query events in batch for type {event_type}: {e}",
                     exc_info=True,
                 )
                 break  # Stop generator on error
+            if not records:
+                break  # No more records
+
+            for record in records:
+                # Re-parse event_data (JSONB) into dictionary if it's a string
+                if "event_data" in record and isinstance(record["event_data"], str):
+                    try:
+                        record["event_data"] = json.loads(record["event_data"])
+                    except json.JSONDecodeError:
+                        pass  # Keep as string if cannot decode
+                yield record  # Yield each individual event
+
+            if len(records) < batch_size:
+                break  # Last batch was smaller than batch_size, so no more records
+            last = records[-1]
+            cursor = (last["timestamp_utc"], last["event_id"])
 
     async def aggregate_events(
         self,
@@ -363,141 +582,199 @@ class PostgreSQLTimeSeriesDB(TimeSeriesDBInterface):
         aggregate_by: str,
     ) -> List[Dict[str, Any]]:
         """
-        Aggregates telemetry events based on a specified time interval or attribute.
+        Aggregates telemetry events by "hour", "day", "provider" or "total".
+
+        Windows of at least one rollup bucket are answered from the minute and
+        hour rollups of migration 003 (widened to whole minutes); only shorter
+        windows, or databases without the rollup tables, scan raw events via
+        the hot columns of migration 002. All queries are fixed module-level
+        texts, so asyncpg prepares each shape once per pooled connection and
+        reuses the plan from its statement cache.
         """
-        # This is a basic implementation; more complex aggregations would be needed for full features.
-        if aggregate_by == "hour":
-            time_trunc_field = "DATE_TRUNC('hour', timestamp)"
-        elif aggregate_by == "day":
-            time_trunc_field = "DATE_TRUNC('day', timestamp)"
-        elif aggregate_by == "provider":
-            # For provider, we need to extract provider_used from event_data
-            # This relies on the 'event_data' JSONB having a 'provider_used' key.
-            # This is specific to how certain event_types (like demo_execution) store data.
-            # It's an important note that general telemetry_events may not have this.
-            aggregate_field = "(event_data->>'provider_used')"
-            query = f"""
-            SELECT
-                {aggregate_field} AS aggregated_key,
-                COUNT(id) AS total_events,
-                SUM(CASE WHEN (event_data->>'success')::boolean = TRUE THEN 1 ELSE 0 END) AS successful_events,
-                AVG((event_data->>'response_time_ms')::float) AS avg_response_time_ms,
-                SUM((event_data->>'cost_estimate')::float) AS total_cost_usd,
-                SUM(CASE WHEN (event_data->>'failover_occurred')::boolean = TRUE THEN 1 ELSE 0 END) AS failover_count
-            FROM
-                telemetry_events
-            WHERE
-                event_type = $1 AND timestamp BETWEEN $2 AND $3
-            GROUP BY
-                {aggregate_field}
-            ORDER BY
-                total_events DESC;
-            """
+        use_rollups = (
+            self.use_rollups
+            and (end_time - start_time).total_seconds() >= ROLLUP_BUCKET_SECONDS
+        )
+        queries = _ROLLUP_AGGREGATE_QUERIES if use_rollups else _AGGREGATE_QUERIES
+        query = queries.get(aggregate_by)
+        if query is None:
+            logger.warning(
+                f"Unsupported aggregation type: {aggregate_by}. Returning empty list."
+            )
+            return []
+
+        try:
             try:
                 results = await self.db_manager.fetch_rows(
                     query, event_type, start_time, end_time
                 )
-                logger.debug(
-                    f"Aggregated events by provider for type {event_type}. Results: {results}"
-                )
-                return results
             except Exception as e:
-                logger.error(
-                    f"Error aggregating events by provider for type {event_type}: {e}",
-                    exc_info=True,
+                if not (
+                    use_rollups
+                    and getattr(e, "sqlstate", None) == UNDEFINED_TABLE_SQLSTATE
+                ):
+                    raise
+                logger.warning(
+                    f"Rollup tables are missing ({e}); apply migration 003. "
+                    "Aggregating raw events instead."
                 )
-                return []
-        elif aggregate_by == "total":
-            query = """
-            SELECT
-                COUNT(id) AS total_requests,
-                SUM((event_data->>'cost_estimate')::float) AS total_cost_usd,
-                SUM(CASE WHEN (event_data->>'failover_occurred')::boolean = TRUE THEN 1 ELSE 0 END) AS total_failovers,
-                AVG((event_data->>'response_time_ms')::float) AS avg_response_time_ms,
-                MAX((event_data->>'bias_score')::float) AS latest_bias_score -- Placeholder for overall bias
-            FROM
-                telemetry_events
-            WHERE
-                event_type = $1 AND timestamp BETWEEN $2 AND $3;
-            """
-            try:
-                result = await self.db_manager.fetch_one(
-                    query, event_type, start_time, end_time
-                )
-                # Ensure values are not None if no records, default to 0/empty
-                if result:
-                    result["total_requests"] = result["total_requests"] or 0
-                    result["total_cost_usd"] = result["total_cost_usd"] or 0.0
-                    result["total_failovers"] = result["total_failovers"] or 0
-                    result["avg_response_time_ms"] = (
-                        result["avg_response_time_ms"] or 0.0
-                    )
-                    result["latest_bias_score"] = result["latest_bias_score"] or 0.0
-                    logger.debug(
-                        f"Aggregated total events for type {event_type}. Result: {result}"
-                    )
-                    return [result]
-                return [
-                    {
-                        "total_requests": 0,
-                        "total_cost_usd": 0.0,
-                        "total_failovers": 0,
-                        "avg_response_time_ms": 0.0,
-                        "latest_bias_score": 0.0,
-                    }
-                ]
-            except Exception as e:
-                logger.error(
-                    f"Error aggregating total events for type {event_type}: {e}",
-                    exc_info=True,
+                self.use_rollups = False
+                results = await self.db_manager.fetch_rows(
+                    _AGGREGATE_QUERIES[aggregate_by], event_type, start_time, end_time
                 )
-                return []
-        else:
-            logger.warning(
-                f"Unsupported aggregation type: {aggregate_by}. Returning empty list."
+        except Exception as e:
+            logger.error(
+                f"Error aggregating events by {aggregate_by} for type {event_type}: {e}",
+                exc_info=True,
             )
             return []
 
-        # Generic time-based aggregation for hour/day
-        query = f"""
-        SELECT
-            {time_trunc_field} AS time_bucket,
-            COUNT(id) AS total_requests,
-            SUM(CASE WHEN (event_data->>'success')::boolean = TRUE THEN 1 ELSE 0 END) AS successful_requests,
-            AVG((event_data->>'response_time_ms')::float) AS avg_response_time_ms,
-            SUM((event_data->>'cost_estimate')::float) AS total_cost_usd,
-            SUM(CASE WHEN (event_data->>'failover_occurred')::boolean = TRUE THEN 1 ELSE 0 END) AS failover_count
-        FROM
-            telemetry_events
-        WHERE
-            event_type = $1 AND timestamp BETWEEN $2 AND $3
-        GROUP BY
-            time_bucket
-        ORDER BY
-            time_bucket ASC;
+        if aggregate_by == "total" and not results:
+            results = [{}]
+        # Ensure numerical values are not None
+        for row in results:
+            for key, default in _AGGREGATE_DEFAULTS[aggregate_by].items():
+                if row.get(key) is None:
+                    row[key] = default
+        logger.debug(
+            f"Aggregated events by {aggregate_by} for type {event_type}. Results: {results}"
+        )
+        return results
+
+    async def aggregate_provider_performance(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Computes the LearningEngine's per-(provider, model) counters over
+        BiasLedger entries in one GROUP BY, expanding resilience events with
+        jsonb_array_elements. Mirrors the LearningEngine's Python aggregation:
+        a failure is attributed to the last API_CALL_FAILURE carrying an
+        error_type or ALL_PROVIDERS_FAILED event, else 'unknown_failure'.
+        Returns None on error so the caller can fall back to streaming.
+        """
+        query = """
+        WITH entries AS (
+            SELECT
+                id,
+                COALESCE(NULLIF(event_data->>'final_provider', ''), 'unknown')
+                    AS provider_name,
+                COALESCE(NULLIF(event_data->>'final_model', ''), 'unknown')
+                    AS model_name,
+                event_data->>'outcome' IN ('SUCCESS', 'MITIGATED_SUCCESS')
+                    AS succeeded,
+                event_data,
+                CASE WHEN jsonb_typeof(event_data->'resilience_events') = 'array'
+                     THEN event_data->'resilience_events'
+                     ELSE '[]'::jsonb
+                END AS resilience_events
+            FROM telemetry_events
+            WHERE event_type = $1 AND timestamp BETWEEN $2 AND $3
+              AND event_data ? 'outcome'
+        ),
+        event_counts AS (
+            SELECT
+                e.id,
+                COUNT(*) FILTER (WHERE ev->>'event_type' = ANY($4::text[]))
+                    AS failovers,
+                COUNT(*) FILTER (WHERE ev->>'event_type' = $5) AS circuit_trips
+            FROM entries e
+            CROSS JOIN LATERAL jsonb_array_elements(e.resilience_events) AS ev
+            GROUP BY e.id
+        ),
+        failure_errors AS (
+            SELECT
+                e.provider_name,
+                e.model_name,
+                COALESCE(
+                    (
+                        SELECT CASE WHEN r.ev->>'event_type' = $7
+                                    THEN 'all_providers_failed'
+                                    ELSE r.ev->'payload'->>'error_type'
+                               END
+                        FROM jsonb_array_elements(e.resilience_events)
+                             WITH ORDINALITY AS r(ev, idx)
+                        WHERE (r.ev->>'event_type' = $6
+                               AND COALESCE(r.ev->'payload'->>'error_type', '') <> '')
+                           OR r.ev->>'event_type' = $7
+                        ORDER BY r.idx DESC
+                        LIMIT 1
+                    ),
+                    'unknown_failure'
+                ) AS error_type
+            FROM entries e
+            WHERE NOT COALESCE(e.succeeded, FALSE)
+        ),
+        error_distributions AS (
+            SELECT provider_name, model_name,
+                   jsonb_object_agg(error_type, failures) AS error_distribution
+            FROM (
+                SELECT provider_name, model_name, error_type, COUNT(*) AS failures
+                FROM failure_errors
+                GROUP BY provider_name, model_name, error_type
+            ) counted
+            GROUP BY provider_name, model_name
+        ),
+        per_model AS (
+            SELECT
+                e.provider_name,
+                e.model_name,
+                COUNT(*) AS total_requests,
+                COUNT(*) FILTER (WHERE e.succeeded) AS successful_requests,
+                COALESCE(
+                    SUM((e.event_data->>'total_latency_ms')::float8)
+                        FILTER (WHERE e.succeeded),
+                    0
+                ) AS total_latency_ms,
+                COUNT(*) FILTER (
+                    WHERE (e.event_data->>'mitigation_attempted')::boolean
+                ) AS mitigation_attempted_count,
+                COUNT(*) FILTER (
+                    WHERE (e.event_data->>'mitigation_attempted')::boolean
+                      AND (e.event_data->>'mitigation_succeeded')::boolean
+                ) AS mitigation_successful_count,
+                COALESCE(SUM(c.failovers), 0) AS failover_occurred_count,
+                COALESCE(SUM(c.circuit_trips), 0) AS circuit_breaker_tripped_count,
+                COALESCE(SUM((e.event_data->>'resilience_score')::float8), 0)
+                    AS resilience_scores_sum,
+                COUNT(e.event_data->>'resilience_score') AS resilience_score_count
+            FROM entries e
+            LEFT JOIN event_counts c ON c.id = e.id
+            GROUP BY e.provider_name, e.model_name
+        )
+        SELECT p.*,
+               COALESCE(d.error_distribution, '{}'::jsonb) AS error_distribution
+        FROM per_model p
+        LEFT JOIN error_distributions d
+               ON d.provider_name = p.provider_name
+              AND d.model_name = p.model_name
+        ORDER BY p.provider_name, p.model_name;
         """
         try:
             results = await self.db_manager.fetch_rows(
-                query, event_type, start_time, end_time
-            )
-            # Ensure numerical values are not None
-            for row in results:
-                row["total_requests"] = row["total_requests"] or 0
-                row["successful_requests"] = row["successful_requests"] or 0
-                row["avg_response_time_ms"] = row["avg_response_time_ms"] or 0.0
-                row["total_cost_usd"] = row["total_cost_usd"] or 0.0
-                row["failover_count"] = row["failover_count"] or 0
-            logger.debug(
-                f"Aggregated events by {aggregate_by} for type {event_type}. Results: {results}"
+                query,
+                BIAS_LOG_ENTRY_CREATED,
+                start_time,
+                end_time,
+                [PROVIDER_FAILOVER, MODEL_FAILOVER, API_KEY_ROTATION],
+                CIRCUIT_TRIPPED,
+                API_CALL_FAILURE,
+                ALL_PROVIDERS_FAILED,
             )
-            return results
         except Exception as e:
             logger.error(
-                f"Error aggregating events by {aggregate_by} for type {event_type}: {e}",
+                f"Error aggregating provider performance in the database: {e}",
                 exc_info=True,
             )
-            return []
-
+            return None
+        for row in results:
+            if isinstance(row["error_distribution"], str):
+                row["error_distribution"] = json.loads(row["error_distribution"])
+        logger.debug(
+            f"Aggregated provider performance for {len(results)} provider/model pairs."
+        )
+        return results
 
 # Example Usage (for testing purposes only)
 async def main():
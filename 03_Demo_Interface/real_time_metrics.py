@@ -43,6 +43,7 @@ sys.path.insert(0, str(CURRENT_DIR))  # For sibling modules within 03_Demo_Inter
 # and UniversalEventSchema for structured logging of demo metrics
 try:
     from telemetry import event_topics  # For specific event types
+    from telemetry.batch_writer import TelemetryBatchWriter
     from telemetry.core_logger import UniversalEventSchema
     from telemetry.time_series_db_interface import TimeSeriesDBInterface
 
@@ -223,6 +224,8 @@ class RealTimeMetricsCollector:
 
     def __init__(self):
         self.timeseries_db: Optional[TimeSeriesDBInterface] = None
+        # Buffers recorded executions so requests never wait on a DB insert.
+        self.batch_writer: Optional[TelemetryBatchWriter] = None
         logger.info("RealTimeMetricsCollector initialized.")
 
     async def initialize(self, timeseries_db: TimeSeriesDBInterface):
@@ -246,10 +249,21 @@ class RealTimeMetricsCollector:
         self.timeseries_db = timeseries_db
         # We don't call timeseries_db.initialize() here, as it's assumed the main lifespan
         # of the demo backend will initialize the shared TimeSeriesDBInterface.
+        self.batch_writer = TelemetryBatchWriter(timeseries_db)
+        self.batch_writer.start()
         logger.info(
             "RealTimeMetricsCollector connected to provided TimeSeriesDB instance."
         )
 
+    async def close(self):
+        """
+        Flushes buffered metrics and stops the batch writer. Call this at
+        application shutdown, before the TimeSeriesDB itself is closed.
+        """
+        if self.batch_writer is not None:
+            await self.batch_writer.close()
+            self.batch_writer = None
+
     async def record_demo_execution(
         self,
         session_id: str,
@@ -302,7 +316,10 @@ class RealTimeMetricsCollector:
         ).model_dump()  # Use model_dump to get dict representation
 
         try:
-            await self.timeseries_db.record_event(event_schema)
+            if self.batch_writer is not None:
+                await self.batch_writer.record_event(event_schema)
+            else:
+                await self.timeseries_db.record_event(event_schema)
             logger.debug(f"Recorded demo execution metric for session {session_id}.")
         except Exception as e:
             logger.error(
@@ -533,7 +550,8 @@ if __name__ == "__main__":
         except Exception as e:
             logger.error(f"Demo error: {e}", exc_info=True)
         finally:
-            # Ensure database connections are closed
+            # Flush buffered metrics, then close database connections
+            await metrics_collector.close()
             await timeseries_db.close()
             print("\nRealTimeMetricsCollector demo completed.")
 
@@ -0,0 +1,167 @@
+-- ============================================================================
+-- ADAPTIVE MIND - Telemetry Hot Columns Migration (002)
+-- Migration: 002_telemetry_hot_columns.sql
+-- Description: Promote the JSONB fields that dashboard aggregates read on every
+--              row (provider, success, latency, cost, failover) to typed
+--              columns filled at insert time, and index telemetry_events for
+--              time-range scans and keyset pagination.
+-- ============================================================================
+
+-- Migration metadata
+INSERT INTO public.schema_migrations (version, description, applied_at, rollback_sql)
+VALUES (
+    '002',
+    'Telemetry hot columns and time-range indexes',
+    NOW(),
+    'DROP TRIGGER IF EXISTS trg_telemetry_events_hot_columns ON adaptive_mind.telemetry_events;
+     DROP FUNCTION IF EXISTS adaptive_mind.telemetry_events_hot_columns();
+     DROP INDEX IF EXISTS adaptive_mind.idx_telemetry_timestamp_brin;
+     DROP INDEX IF EXISTS adaptive_mind.idx_telemetry_type_time_id;
+     DROP INDEX IF EXISTS adaptive_mind.idx_telemetry_type_provider_time;
+     ALTER TABLE adaptive_mind.telemetry_events
+         DROP COLUMN IF EXISTS provider,
+         DROP COLUMN IF EXISTS success,
+         DROP COLUMN IF EXISTS latency_ms,
+         DROP COLUMN IF EXISTS cost_usd,
+         DROP COLUMN IF EXISTS failover_occurred;'
+)
+ON CONFLICT (version) DO NOTHING;
+
+-- Begin transaction for atomic migration
+BEGIN;
+
+SET search_path TO adaptive_mind, public;
+
+-- ============================================================================
+-- HOT COLUMNS
+-- ============================================================================
+
+ALTER TABLE telemetry_events
+    ADD COLUMN IF NOT EXISTS provider VARCHAR(100),
+    ADD COLUMN IF NOT EXISTS success BOOLEAN,
+    ADD COLUMN IF NOT EXISTS latency_ms DOUBLE PRECISION,
+    ADD COLUMN IF NOT EXISTS cost_usd NUMERIC(14,6),
+    ADD COLUMN IF NOT EXISTS failover_occurred BOOLEAN;
+
+-- Fills the hot columns from event_data for every writer (single INSERTs and
+-- COPY batches alike). Demo events carry provider_used/success/response_time_ms/
+-- cost_estimate; BiasLedger entries carry final_provider/outcome/
+-- total_latency_ms/estimated_cost_usd. Values of the wrong JSON type are left
+-- NULL instead of failing the insert. Columns set explicitly by the writer win;
+-- on UPDATE that means columns the statement changed, and every other hot
+-- column is recomputed from the new event_data.
+CREATE OR REPLACE FUNCTION telemetry_events_hot_columns()
+RETURNS TRIGGER AS $$
+DECLARE
+    data JSONB := NEW.event_data;
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.provider IS NOT DISTINCT FROM OLD.provider THEN
+            NEW.provider := NULL;
+        END IF;
+        IF NEW.success IS NOT DISTINCT FROM OLD.success THEN
+            NEW.success := NULL;
+        END IF;
+        IF NEW.latency_ms IS NOT DISTINCT FROM OLD.latency_ms THEN
+            NEW.latency_ms := NULL;
+        END IF;
+        IF NEW.cost_usd IS NOT DISTINCT FROM OLD.cost_usd THEN
+            NEW.cost_usd := NULL;
+        END IF;
+        IF NEW.failover_occurred IS NOT DISTINCT FROM OLD.failover_occurred THEN
+            NEW.failover_occurred := NULL;
+        END IF;
+    END IF;
+
+    NEW.provider := COALESCE(
+        NEW.provider,
+        NULLIF(data->>'provider_used', ''),
+        NULLIF(data->>'final_provider', '')
+    );
+    NEW.success := COALESCE(
+        NEW.success,
+        CASE WHEN jsonb_typeof(data->'success') = 'boolean'
+             THEN (data->>'success')::boolean END,
+        CASE WHEN jsonb_typeof(data->'outcome') = 'string'
+             THEN data->>'outcome' IN ('SUCCESS', 'MITIGATED_SUCCESS') END
+    );
+    NEW.latency_ms := COALESCE(
+        NEW.latency_ms,
+        CASE WHEN jsonb_typeof(data->'response_time_ms') = 'number'
+             THEN (data->>'response_time_ms')::double precision END,
+        CASE WHEN jsonb_typeof(data->'total_latency_ms') = 'number'
+             THEN (data->>'total_latency_ms')::double precision END
+    );
+    NEW.cost_usd := COALESCE(
+        NEW.cost_usd,
+        CASE WHEN jsonb_typeof(data->'cost_estimate') = 'number'
+             THEN (data->>'cost_estimate')::numeric END,
+        CASE WHEN jsonb_typeof(data->'estimated_cost_usd') IN ('number', 'string')
+             AND data->>'estimated_cost_usd' ~ '^-?[0-9]+(\.[0-9]+)?$'
+             THEN (data->>'estimated_cost_usd')::numeric END
+    );
+    NEW.failover_occurred := COALESCE(
+        NEW.failover_occurred,
+        CASE WHEN jsonb_typeof(data->'failover_occurred') = 'boolean'
+             THEN (data->>'failover_occurred')::boolean END
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_telemetry_events_hot_columns ON telemetry_events;
+CREATE TRIGGER trg_telemetry_events_hot_columns
+    BEFORE INSERT OR UPDATE OF event_data ON telemetry_events
+    FOR EACH ROW EXECUTE FUNCTION telemetry_events_hot_columns();
+
+-- Backfill existing rows through the trigger. On very large tables run this in
+-- id ranges outside the migration instead.
+UPDATE telemetry_events
+SET event_data = event_data
+WHERE provider IS NULL
+  AND success IS NULL
+  AND latency_ms IS NULL
+  AND cost_usd IS NULL
+  AND failover_occurred IS NULL;
+
+-- ============================================================================
+-- INDEXES
+-- ============================================================================
+
+-- telemetry_events is append-only in timestamp order, so a BRIN index covers
+-- wide time-range scans at a fraction of a B-tree's size.
+CREATE INDEX IF NOT EXISTS idx_telemetry_timestamp_brin
+    ON telemetry_events USING BRIN (timestamp) WITH (pages_per_range = 32);
+
+-- Matches the (timestamp, id) keyset used by query_events_generator and the
+-- event_type + time-range filter of every dashboard query.
+CREATE INDEX IF NOT EXISTS idx_telemetry_type_time_id
+    ON telemetry_events (event_type, timestamp, id);
+
+-- Per-provider aggregates read only the hot columns.
+CREATE INDEX IF NOT EXISTS idx_telemetry_type_provider_time
+    ON telemetry_events (event_type, provider, timestamp)
+    INCLUDE (success, latency_ms, cost_usd, failover_occurred);
+
+COMMENT ON COLUMN telemetry_events.provider IS 'Provider from event_data, filled by trg_telemetry_events_hot_columns';
+COMMENT ON COLUMN telemetry_events.success IS 'Call/request success from event_data';
+COMMENT ON COLUMN telemetry_events.latency_ms IS 'Response latency from event_data';
+COMMENT ON COLUMN telemetry_events.cost_usd IS 'Estimated cost in USD from event_data';
+COMMENT ON COLUMN telemetry_events.failover_occurred IS 'Whether a failover happened, from event_data';
+
+-- Update migration record with completion timestamp
+UPDATE public.schema_migrations
+SET applied_at = NOW()
+WHERE version = '002';
+
+-- Commit the migration
+COMMIT;
+
+-- ============================================================================
+-- POST-MIGRATION TASKS
+-- ============================================================================
+
+ANALYZE adaptive_mind.telemetry_events;
+
+-- Success message
+SELECT 'Adaptive Mind database schema migration 002 completed successfully!' as migration_status;
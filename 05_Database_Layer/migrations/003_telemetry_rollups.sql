@@ -0,0 +1,196 @@
+-- ============================================================================
+-- ADAPTIVE MIND - Telemetry Rollups Migration (003)
+-- Migration: 003_telemetry_rollups.sql
+-- Description: Minute- and hour-level rollups of telemetry_events, maintained
+--              incrementally on ingestion, so dashboard aggregates read a few
+--              pre-summed buckets instead of scanning raw events.
+-- Requires:    002_telemetry_hot_columns.sql
+-- ============================================================================
+
+-- Migration metadata
+INSERT INTO public.schema_migrations (version, description, applied_at, rollback_sql)
+VALUES (
+    '003',
+    'Minute and hour telemetry rollups',
+    NOW(),
+    'DROP TRIGGER IF EXISTS trg_telemetry_events_rollup ON adaptive_mind.telemetry_events;
+     DROP FUNCTION IF EXISTS adaptive_mind.telemetry_events_rollup();
+     DROP TABLE IF EXISTS adaptive_mind.telemetry_rollups_minute;
+     DROP TABLE IF EXISTS adaptive_mind.telemetry_rollups_hour;'
+)
+ON CONFLICT (version) DO NOTHING;
+
+-- Begin transaction for atomic migration
+BEGIN;
+
+SET search_path TO adaptive_mind, public;
+
+-- ============================================================================
+-- ROLLUP TABLES
+-- ============================================================================
+
+-- Every counter is additive (or a max), so buckets merge by summing and
+-- averages are recovered as latency_sum / latency_count.
+CREATE TABLE IF NOT EXISTS telemetry_rollups_minute (
+    event_type VARCHAR(100) NOT NULL,
+    bucket_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    provider VARCHAR(100) NOT NULL DEFAULT '',
+    total_count BIGINT NOT NULL DEFAULT 0,
+    success_count BIGINT NOT NULL DEFAULT 0,
+    failover_count BIGINT NOT NULL DEFAULT 0,
+    latency_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    latency_count BIGINT NOT NULL DEFAULT 0,
+    cost_sum NUMERIC(18,6) NOT NULL DEFAULT 0,
+    bias_score_max DOUBLE PRECISION,
+    PRIMARY KEY (event_type, bucket_start, provider)
+);
+
+CREATE TABLE IF NOT EXISTS telemetry_rollups_hour (
+    LIKE telemetry_rollups_minute INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+    PRIMARY KEY (event_type, bucket_start, provider)
+);
+
+-- ============================================================================
+-- INCREMENTAL MAINTENANCE
+-- ============================================================================
+
+-- A statement-level trigger sees each INSERT or COPY batch as one transition
+-- table, so a batch of N events costs two grouped upserts, not N row updates.
+CREATE OR REPLACE FUNCTION telemetry_events_rollup()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO telemetry_rollups_minute AS r (
+        event_type, bucket_start, provider, total_count, success_count,
+        failover_count, latency_sum, latency_count, cost_sum, bias_score_max
+    )
+    SELECT
+        event_type,
+        date_trunc('minute', timestamp),
+        COALESCE(provider, ''),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE success),
+        COUNT(*) FILTER (WHERE failover_occurred),
+        COALESCE(SUM(latency_ms), 0),
+        COUNT(latency_ms),
+        COALESCE(SUM(cost_usd), 0),
+        MAX(
+            CASE WHEN jsonb_typeof(event_data->'bias_score') = 'number'
+                 THEN (event_data->>'bias_score')::double precision END
+        )
+    FROM new_events
+    GROUP BY 1, 2, 3
+    ON CONFLICT (event_type, bucket_start, provider) DO UPDATE SET
+        total_count = r.total_count + EXCLUDED.total_count,
+        success_count = r.success_count + EXCLUDED.success_count,
+        failover_count = r.failover_count + EXCLUDED.failover_count,
+        latency_sum = r.latency_sum + EXCLUDED.latency_sum,
+        latency_count = r.latency_count + EXCLUDED.latency_count,
+        cost_sum = r.cost_sum + EXCLUDED.cost_sum,
+        bias_score_max = GREATEST(r.bias_score_max, EXCLUDED.bias_score_max);
+
+    INSERT INTO telemetry_rollups_hour AS r (
+        event_type, bucket_start, provider, total_count, success_count,
+        failover_count, latency_sum, latency_count, cost_sum, bias_score_max
+    )
+    SELECT
+        event_type,
+        date_trunc('hour', timestamp),
+        COALESCE(provider, ''),
+        COUNT(*),
+        COUNT(*) FILTER (WHERE success),
+        COUNT(*) FILTER (WHERE failover_occurred),
+        COALESCE(SUM(latency_ms), 0),
+        COUNT(latency_ms),
+        COALESCE(SUM(cost_usd), 0),
+        MAX(
+            CASE WHEN jsonb_typeof(event_data->'bias_score') = 'number'
+                 THEN (event_data->>'bias_score')::double precision END
+        )
+    FROM new_events
+    GROUP BY 1, 2, 3
+    ON CONFLICT (event_type, bucket_start, provider) DO UPDATE SET
+        total_count = r.total_count + EXCLUDED.total_count,
+        success_count = r.success_count + EXCLUDED.success_count,
+        failover_count = r.failover_count + EXCLUDED.failover_count,
+        latency_sum = r.latency_sum + EXCLUDED.latency_sum,
+        latency_count = r.latency_count + EXCLUDED.latency_count,
+        cost_sum = r.cost_sum + EXCLUDED.cost_sum,
+        bias_score_max = GREATEST(r.bias_score_max, EXCLUDED.bias_score_max);
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_telemetry_events_rollup ON telemetry_events;
+CREATE TRIGGER trg_telemetry_events_rollup
+    AFTER INSERT ON telemetry_events
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT EXECUTE FUNCTION telemetry_events_rollup();
+
+-- ============================================================================
+-- BACKFILL
+-- ============================================================================
+
+-- Rebuild both rollups from the raw events already stored. The trigger is in
+-- place first, so nothing inserted during the migration is missed.
+TRUNCATE telemetry_rollups_minute, telemetry_rollups_hour;
+
+INSERT INTO telemetry_rollups_minute (
+    event_type, bucket_start, provider, total_count, success_count,
+    failover_count, latency_sum, latency_count, cost_sum, bias_score_max
+)
+SELECT
+    event_type,
+    date_trunc('minute', timestamp),
+    COALESCE(provider, ''),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE success),
+    COUNT(*) FILTER (WHERE failover_occurred),
+    COALESCE(SUM(latency_ms), 0),
+    COUNT(latency_ms),
+    COALESCE(SUM(cost_usd), 0),
+    MAX(
+        CASE WHEN jsonb_typeof(event_data->'bias_score') = 'number'
+             THEN (event_data->>'bias_score')::double precision END
+    )
+FROM telemetry_events
+GROUP BY 1, 2, 3;
+
+INSERT INTO telemetry_rollups_hour (
+    event_type, bucket_start, provider, total_count, success_count,
+    failover_count, latency_sum, latency_count, cost_sum, bias_score_max
+)
+SELECT
+    event_type,
+    date_trunc('hour', bucket_start),
+    provider,
+    SUM(total_count),
+    SUM(success_count),
+    SUM(failover_count),
+    SUM(latency_sum),
+    SUM(latency_count),
+    SUM(cost_sum),
+    MAX(bias_score_max)
+FROM telemetry_rollups_minute
+GROUP BY 1, 2, 3;
+
+COMMENT ON TABLE telemetry_rollups_minute IS 'Per-minute telemetry_events counters, maintained by trg_telemetry_events_rollup';
+COMMENT ON TABLE telemetry_rollups_hour IS 'Per-hour telemetry_events counters, maintained by trg_telemetry_events_rollup';
+
+-- Update migration record with completion timestamp
+UPDATE public.schema_migrations
+SET applied_at = NOW()
+WHERE version = '003';
+
+-- Commit the migration
+COMMIT;
+
+-- ============================================================================
+-- POST-MIGRATION TASKS
+-- ============================================================================
+
+ANALYZE adaptive_mind.telemetry_rollups_minute;
+ANALYZE adaptive_mind.telemetry_rollups_hour;
+
+-- Success message
+SELECT 'Adaptive Mind database schema migration 003 completed successfully!' as migration_status;